@@ -0,0 +1,66 @@
+"""add aws rollup tables
+
+Revision ID: a7d4e9c2b5f8
+Revises: f3c8a2d1b7e4
+Create Date: 2026-10-17 13:00:00.000000
+
+Agregados por tenant (inventario activo y findings abiertos) que mantiene
+InventoryRollupService al terminar cada auditoría. Tras aplicar la
+migración, poblarlos con `python scripts/refresh_rollups.py`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a7d4e9c2b5f8'
+down_revision = 'f3c8a2d1b7e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'aws_inventory_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('aws_account_id', sa.Integer(), nullable=False),
+        sa.Column('service_name', sa.String(length=50), nullable=False),
+        sa.Column('region', sa.String(length=50), nullable=True),
+        sa.Column('resource_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('affected_resources', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id']),
+        sa.ForeignKeyConstraint(['aws_account_id'], ['aws_accounts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_aws_inventory_rollups_client_account', 'aws_inventory_rollups',
+        ['client_id', 'aws_account_id']
+    )
+
+    op.create_table(
+        'aws_finding_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('aws_account_id', sa.Integer(), nullable=False),
+        sa.Column('service_name', sa.String(length=50), nullable=False),
+        sa.Column('region', sa.String(length=50), nullable=True),
+        sa.Column('severity', sa.String(length=20), nullable=False),
+        sa.Column('open_findings', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('open_savings', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id']),
+        sa.ForeignKeyConstraint(['aws_account_id'], ['aws_accounts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_aws_finding_rollups_client_account', 'aws_finding_rollups',
+        ['client_id', 'aws_account_id']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_aws_finding_rollups_client_account', table_name='aws_finding_rollups')
+    op.drop_table('aws_finding_rollups')
+    op.drop_index('ix_aws_inventory_rollups_client_account', table_name='aws_inventory_rollups')
+    op.drop_table('aws_inventory_rollups')
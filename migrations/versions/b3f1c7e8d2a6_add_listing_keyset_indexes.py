@@ -0,0 +1,36 @@
+"""add keyset indexes for findings and inventory listings
+
+Revision ID: b3f1c7e8d2a6
+Revises: a7d4e9c2b5f8
+Create Date: 2026-10-17 14:00:00.000000
+
+Índices que coinciden con el ORDER BY de la paginación por cursor
+(src/services/keyset_pagination.py): orden por defecto de findings
+(created_at DESC NULLS LAST, id DESC) e inventario activo
+(service_name, resource_id, id).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b3f1c7e8d2a6'
+down_revision = 'a7d4e9c2b5f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_aws_findings_client_created_keyset', 'aws_findings',
+        ['client_id', sa.text('created_at DESC NULLS LAST'), sa.text('id DESC')]
+    )
+    op.create_index(
+        'ix_aws_inventory_client_keyset', 'aws_resource_inventory',
+        ['client_id', 'service_name', 'resource_id', 'id'],
+        postgresql_where=sa.text('is_active')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_aws_inventory_client_keyset', table_name='aws_resource_inventory')
+    op.drop_index('ix_aws_findings_client_created_keyset', table_name='aws_findings')
@@ -0,0 +1,152 @@
+"""add trigram and full-text search for findings and inventory
+
+Revision ID: c9e2a5f1d4b7
+Revises: b3f1c7e8d2a6
+Create Date: 2026-10-17 15:00:00.000000
+
+- pg_trgm + índices GIN trigram: los ILIKE '%x%' de los filtros de
+  findings dejan de hacer seq scan (términos de 3+ caracteres).
+- search_vector: columna tsvector mantenida por un trigger BEFORE
+  INSERT/UPDATE + índice GIN, usada por /search para prefijos y ranking.
+- Índices btree para los filtros de servicio (lower(aws_service)) y de
+  región (prefijo con varchar_pattern_ops).
+
+Sin bloquear las tablas:
+- search_vector NO es una columna GENERATED ... STORED: agregarla
+  reescribe la tabla entera bajo ACCESS EXCLUSIVE. Un ADD COLUMN nullable
+  sin default es solo metadata; el trigger cubre las filas nuevas y el
+  backfill llena las existentes en lotes de BACKFILL_BATCH_SIZE, cada uno
+  en su propia transacción (autocommit_block).
+- Los índices se crean CONCURRENTLY (no bloquean escrituras).
+
+Si la migración se corta a mitad del backfill se puede volver a correr
+desde el principio: el backfill retoma donde search_vector IS NULL. Un
+índice CONCURRENTLY interrumpido queda INVALID y hay que dropearlo a mano
+antes de reintentar.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = 'c9e2a5f1d4b7'
+down_revision = 'b3f1c7e8d2a6'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+# {row} = "NEW." en el trigger, "" en el backfill
+FINDINGS_VECTOR = (
+    "to_tsvector('simple', coalesce({row}resource_id, '') || ' ' || "
+    "coalesce({row}aws_service, '') || ' ' || coalesce({row}finding_type, '') || ' ' || "
+    "coalesce({row}message, ''))"
+)
+
+INVENTORY_VECTOR = (
+    "to_tsvector('simple', coalesce({row}resource_id, '') || ' ' || "
+    "coalesce({row}service_name, '') || ' ' || coalesce({row}resource_type, '') || ' ' || "
+    "coalesce({row}region, ''))"
+)
+
+# (tabla, expresión, columnas que alimentan el vector)
+SEARCH_TABLES = (
+    ('aws_findings', FINDINGS_VECTOR, 'resource_id, aws_service, finding_type, message'),
+    ('aws_resource_inventory', INVENTORY_VECTOR, 'resource_id, service_name, resource_type, region'),
+)
+
+INDEXES = (
+    dict(
+        index_name='ix_aws_findings_resource_id_trgm', table_name='aws_findings',
+        columns=['resource_id'],
+        postgresql_using='gin', postgresql_ops={'resource_id': 'gin_trgm_ops'},
+    ),
+    dict(
+        index_name='ix_aws_findings_message_trgm', table_name='aws_findings',
+        columns=['message'],
+        postgresql_using='gin', postgresql_ops={'message': 'gin_trgm_ops'},
+    ),
+    dict(
+        index_name='ix_aws_findings_search_vector', table_name='aws_findings',
+        columns=['search_vector'],
+        postgresql_using='gin',
+    ),
+    dict(
+        index_name='ix_aws_findings_client_service_lower', table_name='aws_findings',
+        columns=['client_id', sa.text('lower(aws_service)')],
+    ),
+    dict(
+        index_name='ix_aws_findings_client_region_prefix', table_name='aws_findings',
+        columns=['client_id', 'region'],
+        postgresql_ops={'region': 'varchar_pattern_ops'},
+    ),
+    dict(
+        index_name='ix_aws_inventory_resource_id_trgm', table_name='aws_resource_inventory',
+        columns=['resource_id'],
+        postgresql_using='gin', postgresql_ops={'resource_id': 'gin_trgm_ops'},
+    ),
+    dict(
+        index_name='ix_aws_inventory_search_vector', table_name='aws_resource_inventory',
+        columns=['search_vector'],
+        postgresql_using='gin',
+    ),
+)
+
+
+def _backfill(connection, table, expression):
+    while True:
+        result = connection.execute(sa.text(
+            f"UPDATE {table} SET search_vector = {expression.format(row='')} "
+            f"WHERE id IN ("
+            f"  SELECT id FROM {table} WHERE search_vector IS NULL "
+            f"  ORDER BY id LIMIT {BACKFILL_BATCH_SIZE}"
+            f")"
+        ))
+        if result.rowcount == 0:
+            break
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, expression, columns in SEARCH_TABLES:
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        op.execute(
+            f"CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$\n"
+            f"BEGIN\n"
+            f"    NEW.search_vector := {expression.format(row='NEW.')};\n"
+            f"    RETURN NEW;\n"
+            f"END\n"
+            f"$$ LANGUAGE plpgsql"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_search_vector_trg "
+            f"BEFORE INSERT OR UPDATE OF {columns} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()"
+        )
+
+    # El trigger queda activo (commit) antes del backfill: ninguna fila
+    # escrita durante el backfill queda con search_vector NULL
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        for table, expression, _ in SEARCH_TABLES:
+            _backfill(connection, table, expression)
+
+        for index in INDEXES:
+            op.create_index(postgresql_concurrently=True, **index)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for index in reversed(INDEXES):
+            op.drop_index(
+                index['index_name'], table_name=index['table_name'],
+                postgresql_concurrently=True
+            )
+
+    for table, _, _ in reversed(SEARCH_TABLES):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_trg ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+        op.drop_column(table, 'search_vector')
+    # pg_trgm se deja instalada: otras bases/esquemas pueden usarla
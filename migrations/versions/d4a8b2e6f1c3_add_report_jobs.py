@@ -0,0 +1,86 @@
+"""add report_jobs, report_artifacts and clients.data_version
+
+Revision ID: d4a8b2e6f1c3
+Revises: c9e2a5f1d4b7
+Create Date: 2026-10-17 16:00:00.000000
+
+Cola de generación de reportes (scripts/report_worker.py) y cache de
+artefactos generados, direccionados por (cliente, cuenta, tipo,
+data_version).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd4a8b2e6f1c3'
+down_revision = 'c9e2a5f1d4b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'clients',
+        sa.Column('data_version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('requested_by', sa.Integer(), nullable=True),
+        sa.Column('report_type', sa.String(length=30), nullable=False),
+        sa.Column('aws_account_id', sa.Integer(), nullable=True),
+        sa.Column('data_version', sa.Integer(), nullable=False),
+        sa.Column('artifact_key', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='2'),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id']),
+        sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_report_jobs_client_id', 'report_jobs', ['client_id'])
+    op.create_index('ix_report_jobs_claim', 'report_jobs', ['status', 'run_after'])
+    op.create_index(
+        'uq_report_jobs_active_artifact', 'report_jobs', ['artifact_key'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+    op.create_table(
+        'report_artifacts',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('aws_account_id', sa.Integer(), nullable=True),
+        sa.Column('report_type', sa.String(length=30), nullable=False),
+        sa.Column('data_version', sa.Integer(), nullable=False),
+        sa.Column('mimetype', sa.String(length=100), nullable=False),
+        sa.Column('filename', sa.String(length=150), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('content', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index(
+        'ix_report_artifacts_client_type', 'report_artifacts',
+        ['client_id', 'report_type', 'aws_account_id']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_report_artifacts_client_type', table_name='report_artifacts')
+    op.drop_table('report_artifacts')
+    op.drop_index('uq_report_jobs_active_artifact', table_name='report_jobs')
+    op.drop_index('ix_report_jobs_claim', table_name='report_jobs')
+    op.drop_index('ix_report_jobs_client_id', table_name='report_jobs')
+    op.drop_table('report_jobs')
+    op.drop_column('clients', 'data_version')
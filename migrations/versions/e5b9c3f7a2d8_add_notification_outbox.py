@@ -0,0 +1,46 @@
+"""add notification_outbox
+
+Revision ID: e5b9c3f7a2d8
+Revises: d4a8b2e6f1c3
+Create Date: 2026-10-17 18:00:00.000000
+
+Cola de notificaciones salientes (email / Slack / Teams) que consume
+scripts/notification_worker.py.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e5b9c3f7a2d8'
+down_revision = 'd4a8b2e6f1c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('channel', sa.String(length=10), nullable=False),
+        sa.Column('recipient', sa.Text(), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=True),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('source', sa.String(length=50), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='5'),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_notification_outbox_claim', 'notification_outbox', ['status', 'run_after'])
+
+
+def downgrade():
+    op.drop_index('ix_notification_outbox_claim', table_name='notification_outbox')
+    op.drop_table('notification_outbox')
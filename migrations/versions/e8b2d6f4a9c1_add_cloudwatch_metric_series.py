@@ -0,0 +1,45 @@
+"""add cloudwatch_metric_series table
+
+Revision ID: e8b2d6f4a9c1
+Revises: c2a7f4d9e1b6
+Create Date: 2026-10-17 09:00:00.000000
+
+Cache persistente de series de CloudWatch usadas por el rightsizing:
+cada corrida solo descarga el tramo desde el último datapoint guardado.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e8b2d6f4a9c1'
+down_revision = 'c2a7f4d9e1b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cloudwatch_metric_series',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('aws_account_id', sa.Integer(), nullable=False),
+        sa.Column('series_key', sa.String(length=64), nullable=False),
+        sa.Column('namespace', sa.String(length=255), nullable=False),
+        sa.Column('metric_name', sa.String(length=255), nullable=False),
+        sa.Column('stat', sa.String(length=30), nullable=False),
+        sa.Column('dimensions', sa.JSON(), nullable=False),
+        sa.Column('period', sa.Integer(), nullable=False),
+        sa.Column('datapoints', sa.JSON(), nullable=False),
+        sa.Column('covered_until', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['aws_account_id'], ['aws_accounts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('aws_account_id', 'series_key', name='uq_cw_series_account_key'),
+    )
+    op.create_index('ix_cloudwatch_metric_series_aws_account_id', 'cloudwatch_metric_series', ['aws_account_id'])
+    op.create_index('ix_cw_series_updated_at', 'cloudwatch_metric_series', ['updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_cw_series_updated_at', table_name='cloudwatch_metric_series')
+    op.drop_index('ix_cloudwatch_metric_series_aws_account_id', table_name='cloudwatch_metric_series')
+    op.drop_table('cloudwatch_metric_series')
@@ -0,0 +1,58 @@
+"""add audit_jobs table
+
+Revision ID: f3c8a2d1b7e4
+Revises: e8b2d6f4a9c1
+Create Date: 2026-10-17 11:00:00.000000
+
+Cola persistente de auditorías consumida por scripts/audit_worker.py
+(reemplaza los ThreadPoolExecutor en proceso de las rutas de audit).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f3c8a2d1b7e4'
+down_revision = 'e8b2d6f4a9c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'audit_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('provider', sa.String(length=10), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('stage', sa.String(length=50), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_audit_jobs_client_id', 'audit_jobs', ['client_id'])
+    op.create_index('ix_audit_jobs_claim', 'audit_jobs', ['status', 'run_after'])
+    op.create_index('ix_audit_jobs_account', 'audit_jobs', ['provider', 'account_id'])
+    op.create_index(
+        'uq_audit_jobs_active_account', 'audit_jobs', ['provider', 'account_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade():
+    op.drop_index('uq_audit_jobs_active_account', table_name='audit_jobs')
+    op.drop_index('ix_audit_jobs_account', table_name='audit_jobs')
+    op.drop_index('ix_audit_jobs_claim', table_name='audit_jobs')
+    op.drop_index('ix_audit_jobs_client_id', table_name='audit_jobs')
+    op.drop_table('audit_jobs')
@@ -0,0 +1,66 @@
+"""
+AUDIT WORKER
+============
+
+Consume la cola persistente `audit_jobs` (AWS / Azure / GCP) que llenan
+las rutas `/api/client/.../audit/run`.
+
+Se ejecuta como proceso aparte del API (systemd, supervisor, contenedor):
+se pueden levantar varios, en uno o más hosts; cada job lo toma uno solo.
+
+Uso:
+  python scripts/audit_worker.py
+  python scripts/audit_worker.py --concurrency 8 --poll-seconds 2
+
+Variables de entorno:
+  AUDIT_WORKER_CONCURRENCY         jobs simultáneos por proceso (4)
+  AUDIT_WORKER_POLL_SECONDS        espera cuando la cola está vacía (5)
+  AUDIT_JOB_TENANT_LIMIT           auditorías simultáneas por cliente (2)
+  AUDIT_JOB_MAX_ATTEMPTS           intentos por job (3)
+  AUDIT_JOB_RETRY_BACKOFF_SECONDS  backoff base entre intentos (60)
+  AUDIT_JOB_STALE_SECONDS          sin heartbeat → se re-encola (900)
+
+SIGTERM / SIGINT: deja de reclamar jobs y termina los que están en curso.
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+
+from app import app
+from src.services.audit_worker import AuditWorker
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Worker de la cola de auditorías (audit_jobs)"
+    )
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs simultáneos")
+    parser.add_argument("--poll-seconds", type=float, default=None, help="Espera con cola vacía")
+    return parser
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+
+    worker = AuditWorker(
+        app,
+        concurrency=args.concurrency,
+        poll_seconds=args.poll_seconds,
+    )
+
+    def _shutdown(signum, frame):
+        print(f"Señal {signum} recibida: terminando jobs en curso...")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    worker.run_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+BENCH ASSISTANT INTENTS
+=======================
+
+Compara la detección de intención de Finops.ia contra un corpus de
+consultas reales (src/services/assistant_data/benchmark_queries.tsv):
+
+- legacy: el recorrido lineal de antes (`any(kw in text)` por intent,
+  primer match gana, sin normalizar tildes).
+- compiled: IntentMatcher (una regex, texto normalizado, gana el mayor
+  puntaje; los intents genéricos sólo si no hay uno específico).
+
+Reporta tiempo por consulta y aciertos de cada uno, y lista las
+consultas donde fallan. No necesita base de datos ni la app.
+
+Uso:
+  python scripts/bench_assistant_intents.py
+  python scripts/bench_assistant_intents.py --repeat 2000 --corpus otro.tsv
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.services.assistant_intent_matcher import (  # noqa: E402
+    DATA_DIR,
+    IntentMatcher,
+    load_intent_data,
+)
+
+
+DEFAULT_CORPUS = os.path.join(DATA_DIR, "benchmark_queries.tsv")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark del detector de intención de Finops.ia")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="TSV: intent<TAB>consulta")
+    parser.add_argument("--repeat", type=int, default=500, help="Pasadas sobre el corpus")
+    return parser
+
+
+def _load_corpus(path: str) -> list[tuple[str, str]]:
+    corpus = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            expected, query = line.split("\t", 1)
+            corpus.append((expected, query))
+    return corpus
+
+
+def _legacy_detector(intents: dict):
+    def detect(text: str) -> str:
+        t = text.lower()
+        for intent, keywords in intents.items():
+            if any(kw in t for kw in keywords):
+                return intent
+        return "unknown"
+    return detect
+
+
+def _compiled_detector(intents: dict, generic: list):
+    matcher = IntentMatcher(intents, generic)
+    return lambda text: matcher.match(text) or "unknown"
+
+
+def _run(name, detect, corpus, repeat):
+    queries = [q for _, q in corpus]
+    seconds = timeit.timeit(lambda: [detect(q) for q in queries], number=repeat)
+    per_query_us = seconds / (repeat * len(queries)) * 1e6
+
+    misses = [(expected, q, detect(q)) for expected, q in corpus if detect(q) != expected]
+    hits = len(corpus) - len(misses)
+
+    print(f"{name:<9} {per_query_us:8.2f} µs/consulta | aciertos {hits}/{len(corpus)}")
+    return misses
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+
+    data = load_intent_data()
+    intents = data["intents"]
+    corpus = _load_corpus(args.corpus)
+    print(f"{len(corpus)} consultas, {sum(len(k) for k in intents.values())} keywords, "
+          f"{args.repeat} pasadas\n")
+
+    results = {
+        "legacy": _run("legacy", _legacy_detector(intents), corpus, args.repeat),
+        "compiled": _run("compiled", _compiled_detector(intents, data["generic"]), corpus, args.repeat),
+    }
+
+    for name, misses in results.items():
+        if not misses:
+            continue
+        print(f"\nFallos {name}:")
+        for expected, query, got in misses:
+            print(f"  {query!r}: esperado {expected}, detectado {got}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
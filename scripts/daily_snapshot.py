@@ -1,30 +1,62 @@
+"""
+DAILY SNAPSHOT
+==============
+
+Auditoría diaria de todos los clientes activos (AWS, Azure y GCP) +
+RiskSnapshot por cliente. Pensado para cron.
+
+Los clientes se procesan en paralelo en un process pool
+(ver src/services/daily_audit_runner.py). Si el run se corta, volver a
+ejecutarlo retoma ese run (por run_id, no por fecha) desde el último
+cliente terminado.
+
+Uso:
+  python scripts/daily_snapshot.py
+  python scripts/daily_snapshot.py --processes 8
+  python scripts/daily_snapshot.py --client-id 12 --client-id 40
+  python scripts/daily_snapshot.py --fresh      # ignora el run sin terminar
+
+Variables de entorno:
+  DAILY_RUN_PROCESSES         procesos del pool (min(4, CPUs))
+  DAILY_RUN_STS_CONCURRENCY   AssumeRole simultáneos en total (4)
+  DAILY_RUN_CE_CONCURRENCY    llamadas a Cost Explorer simultáneas en total (2)
+  DAILY_RUN_STATE_PATH        archivo de estado/reporte (instance/daily_run_state.json)
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
 from app import app
-from src.models.client import Client
-from src.models.aws_account import AWSAccount
-from src.aws.finops_auditor import FinOpsAuditor
-from src.services.risk_snapshot_service import RiskSnapshotService
+from src.services.daily_audit_runner import DailyAuditRunner
 
-with app.app_context():
 
-    clients = Client.query.filter_by(is_active=True).all()
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Auditoría diaria multi-tenant")
+    parser.add_argument("--processes", type=int, default=None, help="Procesos del pool")
+    parser.add_argument(
+        "--client-id", type=int, action="append", dest="client_ids",
+        help="Limitar a estos clientes (repetible)"
+    )
+    parser.add_argument(
+        "--fresh", action="store_true",
+        help="No retomar: arrancar un run nuevo aunque haya uno sin terminar"
+    )
+    return parser
 
-    for client in clients:
 
-        print(f"\n=== Processing client {client.id} ===")
+def main() -> int:
+    args = _build_parser().parse_args()
 
-        accounts = AWSAccount.query.filter_by(
-            client_id=client.id,
-            is_active=True
-        ).all()
+    runner = DailyAuditRunner(processes=args.processes)
 
-        auditor = FinOpsAuditor()
+    with app.app_context():
+        state = runner.run(client_ids=args.client_ids, fresh=args.fresh)
 
-        # 1️⃣ Ejecutar auditoría por cada cuenta AWS
-        for account in accounts:
-            print(f"Running audit for AWS account {account.id}")
-            auditor.run_comprehensive_audit(client.id, account)
+    failed = [r for r in state["tenants"].values() if r["status"] != "ok"]
+    return 1 if failed else 0
 
-        # 2️⃣ Crear snapshot agregado del cliente
-        RiskSnapshotService.create_snapshot(client.id)
 
-        print(f"Snapshot created for client {client.id}")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+NOTIFICATION WORKER
+===================
+
+Consume la cola `notification_outbox` (emails de eventos de usuario,
+rutas y alertas; webhooks de Slack / Teams) y entrega por canal.
+
+Se ejecuta como proceso aparte del API (systemd, supervisor, contenedor);
+se pueden levantar varios, en uno o más hosts.
+
+Uso:
+  python scripts/notification_worker.py
+  python scripts/notification_worker.py --batch-size 200 --poll-seconds 1
+
+Variables de entorno:
+  NOTIFICATION_BATCH_SIZE             notificaciones por lote (100)
+  NOTIFICATION_POLL_SECONDS           espera cuando la cola está vacía (2)
+  NOTIFICATION_WEBHOOK_CONCURRENCY    posts simultáneos por canal (4)
+  NOTIFICATION_SLACK_CONCURRENCY      override para Slack
+  NOTIFICATION_TEAMS_CONCURRENCY      override para Teams
+  NOTIFICATION_MAX_ATTEMPTS           intentos por notificación (5)
+  NOTIFICATION_RETRY_BACKOFF_SECONDS  backoff base entre intentos (30)
+  NOTIFICATION_STALE_SECONDS          en `sending` más de esto → se re-encola (300)
+  NOTIFICATION_RETENTION_DAYS         antigüedad máxima de enviadas / fallidas (7)
+
+SIGTERM / SIGINT: termina el lote en curso y sale.
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+
+from app import app
+from src.services.notification_dispatcher import NotificationDispatcher
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Worker de la cola de notificaciones (notification_outbox)"
+    )
+    parser.add_argument("--batch-size", type=int, default=None, help="Notificaciones por lote")
+    parser.add_argument("--poll-seconds", type=float, default=None, help="Espera con cola vacía")
+    return parser
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+
+    dispatcher = NotificationDispatcher(
+        app,
+        batch_size=args.batch_size,
+        poll_seconds=args.poll_seconds,
+    )
+
+    def _shutdown(signum, frame):
+        print(f"Señal {signum} recibida: terminando el lote en curso...")
+        dispatcher.stop()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    dispatcher.run_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+REFRESH ROLLUPS
+===============
+
+Recalcula `aws_inventory_rollups` / `aws_finding_rollups` desde las
+tablas crudas. En operación normal no hace falta (FindingEngine los
+refresca al terminar cada auditoría); sirve para el backfill después de
+la migración o para reparar un tenant.
+
+Uso:
+  python scripts/refresh_rollups.py                 # todos los clientes activos
+  python scripts/refresh_rollups.py --client-id 12 --client-id 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from app import app
+from src.models.client import Client
+from src.models.database import db
+from src.services.inventory.rollup_service import InventoryRollupService
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Recalcular rollups de inventario/findings AWS")
+    parser.add_argument(
+        "--client-id", type=int, action="append", dest="client_ids",
+        help="Limitar a estos clientes (repetible)"
+    )
+    return parser
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+
+    with app.app_context():
+        query = Client.query.filter_by(is_active=True)
+        if args.client_ids:
+            query = query.filter(Client.id.in_(args.client_ids))
+
+        client_ids = [c.id for c in query.order_by(Client.id).all()]
+
+        for client_id in client_ids:
+            InventoryRollupService.refresh(client_id)
+            db.session.commit()
+            print(f"✓ client {client_id}")
+
+    print(f"{len(client_ids)} clientes actualizados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
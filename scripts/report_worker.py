@@ -0,0 +1,66 @@
+"""
+REPORT WORKER
+=============
+
+Consume la cola `report_jobs` que llena `POST /api/client/reports/jobs`
+y guarda los archivos generados en `report_artifacts`.
+
+Se ejecuta como proceso aparte del API (systemd, supervisor, contenedor);
+se pueden levantar varios, en uno o más hosts.
+
+Uso:
+  python scripts/report_worker.py
+  python scripts/report_worker.py --concurrency 4 --poll-seconds 1
+
+Variables de entorno:
+  REPORT_WORKER_CONCURRENCY         reportes simultáneos por proceso (2)
+  REPORT_WORKER_POLL_SECONDS        espera cuando la cola está vacía (2)
+  REPORT_JOB_MAX_ATTEMPTS           intentos por job (2)
+  REPORT_JOB_RETRY_BACKOFF_SECONDS  backoff base entre intentos (30)
+  REPORT_JOB_STALE_SECONDS          sin heartbeat → se re-encola (600)
+  REPORT_ARTIFACT_RETENTION_HOURS   antigüedad máxima de artefactos (168)
+
+SIGTERM / SIGINT: deja de reclamar jobs y termina los que están en curso.
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+
+from app import app
+from src.services.report_worker import ReportWorker
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Worker de la cola de reportes (report_jobs)"
+    )
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs simultáneos")
+    parser.add_argument("--poll-seconds", type=float, default=None, help="Espera con cola vacía")
+    return parser
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+
+    worker = ReportWorker(
+        app,
+        concurrency=args.concurrency,
+        poll_seconds=args.poll_seconds,
+    )
+
+    def _shutdown(signum, frame):
+        print(f"Señal {signum} recibida: terminando jobs en curso...")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    worker.run_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,8 +7,9 @@ Prueba end-to-end de notificación de alertas sin depender de métricas AWS.
 Qué hace:
 1) Crea una política temporal "smoke-test-notification"
 2) Usa un evaluador temporal que siempre retorna fired=True
-3) Ejecuta el flujo de envío real (email/slack/teams)
-4) Marca fired solo si el envío fue exitoso
+3) Encola la notificación real (email/slack/teams) en notification_outbox;
+   la entrega la hace scripts/notification_worker.py
+4) Marca fired solo si se pudo encolar
 5) Elimina la política temporal al finalizar (por defecto)
 
 Uso:
@@ -73,7 +74,7 @@ def _build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _smoke_evaluator(policy: AlertPolicy):
+def _smoke_evaluator(policy: AlertPolicy, ctx=None):
     now_utc = datetime.utcnow().isoformat(timespec="seconds")
     return True, {
         "tipo": "smoke-test",
@@ -119,10 +120,11 @@ def main() -> int:
                 return 2
 
             delivered = dispatch_alert(policy, context)
-            print(f"[SMOKE] Envío notificación: delivered={delivered}")
+            print(f"[SMOKE] Notificación encolada: delivered={delivered}")
 
             if delivered:
                 alert_engine._mark_fired(policy)
+                db.session.commit()
                 refreshed = AlertPolicy.query.get(policy.id)
                 last_fired = refreshed.last_fired_at if refreshed else None
                 print(f"[SMOKE] last_fired_at: {last_fired}")
@@ -131,7 +133,7 @@ def main() -> int:
                     print("[SMOKE] ERROR: Envío exitoso sin last_fired_at")
                     return 3
 
-                print("[SMOKE] OK: notificación enviada y política marcada como fired")
+                print("[SMOKE] OK: notificación encolada y política marcada como fired")
                 return 0
 
             print("[SMOKE] ERROR: la notificación no fue entregada")
@@ -11,7 +11,6 @@ por el ML nativo de AWS (más preciso que cálculo manual).
 Requiere permiso: ce:CreateAnomalyMonitor, ce:GetAnomalies
 """
 
-import boto3
 from datetime import date, timedelta
 from botocore.exceptions import ClientError
 
@@ -69,12 +68,7 @@ class AnomalyMonitorService:
             return []
 
         try:
-            creds = STSService.assume_role(account.role_arn, account.external_id)
-            session = boto3.Session(
-                aws_access_key_id=creds["AccessKeyId"],
-                aws_secret_access_key=creds["SecretAccessKey"],
-                aws_session_token=creds["SessionToken"],
-            )
+            session = STSService.get_session(account.role_arn, account.external_id)
             ce = session.client("ce", region_name="us-east-1")
 
             today = date.today().isoformat()
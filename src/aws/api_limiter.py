@@ -0,0 +1,85 @@
+"""
+AWS API LIMITER — tope global de llamadas concurrentes por servicio
+===================================================================
+STS y Cost Explorer tienen cuotas de cuenta bajas (CE además cobra por
+request). Cuando varias auditorías corren a la vez (runner diario con
+process pool, worker de audit_jobs) hay que acotar cuántas llamadas
+simultáneas salen en total, no por thread.
+
+Por defecto no limita nada. Quien orquesta instala los semáforos con
+`install()`; pueden ser de `multiprocessing` (compartidos entre
+procesos del pool) o de `threading`:
+
+    api_limiter.install({"sts": ctx.BoundedSemaphore(4),
+                         "cost-explorer": ctx.BoundedSemaphore(2)})
+
+Las sesiones de STSService registran los hooks de botocore
+(`register()`), así que cualquier cliente CE creado desde ellas pasa
+por el semáforo sin cambiar el código que lo usa. El AssumeRole propio
+de STSService usa `slot("sts")` directamente.
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+# service_id de botocore -> semáforo
+_semaphores = {}
+
+_held = threading.local()
+
+
+def install(semaphores: dict) -> None:
+    _semaphores.update(semaphores)
+
+
+def clear() -> None:
+    _semaphores.clear()
+
+
+@contextmanager
+def slot(service_id: str):
+    semaphore = _semaphores.get(service_id)
+    if semaphore is None:
+        yield
+        return
+
+    semaphore.acquire()
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+# =====================================================
+# HOOKS DE BOTOCORE
+# =====================================================
+def _acquire(event_name=None, **kwargs):
+    service_id = event_name.split(".")[1]
+    semaphore = _semaphores.get(service_id)
+    if semaphore is None:
+        return
+
+    semaphore.acquire()
+    held = getattr(_held, "services", None)
+    if held is None:
+        held = _held.services = []
+    held.append(service_id)
+
+
+def _release(event_name=None, **kwargs):
+    service_id = event_name.split(".")[1]
+    held = getattr(_held, "services", None)
+    if not held or service_id not in held:
+        return
+
+    held.remove(service_id)
+    _semaphores[service_id].release()
+
+
+def register(botocore_session, service_ids=("sts", "cost-explorer")) -> None:
+    """Engancha el límite a los clientes creados desde esta sesión."""
+    for service_id in service_ids:
+        botocore_session.register(f"before-call.{service_id}", _acquire)
+        botocore_session.register(f"after-call.{service_id}", _release)
+        botocore_session.register(f"after-call-error.{service_id}", _release)
@@ -1,4 +1,3 @@
-import boto3
 from datetime import date
 from dateutil.relativedelta import relativedelta
 from src.aws.sts_service import STSService
@@ -8,18 +7,12 @@ from datetime import timedelta
 class CostExplorerService:
 
     def __init__(self, aws_account):
-        creds = STSService.assume_role(
+        session = STSService.get_session(
             role_arn=aws_account.role_arn,
             external_id=aws_account.external_id
         )
 
-        self.client = boto3.client(
-            "ce",
-            aws_access_key_id=creds["AccessKeyId"],
-            aws_secret_access_key=creds["SecretAccessKey"],
-            aws_session_token=creds["SessionToken"],
-            region_name="us-east-1"
-        )
+        self.client = session.client("ce", region_name="us-east-1")
 
     def get_last_6_months_cost(self):
 
@@ -1,17 +1,11 @@
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.aws_finding import AWSFinding
-from src.models.database import db
-from datetime import datetime
-
-
 class DynamoDBRules:
 
     @staticmethod
-    def run_all(client_id: int):
+    def run_all(ctx):
 
         total = 0
-        total += DynamoDBRules.provisioned_mode_rule(client_id)
-        total += DynamoDBRules.empty_table_rule(client_id)
+        total += DynamoDBRules.provisioned_mode_rule(ctx)
+        total += DynamoDBRules.empty_table_rule(ctx)
 
         return total
 
@@ -19,10 +13,10 @@ class DynamoDBRules:
     # PROVISIONED MODE
     # =====================================================
     @staticmethod
-    def provisioned_mode_rule(client_id: int):
+    def provisioned_mode_rule(ctx):
 
         return DynamoDBRules._evaluate_rule(
-            client_id,
+            ctx,
             condition=lambda r: r.resource_metadata.get("billing_mode") == "PROVISIONED",
             finding_type="DYNAMODB_PROVISIONED_MODE",
             severity="MEDIUM",
@@ -34,10 +28,10 @@ class DynamoDBRules:
     # EMPTY TABLE
     # =====================================================
     @staticmethod
-    def empty_table_rule(client_id: int):
+    def empty_table_rule(ctx):
 
         return DynamoDBRules._evaluate_rule(
-            client_id,
+            ctx,
             condition=lambda r: r.resource_metadata.get("item_count", 0) == 0,
             finding_type="DYNAMODB_EMPTY_TABLE",
             severity="LOW",
@@ -49,55 +43,14 @@ class DynamoDBRules:
     # CORE ENGINE
     # =====================================================
     @staticmethod
-    def _evaluate_rule(client_id, condition, finding_type, severity, message, savings):
-
-        resources = AWSResourceInventory.query.filter_by(
-            client_id=client_id,
-            service_name="DynamoDB",
-            resource_type="Table",
-            is_active=True
-        ).all()
-
-        findings_created = 0
-
-        for resource in resources:
-
-            existing = AWSFinding.query.filter_by(
-                client_id=client_id,
-                resource_id=resource.resource_id,
-                finding_type=finding_type
-            ).first()
-
-            if condition(resource):
-
-                if existing:
-                    existing.resolved = False
-                    existing.detected_at = datetime.utcnow()
-                    existing.message = message
-                    existing.estimated_monthly_savings = savings
-                else:
-                    finding = AWSFinding(
-                        client_id=client_id,
-                        aws_account_id=resource.aws_account_id,
-                        resource_id=resource.resource_id,
-                        resource_type=resource.resource_type,
-                        region=resource.region,
-                        aws_service="DynamoDB",
-                        finding_type=finding_type,
-                        severity=severity,
-                        message=message,
-                        estimated_monthly_savings=savings,
-                        resolved=False,
-                        detected_at=datetime.utcnow(),
-                        created_at=datetime.utcnow()
-                    )
-
-                    db.session.add(finding)
-                    findings_created += 1
-
-            else:
-                if existing and not existing.resolved:
-                    existing.resolved = True
-                    existing.resolved_at = datetime.utcnow()
-
-        return findings_created
+    def _evaluate_rule(ctx, condition, finding_type, severity, message, savings):
+
+        return ctx.evaluate(
+            ctx.resources("DynamoDB", "Table"),
+            condition=condition,
+            finding_type=finding_type,
+            severity=severity,
+            message=message,
+            savings=savings,
+            aws_service="DynamoDB",
+        )
@@ -1,42 +1,25 @@
-from datetime import datetime
-from sqlalchemy import and_
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.aws_finding import AWSFinding
-
-
 class EC2Rules:
 
     @staticmethod
-    def stopped_instances_rule(client_id: int):
-
-        stopped_instances = AWSResourceInventory.query.filter(
-            and_(
-                AWSResourceInventory.client_id == client_id,
-                AWSResourceInventory.service_name == "EC2",
-                AWSResourceInventory.resource_type == "Instance",
-                AWSResourceInventory.state == "stopped",
-                AWSResourceInventory.is_active == True
-            )
-        ).all()
+    def stopped_instances_rule(ctx):
 
         findings_created = 0
 
-        for instance in stopped_instances:
+        for instance in ctx.resources("EC2", "Instance"):
 
-            created = AWSFinding.upsert_finding(
-                client_id=client_id,
-                aws_account_id=instance.aws_account_id,
-                resource_id=instance.resource_id,
-                resource_type="Instance",
-                region=instance.region,
-                aws_service=instance.service_name,
+            if instance.state != "stopped":
+                continue
+
+            # Como el upsert_finding original: cuenta cada recurso que cumple
+            # la condición, sea un finding nuevo o uno que sigue abierto
+            ctx.open(
+                instance,
                 finding_type="STOPPED_INSTANCE",
                 severity="MEDIUM",
                 message="EC2 instance is stopped",
-                estimated_monthly_savings=10.0
+                savings=10.0,
+                resource_type="Instance",
             )
+            findings_created += 1
 
-            if created:
-                findings_created += 1
-
-        return findings_created
\ No newline at end of file
+        return findings_created
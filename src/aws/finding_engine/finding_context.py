@@ -0,0 +1,278 @@
+"""
+FINDING CONTEXT — snapshot en memoria para una corrida del FindingEngine
+========================================================================
+En vez de que cada regla haga su propio `AWSResourceInventory.query...all()`
+y un `AWSFinding.query.filter_by(...).first()` + `upsert_finding` por
+recurso, el engine carga UNA vez:
+
+  - el inventario activo del cliente, indexado por servicio,
+    (servicio, tipo) y resource_id;
+  - los findings existentes del cliente (abiertos y resueltos),
+    indexados por (resource_id, finding_type).
+
+Las reglas pasan a ser predicados sobre esas estructuras y solo
+registran intenciones (`open` / `resolve`). Al final `apply()` escribe
+los tres conjuntos resultantes con pocos statements:
+
+  - creates  → INSERT multi-fila ... ON CONFLICT (uq_client_resource_type)
+  - updates  → bulk UPDATE por id (solo findings que realmente cambian)
+  - touches  → UPDATE detected_at WHERE id IN (...) para los findings
+               abiertos que se re-detectan sin cambios (detected_at es la
+               última vez que una corrida vio el problema, como en el
+               upsert_finding original)
+  - resolves → UPDATE ... WHERE id IN (...)
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.models.database import db
+from src.models.aws_finding import AWSFinding
+from src.models.aws_resource_inventory import AWSResourceInventory
+
+
+WRITE_CHUNK_SIZE = 1000
+
+
+def _chunks(items, size=WRITE_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _same_amount(a, b):
+    return float(a or 0) == float(b or 0)
+
+
+class FindingContext:
+
+    def __init__(self, client_id, resources, findings):
+        self.client_id = client_id
+
+        self._resources = resources
+        self._by_id = {}
+        self._by_service = defaultdict(list)
+        self._by_service_type = defaultdict(list)
+
+        for resource in resources:
+            self._by_id[resource.resource_id] = resource
+            self._by_service[resource.service_name].append(resource)
+            self._by_service_type[(resource.service_name, resource.resource_type)].append(resource)
+
+        # (resource_id, finding_type) -> fila liviana del finding existente
+        self._findings = {(f.resource_id, f.finding_type): f for f in findings}
+
+        self._creates = {}
+        self._updates = {}
+        self._touches = set()
+        self._resolves = set()
+
+    # =====================================================
+    # LOAD (2 QUERIES POR CORRIDA)
+    # =====================================================
+    @classmethod
+    def load(cls, client_id):
+        resources = AWSResourceInventory.query.filter_by(
+            client_id=client_id,
+            is_active=True
+        ).all()
+
+        findings = db.session.query(
+            AWSFinding.id,
+            AWSFinding.resource_id,
+            AWSFinding.finding_type,
+            AWSFinding.resolved,
+            AWSFinding.resource_type,
+            AWSFinding.aws_service,
+            AWSFinding.region,
+            AWSFinding.severity,
+            AWSFinding.message,
+            AWSFinding.estimated_monthly_savings,
+        ).filter(
+            AWSFinding.client_id == client_id
+        ).all()
+
+        return cls(client_id, resources, findings)
+
+    # =====================================================
+    # LECTURA DEL INVENTARIO
+    # =====================================================
+    def resources(self, service_name=None, resource_type=None):
+        if service_name is None:
+            return self._resources
+        if resource_type is None:
+            return self._by_service.get(service_name, [])
+        return self._by_service_type.get((service_name, resource_type), [])
+
+    def resource(self, resource_id):
+        return self._by_id.get(resource_id)
+
+    def resource_ids(self, service_name, resource_type=None):
+        return {r.resource_id for r in self.resources(service_name, resource_type)}
+
+    def existing_finding(self, resource_id, finding_type):
+        return self._findings.get((resource_id, finding_type))
+
+    def existing_findings(self, finding_type_prefix=None):
+        """Findings ya persistidos (abiertos y resueltos), opcionalmente por prefijo de tipo."""
+        if finding_type_prefix is None:
+            return list(self._findings.values())
+        return [
+            f for f in self._findings.values()
+            if f.finding_type.startswith(finding_type_prefix)
+        ]
+
+    # =====================================================
+    # INTENCIONES DE LAS REGLAS
+    # =====================================================
+    def open(self, resource, finding_type, severity, message, savings,
+             aws_service=None, resource_type=None):
+        """
+        Registra que el finding debe quedar abierto. Devuelve True si es
+        un finding nuevo: las reglas que antes chequeaban `existing` cuentan
+        solo esos; las que llamaban a upsert_finding sin chequeo (volúmenes
+        sin adjuntar, instancias detenidas, rightsizing) cuentan cada hit.
+        """
+        key = (resource.resource_id, finding_type)
+        self._resolves.discard(key)
+
+        existing = self._findings.get(key)
+        resource_type = resource_type or resource.resource_type
+        aws_service = aws_service or resource.service_name
+
+        if existing is None:
+            if key in self._creates:
+                return False
+            now = datetime.utcnow()
+            self._creates[key] = {
+                "client_id": self.client_id,
+                "aws_account_id": resource.aws_account_id,
+                "resource_id": resource.resource_id,
+                "resource_type": resource_type,
+                "region": resource.region,
+                "aws_service": aws_service,
+                "finding_type": finding_type,
+                "severity": severity,
+                "message": message,
+                "estimated_monthly_savings": savings,
+                "resolved": False,
+                "detected_at": now,
+                "created_at": now,
+            }
+            return True
+
+        unchanged = (
+            not existing.resolved
+            and existing.severity == severity
+            and existing.message == message
+            and _same_amount(existing.estimated_monthly_savings, savings)
+            and existing.resource_type == resource_type
+            and existing.aws_service == aws_service
+            and existing.region == resource.region
+        )
+        if unchanged:
+            self._touches.add(key)
+        else:
+            self._updates[key] = {
+                "id": existing.id,
+                "resolved": False,
+                "severity": severity,
+                "message": message,
+                "estimated_monthly_savings": savings,
+                # Como el upsert original: el finding sigue al recurso
+                "resource_type": resource_type,
+                "aws_service": aws_service,
+                "region": resource.region,
+            }
+        return False
+
+    def resolve(self, resource_id, finding_type):
+        key = (resource_id, finding_type)
+        existing = self._findings.get(key)
+
+        self._creates.pop(key, None)
+        self._updates.pop(key, None)
+        self._touches.discard(key)
+
+        if existing is not None and not existing.resolved:
+            self._resolves.add(key)
+
+    def evaluate(self, resources, condition, finding_type, severity, message,
+                 savings, aws_service=None):
+        """
+        Patrón idempotente con auto-resolución que antes repetía cada
+        `_evaluate_rule`: abre el finding si se cumple la condición y lo
+        resuelve si existía abierto y ya no se cumple.
+        """
+        findings_created = 0
+
+        for resource in resources:
+            if condition(resource):
+                if self.open(resource, finding_type, severity, message, savings,
+                             aws_service=aws_service):
+                    findings_created += 1
+            else:
+                self.resolve(resource.resource_id, finding_type)
+
+        return findings_created
+
+    # =====================================================
+    # APPLY (BULK)
+    # =====================================================
+    def apply(self):
+        """Escribe creates / updates / resolves. No hace commit."""
+        now = datetime.utcnow()
+
+        creates = list(self._creates.values())
+        for chunk in _chunks(creates):
+            stmt = insert(AWSFinding).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_client_resource_type",
+                set_={
+                    "severity": stmt.excluded.severity,
+                    "message": stmt.excluded.message,
+                    "estimated_monthly_savings": stmt.excluded.estimated_monthly_savings,
+                    "resolved": False,
+                    "detected_at": stmt.excluded.detected_at,
+                    "resource_type": stmt.excluded.resource_type,
+                    "aws_service": stmt.excluded.aws_service,
+                    "region": stmt.excluded.region,
+                }
+            )
+            db.session.execute(stmt)
+
+        updates = [{**update, "detected_at": now} for update in self._updates.values()]
+        for chunk in _chunks(updates):
+            db.session.bulk_update_mappings(AWSFinding, chunk)
+
+        touch_ids = [self._findings[key].id for key in self._touches]
+        for chunk in _chunks(touch_ids):
+            AWSFinding.query.filter(
+                AWSFinding.id.in_(chunk)
+            ).update({
+                "detected_at": now,
+            }, synchronize_session=False)
+
+        resolve_ids = [self._findings[key].id for key in self._resolves]
+        for chunk in _chunks(resolve_ids):
+            AWSFinding.query.filter(
+                AWSFinding.id.in_(chunk)
+            ).update({
+                "resolved": True,
+                "resolved_at": now,
+            }, synchronize_session=False)
+
+        stats = {
+            "created": len(creates),
+            "updated": len(updates),
+            "touched": len(touch_ids),
+            "resolved": len(resolve_ids),
+        }
+
+        self._creates.clear()
+        self._updates.clear()
+        self._touches.clear()
+        self._resolves.clear()
+
+        return stats
@@ -22,13 +22,19 @@ from src.aws.finops.rightsizing_engine import RightsizingEngine
 from src.aws.finops.coverage_engine import CoverageEngine
 from src.aws.finops.sp_coverage_engine import SavingsPlanCoverageEngine
 
-from src.models.aws_finding import AWSFinding
+from src.aws.finding_engine.finding_context import FindingContext
+
+from src.config import metrics
+from src.services.inventory.rollup_service import InventoryRollupService
 from src.models.database import db
-from src.models.aws_resource_inventory import AWSResourceInventory
 
+import logging
 import re
 
 
+logger = logging.getLogger(__name__)
+
+
 # =====================================================
 # ENTERPRISE REGION RESOLVER
 # =====================================================
@@ -99,15 +105,14 @@ class FindingEngine:
             pass
 
             # =====================================================
-            # 2️⃣ RESOLVE REGIONS FOR INVENTORY
+            # 2️⃣ SNAPSHOT EN MEMORIA (INVENTARIO + FINDINGS)
             # =====================================================
+            # Las reglas evalúan predicados sobre este snapshot y
+            # registran open/resolve; ctx.apply() escribe todo en bulk.
 
-            resources = AWSResourceInventory.query.filter_by(
-                client_id=client_id,
-                is_active=True
-            ).all()
+            ctx = FindingContext.load(client_id)
 
-            for resource in resources:
+            for resource in ctx.resources():
 
                 if not getattr(resource, "region", None):
 
@@ -120,42 +125,56 @@ class FindingEngine:
             # 3️⃣ EJECUTAR REGLAS BASE
             # =====================================================
 
-            total_findings += EC2Rules.stopped_instances_rule(client_id)
-            total_findings += EBSRules.unattached_volumes_rule(client_id)
-            total_findings += EBSRules.orphaned_snapshot_rule(client_id)
-            total_findings += EIPRules.unassociated_eip_rule(client_id)
-            total_findings += TagRules.missing_required_tags_rule(client_id)
-            total_findings += RDSRules.run_all(client_id)
-            total_findings += LambdaRules.run_all(client_id)
-            total_findings += DynamoDBRules.run_all(client_id)
-            total_findings += CloudWatchRules.run_all(client_id)
-            total_findings += ELBRules.run_all(client_id)
-            total_findings += ElastiCacheRules.run_all(client_id)
-            total_findings += CloudFrontRules.run_all(client_id)
-            total_findings += SageMakerRules.run_all(client_id)
-            total_findings += Route53Rules.run_all(client_id)
-            total_findings += MessagingRules.run_all(client_id)
-            total_findings += KinesisRules.run_all(client_id)
-            total_findings += OpenSearchRules.run_all(client_id)
+            total_findings += metrics.run_rule("aws", "EC2Rules.stopped_instances_rule", EC2Rules.stopped_instances_rule, ctx)
+            total_findings += metrics.run_rule("aws", "EBSRules.unattached_volumes_rule", EBSRules.unattached_volumes_rule, ctx)
+            total_findings += metrics.run_rule("aws", "EBSRules.orphaned_snapshot_rule", EBSRules.orphaned_snapshot_rule, ctx)
+            total_findings += metrics.run_rule("aws", "EIPRules.unassociated_eip_rule", EIPRules.unassociated_eip_rule, ctx)
+            total_findings += metrics.run_rule("aws", "TagRules.missing_required_tags_rule", TagRules.missing_required_tags_rule, ctx)
+            total_findings += metrics.run_rule("aws", "RDSRules.run_all", RDSRules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "LambdaRules.run_all", LambdaRules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "DynamoDBRules.run_all", DynamoDBRules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "CloudWatchRules.run_all", CloudWatchRules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "ELBRules.run_all", ELBRules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "ElastiCacheRules.run_all", ElastiCacheRules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "CloudFrontRules.run_all", CloudFrontRules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "SageMakerRules.run_all", SageMakerRules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "Route53Rules.run_all", Route53Rules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "MessagingRules.run_all", MessagingRules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "KinesisRules.run_all", KinesisRules.run_all, ctx)
+            total_findings += metrics.run_rule("aws", "OpenSearchRules.run_all", OpenSearchRules.run_all, ctx)
 
             # =====================================================
             # 4️⃣ FINOPS CLASSIC RULES
             # =====================================================
 
-            total_findings += ReservedInstanceRules.unused_ri_rule(client_id)
-            total_findings += SavingsPlanRules.review_active_plans_rule(client_id)
-            total_findings += RightsizingRules.ec2_oversized_rule(client_id)
+            total_findings += metrics.run_rule("aws", "ReservedInstanceRules.unused_ri_rule", ReservedInstanceRules.unused_ri_rule, ctx)
+            total_findings += metrics.run_rule("aws", "SavingsPlanRules.review_active_plans_rule", SavingsPlanRules.review_active_plans_rule, ctx)
+            total_findings += metrics.run_rule("aws", "RightsizingRules.ec2_oversized_rule", RightsizingRules.ec2_oversized_rule, ctx)
+
+            stats = ctx.apply()
+
+            logger.info(
+                f"FINDING RULES APPLIED | client_id={client_id} | "
+                f"created={stats['created']} | updated={stats['updated']} | "
+                f"touched={stats['touched']} | resolved={stats['resolved']}"
+            )
 
             # =====================================================
             # 5️⃣ FINOPS ENGINES AVANZADOS
             # =====================================================
 
-            total_findings += RightsizingEngine.run(client_id)
-            total_findings += CoverageEngine.run(client_id)
-            total_findings += SavingsPlanCoverageEngine.run(client_id)
+            total_findings += metrics.run_rule("aws", "RightsizingEngine.run", RightsizingEngine.run, client_id)
+            total_findings += metrics.run_rule("aws", "CoverageEngine.run", CoverageEngine.run, client_id)
+            total_findings += metrics.run_rule("aws", "SavingsPlanCoverageEngine.run", SavingsPlanCoverageEngine.run, client_id)
+
+            # =====================================================
+            # 6️⃣ ROLLUPS DEL TENANT (misma transacción)
+            # =====================================================
+
+            InventoryRollupService.refresh(client_id)
 
             # =====================================================
-            # 6️⃣ SINGLE ENTERPRISE COMMIT
+            # 7️⃣ SINGLE ENTERPRISE COMMIT
             # =====================================================
 
             db.session.commit()
@@ -1,24 +1,20 @@
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.aws_finding import AWSFinding
-
-
 class RDSRules:
 
     # =====================================================
     # ENTRYPOINT
     # =====================================================
     @staticmethod
-    def run_all(client_id: int):
+    def run_all(ctx):
 
         total = 0
 
-        total += RDSRules.public_access_rule(client_id)
-        total += RDSRules.backup_retention_rule(client_id)
-        total += RDSRules.encryption_rule(client_id)
-        total += RDSRules.gp2_storage_rule(client_id)
-        total += RDSRules.multi_az_rule(client_id)
-        total += RDSRules.orphaned_snapshot_rule(client_id)
-        total += RDSRules.aurora_backup_retention_rule(client_id)
+        total += RDSRules.public_access_rule(ctx)
+        total += RDSRules.backup_retention_rule(ctx)
+        total += RDSRules.encryption_rule(ctx)
+        total += RDSRules.gp2_storage_rule(ctx)
+        total += RDSRules.multi_az_rule(ctx)
+        total += RDSRules.orphaned_snapshot_rule(ctx)
+        total += RDSRules.aurora_backup_retention_rule(ctx)
 
         return total
 
@@ -26,10 +22,10 @@ class RDSRules:
     # PUBLIC ACCESS
     # =====================================================
     @staticmethod
-    def public_access_rule(client_id: int):
+    def public_access_rule(ctx):
 
         return RDSRules._evaluate_rule(
-            client_id,
+            ctx,
             condition=lambda r: r.resource_metadata.get("publicly_accessible"),
             finding_type="RDS_PUBLIC_ACCESS",
             severity="HIGH",
@@ -41,10 +37,10 @@ class RDSRules:
     # BACKUP RETENTION
     # =====================================================
     @staticmethod
-    def backup_retention_rule(client_id: int):
+    def backup_retention_rule(ctx):
 
         return RDSRules._evaluate_rule(
-            client_id,
+            ctx,
             condition=lambda r: r.resource_metadata.get("backup_retention", 0) == 0,
             finding_type="RDS_NO_BACKUP_RETENTION",
             severity="HIGH",
@@ -56,10 +52,10 @@ class RDSRules:
     # ENCRYPTION
     # =====================================================
     @staticmethod
-    def encryption_rule(client_id: int):
+    def encryption_rule(ctx):
 
         return RDSRules._evaluate_rule(
-            client_id,
+            ctx,
             condition=lambda r: not r.resource_metadata.get("encrypted", False),
             finding_type="RDS_NOT_ENCRYPTED",
             severity="HIGH",
@@ -71,10 +67,10 @@ class RDSRules:
     # GP2 STORAGE
     # =====================================================
     @staticmethod
-    def gp2_storage_rule(client_id: int):
+    def gp2_storage_rule(ctx):
 
         return RDSRules._evaluate_rule(
-            client_id,
+            ctx,
             condition=lambda r: r.resource_metadata.get("storage_type") == "gp2",
             finding_type="RDS_GP2_STORAGE",
             severity="MEDIUM",
@@ -86,10 +82,10 @@ class RDSRules:
     # MULTI-AZ
     # =====================================================
     @staticmethod
-    def multi_az_rule(client_id: int):
+    def multi_az_rule(ctx):
 
         return RDSRules._evaluate_rule(
-            client_id,
+            ctx,
             condition=lambda r: not r.resource_metadata.get("multi_az", False),
             finding_type="RDS_MULTI_AZ_DISABLED",
             severity="MEDIUM",
@@ -101,174 +97,48 @@ class RDSRules:
     # SNAPSHOT HUÉRFANO (la instancia de origen ya no existe)
     # =====================================================
     @staticmethod
-    def orphaned_snapshot_rule(client_id: int):
-
-        finding_type = "RDS_ORPHANED_SNAPSHOT"
-        severity = "LOW"
-        message = "Snapshot de RDS cuya instancia de origen ya no existe; sigue generando costo de almacenamiento."
-
-        active_db_instance_ids = {
-            r.resource_id
-            for r in AWSResourceInventory.query.filter_by(
-                client_id=client_id,
-                service_name="RDS",
-                resource_type="DBInstance",
-                is_active=True
-            ).all()
-        }
-
-        snapshots = AWSResourceInventory.query.filter_by(
-            client_id=client_id,
-            service_name="RDS",
-            resource_type="Snapshot",
-            is_active=True
-        ).all()
-
-        findings_created = 0
-
-        for snapshot in snapshots:
-
-            source_db_id = (snapshot.resource_metadata or {}).get("db_instance_identifier")
-            is_orphaned = source_db_id not in active_db_instance_ids
-
-            existing = AWSFinding.query.filter_by(
-                client_id=client_id,
-                resource_id=snapshot.resource_id,
-                finding_type=finding_type
-            ).first()
-
-            if is_orphaned:
-
-                if existing:
-                    existing.resolved = False
-                    existing.message = message
-                    existing.severity = severity
-                else:
-                    created = AWSFinding.upsert_finding(
-                        client_id=client_id,
-                        aws_account_id=snapshot.aws_account_id,
-                        resource_id=snapshot.resource_id,
-                        resource_type="Snapshot",
-                        region=snapshot.region,
-                        aws_service="RDS",
-                        finding_type=finding_type,
-                        severity=severity,
-                        message=message,
-                        estimated_monthly_savings=0
-                    )
-                    if created:
-                        findings_created += 1
-
-            else:
-                if existing and not existing.resolved:
-                    existing.resolved = True
-
-        return findings_created
+    def orphaned_snapshot_rule(ctx):
+
+        active_db_instance_ids = ctx.resource_ids("RDS", "DBInstance")
+
+        return ctx.evaluate(
+            ctx.resources("RDS", "Snapshot"),
+            condition=lambda s: (s.resource_metadata or {}).get("db_instance_identifier") not in active_db_instance_ids,
+            finding_type="RDS_ORPHANED_SNAPSHOT",
+            severity="LOW",
+            message="Snapshot de RDS cuya instancia de origen ya no existe; sigue generando costo de almacenamiento.",
+            savings=0,
+            aws_service="RDS",
+        )
 
     # =====================================================
     # AURORA: BACKUP RETENTION DESHABILITADO (MOTOR PROPIO)
     # =====================================================
     @staticmethod
-    def aurora_backup_retention_rule(client_id: int):
-
-        finding_type = "AURORA_NO_BACKUP_RETENTION"
-        severity = "HIGH"
-        message = "Cluster Aurora con backup retention en 0 días; sin respaldo automático ante una falla o borrado accidental."
-        savings = 0
-
-        clusters = AWSResourceInventory.query.filter_by(
-            client_id=client_id,
-            service_name="Aurora",
-            resource_type="Cluster",
-            is_active=True
-        ).all()
+    def aurora_backup_retention_rule(ctx):
 
-        findings_created = 0
-
-        for cluster in clusters:
-            metadata = cluster.resource_metadata or {}
-            no_backup = (metadata.get("backup_retention_period") or 0) == 0
-
-            existing = AWSFinding.query.filter_by(
-                client_id=client_id,
-                resource_id=cluster.resource_id,
-                finding_type=finding_type
-            ).first()
-
-            if no_backup:
-                if existing:
-                    existing.resolved = False
-                    existing.message = message
-                    existing.severity = severity
-                else:
-                    created = AWSFinding.upsert_finding(
-                        client_id=client_id,
-                        aws_account_id=cluster.aws_account_id,
-                        resource_id=cluster.resource_id,
-                        resource_type="Cluster",
-                        region=cluster.region,
-                        aws_service="Aurora",
-                        finding_type=finding_type,
-                        severity=severity,
-                        message=message,
-                        estimated_monthly_savings=savings
-                    )
-                    if created:
-                        findings_created += 1
-            else:
-                if existing and not existing.resolved:
-                    existing.resolved = True
-
-        return findings_created
+        return ctx.evaluate(
+            ctx.resources("Aurora", "Cluster"),
+            condition=lambda c: ((c.resource_metadata or {}).get("backup_retention_period") or 0) == 0,
+            finding_type="AURORA_NO_BACKUP_RETENTION",
+            severity="HIGH",
+            message="Cluster Aurora con backup retention en 0 días; sin respaldo automático ante una falla o borrado accidental.",
+            savings=0,
+            aws_service="Aurora",
+        )
 
     # =====================================================
     # CORE ENGINE (IDEMPOTENT)
     # =====================================================
     @staticmethod
-    def _evaluate_rule(client_id, condition, finding_type, severity, message, savings):
-
-        resources = AWSResourceInventory.query.filter_by(
-            client_id=client_id,
-            service_name="RDS",
-            resource_type="DBInstance",
-            is_active=True
-        ).all()
-
-        findings_created = 0
-
-        for resource in resources:
-
-            existing = AWSFinding.query.filter_by(
-                client_id=client_id,
-                resource_id=resource.resource_id,
-                finding_type=finding_type
-            ).first()
-
-            if condition(resource):
-
-                if existing:
-                    existing.resolved = False
-                    existing.message = message
-                    existing.severity = severity
-                    existing.estimated_monthly_savings = savings
-                else:
-                    created = AWSFinding.upsert_finding(
-                        client_id=client_id,
-                        aws_account_id=resource.aws_account_id,
-                        resource_id=resource.resource_id,
-                        resource_type=resource.resource_type,
-                        region=resource.region,
-                        aws_service="RDS",
-                        finding_type=finding_type,
-                        severity=severity,
-                        message=message,
-                        estimated_monthly_savings=savings
-                    )
-                    if created:
-                        findings_created += 1
-
-            else:
-                if existing and not existing.resolved:
-                    existing.resolved = True
-
-        return findings_created
+    def _evaluate_rule(ctx, condition, finding_type, severity, message, savings):
+
+        return ctx.evaluate(
+            ctx.resources("RDS", "DBInstance"),
+            condition=condition,
+            finding_type=finding_type,
+            severity=severity,
+            message=message,
+            savings=savings,
+            aws_service="RDS",
+        )
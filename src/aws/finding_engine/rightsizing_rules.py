@@ -1,11 +1,7 @@
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.aws_finding import AWSFinding
-
-
 class RightsizingRules:
 
     @staticmethod
-    def ec2_oversized_rule(client_id):
+    def ec2_oversized_rule(ctx):
 
         count = 0
 
@@ -16,15 +12,9 @@ class RightsizingRules:
             "r5.4xlarge"
         ]
 
-        instances = AWSResourceInventory.query.filter_by(
-            client_id=client_id,
-            service_name="EC2",
-            is_active=True
-        ).all()
-
-        for instance in instances:
+        for instance in ctx.resources("EC2"):
 
-            instance_type = instance.resource_metadata.get("instance_type")
+            instance_type = (instance.resource_metadata or {}).get("instance_type")
             state = instance.state
 
             if state != "running":
@@ -32,20 +22,16 @@ class RightsizingRules:
 
             if instance_type in oversized_types:
 
-                created = AWSFinding.upsert_finding(
-                    client_id=client_id,
-                    aws_account_id=instance.aws_account_id,
-                    resource_id=instance.resource_id,
-                    resource_type="Instance",
-                    region=instance.region,
-                    aws_service=instance.service_name,
+                # Como el upsert_finding original: cuenta cada recurso que cumple
+                # la condición, sea un finding nuevo o uno que sigue abierto
+                ctx.open(
+                    instance,
                     finding_type="RIGHTSIZING_OPPORTUNITY",
                     severity="MEDIUM",
                     message=f"Instance {instance.resource_id} may be oversized ({instance_type})",
-                    estimated_monthly_savings=50.0
+                    savings=50.0,
+                    resource_type="Instance",
                 )
-
-                if created:
-                    count += 1
+                count += 1
 
         return count
@@ -1,63 +1,103 @@
-from datetime import datetime
-from sqlalchemy import and_
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.aws_finding import AWSFinding
+import logging
+
+from src.models.tag_policy import TagPolicy
+
+
+logger = logging.getLogger(__name__)
 
 
 class TagRules:
 
-    REQUIRED_TAGS = ["Owner", "Environment"]
+    # Usado solo si el cliente todavía no definió su tag policy
+    DEFAULT_REQUIRED_TAGS = ["Owner", "Environment"]
 
+    FINDING_PREFIX = "MISSING_TAG_"
+
+    # =====================================================
+    # TAG POLICY DEL CLIENTE
+    # =====================================================
     @staticmethod
-    def missing_required_tags_rule(client_id: int):
+    def required_tags(client_id: int):
 
-        resources = AWSResourceInventory.query.filter(
-            and_(
-                AWSResourceInventory.client_id == client_id,
-                AWSResourceInventory.is_active == True
-            )
-        ).all()
+        policies = TagPolicy.query.filter_by(client_id=client_id).all()
 
-        findings_created = 0
+        if not policies:
+            return list(TagRules.DEFAULT_REQUIRED_TAGS)
+
+        return [p.tag_key for p in policies if p.is_required]
+
+    @staticmethod
+    def finding_type_for(tag_key: str):
+        # finding_type es String(100)
+        return f"{TagRules.FINDING_PREFIX}{tag_key.upper()}"[:100]
+
+    # =====================================================
+    # TAG COMPLIANCE (SET-BASED)
+    # =====================================================
+    @staticmethod
+    def missing_required_tags_rule(ctx):
+        """
+        Evalúa los tags del inventario ya guardado contra la tag policy
+        vigente del cliente. Los MISSING_TAG_* existentes vienen
+        precargados en el FindingContext, así que la regla no consulta
+        findings por recurso: arma los conjuntos en memoria y ctx.apply()
+        los escribe en bulk.
+
+          - newly_missing   → finding nuevo
+          - still_missing   → finding abierto (o reabierto) sin cambios
+          - newly_compliant → el recurso ya tiene el tag, o el tag dejó
+                              de ser requerido por la policy
+        """
+        required = {
+            TagRules.finding_type_for(tag): tag
+            for tag in TagRules.required_tags(ctx.client_id)
+        }
+
+        existing_open = {
+            (f.resource_id, f.finding_type)
+            for f in ctx.existing_findings(TagRules.FINDING_PREFIX)
+            if not f.resolved
+        }
 
-        for resource in resources:
+        missing = set()
 
+        for resource in ctx.resources():
             tags = resource.tags or {}
+            for finding_type, tag in required.items():
+                if tag not in tags:
+                    missing.add((resource.resource_id, finding_type))
+
+        newly_missing = missing - existing_open
+        still_missing = missing & existing_open
+        # Recursos inactivos conservan su finding salvo que el tag haya
+        # salido de la policy (igual que antes: solo se evalúa lo activo).
+        newly_compliant = {
+            (resource_id, finding_type)
+            for resource_id, finding_type in existing_open - missing
+            if finding_type not in required or ctx.resource(resource_id) is not None
+        }
+
+        findings_created = 0
+
+        for resource_id, finding_type in missing:
+            tag = required[finding_type]
+            created = ctx.open(
+                ctx.resource(resource_id),
+                finding_type=finding_type,
+                severity="LOW",
+                message=f"Missing required tag: {tag}",
+                savings=0.0,
+            )
+            if created:
+                findings_created += 1
+
+        for resource_id, finding_type in newly_compliant:
+            ctx.resolve(resource_id, finding_type)
+
+        logger.info(
+            f"TAG COMPLIANCE | client_id={ctx.client_id} | required={sorted(required.values())} | "
+            f"newly_missing={len(newly_missing)} | still_missing={len(still_missing)} | "
+            f"newly_compliant={len(newly_compliant)}"
+        )
 
-            for required_tag in TagRules.REQUIRED_TAGS:
-
-                finding_type = f"MISSING_TAG_{required_tag.upper()}"
-
-                existing = AWSFinding.query.filter_by(
-                    client_id=client_id,
-                    resource_id=resource.resource_id,
-                    finding_type=finding_type
-                ).first()
-
-                if required_tag not in tags:
-
-                    if existing:
-                        existing.resolved = False
-                        existing.detected_at = datetime.utcnow()
-                        existing.message = f"Missing required tag: {required_tag}"
-                    else:
-                        created = AWSFinding.upsert_finding(
-                            client_id=client_id,
-                            aws_account_id=resource.aws_account_id,
-                            resource_id=resource.resource_id,
-                            resource_type=resource.resource_type,
-                            region=resource.region,
-                            aws_service=resource.service_name,
-                            finding_type=finding_type,
-                            severity="LOW",
-                            message=f"Missing required tag: {required_tag}",
-                            estimated_monthly_savings=0.0
-                        )
-                        if created:
-                            findings_created += 1
-                else:
-                    if existing and not existing.resolved:
-                        existing.resolved = True
-                        existing.resolved_at = datetime.utcnow()
-
-        return findings_created
\ No newline at end of file
+        return findings_created
@@ -4,9 +4,8 @@ from src.aws.finops.rightsizing.shared import (
     NAT_LOW_TRAFFIC_BYTES,
     resolve_finding,
     upsert_recommendation,
-    get_metric_sum,
-    get_metric_average,
 )
+from src.aws.finops.rightsizing.metrics import MetricBatch, average, total
 from src.aws.finops.rightsizing.pricing import (
     ECS_CPU_DOWNSIZE, ECS_MIN_MEMORY, ecs_task_monthly, HOURS_MONTH,
 )
@@ -33,6 +32,32 @@ def evaluate_ecs(session, client_id, aws_account_id):
 
     ft_idle    = "ECS_SERVICE_RIGHTSIZING_REVIEW"
     ft_fargate = "ECS_FARGATE_RIGHTSIZING"
+    end   = datetime.utcnow()
+    start = end - timedelta(days=7)
+
+    # CPU is only needed for active Fargate services (case 2 below)
+    batch = MetricBatch(session, start, end, aws_account_id=aws_account_id)
+    for service in services:
+        metadata = service.resource_metadata or {}
+        desired  = int(metadata.get("desired_count") or 0)
+        running  = int(metadata.get("running_count") or 0)
+        if desired == 0 or running == 0:
+            continue
+        if metadata.get("launch_type") != "FARGATE" or not metadata.get("task_definition"):
+            continue
+        cluster_arn = metadata.get("cluster_arn")
+        if not cluster_arn:
+            continue
+        batch.add(
+            service.resource_id, service.region,
+            "AWS/ECS", "CPUUtilization",
+            [
+                {"Name": "ClusterName", "Value": cluster_arn.split("/")[-1]},
+                {"Name": "ServiceName", "Value": service.resource_id},
+            ],
+            "Average",
+        )
+    metrics = batch.fetch()
 
     for service in services:
         metadata      = service.resource_metadata or {}
@@ -79,27 +104,13 @@ def evaluate_ecs(session, client_id, aws_account_id):
                 resolve_finding(client_id, aws_account_id, service.resource_id, ft_fargate)
                 continue
 
-            try:
-                cluster_name = cluster_arn.split("/")[-1]
-                cw  = session.client("cloudwatch", region_name=service.region)
-                end = datetime.utcnow()
-                st  = end - timedelta(days=7)
-
-                avg_cpu_util = get_metric_average(
-                    cloudwatch=cw,
-                    namespace="AWS/ECS",
-                    metric_name="CPUUtilization",
-                    dimensions=[
-                        {"Name": "ClusterName", "Value": cluster_name},
-                        {"Name": "ServiceName", "Value": service.resource_id},
-                    ],
-                    start=st, end=end,
-                )
-            except Exception as e:
-                print(f"[ECS CloudWatch ERROR]: {str(e)}")
+            series = metrics.get(service.resource_id)
+            if series is None:
                 resolve_finding(client_id, aws_account_id, service.resource_id, ft_fargate)
                 continue
 
+            avg_cpu_util = average(series["CPUUtilization"])
+
             if avg_cpu_util is None or avg_cpu_util >= 20:
                 resolve_finding(client_id, aws_account_id, service.resource_id, ft_fargate)
                 continue
@@ -210,29 +221,29 @@ def evaluate_nat(session, client_id, aws_account_id):
     end   = datetime.utcnow()
     start = end - timedelta(days=7)
 
+    batch = MetricBatch(session, start, end, aws_account_id=aws_account_id)
+    for gw in gateways:
+        if gw.state != "available":
+            continue
+        dims = [{"Name": "NatGatewayId", "Value": gw.resource_id}]
+        batch.add(gw.resource_id, gw.region,
+                  "AWS/NATGateway", "BytesOutToDestination", dims, "Sum")
+        batch.add(gw.resource_id, gw.region,
+                  "AWS/NATGateway", "BytesInFromSource", dims, "Sum")
+    metrics = batch.fetch()
+
     for gw in gateways:
         if gw.state != "available":
             resolve_finding(client_id, aws_account_id, gw.resource_id, finding_type)
             continue
 
-        try:
-            cw = session.client("cloudwatch", region_name=gw.region)
-            bytes_out = get_metric_sum(
-                cloudwatch=cw, namespace="AWS/NATGateway",
-                metric_name="BytesOutToDestination",
-                dimensions=[{"Name": "NatGatewayId", "Value": gw.resource_id}],
-                start=start, end=end,
-            ) or 0
-            bytes_in = get_metric_sum(
-                cloudwatch=cw, namespace="AWS/NATGateway",
-                metric_name="BytesInFromSource",
-                dimensions=[{"Name": "NatGatewayId", "Value": gw.resource_id}],
-                start=start, end=end,
-            ) or 0
-        except Exception as e:
-            print(f"[NAT RIGHTSIZING ERROR]: {str(e)}")
+        series = metrics.get(gw.resource_id)
+        if series is None or "BytesOutToDestination" not in series or "BytesInFromSource" not in series:
             continue
 
+        bytes_out = total(series["BytesOutToDestination"]) or 0
+        bytes_in  = total(series["BytesInFromSource"]) or 0
+
         total_bytes = bytes_in + bytes_out
 
         if total_bytes < NAT_LOW_TRAFFIC_BYTES:
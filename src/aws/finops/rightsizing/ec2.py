@@ -4,8 +4,8 @@ from src.aws.finops.rightsizing.shared import (
     EC2_CPU_THRESHOLD,
     resolve_finding,
     upsert_recommendation,
-    get_metric_average,
 )
+from src.aws.finops.rightsizing.metrics import MetricBatch, average
 from src.aws.finops.rightsizing.pricing import EC2_DOWNSIZE, ec2_monthly
 
 
@@ -25,6 +25,20 @@ def evaluate_ec2(session, client_id, aws_account_id):
         is_active=True
     ).all()
 
+    end   = datetime.utcnow()
+    start = end - timedelta(days=7)
+
+    batch = MetricBatch(session, start, end, aws_account_id=aws_account_id)
+    for instance in instances:
+        if instance.state == "running":
+            batch.add(
+                instance.resource_id, instance.region,
+                "AWS/EC2", "CPUUtilization",
+                [{"Name": "InstanceId", "Value": instance.resource_id}],
+                "Average",
+            )
+    metrics = batch.fetch()
+
     for instance in instances:
         finding_type = "EC2_UNDERUTILIZED"
 
@@ -36,23 +50,13 @@ def evaluate_ec2(session, client_id, aws_account_id):
         instance_id  = instance.resource_id
         instance_type = (instance.resource_metadata or {}).get("instance_type", "")
 
-        cloudwatch = session.client("cloudwatch", region_name=region)
-        end   = datetime.utcnow()
-        start = end - timedelta(days=7)
-
-        try:
-            avg_cpu = get_metric_average(
-                cloudwatch=cloudwatch,
-                namespace="AWS/EC2",
-                metric_name="CPUUtilization",
-                dimensions=[{"Name": "InstanceId", "Value": instance_id}],
-                start=start,
-                end=end,
-            )
-        except Exception as e:
-            print(f"[EC2 RIGHTSIZING ERROR]: {str(e)}")
+        series = metrics.get(instance_id)
+        if series is None:
+            # CloudWatch query failed for this instance's region
             continue
 
+        avg_cpu = average(series["CPUUtilization"])
+
         if avg_cpu is None:
             resolve_finding(client_id, aws_account_id, instance_id, finding_type)
             continue
@@ -4,9 +4,8 @@ from src.aws.finops.rightsizing.shared import (
     LAMBDA_LOW_INVOCATIONS_THRESHOLD,
     resolve_finding,
     upsert_recommendation,
-    get_metric_sum,
-    get_metric_average,
 )
+from src.aws.finops.rightsizing.metrics import MetricBatch, average, total
 from src.aws.finops.rightsizing.pricing import (
     next_smaller_lambda_memory,
     lambda_monthly_cost,
@@ -33,6 +32,17 @@ def evaluate_lambda(session, client_id, aws_account_id):
     end   = datetime.utcnow()
     start = end - timedelta(days=7)
 
+    batch = MetricBatch(session, start, end, aws_account_id=aws_account_id)
+    for function in functions:
+        if int((function.resource_metadata or {}).get("memory_size") or 0) <= 128:
+            continue
+        dims = [{"Name": "FunctionName", "Value": function.resource_id}]
+        batch.add(function.resource_id, function.region,
+                  "AWS/Lambda", "Invocations", dims, "Sum")
+        batch.add(function.resource_id, function.region,
+                  "AWS/Lambda", "Duration", dims, "Average")
+    metrics = batch.fetch()
+
     for function in functions:
         memory_size = int((function.resource_metadata or {}).get("memory_size") or 0)
 
@@ -41,30 +51,13 @@ def evaluate_lambda(session, client_id, aws_account_id):
             resolve_finding(client_id, aws_account_id, function.resource_id, finding_type)
             continue
 
-        try:
-            cloudwatch = session.client("cloudwatch", region_name=function.region)
-
-            total_invocations = get_metric_sum(
-                cloudwatch=cloudwatch,
-                namespace="AWS/Lambda",
-                metric_name="Invocations",
-                dimensions=[{"Name": "FunctionName", "Value": function.resource_id}],
-                start=start,
-                end=end,
-            )
-
-            avg_duration_ms = get_metric_average(
-                cloudwatch=cloudwatch,
-                namespace="AWS/Lambda",
-                metric_name="Duration",
-                dimensions=[{"Name": "FunctionName", "Value": function.resource_id}],
-                start=start,
-                end=end,
-            )
-        except Exception as e:
-            print(f"[LAMBDA RIGHTSIZING ERROR]: {str(e)}")
+        series = metrics.get(function.resource_id)
+        if series is None or "Invocations" not in series or "Duration" not in series:
             continue
 
+        total_invocations = total(series["Invocations"])
+        avg_duration_ms   = average(series["Duration"])
+
         # No invocations in 7 days + high memory → flag as dormant
         if (total_invocations is None or total_invocations == 0) and memory_size > 1024:
             upsert_recommendation(
@@ -0,0 +1,135 @@
+"""
+Persistent store for the CloudWatch series read by the rightsizing.
+
+Daily datapoints for closed periods never change, so there is no point
+in downloading the full 7-day window on every audit. Series are kept in
+`cloudwatch_metric_series`, keyed by account + (region, namespace,
+metric, stat, dimensions, period), together with `covered_until`: the end of the range
+already fetched. MetricBatch only asks CloudWatch for the gap after it.
+
+Points older than CLOUDWATCH_METRIC_RETENTION_DAYS are trimmed on every
+write, and series nobody has refreshed within that window (deleted
+resources) are purged by `purge_stale()`.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.models.database import db
+from src.models.cloudwatch_metric_series import CloudWatchMetricSeries
+
+
+WRITE_CHUNK_SIZE = 500
+
+
+def cache_enabled():
+    return os.getenv("CLOUDWATCH_METRIC_CACHE", "true").lower() == "true"
+
+
+def retention_days():
+    return max(1, int(os.getenv("CLOUDWATCH_METRIC_RETENTION_DAYS", "14")))
+
+
+def series_key(region, namespace, metric_name, stat, dimensions, period):
+    dims = sorted((d["Name"], d["Value"]) for d in dimensions)
+    raw = json.dumps([region, namespace, metric_name, stat, dims, period])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def align(ts, period):
+    """Floors a naive UTC datetime to a period boundary (midnight for daily)."""
+    epoch = datetime(1970, 1, 1)
+    seconds = int((ts - epoch).total_seconds())
+    return epoch + timedelta(seconds=seconds - seconds % period)
+
+
+def _chunks(items, size=WRITE_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class MetricSeriesStore:
+
+    def __init__(self, aws_account_id):
+        self.aws_account_id = aws_account_id
+
+    # =====================================================
+    # READ
+    # =====================================================
+    def load(self, keys):
+        """series_key -> (datapoints, covered_until) for the keys already stored."""
+        stored = {}
+
+        for chunk in _chunks(list(set(keys))):
+            rows = db.session.query(
+                CloudWatchMetricSeries.series_key,
+                CloudWatchMetricSeries.datapoints,
+                CloudWatchMetricSeries.covered_until,
+            ).filter(
+                CloudWatchMetricSeries.aws_account_id == self.aws_account_id,
+                CloudWatchMetricSeries.series_key.in_(chunk)
+            ).all()
+
+            for row in rows:
+                stored[row.series_key] = (row.datapoints or {}, row.covered_until)
+
+        return stored
+
+    # =====================================================
+    # WRITE (no commit — the rightsizing run commits)
+    # =====================================================
+    def save(self, series):
+        """
+        series: list of dicts with series_key, namespace, metric_name,
+        stat, dimensions, period, datapoints and covered_until.
+        """
+        if not series:
+            return
+
+        now = datetime.utcnow()
+        cutoff = (now - timedelta(days=retention_days())).isoformat()
+
+        # Postgres rejects an ON CONFLICT touching the same row twice per statement
+        rows = {}
+        for item in series:
+            rows[item["series_key"]] = {
+                **item,
+                "aws_account_id": self.aws_account_id,
+                "datapoints": {
+                    ts: value for ts, value in item["datapoints"].items()
+                    if ts >= cutoff
+                },
+                "updated_at": now,
+            }
+
+        for chunk in _chunks(list(rows.values())):
+            stmt = insert(CloudWatchMetricSeries).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_cw_series_account_key",
+                set_={
+                    "datapoints": stmt.excluded.datapoints,
+                    "covered_until": stmt.excluded.covered_until,
+                    "updated_at": stmt.excluded.updated_at,
+                }
+            )
+            with db.session.begin_nested():
+                db.session.execute(stmt)
+
+    # =====================================================
+    # RETENTION
+    # =====================================================
+    @staticmethod
+    def purge_stale(aws_account_id=None):
+        cutoff = datetime.utcnow() - timedelta(days=retention_days())
+
+        query = CloudWatchMetricSeries.query.filter(
+            CloudWatchMetricSeries.updated_at < cutoff
+        )
+        if aws_account_id is not None:
+            query = query.filter(CloudWatchMetricSeries.aws_account_id == aws_account_id)
+
+        return query.delete(synchronize_session=False)
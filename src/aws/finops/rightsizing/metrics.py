@@ -0,0 +1,236 @@
+"""
+Batched CloudWatch reads for the rightsizing evaluators.
+
+Instead of one `get_metric_statistics` call (and one new CloudWatch
+client) per resource, an evaluator declares every metric it needs on a
+MetricBatch and fetches them all at once through `GetMetricData`:
+one client per region, up to 500 metric queries per call.
+
+    batch = MetricBatch(session, start, end, aws_account_id=aws_account_id)
+    batch.add(instance_id, region, "AWS/EC2", "CPUUtilization",
+              [{"Name": "InstanceId", "Value": instance_id}], "Average")
+    metrics = batch.fetch()
+
+    series = metrics.get(instance_id)          # None -> CloudWatch call failed
+    avg_cpu = average(series["CPUUtilization"]) # None -> no datapoints
+
+`fetch()` returns resource_id -> {metric_name: [values]}. Resources whose
+query failed are left out of the map, so evaluators keep their previous
+"error -> skip" behaviour; a declared metric without datapoints maps to
+an empty list, which average()/total() turn into None like the old
+get_metric_average / get_metric_sum helpers.
+
+When `aws_account_id` is given (and CLOUDWATCH_METRIC_CACHE is on) the
+series go through MetricSeriesStore (metric_store.py): the window is
+aligned to whole periods and only the gap after the stored data is
+requested.
+"""
+
+from collections import defaultdict
+from datetime import timezone
+
+from src.aws.finops.rightsizing.metric_store import (
+    MetricSeriesStore,
+    align,
+    cache_enabled,
+    series_key,
+)
+
+
+MAX_QUERIES_PER_CALL = 500
+DEFAULT_PERIOD = 86400
+
+
+def _chunks(items, size=MAX_QUERIES_PER_CALL):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _naive_utc(ts):
+    if ts.tzinfo is None:
+        return ts
+    return ts.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def average(values):
+    if not values:
+        return None
+    return sum(values) / len(values)
+
+
+def total(values):
+    if not values:
+        return None
+    return sum(values)
+
+
+class MetricBatch:
+
+    def __init__(self, session, start, end, period=DEFAULT_PERIOD, aws_account_id=None):
+        self.session = session
+        self.period = period
+
+        self.store = None
+        if aws_account_id is not None and cache_enabled():
+            self.store = MetricSeriesStore(aws_account_id)
+            # Only closed periods are cached, so the window is whole periods
+            start = align(start, period)
+            end = align(end, period)
+
+        self.start = start
+        self.end = end
+
+        # region -> [query dict]
+        self._queries = defaultdict(list)
+
+    def __len__(self):
+        return sum(len(q) for q in self._queries.values())
+
+    # =====================================================
+    # DECLARE
+    # =====================================================
+    def add(self, resource_id, region, namespace, metric_name, dimensions, stat):
+        self._queries[region].append({
+            "resource_id": resource_id,
+            "namespace": namespace,
+            "metric_name": metric_name,
+            "dimensions": dimensions,
+            "stat": stat,
+        })
+
+    # =====================================================
+    # FETCH
+    # =====================================================
+    def fetch(self):
+        if self.store is None:
+            return self._fetch_window()
+        return self._fetch_incremental()
+
+    def _fetch_window(self):
+        results = {}
+
+        for region, queries in self._queries.items():
+            cloudwatch = self.session.client("cloudwatch", region_name=region)
+
+            for chunk in _chunks(queries):
+                try:
+                    points = self._get_metric_data(cloudwatch, chunk, self.start, self.end)
+                except Exception as e:
+                    print(f"[CLOUDWATCH GetMetricData ERROR] region={region}: {str(e)}")
+                    continue
+
+                for query, series in zip(chunk, points):
+                    results.setdefault(query["resource_id"], {})[query["metric_name"]] = [
+                        value for _, value in series
+                    ]
+
+        return results
+
+    def _fetch_incremental(self):
+        results = {}
+        updated = []
+
+        for region, queries in self._queries.items():
+            for query in queries:
+                query["series_key"] = series_key(
+                    region, query["namespace"], query["metric_name"],
+                    query["stat"], query["dimensions"], self.period,
+                )
+
+        stored = self.store.load(
+            q["series_key"] for queries in self._queries.values() for q in queries
+        )
+
+        start_iso = self.start.isoformat()
+        end_iso = self.end.isoformat()
+
+        def collect(query, datapoints):
+            results.setdefault(query["resource_id"], {})[query["metric_name"]] = [
+                value for ts, value in sorted(datapoints.items())
+                if start_iso <= ts < end_iso
+            ]
+
+        # Queries sharing a region and a gap start go in the same calls
+        gaps = defaultdict(list)
+        for region, queries in self._queries.items():
+            for query in queries:
+                datapoints, covered_until = stored.get(query["series_key"], ({}, None))
+                query["datapoints"] = dict(datapoints)
+
+                gap_start = self.start
+                if covered_until is not None and covered_until > self.start:
+                    gap_start = covered_until
+
+                if gap_start >= self.end:
+                    collect(query, query["datapoints"])
+                else:
+                    gaps[(region, gap_start)].append(query)
+
+        for (region, gap_start), queries in gaps.items():
+            cloudwatch = self.session.client("cloudwatch", region_name=region)
+
+            for chunk in _chunks(queries):
+                try:
+                    points = self._get_metric_data(cloudwatch, chunk, gap_start, self.end)
+                except Exception as e:
+                    print(f"[CLOUDWATCH GetMetricData ERROR] region={region}: {str(e)}")
+                    continue
+
+                for query, series in zip(chunk, points):
+                    for ts, value in series:
+                        query["datapoints"][_naive_utc(ts).isoformat()] = value
+
+                    collect(query, query["datapoints"])
+                    updated.append({
+                        "series_key": query["series_key"],
+                        "namespace": query["namespace"],
+                        "metric_name": query["metric_name"],
+                        "stat": query["stat"],
+                        "dimensions": query["dimensions"],
+                        "period": self.period,
+                        "datapoints": query["datapoints"],
+                        "covered_until": self.end,
+                    })
+
+        try:
+            self.store.save(updated)
+        except Exception as e:
+            # The cache is an optimisation: the results are still valid
+            print(f"[CLOUDWATCH METRIC CACHE ERROR]: {str(e)}")
+
+        return results
+
+    def _get_metric_data(self, cloudwatch, chunk, start, end):
+        """One [(timestamp, value)] list per query in `chunk`, in order."""
+        metric_queries = [
+            {
+                "Id": f"m{i}",
+                "MetricStat": {
+                    "Metric": {
+                        "Namespace": query["namespace"],
+                        "MetricName": query["metric_name"],
+                        "Dimensions": query["dimensions"],
+                    },
+                    "Period": self.period,
+                    "Stat": query["stat"],
+                },
+                "ReturnData": True,
+            }
+            for i, query in enumerate(chunk)
+        ]
+
+        points = {query["Id"]: [] for query in metric_queries}
+
+        # Results for the same Id can be split across pages
+        paginator = cloudwatch.get_paginator("get_metric_data")
+        for page in paginator.paginate(
+            MetricDataQueries=metric_queries,
+            StartTime=start,
+            EndTime=end,
+        ):
+            for result in page.get("MetricDataResults", []):
+                points[result["Id"]].extend(
+                    zip(result.get("Timestamps", []), result.get("Values", []))
+                )
+
+        return [points[f"m{i}"] for i in range(len(chunk))]
@@ -5,8 +5,8 @@ from src.aws.finops.rightsizing.shared import (
     REDSHIFT_CPU_THRESHOLD,
     resolve_finding,
     upsert_recommendation,
-    get_metric_average,
 )
+from src.aws.finops.rightsizing.metrics import MetricBatch, average
 from src.aws.finops.rightsizing.pricing import (
     RDS_DOWNSIZE, rds_monthly,
     REDSHIFT_PRICING, REDSHIFT_DOWNSIZE, HOURS_MONTH,
@@ -29,6 +29,20 @@ def evaluate_rds(session, client_id, aws_account_id):
         is_active=True
     ).all()
 
+    end   = datetime.utcnow()
+    start = end - timedelta(days=7)
+
+    batch = MetricBatch(session, start, end, aws_account_id=aws_account_id)
+    for db_instance in rds_instances:
+        if db_instance.state == "available":
+            batch.add(
+                db_instance.resource_id, db_instance.region,
+                "AWS/RDS", "CPUUtilization",
+                [{"Name": "DBInstanceIdentifier", "Value": db_instance.resource_id}],
+                "Average",
+            )
+    metrics = batch.fetch()
+
     for db_instance in rds_instances:
         finding_type = "RDS_UNDERUTILIZED"
 
@@ -42,23 +56,12 @@ def evaluate_rds(session, client_id, aws_account_id):
         instance_class = metadata.get("instance_class", "")
         multi_az       = bool(metadata.get("multi_az", False))
 
-        cloudwatch = session.client("cloudwatch", region_name=region)
-        end   = datetime.utcnow()
-        start = end - timedelta(days=7)
-
-        try:
-            avg_cpu = get_metric_average(
-                cloudwatch=cloudwatch,
-                namespace="AWS/RDS",
-                metric_name="CPUUtilization",
-                dimensions=[{"Name": "DBInstanceIdentifier", "Value": db_identifier}],
-                start=start,
-                end=end,
-            )
-        except Exception as e:
-            print(f"[RDS RIGHTSIZING ERROR]: {str(e)}")
+        series = metrics.get(db_identifier)
+        if series is None:
             continue
 
+        avg_cpu = average(series["CPUUtilization"])
+
         if avg_cpu is None:
             resolve_finding(client_id, aws_account_id, db_identifier, finding_type)
             continue
@@ -125,6 +128,17 @@ def evaluate_redshift(session, client_id, aws_account_id):
     end   = datetime.utcnow()
     start = end - timedelta(days=7)
 
+    batch = MetricBatch(session, start, end, aws_account_id=aws_account_id)
+    for cluster in clusters:
+        if cluster.state == "available":
+            batch.add(
+                cluster.resource_id, cluster.region,
+                "AWS/Redshift", "CPUUtilization",
+                [{"Name": "ClusterIdentifier", "Value": cluster.resource_id}],
+                "Average",
+            )
+    metrics = batch.fetch()
+
     for cluster in clusters:
         if cluster.state != "available":
             resolve_finding(client_id, aws_account_id, cluster.resource_id, finding_type)
@@ -134,20 +148,12 @@ def evaluate_redshift(session, client_id, aws_account_id):
         node_type  = metadata.get("node_type", "")
         node_count = int(metadata.get("number_of_nodes") or 1)
 
-        try:
-            cloudwatch = session.client("cloudwatch", region_name=cluster.region)
-            avg_cpu = get_metric_average(
-                cloudwatch=cloudwatch,
-                namespace="AWS/Redshift",
-                metric_name="CPUUtilization",
-                dimensions=[{"Name": "ClusterIdentifier", "Value": cluster.resource_id}],
-                start=start,
-                end=end,
-            )
-        except Exception as e:
-            print(f"[REDSHIFT RIGHTSIZING ERROR]: {str(e)}")
+        series = metrics.get(cluster.resource_id)
+        if series is None:
             continue
 
+        avg_cpu = average(series["CPUUtilization"])
+
         if avg_cpu is None or avg_cpu >= REDSHIFT_CPU_THRESHOLD:
             resolve_finding(client_id, aws_account_id, cluster.resource_id, finding_type)
             continue
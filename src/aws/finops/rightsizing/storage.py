@@ -6,9 +6,8 @@ from src.aws.finops.rightsizing.shared import (
     S3_MIN_BUCKET_AGE_DAYS,
     resolve_finding,
     upsert_recommendation,
-    get_metric_average,
-    get_metric_sum,
 )
+from src.aws.finops.rightsizing.metrics import MetricBatch, average, total
 from src.aws.finops.rightsizing.pricing import (
     DYNAMO_WCU_MONTH,
     DYNAMO_RCU_MONTH,
@@ -35,6 +34,17 @@ def evaluate_dynamodb(session, client_id, aws_account_id):
     end   = datetime.utcnow()
     start = end - timedelta(days=7)
 
+    batch = MetricBatch(session, start, end, aws_account_id=aws_account_id)
+    for table in tables:
+        if (table.resource_metadata or {}).get("billing_mode") != "PROVISIONED":
+            continue
+        dims = [{"Name": "TableName", "Value": table.resource_id}]
+        batch.add(table.resource_id, table.region,
+                  "AWS/DynamoDB", "ConsumedWriteCapacityUnits", dims, "Sum")
+        batch.add(table.resource_id, table.region,
+                  "AWS/DynamoDB", "ConsumedReadCapacityUnits", dims, "Sum")
+    metrics = batch.fetch()
+
     for table in tables:
         metadata     = table.resource_metadata or {}
         billing_mode = metadata.get("billing_mode")
@@ -48,27 +58,15 @@ def evaluate_dynamodb(session, client_id, aws_account_id):
 
         # Try to get consumed capacity from CloudWatch
         consumed_wcu = consumed_rcu = None
-        try:
-            cw = session.client("cloudwatch", region_name=table.region)
-            dims = [{"Name": "TableName", "Value": table.resource_id}]
+        series = metrics.get(table.resource_id) or {}
 
-            raw_wcu = get_metric_sum(
-                cloudwatch=cw, namespace="AWS/DynamoDB",
-                metric_name="ConsumedWriteCapacityUnits",
-                dimensions=dims, start=start, end=end,
-            )
-            raw_rcu = get_metric_sum(
-                cloudwatch=cw, namespace="AWS/DynamoDB",
-                metric_name="ConsumedReadCapacityUnits",
-                dimensions=dims, start=start, end=end,
-            )
-            # Convert 7-day sum (units) to avg daily, then estimate provisioned-equivalent
-            if raw_wcu is not None:
-                consumed_wcu = int(raw_wcu / (7 * 86400))   # avg units/second → equiv WCU
-            if raw_rcu is not None:
-                consumed_rcu = int(raw_rcu / (7 * 86400))
-        except Exception as e:
-            print(f"[DYNAMODB RIGHTSIZING ERROR]: {str(e)}")
+        raw_wcu = total(series.get("ConsumedWriteCapacityUnits"))
+        raw_rcu = total(series.get("ConsumedReadCapacityUnits"))
+        # Convert 7-day sum (units) to avg daily, then estimate provisioned-equivalent
+        if raw_wcu is not None:
+            consumed_wcu = int(raw_wcu / (7 * 86400))   # avg units/second → equiv WCU
+        if raw_rcu is not None:
+            consumed_rcu = int(raw_rcu / (7 * 86400))
 
         if consumed_wcu is not None and consumed_rcu is not None and prov_wcu > 0:
             # Only flag if consumed is less than 50% of provisioned
@@ -193,6 +191,20 @@ def evaluate_s3(session, client_id, aws_account_id):
     end   = datetime.utcnow()
     start = end - timedelta(days=7)
 
+    # BucketSizeBytes is published in us-east-1 for every bucket
+    batch = MetricBatch(session, start, end, aws_account_id=aws_account_id)
+    for bucket in buckets:
+        batch.add(
+            bucket.resource_id, "us-east-1",
+            "AWS/S3", "BucketSizeBytes",
+            [
+                {"Name": "BucketName",   "Value": bucket.resource_id},
+                {"Name": "StorageType",  "Value": "StandardStorage"},
+            ],
+            "Average",
+        )
+    metrics = batch.fetch()
+
     for bucket in buckets:
         created_at = (bucket.resource_metadata or {}).get("creation_date")
         try:
@@ -204,20 +216,7 @@ def evaluate_s3(session, client_id, aws_account_id):
             (end - created_dt.replace(tzinfo=None)).days if created_dt else 0
         )
 
-        try:
-            cw = session.client("cloudwatch", region_name="us-east-1")
-            bucket_size = get_metric_average(
-                cloudwatch=cw, namespace="AWS/S3",
-                metric_name="BucketSizeBytes",
-                dimensions=[
-                    {"Name": "BucketName",   "Value": bucket.resource_id},
-                    {"Name": "StorageType",  "Value": "StandardStorage"},
-                ],
-                start=start, end=end,
-            )
-        except Exception as e:
-            print(f"[S3 RIGHTSIZING ERROR]: {str(e)}")
-            bucket_size = None
+        bucket_size = average((metrics.get(bucket.resource_id) or {}).get("BucketSizeBytes"))
 
         qualifies = (
             bucket_size is not None
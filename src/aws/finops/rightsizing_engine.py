@@ -2,7 +2,6 @@
 Thin orchestrator — preserves the original RightsizingEngine public API.
 All implementation lives under src/aws/finops/rightsizing/.
 """
-import boto3
 from src.models.aws_account import AWSAccount
 from src.aws.sts_service import STSService
 
@@ -20,6 +19,7 @@ from src.aws.finops.rightsizing.shared import (
     get_metric_sum,
     get_metric_average,
 )
+from src.aws.finops.rightsizing.metric_store import MetricSeriesStore
 from src.aws.finops.rightsizing.ec2 import evaluate_ec2, evaluate_ebs
 from src.aws.finops.rightsizing.rds import evaluate_rds, evaluate_redshift
 from src.aws.finops.rightsizing.lambda_ import evaluate_lambda
@@ -68,22 +68,15 @@ class RightsizingEngine:
         if not aws_accounts:
             return 0
 
-        sts = STSService()
         total = 0
 
         for aws_account in aws_accounts:
-            credentials = sts.assume_role(
+            session = STSService.get_session(
                 role_arn=aws_account.role_arn,
                 external_id=aws_account.external_id,
                 session_name=f"finops-rightsizing-{aws_account.id}"
             )
 
-            session = boto3.Session(
-                aws_access_key_id=credentials["AccessKeyId"],
-                aws_secret_access_key=credentials["SecretAccessKey"],
-                aws_session_token=credentials["SessionToken"],
-            )
-
             total += evaluate_ec2(session, client_id, aws_account.id)
             total += evaluate_ebs(client_id, aws_account.id)
             total += evaluate_rds(session, client_id, aws_account.id)
@@ -96,6 +89,8 @@ class RightsizingEngine:
             total += evaluate_nat(session, client_id, aws_account.id)
             total += evaluate_redshift(session, client_id, aws_account.id)
 
+            MetricSeriesStore.purge_stale(aws_account.id)
+
         return total
 
     # =====================================================
@@ -1,4 +1,3 @@
-import boto3
 from datetime import datetime, timedelta, timezone
 
 from src.models.aws_account import AWSAccount
@@ -21,20 +20,12 @@ class SavingsPlanCoverageEngine:
         if not aws_account:
             return 0
 
-        sts = STSService()
-
-        credentials = sts.assume_role(
+        session = STSService.get_session(
             role_arn=aws_account.role_arn,
             external_id=aws_account.external_id,
             session_name="finops-sp-coverage"
         )
 
-        session = boto3.Session(
-            aws_access_key_id=credentials["AccessKeyId"],
-            aws_secret_access_key=credentials["SecretAccessKey"],
-            aws_session_token=credentials["SessionToken"],
-        )
-
         ce = session.client("ce", region_name="us-east-1")
 
         end = datetime.now(timezone.utc).date()
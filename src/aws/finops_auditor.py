@@ -1,4 +1,3 @@
-import boto3
 import logging
 import time
 from datetime import datetime
@@ -7,6 +6,7 @@ from src.aws.sts_service import STSService
 from src.aws.inventory_scanner import InventoryScanner
 from src.aws.finding_engine.finding_engine import FindingEngine
 from src.services.risk_snapshot_service import RiskSnapshotService
+from src.config import metrics
 from src.models.database import db
 from src.models.aws_account import AWSAccount
 
@@ -19,7 +19,7 @@ class FinOpsAuditor:
     # =====================================================
     # MAIN ORCHESTRATOR (FULL ENTERPRISE SAFE + TIMING)
     # =====================================================
-    def run_comprehensive_audit(self, client_id, aws_account_id):
+    def run_comprehensive_audit(self, client_id, aws_account_id, progress=None):
 
         audit_start = time.time()
         logger.info(f"AUDIT START | client_id={client_id}")
@@ -38,33 +38,23 @@ class FinOpsAuditor:
         # ==========================================
         # 1️⃣ ASSUME ROLE
         # ==========================================
+        if progress:
+            progress(5, "sts")
+
         try:
             sts_start = time.time()
 
-            sts_service = STSService()
-
-            creds = sts_service.assume_role(
+            # Credenciales cacheadas por (role_arn, external_id): el scanner,
+            # rightsizing, coverage y cost explorer reutilizan esta misma
+            # llamada a STS en vez de asumir el rol otra vez.
+            STSService.assume_role(
                 role_arn=aws_account.role_arn,
                 external_id=aws_account.external_id,
                 session_name="finops-audit"
             )
 
-            if not creds:
-                logger.error(f"STS assume_role failed | client_id={client_id}")
-                return {
-                    "status": "error",
-                    "message": "Unable to assume role",
-                    "findings_created": 0
-                }
-
-            session = boto3.Session(
-                aws_access_key_id=creds["AccessKeyId"],
-                aws_secret_access_key=creds["SecretAccessKey"],
-                aws_session_token=creds["SessionToken"],
-                region_name="us-east-1"
-            )
-
             sts_elapsed = time.time() - sts_start
+            metrics.observe_stage("aws", "sts", sts_elapsed)
             logger.info(
                 f"STS COMPLETED | client_id={client_id} | duration={sts_elapsed:.2f}s"
             )
@@ -81,6 +71,9 @@ class FinOpsAuditor:
         # ==========================================
         # 2️⃣ INVENTORY
         # ==========================================
+        if progress:
+            progress(10, "inventory")
+
         try:
             inventory_start = time.time()
 
@@ -91,6 +84,7 @@ class FinOpsAuditor:
             )
             scanner.run()
             inventory_elapsed = time.time() - inventory_start
+            metrics.observe_stage("aws", "inventory", inventory_elapsed)
 
             logger.info(
                 f"INVENTORY COMPLETED | client_id={client_id} | duration={inventory_elapsed:.2f}s"
@@ -108,12 +102,16 @@ class FinOpsAuditor:
         # ==========================================
         # 3️⃣ FINDING ENGINE
         # ==========================================
+        if progress:
+            progress(50, "findings")
+
         try:
             findings_start = time.time()
 
             logger.info(f"FINDING ENGINE START | client_id={client_id}")
             findings_created = FindingEngine.run(client_id)
             findings_elapsed = time.time() - findings_start
+            metrics.observe_stage("aws", "findings", findings_elapsed)
 
             logger.info(
                 f"FINDING ENGINE COMPLETED | client_id={client_id} | "
@@ -132,12 +130,16 @@ class FinOpsAuditor:
         # ==========================================
         # 4️⃣ SNAPSHOT GENERATION
         # ==========================================
+        if progress:
+            progress(85, "snapshot")
+
         try:
             snapshot_start = time.time()
 
             logger.info(f"SNAPSHOT START | client_id={client_id}")
             RiskSnapshotService.create_snapshot(client_id)
             snapshot_elapsed = time.time() - snapshot_start
+            metrics.observe_stage("aws", "snapshot", snapshot_elapsed)
 
             logger.info(
                 f"SNAPSHOT COMPLETED | client_id={client_id} | duration={snapshot_elapsed:.2f}s"
@@ -155,6 +157,9 @@ class FinOpsAuditor:
         # ==========================================
         # 5️⃣ UPDATE ACCOUNT LAST SYNC
         # ==========================================
+        if progress:
+            progress(95, "finalize")
+
         try:
             aws_account.last_sync = datetime.utcnow()
             db.session.commit()
@@ -168,6 +173,7 @@ class FinOpsAuditor:
             }
 
         audit_elapsed = time.time() - audit_start
+        metrics.observe_stage("aws", "total", audit_elapsed)
 
         logger.info(
             f"AUDIT COMPLETED SUCCESSFULLY | client_id={client_id} | "
@@ -14,13 +14,23 @@ All service-specific scanning logic lives in src/aws/scanners/:
   - kinesis_scanner.py      : Kinesis Data Streams
   - opensearch_scanner.py   : OpenSearch
   - shared.py               : BaseScanner (session bootstrap + upsert_resource)
+
+Two execution modes (see InventoryScanner.run):
+  - sequential (default) : region by region, service by service.
+  - concurrent           : (region, service) units on a bounded thread pool
+                           with per-service / per-region limits
+                           (INVENTORY_SCAN_* env vars, src/cloud/scan_pool.py).
 """
 
 import logging
+import os
+import queue
 from datetime import datetime
 
+from src.config import metrics
 from src.models.database import db
 from src.models.aws_resource_inventory import AWSResourceInventory
+from src.cloud.scan_pool import ConcurrentScanPool, ScanPoolLimits, ScanUnit
 
 from src.aws.scanners.ec2_scanner import EC2Scanner
 from src.aws.scanners.rds_scanner import RDSScanner
@@ -52,80 +62,165 @@ class InventoryScanner(
     to every method.
     """
 
+    # Per-service concurrency overrides for the concurrent mode. Snapshot
+    # listings are the heaviest/most throttled describe calls.
+    SERVICE_CONCURRENCY_DEFAULTS = {
+        "EBSSnapshot": 2,
+        "RDSSnapshot": 2,
+    }
+
     # ------------------------------------------------------------------
     # PUBLIC ENTRY-POINT
     # ------------------------------------------------------------------
-    def run(self):
-        logger.info(f"Inventory started | client_id={self.client_id}")
+    def run(self, concurrent=None):
+        """
+        Scans every enabled region plus the global services.
+
+        concurrent=None reads INVENTORY_SCAN_CONCURRENT (default off).
+        In concurrent mode (region, service) units run on a bounded pool
+        (see src/cloud/scan_pool.py) and this thread is the only DB writer.
+        """
+        if concurrent is None:
+            concurrent = os.getenv("INVENTORY_SCAN_CONCURRENT", "false").strip().lower() in {
+                "1", "true", "yes", "on"
+            }
+
+        logger.info(
+            f"Inventory started | client_id={self.client_id} | "
+            f"mode={'concurrent' if concurrent else 'sequential'}"
+        )
         now = datetime.utcnow()
 
         regions = self.get_enabled_regions()
 
+        if concurrent:
+            self._run_concurrent(regions)
+        else:
+            self._run_sequential(regions)
+
+        logger.info("Inventory completed")
+
+        # Mark resources not seen in this scan as inactive
+        AWSResourceInventory.query.filter(
+            AWSResourceInventory.client_id == self.client_id,
+            AWSResourceInventory.aws_account_id == self.aws_account_id,
+            AWSResourceInventory.last_seen_at < now
+        ).update({
+            "is_active": False,
+            "updated_at": now
+        })
+
+        db.session.commit()
+
+    # ------------------------------------------------------------------
+    # SERVICE CATALOG
+    # ------------------------------------------------------------------
+    def _regional_services(self):
+        services = [
+            ("EC2",              self.scan_ec2),
+            ("EBS",              self.scan_ebs),
+            ("RDS",              self.scan_rds),
+            ("Lambda",           self.scan_lambda),
+            ("DynamoDB",         self.scan_dynamodb),
+            ("CloudWatchLogs",   self.scan_cloudwatch_logs),
+            ("NAT",              self.scan_nat_gateways),
+            ("ECS",              self.scan_ecs),
+            ("Redshift",         self.scan_redshift),
+            ("EKS",              self.scan_eks),
+            ("ReservedInstances", self.scan_reserved_instances),
+            ("ElasticIP",        self.scan_elastic_ips),
+            ("EBSSnapshot",      self.scan_ebs_snapshots),
+            ("RDSSnapshot",      self.scan_rds_snapshots),
+            ("Aurora",           self.scan_aurora_clusters),
+            ("ELB",              self.scan_load_balancers),
+            ("ClassicELB",       self.scan_classic_load_balancers),
+            ("ElastiCache",      self.scan_elasticache),
+            ("SageMakerEndpoint", self.scan_sagemaker_endpoints),
+            ("SageMakerNotebook", self.scan_sagemaker_notebooks),
+            ("SNS",              self.scan_sns),
+            ("SQS",              self.scan_sqs),
+            ("Kinesis",          self.scan_kinesis),
+            ("OpenSearch",       self.scan_opensearch),
+        ]
+        return [(name, metrics.timed_scan("aws", name, fn)) for name, fn in services]
+
+    def _global_services(self):
+        services = [
+            ("S3",           self.scan_s3,           []),
+            ("SavingsPlans", self.scan_savings_plans, [None]),
+            ("CloudFront",   self.scan_cloudfront,   []),
+            ("Route53",      self.scan_route53,      []),
+        ]
+        return [(name, metrics.timed_scan("aws", name, fn), args) for name, fn, args in services]
+
+    # ------------------------------------------------------------------
+    # SEQUENTIAL MODE
+    # ------------------------------------------------------------------
+    def _run_sequential(self, regions):
         for region in regions:
             logger.info(f"Scanning region {region}")
 
-            regional_services = [
-                ("EC2",              self.scan_ec2),
-                ("EBS",              self.scan_ebs),
-                ("RDS",              self.scan_rds),
-                ("Lambda",           self.scan_lambda),
-                ("DynamoDB",         self.scan_dynamodb),
-                ("CloudWatchLogs",   self.scan_cloudwatch_logs),
-                ("NAT",              self.scan_nat_gateways),
-                ("ECS",              self.scan_ecs),
-                ("Redshift",         self.scan_redshift),
-                ("EKS",              self.scan_eks),
-                ("ReservedInstances", self.scan_reserved_instances),
-                ("ElasticIP",        self.scan_elastic_ips),
-                ("EBSSnapshot",      self.scan_ebs_snapshots),
-                ("RDSSnapshot",      self.scan_rds_snapshots),
-                ("Aurora",           self.scan_aurora_clusters),
-                ("ELB",              self.scan_load_balancers),
-                ("ClassicELB",       self.scan_classic_load_balancers),
-                ("ElastiCache",      self.scan_elasticache),
-                ("SageMakerEndpoint", self.scan_sagemaker_endpoints),
-                ("SageMakerNotebook", self.scan_sagemaker_notebooks),
-                ("SNS",              self.scan_sns),
-                ("SQS",              self.scan_sqs),
-                ("Kinesis",          self.scan_kinesis),
-                ("OpenSearch",       self.scan_opensearch),
-            ]
-
-            for service_name, service_method in regional_services:
+            for service_name, service_method in self._regional_services():
                 try:
                     service_method(region)
                 except Exception:
                     logger.exception(
                         f"{service_name} scan failed | region={region} | client_id={self.client_id}"
                     )
-
-            db.session.commit()
+                finally:
+                    self.flush_inventory()
 
         # Global services
-        for label, fn, args in [
-            ("S3",           self.scan_s3,           []),
-            ("SavingsPlans", self.scan_savings_plans, [None]),
-            ("CloudFront",   self.scan_cloudfront,   []),
-            ("Route53",      self.scan_route53,      []),
-        ]:
+        for label, fn, args in self._global_services():
             try:
                 fn(*args)
             except Exception:
                 logger.exception(
                     f"{label} scan failed | client_id={self.client_id}"
                 )
+            finally:
+                self.flush_inventory()
 
-        db.session.commit()
-        logger.info("Inventory completed")
-
-        # Mark resources not seen in this scan as inactive
-        AWSResourceInventory.query.filter(
-            AWSResourceInventory.client_id == self.client_id,
-            AWSResourceInventory.aws_account_id == self.aws_account_id,
-            AWSResourceInventory.last_seen_at < now
-        ).update({
-            "is_active": False,
-            "updated_at": now
-        })
-
-        db.session.commit()
+    # ------------------------------------------------------------------
+    # CONCURRENT MODE
+    # ------------------------------------------------------------------
+    def _run_concurrent(self, regions):
+        limits = ScanPoolLimits.from_env(
+            "INVENTORY_SCAN", service_defaults=self.SERVICE_CONCURRENCY_DEFAULTS
+        )
+
+        units = [
+            ScanUnit(service=service_name, fn=service_method, args=(region,), region=region)
+            for region in regions
+            for service_name, service_method in self._regional_services()
+        ]
+        units += [
+            ScanUnit(service=label, fn=fn, args=tuple(args))
+            for label, fn, args in self._global_services()
+        ]
+
+        logger.info(
+            f"Concurrent inventory | client_id={self.client_id} | "
+            f"units={len(units)} | workers={limits.max_workers} | "
+            f"region_limit={limits.region_limit}"
+        )
+
+        self._row_queue = queue.Queue()
+        try:
+            pool = ConcurrentScanPool(
+                limits,
+                row_queue=self._row_queue,
+                write_row=self.write_inventory_row,
+                on_unit_done=lambda unit: self.flush_inventory(),
+            )
+            failures = pool.run(units)
+        finally:
+            self._row_queue = None
+
+        for unit, error in failures:
+            logger.error(
+                f"{unit.service} scan failed | region={unit.region} | client_id={self.client_id}",
+                exc_info=error,
+            )
+
+        self.flush_inventory()
@@ -14,7 +14,7 @@ class CloudFrontScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_cloudfront(self):
         try:
-            cloudfront = self.aws_session.client("cloudfront", region_name="us-east-1")
+            cloudfront = self.get_client("cloudfront", region_name="us-east-1")
             paginator = cloudfront.get_paginator("list_distributions")
 
             for page in paginator.paginate():
@@ -43,7 +43,7 @@ class CloudFrontScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_route53(self):
         try:
-            route53 = self.aws_session.client("route53", region_name="us-east-1")
+            route53 = self.get_client("route53", region_name="us-east-1")
             paginator = route53.get_paginator("list_hosted_zones")
 
             for page in paginator.paginate():
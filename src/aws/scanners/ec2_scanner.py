@@ -13,7 +13,7 @@ class EC2Scanner(BaseScanner):
     # EC2 INSTANCES
     # ------------------------------------------------------------------
     def scan_ec2(self, region):
-        ec2 = self.aws_session.client("ec2", region_name=region)
+        ec2 = self.get_client("ec2", region_name=region)
         paginator = ec2.get_paginator("describe_instances")
 
         for page in paginator.paginate():
@@ -44,7 +44,7 @@ class EC2Scanner(BaseScanner):
     # EBS VOLUMES
     # ------------------------------------------------------------------
     def scan_ebs(self, region):
-        ec2 = self.aws_session.client("ec2", region_name=region)
+        ec2 = self.get_client("ec2", region_name=region)
         paginator = ec2.get_paginator("describe_volumes")
 
         for page in paginator.paginate():
@@ -75,7 +75,7 @@ class EC2Scanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_nat_gateways(self, region):
         try:
-            ec2 = self.aws_session.client("ec2", region_name=region)
+            ec2 = self.get_client("ec2", region_name=region)
             paginator = ec2.get_paginator("describe_nat_gateways")
 
             for page in paginator.paginate():
@@ -110,7 +110,7 @@ class EC2Scanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_elastic_ips(self, region):
         try:
-            ec2 = self.aws_session.client("ec2", region_name=region)
+            ec2 = self.get_client("ec2", region_name=region)
             response = ec2.describe_addresses()
 
             for address in response.get("Addresses", []):
@@ -147,7 +147,7 @@ class EC2Scanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_ebs_snapshots(self, region):
         try:
-            ec2 = self.aws_session.client("ec2", region_name=region)
+            ec2 = self.get_client("ec2", region_name=region)
             paginator = ec2.get_paginator("describe_snapshots")
 
             for page in paginator.paginate(OwnerIds=["self"]):
@@ -183,7 +183,7 @@ class EC2Scanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_reserved_instances(self, region):
         try:
-            ec2 = self.aws_session.client("ec2", region_name=region)
+            ec2 = self.get_client("ec2", region_name=region)
 
             response = ec2.describe_reserved_instances(
                 Filters=[{"Name": "state", "Values": ["active"]}]
@@ -11,7 +11,7 @@ class ElastiCacheScanner(BaseScanner):
 
     def scan_elasticache(self, region):
         try:
-            elasticache = self.aws_session.client("elasticache", region_name=region)
+            elasticache = self.get_client("elasticache", region_name=region)
             paginator = elasticache.get_paginator("describe_cache_clusters")
 
             for page in paginator.paginate(ShowCacheNodeInfo=True):
@@ -14,7 +14,7 @@ class ELBScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_load_balancers(self, region):
         try:
-            elbv2 = self.aws_session.client("elbv2", region_name=region)
+            elbv2 = self.get_client("elbv2", region_name=region)
             paginator = elbv2.get_paginator("describe_load_balancers")
 
             for page in paginator.paginate():
@@ -49,7 +49,7 @@ class ELBScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_classic_load_balancers(self, region):
         try:
-            elb = self.aws_session.client("elb", region_name=region)
+            elb = self.get_client("elb", region_name=region)
             paginator = elb.get_paginator("describe_load_balancers")
 
             for page in paginator.paginate():
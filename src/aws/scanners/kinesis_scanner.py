@@ -11,7 +11,7 @@ class KinesisScanner(BaseScanner):
 
     def scan_kinesis(self, region):
         try:
-            kinesis = self.aws_session.client("kinesis", region_name=region)
+            kinesis = self.get_client("kinesis", region_name=region)
             paginator = kinesis.get_paginator("list_streams")
 
             for page in paginator.paginate():
@@ -14,7 +14,7 @@ class LambdaScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_lambda(self, region):
         try:
-            lambda_client = self.aws_session.client("lambda", region_name=region)
+            lambda_client = self.get_client("lambda", region_name=region)
             paginator = lambda_client.get_paginator("list_functions")
 
             for page in paginator.paginate():
@@ -44,7 +44,7 @@ class LambdaScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_cloudwatch_logs(self, region):
         try:
-            logs_client = self.aws_session.client("logs", region_name=region)
+            logs_client = self.get_client("logs", region_name=region)
             paginator = logs_client.get_paginator("describe_log_groups")
 
             for page in paginator.paginate():
@@ -72,7 +72,7 @@ class LambdaScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_ecs(self, region):
         try:
-            ecs = self.aws_session.client("ecs", region_name=region)
+            ecs = self.get_client("ecs", region_name=region)
 
             cluster_arns = ecs.list_clusters().get("clusterArns", [])
 
@@ -135,7 +135,7 @@ class LambdaScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_eks(self, region):
         try:
-            eks = self.aws_session.client("eks", region_name=region)
+            eks = self.get_client("eks", region_name=region)
 
             cluster_names = eks.list_clusters().get("clusters", [])
 
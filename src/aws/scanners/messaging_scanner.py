@@ -14,7 +14,7 @@ class MessagingScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_sns(self, region):
         try:
-            sns = self.aws_session.client("sns", region_name=region)
+            sns = self.get_client("sns", region_name=region)
             paginator = sns.get_paginator("list_topics")
 
             for page in paginator.paginate():
@@ -46,7 +46,7 @@ class MessagingScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_sqs(self, region):
         try:
-            sqs = self.aws_session.client("sqs", region_name=region)
+            sqs = self.get_client("sqs", region_name=region)
             paginator = sqs.get_paginator("list_queues")
 
             for page in paginator.paginate():
@@ -11,7 +11,7 @@ class OpenSearchScanner(BaseScanner):
 
     def scan_opensearch(self, region):
         try:
-            opensearch = self.aws_session.client("opensearch", region_name=region)
+            opensearch = self.get_client("opensearch", region_name=region)
             domain_names = [
                 d["DomainName"]
                 for d in opensearch.list_domain_names().get("DomainNames", [])
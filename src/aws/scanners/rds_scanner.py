@@ -15,7 +15,7 @@ class RDSScanner(BaseScanner):
     # RDS
     # ------------------------------------------------------------------
     def scan_rds(self, region):
-        rds = self.aws_session.client("rds", region_name=region)
+        rds = self.get_client("rds", region_name=region)
         paginator = rds.get_paginator("describe_db_instances")
 
         for page in paginator.paginate():
@@ -42,7 +42,7 @@ class RDSScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_rds_snapshots(self, region):
         try:
-            rds = self.aws_session.client("rds", region_name=region)
+            rds = self.get_client("rds", region_name=region)
             paginator = rds.get_paginator("describe_db_snapshots")
 
             for page in paginator.paginate():
@@ -72,7 +72,7 @@ class RDSScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_aurora_clusters(self, region):
         try:
-            rds = self.aws_session.client("rds", region_name=region)
+            rds = self.get_client("rds", region_name=region)
             paginator = rds.get_paginator("describe_db_clusters")
 
             for page in paginator.paginate():
@@ -107,7 +107,7 @@ class RDSScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_redshift(self, region):
         try:
-            redshift = self.aws_session.client("redshift", region_name=region)
+            redshift = self.get_client("redshift", region_name=region)
             paginator = redshift.get_paginator("describe_clusters")
 
             for page in paginator.paginate():
@@ -145,7 +145,7 @@ class RDSScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_dynamodb(self, region):
         try:
-            dynamodb = self.aws_session.client("dynamodb", region_name=region)
+            dynamodb = self.get_client("dynamodb", region_name=region)
             paginator = dynamodb.get_paginator("list_tables")
 
             for page in paginator.paginate():
@@ -14,7 +14,7 @@ class SageMakerScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_sagemaker_endpoints(self, region):
         try:
-            sagemaker = self.aws_session.client("sagemaker", region_name=region)
+            sagemaker = self.get_client("sagemaker", region_name=region)
             paginator = sagemaker.get_paginator("list_endpoints")
 
             for page in paginator.paginate():
@@ -41,7 +41,7 @@ class SageMakerScanner(BaseScanner):
     # ------------------------------------------------------------------
     def scan_sagemaker_notebooks(self, region):
         try:
-            sagemaker = self.aws_session.client("sagemaker", region_name=region)
+            sagemaker = self.get_client("sagemaker", region_name=region)
             paginator = sagemaker.get_paginator("list_notebook_instances")
 
             for page in paginator.paginate():
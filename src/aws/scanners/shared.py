@@ -1,22 +1,28 @@
 import logging
+import threading
 from datetime import datetime
 
-import boto3
-from sqlalchemy.dialects.postgresql import insert
+from botocore.config import Config
 
 from src.models.database import db
 from src.models.aws_account import AWSAccount
 from src.models.aws_resource_inventory import AWSResourceInventory
 from src.aws.sts_service import STSService
+from src.cloud.inventory_writer import InventoryBatchWriter
 
 
 logger = logging.getLogger(__name__)
 
+# Adaptive retries back off client-side when AWS starts throttling, which
+# matters once several regions/services are scanned at the same time.
+SCANNER_CLIENT_CONFIG = Config(retries={"max_attempts": 8, "mode": "adaptive"})
+
 
 class BaseScanner:
     """
-    Holds the boto3 session and the shared helpers (upsert_resource,
-    get_enabled_regions) used by every service-specific scanner.
+    Holds the boto3 session and the shared helpers (get_client,
+    upsert_resource, get_enabled_regions) used by every service-specific
+    scanner.
     """
 
     def __init__(self, client_id, aws_account_id):
@@ -27,23 +33,48 @@ class BaseScanner:
         if not aws_account:
             raise Exception("AWS account not found")
 
-        sts_service = STSService()
-
-        credentials = sts_service.assume_role(
+        # Shared, auto-refreshing credentials (see STSService): the auditor
+        # already assumed this role, so this normally costs no STS call.
+        self.aws_session = STSService.get_session(
             role_arn=aws_account.role_arn,
             external_id=aws_account.external_id,
             session_name="finops-inventory"
         )
 
-        self.aws_session = boto3.Session(
-            aws_access_key_id=credentials["AccessKeyId"],
-            aws_secret_access_key=credentials["SecretAccessKey"],
-            aws_session_token=credentials["SessionToken"],
-        )
+        # boto3 Sessions are not thread-safe, the clients they create are:
+        # creation is serialised and each thread keeps its own clients.
+        self._session_lock = threading.Lock()
+        self._thread_clients = threading.local()
+
+        # When set (concurrent scan mode), upsert_resource enqueues rows
+        # here instead of writing them; the orchestrating thread is the
+        # single DB writer.
+        self._row_queue = None
+
+        # Rows are upserted in multi-row batches (src/cloud/inventory_writer.py).
+        self._inventory_writer = InventoryBatchWriter(AWSResourceInventory)
+
+    # ------------------------------------------------------------------
+    def get_client(self, service_name, region_name=None):
+        clients = getattr(self._thread_clients, "clients", None)
+        if clients is None:
+            clients = self._thread_clients.clients = {}
+
+        key = (service_name, region_name)
+        client = clients.get(key)
+        if client is None:
+            with self._session_lock:
+                client = self.aws_session.client(
+                    service_name,
+                    region_name=region_name,
+                    config=SCANNER_CLIENT_CONFIG,
+                )
+            clients[key] = client
+        return client
 
     # ------------------------------------------------------------------
     def get_enabled_regions(self):
-        ec2 = self.aws_session.client("ec2", region_name="us-east-1")
+        ec2 = self.get_client("ec2", region_name="us-east-1")
         response = ec2.describe_regions(AllRegions=False)
         return [r["RegionName"] for r in response["Regions"]]
 
@@ -64,43 +95,45 @@ class BaseScanner:
         if region and len(region) > 9 and region[-1].isalpha():
             region = region[:-1]
 
-        stmt = insert(AWSResourceInventory).values(
-            client_id=self.client_id,
-            aws_account_id=self.aws_account_id,
-            service_name=service_name,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            region=region,
-            state=state,
-            tags=tags or {},
-            resource_metadata=resource_metadata or {},
-            detected_at=now,
-            last_seen_at=now,
-            is_active=True,
-            created_at=now,
-            updated_at=now
-        )
-
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["client_id", "resource_id"],
-            set_={
-                "service_name": service_name,
-                "resource_type": resource_type,
-                "region": region,
-                "state": state,
-                "tags": tags or {},
-                "resource_metadata": resource_metadata or {},
-                "last_seen_at": now,
-                "is_active": True,
-                "updated_at": now
-            }
-        )
+        row = {
+            "client_id": self.client_id,
+            "aws_account_id": self.aws_account_id,
+            "service_name": service_name,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "region": region,
+            "state": state,
+            "tags": tags or {},
+            "resource_metadata": resource_metadata or {},
+            "detected_at": now,
+            "last_seen_at": now,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        if self._row_queue is not None:
+            self._row_queue.put(row)
+            return
+
+        self.write_inventory_row(row)
 
+    # ------------------------------------------------------------------
+    def write_inventory_row(self, row):
+        """Buffers a row; the writer flushes every INVENTORY_UPSERT_BATCH_SIZE rows."""
+        self._inventory_writer.add(row)
+
+    def flush_inventory(self):
+        """
+        Writes whatever is buffered and commits it. Called after every
+        scan unit — also when the scan raised — so a service failing
+        mid-pagination still keeps the rows it already discovered.
+        """
         try:
-            db.session.execute(stmt)
+            self._inventory_writer.flush()
+            db.session.commit()
         except Exception:
             logger.exception(
-                f"Inventory upsert failed | resource={resource_id}"
+                f"Inventory flush failed | client_id={self.client_id}"
             )
             db.session.rollback()
-            raise
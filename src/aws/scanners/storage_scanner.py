@@ -13,7 +13,7 @@ class StorageScanner(BaseScanner):
     # S3 (GLOBAL SERVICE)
     # ------------------------------------------------------------------
     def scan_s3(self):
-        s3 = self.aws_session.client("s3")
+        s3 = self.get_client("s3")
         response = s3.list_buckets()
 
         for bucket in response.get("Buckets", []):
@@ -43,7 +43,7 @@ class StorageScanner(BaseScanner):
     def scan_savings_plans(self, region):
         try:
             # Savings Plans API is always queried against us-east-1
-            savings = self.aws_session.client(
+            savings = self.get_client(
                 "savingsplans",
                 region_name="us-east-1"
             )
@@ -1,27 +1,208 @@
-import boto3
+import logging
 import os
+import threading
+
+import boto3
+import botocore.session
+from botocore.credentials import CredentialProvider, CredentialResolver, RefreshableCredentials
+
+from src.aws import api_limiter
+from src.config import metrics
+
+
+logger = logging.getLogger(__name__)
+
+# Errores que indican que el token del rol ya no sirve: se descartan las
+# credenciales cacheadas y el próximo get_session() vuelve a asumir el rol.
+# AccessDenied NO entra: en roles de mínimo privilegio los scanners lo
+# reciben a diario (bucket policies, Cost Explorer en cuentas linkeadas)
+# con un token perfectamente válido.
+INVALID_TOKEN_ERRORS = {
+    "ExpiredToken",
+    "ExpiredTokenException",
+    "InvalidClientTokenId",
+    "UnrecognizedClientException",
+}
+
+
+class _CachedRoleProvider(CredentialProvider):
+    """Provider de botocore que entrega las RefreshableCredentials cacheadas."""
+
+    METHOD = "sts-assume-role-cached"
+    CANONICAL_NAME = "sts-assume-role-cached"
+
+    def __init__(self, credentials):
+        super().__init__()
+        self._credentials = credentials
+
+    def load(self):
+        return self._credentials
 
 
 class STSService:
+    """
+    AssumeRole contra cuentas cliente, con cache de credenciales a nivel
+    de proceso.
+
+    Un audit completo (auditor, scanners, rightsizing, coverage, cost
+    explorer...) pedía el mismo rol 4+ veces, cada vez con un cliente STS
+    nuevo. Ahora:
+
+    - las credenciales se cachean por (role_arn, external_id) como
+      RefreshableCredentials de botocore, que se renuevan solas antes del
+      `Expiration` (ventana advisory de botocore: 15 min);
+    - el cliente STS de la plataforma se crea una sola vez;
+    - get_session() entrega un boto3.Session listo que comparte esas
+      credenciales (vía un credential provider propio en la cadena de
+      botocore). boto3.Session no es thread-safe, así que se cachea
+      una sesión por thread (las credenciales sí son compartidas);
+    - si AWS rechaza el token por expirado o inválido
+      (INVALID_TOKEN_ERRORS), un hook after-call invalida esas credenciales.
+    """
+
+    DEFAULT_REGION = "us-east-1"
+
+    _lock = threading.Lock()
+    _sts_client = None
+    _credentials = {}
+    _thread_sessions = threading.local()
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _get_sts_client():
+        if STSService._sts_client is None:
+            with STSService._lock:
+                if STSService._sts_client is None:
+                    STSService._sts_client = boto3.client(
+                        "sts",
+                        aws_access_key_id=os.getenv("FINOPS_AWS_ACCESS_KEY_ID"),
+                        aws_secret_access_key=os.getenv("FINOPS_AWS_SECRET_ACCESS_KEY"),
+                        region_name=STSService.DEFAULT_REGION
+                    )
+        return STSService._sts_client
 
+    @staticmethod
+    def _fetch_credentials(role_arn, external_id, session_name):
+        params = {
+            "RoleArn": role_arn,
+            "RoleSessionName": session_name,
+        }
+        if external_id:
+            params["ExternalId"] = external_id
+
+        with api_limiter.slot("sts"):
+            response = STSService._get_sts_client().assume_role(**params)
+        credentials = response["Credentials"]
+
+        return {
+            "access_key": credentials["AccessKeyId"],
+            "secret_key": credentials["SecretAccessKey"],
+            "token": credentials["SessionToken"],
+            "expiry_time": credentials["Expiration"].isoformat(),
+        }
+
+    @staticmethod
+    def _get_refreshable(role_arn, external_id, session_name):
+        key = (role_arn, external_id)
+
+        with STSService._lock:
+            credentials = STSService._credentials.get(key)
+
+        if credentials is not None:
+            return credentials
+
+        def refresh():
+            return STSService._fetch_credentials(role_arn, external_id, session_name)
+
+        credentials = RefreshableCredentials.create_from_metadata(
+            metadata=refresh(),
+            refresh_using=refresh,
+            method="sts-assume-role",
+        )
+
+        with STSService._lock:
+            # Si otro thread llegó primero, se usa el suyo
+            return STSService._credentials.setdefault(key, credentials)
+
+    # ------------------------------------------------------------------
     @staticmethod
     def assume_role(role_arn: str, external_id: str, session_name: str = "finops-session"):
         """
-        Asume un role en cuenta cliente usando ExternalId
+        Asume un role en cuenta cliente usando ExternalId.
+
+        Devuelve el dict de credenciales (AccessKeyId / SecretAccessKey /
+        SessionToken) vigente en el cache; solo llama a STS si no hay
+        credenciales o están por expirar.
         """
+        frozen = STSService._get_refreshable(
+            role_arn, external_id, session_name
+        ).get_frozen_credentials()
 
-        sts_client = boto3.client(
-            "sts",
-            aws_access_key_id=os.getenv("FINOPS_AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("FINOPS_AWS_SECRET_ACCESS_KEY"),
-            region_name="us-east-1"
-        )
+        return {
+            "AccessKeyId": frozen.access_key,
+            "SecretAccessKey": frozen.secret_key,
+            "SessionToken": frozen.token,
+        }
+
+    @staticmethod
+    def get_session(role_arn: str, external_id: str, session_name: str = "finops-session",
+                    region_name: str = DEFAULT_REGION):
+        """boto3.Session (por thread) sobre las credenciales cacheadas del rol."""
+        credentials = STSService._get_refreshable(role_arn, external_id, session_name)
+
+        sessions = getattr(STSService._thread_sessions, "sessions", None)
+        if sessions is None:
+            sessions = STSService._thread_sessions.sessions = {}
 
-        response = sts_client.assume_role(
-            RoleArn=role_arn,
-            RoleSessionName=session_name,
-            ExternalId=external_id
+        key = (role_arn, external_id, region_name)
+        cached = sessions.get(key)
+
+        # Si el cache de credenciales se invalidó, la sesión vieja no sirve
+        if cached is not None and cached[0] is credentials:
+            return cached[1]
+
+        botocore_session = botocore.session.get_session()
+        botocore_session.register_component(
+            "credential_provider",
+            CredentialResolver(providers=[_CachedRoleProvider(credentials)])
+        )
+        botocore_session.register(
+            "after-call",
+            STSService._invalidate_on_token_error(role_arn, external_id, credentials)
+        )
+        api_limiter.register(botocore_session)
+        metrics.register_aws_metrics(botocore_session)
+        session = boto3.Session(
+            botocore_session=botocore_session,
+            region_name=region_name,
         )
 
-        credentials = response["Credentials"]
-        return credentials
+        sessions[key] = (credentials, session)
+        return session
+
+    @staticmethod
+    def invalidate(role_arn: str, external_id: str = None, credentials=None):
+        """
+        Descarta las credenciales cacheadas del rol. Con `credentials`,
+        solo si siguen siendo esas (otro thread ya pudo haberlas renovado).
+        """
+        key = (role_arn, external_id)
+        with STSService._lock:
+            cached = STSService._credentials.get(key)
+            if cached is None or (credentials is not None and cached is not credentials):
+                return False
+            del STSService._credentials[key]
+        return True
+
+    @staticmethod
+    def _invalidate_on_token_error(role_arn, external_id, credentials):
+        def handler(parsed=None, event_name=None, **kwargs):
+            code = ((parsed or {}).get("Error") or {}).get("Code")
+            if code not in INVALID_TOKEN_ERRORS:
+                return
+            if STSService.invalidate(role_arn, external_id, credentials):
+                logger.warning(
+                    f"STS credentials invalidated | role_arn={role_arn} | "
+                    f"error={code} | event={event_name}"
+                )
+        return handler
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from src.azure.inventory_scanner import AzureInventoryScanner
 from src.azure.finding_engine.finding_engine import AzureFindingEngine
+from src.config import metrics
 from src.models.database import db
 from src.models.azure_account import AzureAccount
 
@@ -17,7 +18,7 @@ class AzureAuditor:
     a AWSFinding) — queda para una iteración futura si se decide
     extenderla a multi-cloud."""
 
-    def run_comprehensive_audit(self, client_id, azure_account_id):
+    def run_comprehensive_audit(self, client_id, azure_account_id, progress=None):
 
         audit_start = time.time()
         logger.info(f"AZURE AUDIT START | client_id={client_id}")
@@ -32,6 +33,9 @@ class AzureAuditor:
                 "findings_created": 0
             }
 
+        if progress:
+            progress(10, "inventory")
+
         try:
             inventory_start = time.time()
 
@@ -42,6 +46,7 @@ class AzureAuditor:
             scanner.run()
 
             inventory_elapsed = time.time() - inventory_start
+            metrics.observe_stage("azure", "inventory", inventory_elapsed)
             logger.info(
                 f"AZURE INVENTORY COMPLETED | client_id={client_id} | duration={inventory_elapsed:.2f}s"
             )
@@ -55,12 +60,16 @@ class AzureAuditor:
                 "findings_created": 0
             }
 
+        if progress:
+            progress(60, "findings")
+
         try:
             findings_start = time.time()
 
             findings_created = AzureFindingEngine.run(client_id)
 
             findings_elapsed = time.time() - findings_start
+            metrics.observe_stage("azure", "findings", findings_elapsed)
             logger.info(
                 f"AZURE FINDING ENGINE COMPLETED | client_id={client_id} | "
                 f"findings={findings_created} | duration={findings_elapsed:.2f}s"
@@ -75,6 +84,9 @@ class AzureAuditor:
                 "findings_created": 0
             }
 
+        if progress:
+            progress(95, "finalize")
+
         try:
             azure_account.last_sync = datetime.utcnow()
             db.session.commit()
@@ -88,6 +100,7 @@ class AzureAuditor:
             }
 
         audit_elapsed = time.time() - audit_start
+        metrics.observe_stage("azure", "total", audit_elapsed)
         logger.info(
             f"AZURE AUDIT COMPLETED SUCCESSFULLY | client_id={client_id} | "
             f"total_duration={audit_elapsed:.2f}s"
@@ -30,6 +30,7 @@ from src.azure.finding_engine.cdn_rules import CDNRules
 from src.azure.finding_engine.dns_rules import DNSRules
 from src.azure.finding_engine.servicebus_rules import ServiceBusRules
 from src.azure.finding_engine.snapshot_rules import SnapshotRules
+from src.config import metrics
 from src.models.database import db
 
 
@@ -41,30 +42,30 @@ class AzureFindingEngine:
         total_findings = 0
 
         try:
-            total_findings += VMRules.run_all(client_id)
-            total_findings += StorageRules.run_all(client_id)
-            total_findings += SQLRules.run_all(client_id)
-            total_findings += PostgreSQLRules.run_all(client_id)
-            total_findings += MySQLRules.run_all(client_id)
-            total_findings += AKSRules.run_all(client_id)
-            total_findings += AppServiceRules.run_all(client_id)
-            total_findings += FunctionsRules.run_all(client_id)
-            total_findings += ContainerInstanceRules.run_all(client_id)
-            total_findings += ContainerRegistryRules.run_all(client_id)
-            total_findings += VNetRules.run_all(client_id)
-            total_findings += LoadBalancerRules.run_all(client_id)
-            total_findings += AppGatewayRules.run_all(client_id)
-            total_findings += KeyVaultRules.run_all(client_id)
-            total_findings += MonitorRules.run_all(client_id)
-            total_findings += CosmosDBRules.run_all(client_id)
-            total_findings += ManagedDiskRules.run_all(client_id)
-            total_findings += PublicIPRules.run_all(client_id)
-            total_findings += NATGatewayRules.run_all(client_id)
-            total_findings += FirewallRules.run_all(client_id)
-            total_findings += CDNRules.run_all(client_id)
-            total_findings += DNSRules.run_all(client_id)
-            total_findings += ServiceBusRules.run_all(client_id)
-            total_findings += SnapshotRules.run_all(client_id)
+            total_findings += metrics.run_rule("azure", "VMRules.run_all", VMRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "StorageRules.run_all", StorageRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "SQLRules.run_all", SQLRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "PostgreSQLRules.run_all", PostgreSQLRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "MySQLRules.run_all", MySQLRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "AKSRules.run_all", AKSRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "AppServiceRules.run_all", AppServiceRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "FunctionsRules.run_all", FunctionsRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "ContainerInstanceRules.run_all", ContainerInstanceRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "ContainerRegistryRules.run_all", ContainerRegistryRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "VNetRules.run_all", VNetRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "LoadBalancerRules.run_all", LoadBalancerRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "AppGatewayRules.run_all", AppGatewayRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "KeyVaultRules.run_all", KeyVaultRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "MonitorRules.run_all", MonitorRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "CosmosDBRules.run_all", CosmosDBRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "ManagedDiskRules.run_all", ManagedDiskRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "PublicIPRules.run_all", PublicIPRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "NATGatewayRules.run_all", NATGatewayRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "FirewallRules.run_all", FirewallRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "CDNRules.run_all", CDNRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "DNSRules.run_all", DNSRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "ServiceBusRules.run_all", ServiceBusRules.run_all, client_id)
+            total_findings += metrics.run_rule("azure", "SnapshotRules.run_all", SnapshotRules.run_all, client_id)
 
             db.session.commit()
 
@@ -25,13 +25,32 @@ Servicios cubiertos hoy:
   - dns_scanner.py : Azure DNS
   - servicebus_scanner.py : Azure Service Bus
   - snapshot_scanner.py : Azure Managed Disk Snapshots
+
+Backends (AZURE_INVENTORY_BACKEND):
+  - management (default) : un scanner por servicio, cada uno paginando su
+                           API de management.
+  - resource_graph       : resource_graph_scanner.py — todos los tipos de
+                           arriba en una query KQL paginada de Azure
+                           Resource Graph (src/azure/resource_graph.py),
+                           mapeados al mismo service_name / metadata. Si
+                           falla, el run cae al backend de management.
+
+Dos modos del backend de management de ejecución (ver AzureInventoryScanner.run):
+  - secuencial (default) : servicio por servicio.
+  - concurrente          : un ScanUnit por servicio sobre el pool acotado
+                           de src/cloud/scan_pool.py
+                           (AZURE_INVENTORY_SCAN_* env vars).
 """
 
 import logging
+import os
+import queue
 from datetime import datetime
 
+from src.config import metrics
 from src.models.database import db
 from src.models.azure_resource_inventory import AzureResourceInventory
+from src.cloud.scan_pool import ConcurrentScanPool, ScanPoolLimits, ScanUnit
 
 from src.azure.scanners.compute_scanner import ComputeScanner
 from src.azure.scanners.storage_scanner import StorageScanner
@@ -51,6 +70,7 @@ from src.azure.scanners.cdn_scanner import CDNScanner
 from src.azure.scanners.dns_scanner import DNSScanner
 from src.azure.scanners.servicebus_scanner import ServiceBusScanner
 from src.azure.scanners.snapshot_scanner import SnapshotScanner
+from src.azure.scanners.resource_graph_scanner import ResourceGraphScanner
 
 
 logger = logging.getLogger(__name__)
@@ -60,7 +80,7 @@ class AzureInventoryScanner(
     ComputeScanner, StorageScanner, SQLScanner, PostgreSQLScanner, MySQLScanner, AKSScanner,
     AppServiceScanner, FunctionsScanner, ContainerInstanceScanner, ContainerRegistryScanner,
     NetworkScanner, KeyVaultScanner, MonitorScanner, CosmosDBScanner,
-    CDNScanner, DNSScanner, ServiceBusScanner, SnapshotScanner,
+    CDNScanner, DNSScanner, ServiceBusScanner, SnapshotScanner, ResourceGraphScanner,
 ):
     """
     Compone todos los scanners de servicios Azure y expone `run()`.
@@ -70,10 +90,59 @@ class AzureInventoryScanner(
     cada recurso reporta su propia `location` en la respuesta.
     """
 
-    def run(self):
-        logger.info(f"Azure inventory started | client_id={self.client_id}")
+    # ------------------------------------------------------------------
+    # ENTRY-POINT
+    # ------------------------------------------------------------------
+    def run(self, concurrent=None, backend=None):
+        """
+        backend=None lee AZURE_INVENTORY_BACKEND ("management" por default,
+        o "resource_graph").
+
+        concurrent=None lee AZURE_INVENTORY_SCAN_CONCURRENT (default off).
+        En modo concurrente los servicios corren en un pool acotado y este
+        thread es el único que escribe en la DB.
+        """
+        if backend is None:
+            backend = os.getenv("AZURE_INVENTORY_BACKEND", "management").strip().lower()
+
+        if concurrent is None:
+            concurrent = os.getenv("AZURE_INVENTORY_SCAN_CONCURRENT", "false").strip().lower() in {
+                "1", "true", "yes", "on"
+            }
+
+        logger.info(
+            f"Azure inventory started | client_id={self.client_id} | backend={backend} | "
+            f"mode={'concurrent' if concurrent else 'sequential'}"
+        )
         now = datetime.utcnow()
 
+        try:
+            scanned = backend == "resource_graph" and self._run_resource_graph()
+            if not scanned and concurrent:
+                self._run_concurrent()
+            elif not scanned:
+                self._run_sequential()
+        finally:
+            self.close_clients()
+
+        logger.info("Azure inventory completed")
+
+        # Marca como inactivos los recursos no vistos en este scan
+        AzureResourceInventory.query.filter(
+            AzureResourceInventory.client_id == self.client_id,
+            AzureResourceInventory.azure_account_id == self.azure_account_id,
+            AzureResourceInventory.last_seen_at < now
+        ).update({
+            "is_active": False,
+            "updated_at": now
+        })
+
+        db.session.commit()
+
+    # ------------------------------------------------------------------
+    # CATÁLOGO DE SERVICIOS
+    # ------------------------------------------------------------------
+    def _services(self):
         services = [
             ("VirtualMachines", self.scan_virtual_machines),
             ("StorageAccounts", self.scan_storage_accounts),
@@ -100,26 +169,79 @@ class AzureInventoryScanner(
             ("ServiceBus", self.scan_namespaces),
             ("Snapshots", self.scan_snapshots),
         ]
-
-        for service_name, service_method in services:
+        return [(name, metrics.timed_scan("azure", name, fn)) for name, fn in services]
+
+    # ------------------------------------------------------------------
+    # BACKEND RESOURCE GRAPH
+    # ------------------------------------------------------------------
+    def _run_resource_graph(self):
+        """
+        Devuelve False si el scan falló, para que run() use el backend de
+        management: con el inventario a medias, el cierre del run marcaría
+        como inactivo todo lo que no llegó a leerse.
+        """
+        try:
+            metrics.timed_scan("azure", "ResourceGraph", self.scan_resource_graph)()
+            return True
+        except Exception:
+            logger.exception(
+                f"ResourceGraph scan failed, falling back to management APIs | client_id={self.client_id}"
+            )
+            return False
+        finally:
+            self.flush_inventory()
+
+    # ------------------------------------------------------------------
+    # MODO SECUENCIAL
+    # ------------------------------------------------------------------
+    def _run_sequential(self):
+        for service_name, service_method in self._services():
             try:
                 service_method()
             except Exception:
                 logger.exception(
                     f"{service_name} scan failed | client_id={self.client_id}"
                 )
+            finally:
+                self.flush_inventory()
+
+    # ------------------------------------------------------------------
+    # MODO CONCURRENTE
+    # ------------------------------------------------------------------
+    def _run_concurrent(self):
+        # Azure no tiene la dimensión región: el throttling de ARM es por
+        # suscripción, así que la "región" de cada unidad es la suscripción
+        # y AZURE_INVENTORY_SCAN_REGION_LIMIT acota las llamadas simultáneas
+        # contra ella.
+        limits = ScanPoolLimits.from_env("AZURE_INVENTORY_SCAN")
+
+        units = [
+            ScanUnit(service=service_name, fn=service_method, region=self.subscription_id)
+            for service_name, service_method in self._services()
+        ]
 
-        db.session.commit()
-        logger.info("Azure inventory completed")
-
-        # Marca como inactivos los recursos no vistos en este scan
-        AzureResourceInventory.query.filter(
-            AzureResourceInventory.client_id == self.client_id,
-            AzureResourceInventory.azure_account_id == self.azure_account_id,
-            AzureResourceInventory.last_seen_at < now
-        ).update({
-            "is_active": False,
-            "updated_at": now
-        })
-
-        db.session.commit()
+        logger.info(
+            f"Concurrent Azure inventory | client_id={self.client_id} | "
+            f"units={len(units)} | workers={limits.max_workers} | "
+            f"subscription_limit={limits.region_limit}"
+        )
+
+        self._row_queue = queue.Queue()
+        try:
+            pool = ConcurrentScanPool(
+                limits,
+                row_queue=self._row_queue,
+                write_row=self.write_inventory_row,
+                on_unit_done=lambda unit: self.flush_inventory(),
+            )
+            failures = pool.run(units)
+        finally:
+            self._row_queue = None
+
+        for unit, error in failures:
+            logger.error(
+                f"{unit.service} scan failed | client_id={self.client_id}",
+                exc_info=error,
+            )
+
+        self.flush_inventory()
@@ -0,0 +1,172 @@
+"""
+resource_graph.py — acceso a Azure Resource Graph (KQL).
+
+Backend alternativo de inventario Azure (ver ResourceGraphScanner): en
+vez de paginar ~24 APIs de management por suscripción, corre una query
+KQL sobre la tabla `Resources` que trae todos los tipos que cubren los
+scanners, para una o muchas suscripciones del mismo tenant a la vez.
+
+- resource_graph_client(): ResourceGraphClient real, o el stand-in
+  RecordedResourceGraphClient si AZURE_RESOURCE_GRAPH_RECORDING apunta a
+  un archivo de respuestas grabadas (desarrollo local / tests, sin
+  credenciales ni red).
+- iter_resources(): pagina con skip tokens (hasta 1000 filas por página)
+  y agrupa las suscripciones de a 1000, el máximo por request.
+"""
+
+import json
+import logging
+import os
+from types import SimpleNamespace
+
+from azure.mgmt.resourcegraph import ResourceGraphClient
+from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
+
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+MAX_SUBSCRIPTIONS_PER_QUERY = 1000
+
+# Tipos ARM (en minúsculas, como los devuelve Resource Graph) que cubren
+# los scanners de src/azure/scanners/. Los endpoints de CDN no son un
+# recurso de inventario propio: se agregan sobre su perfil.
+INVENTORY_TYPES = (
+    "microsoft.compute/virtualmachines",
+    "microsoft.compute/disks",
+    "microsoft.compute/snapshots",
+    "microsoft.storage/storageaccounts",
+    "microsoft.sql/servers",
+    "microsoft.sql/servers/databases",
+    "microsoft.dbforpostgresql/flexibleservers",
+    "microsoft.dbformysql/flexibleservers",
+    "microsoft.containerservice/managedclusters",
+    "microsoft.web/sites",
+    "microsoft.containerinstance/containergroups",
+    "microsoft.containerregistry/registries",
+    "microsoft.network/virtualnetworks",
+    "microsoft.network/loadbalancers",
+    "microsoft.network/applicationgateways",
+    "microsoft.network/publicipaddresses",
+    "microsoft.network/natgateways",
+    "microsoft.network/azurefirewalls",
+    "microsoft.network/dnszones",
+    "microsoft.keyvault/vaults",
+    "microsoft.operationalinsights/workspaces",
+    "microsoft.documentdb/databaseaccounts",
+    "microsoft.cdn/profiles",
+    "microsoft.cdn/profiles/endpoints",
+    "microsoft.servicebus/namespaces",
+)
+
+# `order by id` da un orden estable entre páginas del skip token.
+INVENTORY_QUERY = (
+    "Resources"
+    " | where type in~ ({types})"
+    " | project id, name, type, kind, location, resourceGroup, subscriptionId,"
+    " tags, sku, managedBy, properties"
+    " | order by id asc"
+).format(types=", ".join(f"'{t}'" for t in INVENTORY_TYPES))
+
+
+def recording_path() -> str | None:
+    return os.getenv("AZURE_RESOURCE_GRAPH_RECORDING") or None
+
+
+def resource_graph_client(credential):
+    """ResourceGraphClient del SDK, o el stand-in grabado si hay recording."""
+    path = recording_path()
+    if path:
+        logger.info(f"Azure Resource Graph: usando respuestas grabadas | path={path}")
+        return RecordedResourceGraphClient.from_file(path)
+    return ResourceGraphClient(credential)
+
+
+def iter_resources(client, subscriptions: list[str], query: str = INVENTORY_QUERY):
+    """Itera las filas (dicts) de `query` sobre todas las suscripciones, página por página."""
+    for start in range(0, len(subscriptions), MAX_SUBSCRIPTIONS_PER_QUERY):
+        batch = subscriptions[start:start + MAX_SUBSCRIPTIONS_PER_QUERY]
+        skip_token = None
+        pages = 0
+
+        while True:
+            response = client.resources(QueryRequest(
+                subscriptions=batch,
+                query=query,
+                options=QueryRequestOptions(
+                    top=PAGE_SIZE,
+                    skip_token=skip_token,
+                    result_format="objectArray",
+                ),
+            ))
+            pages += 1
+
+            yield from response.data or []
+
+            skip_token = response.skip_token
+            if not skip_token:
+                break
+
+        logger.info(
+            f"Azure Resource Graph query done | subscriptions={len(batch)} | "
+            f"pages={pages} | total_records={response.total_records}"
+        )
+
+
+# =====================================================
+# STAND-IN GRABADO
+# =====================================================
+class RecordedResourceGraphClient:
+    """
+    Reemplazo local de ResourceGraphClient que reproduce páginas grabadas.
+
+    Formato del archivo (JSON):
+
+        {"pages": [
+            {"data": [{...fila...}, ...], "skip_token": "p2"},
+            {"data": [...], "skip_token": null}
+        ]}
+
+    La primera página se sirve sin skip token; las siguientes, cuando el
+    request trae el skip token de la anterior. Ignora el texto de la
+    query y filtra las filas por las suscripciones del request, así un
+    mismo archivo sirve para varias cuentas.
+    """
+
+    def __init__(self, pages: list[dict]):
+        self.pages = pages
+        self.requests = []
+
+    @classmethod
+    def from_file(cls, path: str) -> "RecordedResourceGraphClient":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["pages"])
+
+    def resources(self, query):
+        self.requests.append(query)
+        skip_token = query.options.skip_token if query.options else None
+
+        if skip_token is None:
+            index = 0
+        else:
+            tokens = [page.get("skip_token") for page in self.pages]
+            if skip_token not in tokens:
+                raise ValueError(f"Skip token no grabado: {skip_token}")
+            index = tokens.index(skip_token) + 1
+
+        page = self.pages[index]
+        subscriptions = {s.lower() for s in query.subscriptions or []}
+        data = [
+            row for row in page.get("data", [])
+            if not subscriptions or (row.get("subscriptionId") or "").lower() in subscriptions
+        ]
+        return SimpleNamespace(
+            data=data,
+            count=len(data),
+            skip_token=page.get("skip_token"),
+            total_records=sum(len(p.get("data", [])) for p in self.pages),
+            result_truncated="false",
+        )
+
+    def close(self):
+        pass
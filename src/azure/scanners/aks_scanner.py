@@ -13,7 +13,7 @@ class AKSScanner(AzureBaseScanner):
 
     def scan_aks_clusters(self):
         try:
-            aks_client = ContainerServiceClient(self.credential, self.subscription_id)
+            aks_client = self.get_client(ContainerServiceClient)
 
             for cluster in aks_client.managed_clusters.list():
                 resource_group = cluster.id.split("/")[4]
@@ -19,7 +19,7 @@ class AppServiceScanner(AzureBaseScanner):
 
     def scan_app_services(self):
         try:
-            web_client = WebSiteManagementClient(self.credential, self.subscription_id)
+            web_client = self.get_client(WebSiteManagementClient)
 
             for site in web_client.web_apps.list():
                 kind = (site.kind or "").lower()
@@ -15,7 +15,7 @@ class CDNScanner(AzureBaseScanner):
 
     def scan_cdn_profiles(self):
         try:
-            cdn_client = CdnManagementClient(self.credential, self.subscription_id)
+            cdn_client = self.get_client(CdnManagementClient)
 
             for profile in cdn_client.profiles.list():
                 resource_group = profile.id.split("/")[4]
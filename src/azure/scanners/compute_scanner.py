@@ -14,14 +14,16 @@ class ComputeScanner(AzureBaseScanner):
 
     def scan_virtual_machines(self):
         try:
-            compute_client = ComputeManagementClient(self.credential, self.subscription_id)
+            compute_client = self.get_client(ComputeManagementClient)
+
+            power_states = self._get_power_states(compute_client)
 
             for vm in compute_client.virtual_machines.list_all():
                 # El resource group siempre va en la posición 4 de un
                 # Resource ID de ARM: /subscriptions/{sub}/resourceGroups/{rg}/...
                 resource_group = vm.id.split("/")[4]
 
-                power_state = self._get_power_state(compute_client, resource_group, vm.name)
+                power_state = power_states.get(vm.id.lower())
 
                 os_type = None
                 if vm.storage_profile and vm.storage_profile.os_disk and vm.storage_profile.os_disk.os_type:
@@ -47,28 +49,32 @@ class ComputeScanner(AzureBaseScanner):
             raise
 
     # ------------------------------------------------------------------
-    # POWER STATE (requiere una llamada aparte a instance_view, a
-    # diferencia de AWS donde el estado viene en describe_instances)
+    # POWER STATE (a diferencia de AWS no viene en el listado normal).
+    # Antes era un instance_view por VM; ahora un solo listado paginado
+    # de toda la suscripción con statusOnly=true, que trae el
+    # instanceView de cada VM: 1-2 páginas en vez de N llamadas.
     # ------------------------------------------------------------------
-    def _get_power_state(self, compute_client, resource_group, vm_name):
+    def _get_power_states(self, compute_client):
+        """{vm_id en minúsculas: power state} para toda la suscripción."""
+        power_states = {}
         try:
-            instance_view = compute_client.virtual_machines.instance_view(
-                resource_group, vm_name
-            )
-            for status in instance_view.statuses:
-                if status.code.startswith("PowerState/"):
-                    return status.code.split("/")[-1]
-            return None
+            for vm in compute_client.virtual_machines.list_all(status_only="true"):
+                statuses = vm.instance_view.statuses if vm.instance_view else None
+                for status in statuses or []:
+                    if status.code and status.code.startswith("PowerState/"):
+                        # ARM no garantiza el mismo casing del ID entre endpoints
+                        power_states[vm.id.lower()] = status.code.split("/")[-1]
+                        break
         except Exception:
-            logger.warning(f"No se pudo obtener power state | vm={vm_name}")
-            return None
+            logger.warning(f"No se pudo obtener power state | subscription={self.subscription_id}")
+        return power_states
 
     # ------------------------------------------------------------------
     # MANAGED DISKS
     # ------------------------------------------------------------------
     def scan_managed_disks(self):
         try:
-            compute_client = ComputeManagementClient(self.credential, self.subscription_id)
+            compute_client = self.get_client(ComputeManagementClient)
 
             for disk in compute_client.disks.list():
                 resource_group = disk.id.split("/")[4]
@@ -13,7 +13,7 @@ class ContainerInstanceScanner(AzureBaseScanner):
 
     def scan_container_instances(self):
         try:
-            aci_client = ContainerInstanceManagementClient(self.credential, self.subscription_id)
+            aci_client = self.get_client(ContainerInstanceManagementClient)
 
             for group in aci_client.container_groups.list():
                 resource_group = group.id.split("/")[4]
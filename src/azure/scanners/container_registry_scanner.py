@@ -13,7 +13,7 @@ class ContainerRegistryScanner(AzureBaseScanner):
 
     def scan_container_registries(self):
         try:
-            acr_client = ContainerRegistryManagementClient(self.credential, self.subscription_id)
+            acr_client = self.get_client(ContainerRegistryManagementClient)
 
             for registry in acr_client.registries.list():
                 resource_group = registry.id.split("/")[4]
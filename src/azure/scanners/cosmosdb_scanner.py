@@ -13,7 +13,7 @@ class CosmosDBScanner(AzureBaseScanner):
 
     def scan_cosmosdb_accounts(self):
         try:
-            cosmos_client = CosmosDBManagementClient(self.credential, self.subscription_id)
+            cosmos_client = self.get_client(CosmosDBManagementClient)
 
             for account in cosmos_client.database_accounts.list():
                 resource_group = account.id.split("/")[4]
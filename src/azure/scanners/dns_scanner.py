@@ -14,7 +14,7 @@ class DNSScanner(AzureBaseScanner):
 
     def scan_dns_zones(self):
         try:
-            dns_client = DnsManagementClient(self.credential, self.subscription_id)
+            dns_client = self.get_client(DnsManagementClient)
 
             for zone in dns_client.zones.list():
                 resource_group = zone.id.split("/")[4]
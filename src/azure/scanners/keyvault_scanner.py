@@ -13,7 +13,7 @@ class KeyVaultScanner(AzureBaseScanner):
 
     def scan_key_vaults(self):
         try:
-            kv_client = KeyVaultManagementClient(self.credential, self.subscription_id)
+            kv_client = self.get_client(KeyVaultManagementClient)
 
             for vault in kv_client.vaults.list_by_subscription():
                 resource_group = vault.id.split("/")[4]
@@ -15,7 +15,7 @@ class MonitorScanner(AzureBaseScanner):
 
     def scan_log_analytics_workspaces(self):
         try:
-            monitor_client = LogAnalyticsManagementClient(self.credential, self.subscription_id)
+            monitor_client = self.get_client(LogAnalyticsManagementClient)
 
             for workspace in monitor_client.workspaces.list():
                 resource_group = workspace.id.split("/")[4]
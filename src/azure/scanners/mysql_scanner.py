@@ -17,7 +17,7 @@ class MySQLScanner(AzureBaseScanner):
 
     def scan_mysql_servers(self):
         try:
-            mysql_client = MySQLManagementClient(self.credential, self.subscription_id)
+            mysql_client = self.get_client(MySQLManagementClient)
 
             for server in mysql_client.servers.list():
                 resource_group = server.id.split("/")[4]
@@ -23,7 +23,7 @@ class NetworkScanner(AzureBaseScanner):
     # ------------------------------------------------------------------
     def scan_virtual_networks(self):
         try:
-            network_client = NetworkManagementClient(self.credential, self.subscription_id)
+            network_client = self.get_client(NetworkManagementClient)
 
             for vnet in network_client.virtual_networks.list_all():
                 resource_group = vnet.id.split("/")[4]
@@ -58,7 +58,7 @@ class NetworkScanner(AzureBaseScanner):
     # ------------------------------------------------------------------
     def scan_load_balancers(self):
         try:
-            network_client = NetworkManagementClient(self.credential, self.subscription_id)
+            network_client = self.get_client(NetworkManagementClient)
 
             for lb in network_client.load_balancers.list_all():
                 resource_group = lb.id.split("/")[4]
@@ -94,7 +94,7 @@ class NetworkScanner(AzureBaseScanner):
     # ------------------------------------------------------------------
     def scan_application_gateways(self):
         try:
-            network_client = NetworkManagementClient(self.credential, self.subscription_id)
+            network_client = self.get_client(NetworkManagementClient)
 
             for gw in network_client.application_gateways.list_all():
                 resource_group = gw.id.split("/")[4]
@@ -131,7 +131,7 @@ class NetworkScanner(AzureBaseScanner):
     # ------------------------------------------------------------------
     def scan_public_ips(self):
         try:
-            network_client = NetworkManagementClient(self.credential, self.subscription_id)
+            network_client = self.get_client(NetworkManagementClient)
 
             for ip in network_client.public_ip_addresses.list_all():
                 resource_group = ip.id.split("/")[4]
@@ -161,7 +161,7 @@ class NetworkScanner(AzureBaseScanner):
     # ------------------------------------------------------------------
     def scan_nat_gateways(self):
         try:
-            network_client = NetworkManagementClient(self.credential, self.subscription_id)
+            network_client = self.get_client(NetworkManagementClient)
 
             for nat in network_client.nat_gateways.list_all():
                 resource_group = nat.id.split("/")[4]
@@ -194,7 +194,7 @@ class NetworkScanner(AzureBaseScanner):
     # ------------------------------------------------------------------
     def scan_firewalls(self):
         try:
-            network_client = NetworkManagementClient(self.credential, self.subscription_id)
+            network_client = self.get_client(NetworkManagementClient)
 
             for fw in network_client.azure_firewalls.list_all():
                 resource_group = fw.id.split("/")[4]
@@ -18,7 +18,7 @@ class PostgreSQLScanner(AzureBaseScanner):
 
     def scan_postgresql_servers(self):
         try:
-            pg_client = PostgreSQLManagementClient(self.credential, self.subscription_id)
+            pg_client = self.get_client(PostgreSQLManagementClient)
 
             for server in pg_client.servers.list():
                 resource_group = server.id.split("/")[4]
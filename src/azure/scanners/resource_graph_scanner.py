@@ -0,0 +1,425 @@
+import logging
+from collections import defaultdict
+
+from azure.mgmt.servicebus import ServiceBusManagementClient
+
+from src.azure.resource_graph import iter_resources, recording_path, resource_graph_client
+from src.azure.scanners.shared import AzureBaseScanner
+
+
+logger = logging.getLogger(__name__)
+
+
+def _get(data, *path):
+    """Lee una ruta anidada de un dict de ARM; None si falta cualquier tramo."""
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _resource_group(row):
+    # Igual que los scanners: el casing del Resource ID, no la columna
+    # resourceGroup de Resource Graph (que viene en minúsculas).
+    return row["id"].split("/")[4]
+
+
+def _base(row, **metadata):
+    return {"name": row.get("name"), "resource_group": _resource_group(row), **metadata}
+
+
+def _backend_address_count(pool):
+    props = pool.get("properties") or {}
+    return (
+        len(props.get("loadBalancerBackendAddresses") or [])
+        + len(props.get("backendIPConfigurations") or [])
+    )
+
+
+# ----------------------------------------------------------------------
+# MAPPERS: fila de Resource Graph (JSON de ARM) -> mismo service_name /
+# resource_type / state / resource_metadata que el scanner equivalente
+# de src/azure/scanners/, para que el finding engine no vea diferencia.
+# ----------------------------------------------------------------------
+def _virtual_machine(row, props):
+    power_code = _get(props, "extended", "instanceView", "powerState", "code")
+    return "VirtualMachines", "VirtualMachine", (
+        power_code.split("/")[-1] if power_code else None
+    ), _base(
+        row,
+        vm_size=_get(props, "hardwareProfile", "vmSize"),
+        os_type=_get(props, "storageProfile", "osDisk", "osType"),
+    )
+
+
+def _disk(row, props):
+    return "ManagedDisks", "Disk", props.get("diskState"), _base(
+        row,
+        sku_name=_get(row, "sku", "name"),
+        disk_size_gb=props.get("diskSizeGB"),
+        managed_by=row.get("managedBy") or None,
+    )
+
+
+def _snapshot(row, props):
+    return "Snapshots", "Snapshot", props.get("provisioningState"), _base(
+        row,
+        source_resource_id=_get(props, "creationData", "sourceResourceId"),
+        disk_size_gb=props.get("diskSizeGB"),
+    )
+
+
+def _storage_account(row, props):
+    return "StorageAccounts", "StorageAccount", props.get("statusOfPrimary"), _base(
+        row,
+        kind=row.get("kind"),
+        sku_name=_get(row, "sku", "name"),
+        access_tier=props.get("accessTier"),
+        allow_blob_public_access=props.get("allowBlobPublicAccess"),
+        supports_https_traffic_only=props.get("supportsHttpsTrafficOnly"),
+    )
+
+
+def _sql_server(row, props):
+    return "SQLDatabase", "SqlServer", props.get("state"), _base(
+        row,
+        public_network_access=props.get("publicNetworkAccess"),
+        minimal_tls_version=props.get("minimalTlsVersion"),
+        version=props.get("version"),
+    )
+
+
+def _sql_database(row, props):
+    # "master" es la base de sistema: se omite igual que en SQLScanner
+    if row.get("name") == "master":
+        return None
+    return "SQLDatabase", "SqlDatabase", props.get("status"), {
+        "name": row.get("name"),
+        "server_name": row["id"].split("/")[8],
+        "sku_name": _get(row, "sku", "name"),
+        "sku_tier": _get(row, "sku", "tier"),
+        "max_size_bytes": props.get("maxSizeBytes"),
+    }
+
+
+def _flexible_server(service_name):
+    def mapper(row, props):
+        return service_name, "FlexibleServer", props.get("state"), _base(
+            row,
+            sku_name=_get(row, "sku", "name"),
+            sku_tier=_get(row, "sku", "tier"),
+            version=props.get("version"),
+            storage_size_gb=_get(props, "storage", "storageSizeGB"),
+            backup_retention_days=_get(props, "backup", "backupRetentionDays"),
+            public_network_access=_get(props, "network", "publicNetworkAccess"),
+            high_availability_mode=_get(props, "highAvailability", "mode"),
+        )
+    return mapper
+
+
+def _aks_cluster(row, props):
+    agent_pools = props.get("agentPoolProfiles") or []
+    return "AKS", "ManagedCluster", props.get("provisioningState"), _base(
+        row,
+        kubernetes_version=props.get("kubernetesVersion"),
+        node_resource_group=props.get("nodeResourceGroup"),
+        disable_local_accounts=props.get("disableLocalAccounts"),
+        agent_pool_count=len(agent_pools),
+        total_node_count=sum(pool.get("count") or 0 for pool in agent_pools),
+        any_pool_without_autoscaling=any(not pool.get("enableAutoScaling") for pool in agent_pools),
+    )
+
+
+def _web_site(row, props):
+    # Mismo listado (web_apps.list) para App Service y Functions: se
+    # separan por kind, igual que AppServiceScanner / FunctionsScanner.
+    is_function = "functionapp" in (row.get("kind") or "").lower()
+    return (
+        "Functions" if is_function else "AppService",
+        "FunctionApp" if is_function else "WebApp",
+        props.get("state"),
+        _base(
+            row,
+            kind=row.get("kind"),
+            https_only=props.get("httpsOnly"),
+            default_host_name=props.get("defaultHostName"),
+            server_farm_id=props.get("serverFarmId"),
+        ),
+    )
+
+
+def _container_group(row, props):
+    containers = props.get("containers") or []
+    requests = [_get(c, "properties", "resources", "requests") or {} for c in containers]
+    return "ContainerInstances", "ContainerGroup", props.get("provisioningState"), _base(
+        row,
+        os_type=props.get("osType"),
+        restart_policy=props.get("restartPolicy"),
+        container_count=len(containers),
+        total_cpu=sum(r.get("cpu") or 0 for r in requests),
+        total_memory_gb=sum(r.get("memoryInGB") or 0 for r in requests),
+        ip_address_type=_get(props, "ipAddress", "type"),
+    )
+
+
+def _container_registry(row, props):
+    return "ContainerRegistry", "Registry", props.get("provisioningState"), _base(
+        row,
+        sku_name=_get(row, "sku", "name"),
+        admin_user_enabled=props.get("adminUserEnabled"),
+        public_network_access=props.get("publicNetworkAccess"),
+    )
+
+
+def _virtual_network(row, props):
+    return "VirtualNetwork", "VirtualNetwork", props.get("provisioningState"), _base(
+        row,
+        address_prefixes=_get(props, "addressSpace", "addressPrefixes") or [],
+        subnet_count=len(props.get("subnets") or []),
+        ddos_protection_enabled=bool(props.get("enableDdosProtection")),
+    )
+
+
+def _load_balancer(row, props):
+    backend_pools = props.get("backendAddressPools") or []
+    return "LoadBalancer", "LoadBalancer", props.get("provisioningState"), _base(
+        row,
+        sku_name=_get(row, "sku", "name"),
+        backend_pool_count=len(backend_pools),
+        total_backend_addresses=sum(_backend_address_count(pool) for pool in backend_pools),
+    )
+
+
+def _application_gateway(row, props):
+    backend_pools = props.get("backendAddressPools") or []
+    return "ApplicationGateway", "ApplicationGateway", (
+        props.get("operationalState") or props.get("provisioningState")
+    ), _base(
+        row,
+        sku_name=_get(props, "sku", "name"),
+        sku_tier=_get(props, "sku", "tier"),
+        autoscale_enabled=props.get("autoscaleConfiguration") is not None,
+        backend_pool_count=len(backend_pools),
+        total_backend_addresses=sum(
+            len(_get(pool, "properties", "backendAddresses") or []) for pool in backend_pools
+        ),
+    )
+
+
+def _public_ip(row, props):
+    return "PublicIP", "PublicIPAddress", (
+        "associated" if props.get("ipConfiguration") else "unassociated"
+    ), _base(
+        row,
+        sku_name=_get(row, "sku", "name"),
+        ip_address=props.get("ipAddress"),
+        allocation_method=props.get("publicIPAllocationMethod"),
+    )
+
+
+def _nat_gateway(row, props):
+    return "NATGateway", "NatGateway", props.get("provisioningState"), _base(
+        row,
+        sku_name=_get(row, "sku", "name"),
+        subnet_count=len(props.get("subnets") or []),
+        public_ip_count=len(props.get("publicIpAddresses") or []),
+    )
+
+
+def _firewall(row, props):
+    return "Firewall", "AzureFirewall", props.get("provisioningState"), _base(
+        row,
+        sku_name=_get(props, "sku", "name"),
+        sku_tier=_get(props, "sku", "tier"),
+        ip_configuration_count=len(props.get("ipConfigurations") or []),
+        has_hub_ip=props.get("hubIPAddresses") is not None,
+    )
+
+
+def _dns_zone(row, props):
+    return "DNS", "Zone", None, _base(
+        row,
+        zone_type=props.get("zoneType"),
+        number_of_record_sets=props.get("numberOfRecordSets"),
+    )
+
+
+def _key_vault(row, props):
+    return "KeyVault", "Vault", "active", _base(
+        row,
+        sku_name=_get(props, "sku", "name"),
+        purge_protection_enabled=bool(props.get("enablePurgeProtection")),
+        soft_delete_enabled=bool(props.get("enableSoftDelete")),
+        network_default_action=_get(props, "networkAcls", "defaultAction") or "Allow",
+    )
+
+
+def _log_analytics_workspace(row, props):
+    return "Monitor", "LogAnalyticsWorkspace", props.get("provisioningState"), _base(
+        row,
+        sku_name=_get(props, "sku", "name"),
+        retention_in_days=props.get("retentionInDays"),
+        daily_quota_gb=_get(props, "workspaceCapping", "dailyQuotaGb"),
+    )
+
+
+def _cosmosdb_account(row, props):
+    locations = props.get("locations") or []
+    return "CosmosDB", "DatabaseAccount", props.get("provisioningState"), _base(
+        row,
+        kind=row.get("kind"),
+        region_count=len(locations),
+        regions=[loc.get("locationName") for loc in locations],
+        public_network_access=props.get("publicNetworkAccess"),
+        is_virtual_network_filter_enabled=bool(props.get("isVirtualNetworkFilterEnabled")),
+        enable_free_tier=bool(props.get("enableFreeTier")),
+    )
+
+
+def _cdn_profile(row, props):
+    # endpoint_count / any_http_allowed se completan con las filas de
+    # endpoints (ver ResourceGraphScanner._apply_cdn_endpoints)
+    return "CDN", "Profile", props.get("resourceState"), _base(
+        row,
+        sku_name=_get(row, "sku", "name"),
+        endpoint_count=0,
+        any_http_allowed=False,
+    )
+
+
+def _servicebus_namespace(row, props):
+    # queue_count / topic_count no están en Resource Graph: se completan
+    # con la API de management (ver ResourceGraphScanner._apply_servicebus_counts)
+    return "ServiceBus", "Namespace", props.get("status"), _base(
+        row,
+        sku_name=_get(row, "sku", "name"),
+        minimum_tls_version=props.get("minimumTlsVersion"),
+    )
+
+
+MAPPERS = {
+    "microsoft.compute/virtualmachines":           _virtual_machine,
+    "microsoft.compute/disks":                     _disk,
+    "microsoft.compute/snapshots":                 _snapshot,
+    "microsoft.storage/storageaccounts":           _storage_account,
+    "microsoft.sql/servers":                       _sql_server,
+    "microsoft.sql/servers/databases":             _sql_database,
+    "microsoft.dbforpostgresql/flexibleservers":   _flexible_server("PostgreSQL"),
+    "microsoft.dbformysql/flexibleservers":        _flexible_server("MySQL"),
+    "microsoft.containerservice/managedclusters":  _aks_cluster,
+    "microsoft.web/sites":                         _web_site,
+    "microsoft.containerinstance/containergroups": _container_group,
+    "microsoft.containerregistry/registries":      _container_registry,
+    "microsoft.network/virtualnetworks":           _virtual_network,
+    "microsoft.network/loadbalancers":             _load_balancer,
+    "microsoft.network/applicationgateways":       _application_gateway,
+    "microsoft.network/publicipaddresses":         _public_ip,
+    "microsoft.network/natgateways":               _nat_gateway,
+    "microsoft.network/azurefirewalls":            _firewall,
+    "microsoft.network/dnszones":                  _dns_zone,
+    "microsoft.keyvault/vaults":                   _key_vault,
+    "microsoft.operationalinsights/workspaces":    _log_analytics_workspace,
+    "microsoft.documentdb/databaseaccounts":       _cosmosdb_account,
+    "microsoft.cdn/profiles":                      _cdn_profile,
+    "microsoft.servicebus/namespaces":             _servicebus_namespace,
+}
+
+CDN_ENDPOINT_TYPE = "microsoft.cdn/profiles/endpoints"
+
+
+class ResourceGraphScanner(AzureBaseScanner):
+    """Backend de inventario por Azure Resource Graph: todos los tipos en
+    una query KQL paginada, en vez de una API de management por servicio."""
+
+    def scan_resource_graph(self):
+        client = resource_graph_client(self.credential)
+        try:
+            resources = []
+            cdn_endpoints = defaultdict(list)
+
+            for row in iter_resources(client, [self.subscription_id]):
+                row_type = (row.get("type") or "").lower()
+                if row_type == CDN_ENDPOINT_TYPE:
+                    profile_id = row["id"].rsplit("/endpoints/", 1)[0].lower()
+                    cdn_endpoints[profile_id].append(row)
+                    continue
+
+                mapper = MAPPERS.get(row_type)
+                if mapper is None:
+                    continue
+                mapped = mapper(row, row.get("properties") or {})
+                if mapped is not None:
+                    resources.append((row, mapped))
+
+            self._apply_cdn_endpoints(resources, cdn_endpoints)
+            self._apply_servicebus_counts(resources)
+
+            for row, (service_name, resource_type, state, metadata) in resources:
+                self.upsert_resource(
+                    service_name=service_name,
+                    resource_type=resource_type,
+                    resource_id=row["id"],
+                    region=row.get("location"),
+                    state=state,
+                    tags=row.get("tags") or {},
+                    resource_metadata=metadata,
+                )
+
+            logger.info(
+                f"Azure Resource Graph scan | subscription={self.subscription_id} | "
+                f"resources={len(resources)}"
+            )
+
+        except Exception:
+            logger.exception(f"Azure Resource Graph scan failed | subscription={self.subscription_id}")
+            raise
+
+        finally:
+            client.close()
+
+    # ------------------------------------------------------------------
+    def _apply_cdn_endpoints(self, resources, cdn_endpoints):
+        for row, (service_name, _, _, metadata) in resources:
+            if service_name != "CDN":
+                continue
+            endpoints = cdn_endpoints.get(row["id"].lower(), [])
+            metadata["endpoint_count"] = len(endpoints)
+            metadata["any_http_allowed"] = any(
+                bool(_get(e, "properties", "isHttpAllowed")) for e in endpoints
+            )
+
+    # ------------------------------------------------------------------
+    # SERVICE BUS: Resource Graph no indexa colas ni topics, así que los
+    # conteos salen de la API de management (las mismas 2 llamadas por
+    # namespace que hacía ServiceBusScanner).
+    # ------------------------------------------------------------------
+    def _apply_servicebus_counts(self, resources):
+        namespaces = [
+            (row, metadata) for row, (service_name, _, _, metadata) in resources
+            if service_name == "ServiceBus"
+        ]
+        if not namespaces:
+            return
+
+        if recording_path():
+            # Respuestas grabadas: no hay credenciales para la API de management.
+            # Sin conteos la regla de namespace vacío no aplica (None != 0).
+            for _, metadata in namespaces:
+                metadata["queue_count"] = metadata["topic_count"] = None
+            return
+
+        sb_client = self.get_client(ServiceBusManagementClient)
+        for row, metadata in namespaces:
+            resource_group = metadata["resource_group"]
+            try:
+                metadata["queue_count"] = len(list(
+                    sb_client.queues.list_by_namespace(resource_group, row["name"])
+                ))
+                metadata["topic_count"] = len(list(
+                    sb_client.topics.list_by_namespace(resource_group, row["name"])
+                ))
+            except Exception:
+                logger.warning(f"No se pudo contar colas/topics | namespace={row['name']}")
+                metadata["queue_count"] = None
+                metadata["topic_count"] = None
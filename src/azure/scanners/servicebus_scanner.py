@@ -14,7 +14,7 @@ class ServiceBusScanner(AzureBaseScanner):
 
     def scan_namespaces(self):
         try:
-            sb_client = ServiceBusManagementClient(self.credential, self.subscription_id)
+            sb_client = self.get_client(ServiceBusManagementClient)
 
             for namespace in sb_client.namespaces.list():
                 resource_group = namespace.id.split("/")[4]
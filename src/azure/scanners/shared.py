@@ -13,14 +13,15 @@ artificial entre dos SDKs que no se parecen.
 """
 
 import logging
+import threading
 from datetime import datetime
 
 from azure.identity import ClientSecretCredential
-from sqlalchemy.dialects.postgresql import insert
 
 from src.models.database import db
 from src.models.azure_account import AzureAccount
 from src.models.azure_resource_inventory import AzureResourceInventory
+from src.cloud.inventory_writer import InventoryBatchWriter
 
 
 logger = logging.getLogger(__name__)
@@ -28,8 +29,9 @@ logger = logging.getLogger(__name__)
 
 class AzureBaseScanner:
     """
-    Holds Azure credentials + subscription_id y el helper compartido
-    upsert_resource, usado por todos los scanners de servicios Azure.
+    Holds Azure credentials + subscription_id y los helpers compartidos
+    (get_client, upsert_resource), usados por todos los scanners de
+    servicios Azure.
     """
 
     def __init__(self, client_id, azure_account_id):
@@ -48,6 +50,44 @@ class AzureBaseScanner:
             client_secret=azure_account.client_secret,
         )
 
+        # Un *ManagementClient por clase para esta suscripción, compartido
+        # por todos los scans del run. Los clientes del SDK de Azure son
+        # thread-safe (a diferencia de las Sessions de boto3), así que el
+        # modo concurrente también los comparte entre threads.
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+
+        # Si está seteada (modo concurrente), upsert_resource encola las
+        # filas acá en vez de escribirlas; el thread que orquesta es el
+        # único que escribe en la DB.
+        self._row_queue = None
+
+        # Upsert multi-fila compartido con AWS/GCP (src/cloud/inventory_writer.py)
+        self._inventory_writer = InventoryBatchWriter(AzureResourceInventory)
+
+    # ------------------------------------------------------------------
+    def get_client(self, client_cls):
+        """Devuelve (creándolo una sola vez) el cliente de management de la suscripción."""
+        client = self._clients.get(client_cls)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(client_cls)
+                if client is None:
+                    client = client_cls(self.credential, self.subscription_id)
+                    self._clients[client_cls] = client
+        return client
+
+    def close_clients(self):
+        """Cierra los pools HTTP de los clientes creados en el run."""
+        with self._clients_lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                logger.warning(f"Azure client close failed | client={type(client).__name__}")
+
     # ------------------------------------------------------------------
     def upsert_resource(
         self,
@@ -61,43 +101,45 @@ class AzureBaseScanner:
     ):
         now = datetime.utcnow()
 
-        stmt = insert(AzureResourceInventory).values(
-            client_id=self.client_id,
-            azure_account_id=self.azure_account_id,
-            service_name=service_name,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            region=region,
-            state=state,
-            tags=tags or {},
-            resource_metadata=resource_metadata or {},
-            detected_at=now,
-            last_seen_at=now,
-            is_active=True,
-            created_at=now,
-            updated_at=now
-        )
-
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["client_id", "resource_id"],
-            set_={
-                "service_name": service_name,
-                "resource_type": resource_type,
-                "region": region,
-                "state": state,
-                "tags": tags or {},
-                "resource_metadata": resource_metadata or {},
-                "last_seen_at": now,
-                "is_active": True,
-                "updated_at": now
-            }
-        )
+        row = {
+            "client_id": self.client_id,
+            "azure_account_id": self.azure_account_id,
+            "service_name": service_name,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "region": region,
+            "state": state,
+            "tags": tags or {},
+            "resource_metadata": resource_metadata or {},
+            "detected_at": now,
+            "last_seen_at": now,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        if self._row_queue is not None:
+            self._row_queue.put(row)
+            return
+
+        self.write_inventory_row(row)
 
+    # ------------------------------------------------------------------
+    def write_inventory_row(self, row):
+        """Acumula la fila; el writer escribe cada INVENTORY_UPSERT_BATCH_SIZE filas."""
+        self._inventory_writer.add(row)
+
+    def flush_inventory(self):
+        """
+        Escribe el batch pendiente y hace commit. Se llama al cerrar cada
+        scan de servicio (también si falló), para conservar las filas ya
+        descubiertas antes del error.
+        """
         try:
-            db.session.execute(stmt)
+            self._inventory_writer.flush()
+            db.session.commit()
         except Exception:
             logger.exception(
-                f"Azure inventory upsert failed | resource={resource_id}"
+                f"Azure inventory flush failed | client_id={self.client_id}"
             )
             db.session.rollback()
-            raise
@@ -15,7 +15,7 @@ class SnapshotScanner(AzureBaseScanner):
 
     def scan_snapshots(self):
         try:
-            compute_client = ComputeManagementClient(self.credential, self.subscription_id)
+            compute_client = self.get_client(ComputeManagementClient)
 
             for snapshot in compute_client.snapshots.list():
                 resource_group = snapshot.id.split("/")[4]
@@ -13,7 +13,7 @@ class SQLScanner(AzureBaseScanner):
 
     def scan_sql_databases(self):
         try:
-            sql_client = SqlManagementClient(self.credential, self.subscription_id)
+            sql_client = self.get_client(SqlManagementClient)
 
             for server in sql_client.servers.list():
                 resource_group = server.id.split("/")[4]
@@ -13,7 +13,7 @@ class StorageScanner(AzureBaseScanner):
 
     def scan_storage_accounts(self):
         try:
-            storage_client = StorageManagementClient(self.credential, self.subscription_id)
+            storage_client = self.get_client(StorageManagementClient)
 
             for account in storage_client.storage_accounts.list():
                 resource_group = account.id.split("/")[4]
@@ -0,0 +1,109 @@
+"""
+INVENTORY WRITER — upsert multi-fila del inventario de recursos
+================================================================
+Buffer compartido por BaseScanner (AWS), AzureBaseScanner y
+GCPBaseScanner: en vez de un `INSERT ... ON CONFLICT DO UPDATE` por
+recurso descubierto, acumula filas y las escribe como un único
+`insert().values([...]).on_conflict_do_update(...)` cada `batch_size`
+filas (o al cerrar cada scan de servicio vía `flush()`).
+
+Las tres tablas de inventario comparten la misma forma (unique
+client_id + resource_id y las mismas columnas mutables), así que el
+writer solo necesita el modelo destino.
+
+Si un batch falla, se reintenta fila por fila dentro de savepoints:
+una fila inválida no arrastra al resto del batch.
+"""
+
+import logging
+import os
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.config import metrics
+from src.models.database import db
+
+
+logger = logging.getLogger(__name__)
+
+CONFLICT_COLUMNS = ["client_id", "resource_id"]
+
+UPDATE_COLUMNS = (
+    "service_name",
+    "resource_type",
+    "region",
+    "state",
+    "tags",
+    "resource_metadata",
+    "last_seen_at",
+    "is_active",
+    "updated_at",
+)
+
+
+def default_batch_size() -> int:
+    return max(1, int(os.getenv("INVENTORY_UPSERT_BATCH_SIZE", "500")))
+
+
+class InventoryBatchWriter:
+
+    def __init__(self, model, batch_size: int | None = None):
+        self.model = model
+        self.batch_size = batch_size or default_batch_size()
+        # Keyed por (client_id, resource_id): Postgres rechaza un
+        # ON CONFLICT que toque la misma fila dos veces en un statement,
+        # así que dentro del buffer gana la última versión del recurso.
+        self._buffer: dict = {}
+
+    def __len__(self):
+        return len(self._buffer)
+
+    # ------------------------------------------------------------------
+    def add(self, row: dict) -> None:
+        self._buffer[(row["client_id"], row["resource_id"])] = row
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    # ------------------------------------------------------------------
+    def _statement(self, rows):
+        stmt = insert(self.model).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=CONFLICT_COLUMNS,
+            set_={col: stmt.excluded[col] for col in UPDATE_COLUMNS},
+        )
+
+    def flush(self) -> int:
+        """Escribe el buffer pendiente. Devuelve las filas escritas."""
+        if not self._buffer:
+            return 0
+
+        written = self._write()
+        metrics.record_rows_upserted(self.model.__tablename__, written)
+        return written
+
+    def _write(self) -> int:
+        rows = list(self._buffer.values())
+        self._buffer.clear()
+
+        try:
+            with db.session.begin_nested():
+                db.session.execute(self._statement(rows))
+            return len(rows)
+        except Exception:
+            logger.exception(
+                f"Inventory batch upsert failed | table={self.model.__tablename__} | "
+                f"rows={len(rows)} — retrying row by row"
+            )
+
+        written = 0
+        for row in rows:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(self._statement([row]))
+                written += 1
+            except Exception:
+                logger.exception(
+                    f"Inventory upsert failed | table={self.model.__tablename__} | "
+                    f"resource={row['resource_id']}"
+                )
+        return written
@@ -0,0 +1,172 @@
+"""
+SCAN POOL — ejecución concurrente de unidades de scan de inventario
+====================================================================
+Ejecuta unidades (servicio, región) sobre un pool de threads acotado,
+respetando límites de concurrencia por servicio y por región para no
+disparar el throttling de las APIs del provider.
+
+Los workers SOLO hablan con la API del provider: nunca tocan
+`db.session`. Las filas que producen se encolan y las escribe un único
+writer en el thread que orquesta (el que tiene el app context), así la
+sesión de SQLAlchemy nunca se comparte entre threads.
+
+Es agnóstico al provider: lo usa InventoryScanner (AWS) y puede usarlo
+cualquier otro orquestador que exponga el mismo par cola/writer.
+"""
+
+import logging
+import os
+import queue
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_REGION = "global"
+
+
+@dataclass
+class ScanUnit:
+    """Una llamada a un método scan_* para un servicio (y región, si aplica)."""
+    service: str
+    fn: Callable
+    args: tuple = ()
+    region: str = GLOBAL_REGION
+
+
+@dataclass
+class ScanPoolLimits:
+    """
+    Límites de concurrencia del pool.
+
+    - max_workers: threads totales del pool.
+    - region_limit: unidades simultáneas contra una misma región.
+    - default_service_limit: unidades simultáneas de un mismo servicio
+      (en todas las regiones) si no tiene override.
+    - service_limits: overrides por servicio (ej. {"EBSSnapshot": 2}).
+    """
+    max_workers: int = 8
+    region_limit: int = 4
+    default_service_limit: int = 4
+    service_limits: dict = field(default_factory=dict)
+
+    def for_service(self, service: str) -> int:
+        return self.service_limits.get(service, self.default_service_limit)
+
+    @classmethod
+    def from_env(cls, prefix: str, service_defaults: dict | None = None):
+        """
+        Lee los límites desde variables de entorno con el prefijo dado:
+
+          <PREFIX>_MAX_WORKERS=8
+          <PREFIX>_REGION_LIMIT=4
+          <PREFIX>_SERVICE_LIMIT=4
+          <PREFIX>_SERVICE_LIMITS="EBSSnapshot=2,EC2=3"
+        """
+        service_limits = dict(service_defaults or {})
+
+        raw = os.getenv(f"{prefix}_SERVICE_LIMITS", "")
+        for item in raw.split(","):
+            name, sep, value = item.partition("=")
+            if not sep or not name.strip():
+                continue
+            try:
+                service_limits[name.strip()] = max(1, int(value))
+            except ValueError:
+                logger.warning(f"Invalid scan service limit ignored | {item.strip()}")
+
+        return cls(
+            max_workers=max(1, int(os.getenv(f"{prefix}_MAX_WORKERS", "8"))),
+            region_limit=max(1, int(os.getenv(f"{prefix}_REGION_LIMIT", "4"))),
+            default_service_limit=max(1, int(os.getenv(f"{prefix}_SERVICE_LIMIT", "4"))),
+            service_limits=service_limits,
+        )
+
+
+class ConcurrentScanPool:
+    """
+    Planifica y ejecuta ScanUnits con límites por servicio/región.
+
+    El thread que llama a `run()` es el único que ejecuta `write_row`
+    (y `on_unit_done`), drenando la cola de filas mientras los workers
+    siguen escaneando.
+    """
+
+    POLL_SECONDS = 0.2
+
+    def __init__(self, limits: ScanPoolLimits, row_queue: "queue.Queue",
+                 write_row: Callable[[Any], None],
+                 on_unit_done: Callable[[ScanUnit], None] | None = None):
+        self.limits = limits
+        self.row_queue = row_queue
+        self.write_row = write_row
+        self.on_unit_done = on_unit_done
+
+    # ------------------------------------------------------------------
+    def _drain(self):
+        while True:
+            try:
+                row = self.row_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.write_row(row)
+
+    # ------------------------------------------------------------------
+    def run(self, units: list[ScanUnit]) -> list[tuple[ScanUnit, BaseException]]:
+        """
+        Ejecuta todas las unidades y devuelve la lista de (unidad, error)
+        de las que fallaron. Un fallo nunca corta el resto del scan.
+        """
+        pending = deque(units)
+        in_flight: dict = {}
+        running_by_region = defaultdict(int)
+        running_by_service = defaultdict(int)
+        failures = []
+
+        def has_capacity(unit):
+            return (
+                running_by_region[unit.region] < self.limits.region_limit
+                and running_by_service[unit.service] < self.limits.for_service(unit.service)
+            )
+
+        with ThreadPoolExecutor(max_workers=self.limits.max_workers) as executor:
+            while pending or in_flight:
+
+                # Despacha todo lo que entre en los límites actuales
+                deferred = deque()
+                while pending and len(in_flight) < self.limits.max_workers:
+                    unit = pending.popleft()
+                    if not has_capacity(unit):
+                        deferred.append(unit)
+                        continue
+                    running_by_region[unit.region] += 1
+                    running_by_service[unit.service] += 1
+                    in_flight[executor.submit(unit.fn, *unit.args)] = unit
+                deferred.extend(pending)
+                pending = deferred
+
+                self._drain()
+
+                done, _ = wait(list(in_flight), timeout=self.POLL_SECONDS,
+                               return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    unit = in_flight.pop(future)
+                    running_by_region[unit.region] -= 1
+                    running_by_service[unit.service] -= 1
+
+                    error = future.exception()
+                    if error is not None:
+                        failures.append((unit, error))
+
+                    # Las filas de la unidad ya están en la cola: se
+                    # escriben antes de avisar que terminó.
+                    self._drain()
+                    if self.on_unit_done:
+                        self.on_unit_done(unit)
+
+        self._drain()
+        return failures
@@ -0,0 +1,223 @@
+# =====================================================
+#   METRICS — Prometheus (no-op si falta prometheus_client)
+# =====================================================
+"""
+Superficie de instrumentación del backend, servida en `/metrics`
+(registrada en system_routes.py).
+
+- finops_audit_stage_seconds{provider,stage}       duración por etapa de auditoría
+- finops_scan_service_seconds{provider,service}    duración de cada scan de servicio
+- finops_aws_api_calls_total{service,operation}    llamadas a AWS (sesiones de STSService)
+- finops_aws_api_throttles_total{service,operation} respuestas de throttling (cada intento)
+- finops_inventory_rows_upserted_total{table}      filas escritas por InventoryBatchWriter
+- finops_findings_created_total{provider,rule}     findings nuevos por regla
+- finops_finding_rule_seconds{provider,rule}       duración de cada regla
+- finops_alert_engine_seconds / finops_alerts_fired_total
+- finops_db_queries_per_request{endpoint}          queries SQL por request HTTP
+
+Con gunicorn (varios workers) o el audit worker en otro proceso, definir
+PROMETHEUS_MULTIPROC_DIR (directorio compartido y vacío al arrancar):
+cada proceso escribe ahí y `/metrics` agrega todos. En gunicorn conviene
+llamar `mark_process_dead(worker.pid)` desde el hook `child_exit`.
+
+METRICS_TOKEN es obligatorio: /metrics exige `Authorization: Bearer <token>`
+y responde 404 si no está configurado.
+"""
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+except ImportError:  # pragma: no cover — dependencia opcional
+    Counter = Histogram = None
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+
+def _histogram(name, documentation, labelnames=(), buckets=None):
+    if Histogram is None:
+        return _NoopMetric()
+    if buckets:
+        return Histogram(name, documentation, labelnames, buckets=buckets)
+    return Histogram(name, documentation, labelnames)
+
+
+def _counter(name, documentation, labelnames=()):
+    if Counter is None:
+        return _NoopMetric()
+    return Counter(name, documentation, labelnames)
+
+
+LONG_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+SHORT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+AUDIT_STAGE_SECONDS = _histogram(
+    "finops_audit_stage_seconds", "Audit stage duration",
+    ["provider", "stage"], LONG_BUCKETS
+)
+SCAN_SERVICE_SECONDS = _histogram(
+    "finops_scan_service_seconds", "Inventory scan duration per service call",
+    ["provider", "service"], SHORT_BUCKETS
+)
+AWS_API_CALLS = _counter(
+    "finops_aws_api_calls_total", "AWS API calls", ["service", "operation"]
+)
+AWS_API_THROTTLES = _counter(
+    "finops_aws_api_throttles_total", "AWS API throttled attempts", ["service", "operation"]
+)
+INVENTORY_ROWS_UPSERTED = _counter(
+    "finops_inventory_rows_upserted_total", "Inventory rows upserted", ["table"]
+)
+FINDINGS_CREATED = _counter(
+    "finops_findings_created_total", "Findings created per rule", ["provider", "rule"]
+)
+FINDING_RULE_SECONDS = _histogram(
+    "finops_finding_rule_seconds", "Finding rule duration",
+    ["provider", "rule"], SHORT_BUCKETS
+)
+ALERT_ENGINE_SECONDS = _histogram(
+    "finops_alert_engine_seconds", "Alert engine run duration", (), SHORT_BUCKETS
+)
+ALERTS_FIRED = _counter(
+    "finops_alerts_fired_total", "Alert policies fired", ["status"]
+)
+DB_QUERIES_PER_REQUEST = _histogram(
+    "finops_db_queries_per_request", "SQL statements executed per HTTP request",
+    ["endpoint"], QUERY_BUCKETS
+)
+
+THROTTLE_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "SlowDown",
+    "EC2ThrottledException",
+    "LimitExceededException",
+}
+
+
+# =====================================================
+#   HELPERS DE INSTRUMENTACIÓN
+# =====================================================
+def observe_stage(provider: str, stage: str, seconds: float) -> None:
+    AUDIT_STAGE_SECONDS.labels(provider, stage).observe(seconds)
+
+
+def timed_scan(provider: str, service: str, fn):
+    """Envuelve un método scan_* para medir su duración (haya fallado o no)."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            SCAN_SERVICE_SECONDS.labels(provider, service).observe(time.perf_counter() - start)
+    return wrapper
+
+
+def run_rule(provider: str, name: str, rule, *args) -> int:
+    """Ejecuta una regla, mide su duración y cuenta los findings creados."""
+    start = time.perf_counter()
+    try:
+        created = rule(*args) or 0
+    finally:
+        FINDING_RULE_SECONDS.labels(provider, name).observe(time.perf_counter() - start)
+    FINDINGS_CREATED.labels(provider, name).inc(created)
+    return created
+
+
+def record_rows_upserted(table: str, rows: int) -> None:
+    if rows:
+        INVENTORY_ROWS_UPSERTED.labels(table).inc(rows)
+
+
+@contextmanager
+def alert_engine_timer():
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ALERT_ENGINE_SECONDS.observe(time.perf_counter() - start)
+
+
+# =====================================================
+#   AWS (HOOKS DE BOTOCORE)
+# =====================================================
+def _count_aws_call(event_name=None, **kwargs):
+    _, service, operation = event_name.split(".", 2)
+    AWS_API_CALLS.labels(service, operation).inc()
+
+
+def _count_aws_throttle(event_name=None, response=None, **kwargs):
+    if not response:
+        return None
+    code = (response[1] or {}).get("Error", {}).get("Code")
+    if code in THROTTLE_ERROR_CODES:
+        _, service, operation = event_name.split(".", 2)
+        AWS_API_THROTTLES.labels(service, operation).inc()
+    # None: no interfiere con la decisión de retry de botocore
+    return None
+
+
+def register_aws_metrics(botocore_session) -> None:
+    botocore_session.register("before-call", _count_aws_call)
+    botocore_session.register("needs-retry", _count_aws_throttle)
+
+
+# =====================================================
+#   FLASK: QUERIES POR REQUEST + /metrics
+# =====================================================
+def init_request_metrics(app) -> None:
+    from flask import g, has_request_context, request
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            g._db_query_count = g.get("_db_query_count", 0) + 1
+
+    @app.after_request
+    def _observe_queries(response):
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        DB_QUERIES_PER_REQUEST.labels(endpoint).observe(g.get("_db_query_count", 0))
+        return response
+
+
+def metrics_response():
+    """(body, status, headers) para la ruta /metrics."""
+    if Counter is None:
+        return "prometheus_client not installed\n", 503, {"Content-Type": "text/plain"}
+
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), 200, {"Content-Type": CONTENT_TYPE_LATEST}
@@ -1,8 +1,12 @@
 # =====================================================
-#   SYSTEM ROUTES — healthcheck, preflight CORS, raíz legacy
+#   SYSTEM ROUTES — healthcheck, métricas, preflight CORS, raíz legacy
 # =====================================================
+import hmac
+import os
 from datetime import datetime
-from flask import jsonify, request
+from flask import Response, jsonify, request
+
+from src.config.metrics import init_request_metrics, metrics_response
 
 
 def register_system_routes(app, allowed_origins: list[str]) -> None:
@@ -19,6 +23,24 @@ def register_system_routes(app, allowed_origins: list[str]) -> None:
     def up():
         return "ok", 200
 
+    init_request_metrics(app)
+
+    @app.route("/metrics")
+    def metrics():
+        # Cerrado por defecto: sin METRICS_TOKEN la ruta no existe (expone
+        # latencias por ruta, tiempos de scan por cliente e internos de
+        # los workers).
+        token = os.getenv("METRICS_TOKEN")
+        if not token:
+            return jsonify({"error": "Not found"}), 404
+
+        auth = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(auth, f"Bearer {token}"):
+            return jsonify({"error": "Unauthorized"}), 401
+
+        body, status, headers = metrics_response()
+        return Response(body, status=status, headers=headers)
+
     @app.route("/api/<path:path>", methods=["OPTIONS"])
     def handle_options(path):
         response = jsonify({"status": "ok"})
@@ -30,6 +30,7 @@ from src.gcp.finding_engine.bigquery_rules import BigQueryRules
 from src.gcp.finding_engine.cdn_rules import CDNRules
 from src.gcp.finding_engine.logging_rules import LoggingRules
 from src.gcp.finding_engine.snapshot_rules import SnapshotRules
+from src.config import metrics
 from src.models.database import db
 
 
@@ -41,29 +42,29 @@ class GCPFindingEngine:
         total_findings = 0
 
         try:
-            total_findings += ComputeRules.run_all(client_id)
-            total_findings += DiskRules.run_all(client_id)
-            total_findings += StaticIPRules.run_all(client_id)
-            total_findings += VPCRules.run_all(client_id)
-            total_findings += FirewallRules.run_all(client_id)
-            total_findings += LoadBalancerRules.run_all(client_id)
-            total_findings += NATGatewayRules.run_all(client_id)
-            total_findings += StorageRules.run_all(client_id)
-            total_findings += SQLRules.run_all(client_id)
-            total_findings += GKERules.run_all(client_id)
-            total_findings += CloudRunRules.run_all(client_id)
-            total_findings += FunctionsRules.run_all(client_id)
-            total_findings += ArtifactRegistryRules.run_all(client_id)
-            total_findings += PubSubRules.run_all(client_id)
-            total_findings += RedisRules.run_all(client_id)
-            total_findings += FirestoreRules.run_all(client_id)
-            total_findings += DNSRules.run_all(client_id)
-            total_findings += FilestoreRules.run_all(client_id)
-            total_findings += KMSRules.run_all(client_id)
-            total_findings += BigQueryRules.run_all(client_id)
-            total_findings += CDNRules.run_all(client_id)
-            total_findings += LoggingRules.run_all(client_id)
-            total_findings += SnapshotRules.run_all(client_id)
+            total_findings += metrics.run_rule("gcp", "ComputeRules.run_all", ComputeRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "DiskRules.run_all", DiskRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "StaticIPRules.run_all", StaticIPRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "VPCRules.run_all", VPCRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "FirewallRules.run_all", FirewallRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "LoadBalancerRules.run_all", LoadBalancerRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "NATGatewayRules.run_all", NATGatewayRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "StorageRules.run_all", StorageRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "SQLRules.run_all", SQLRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "GKERules.run_all", GKERules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "CloudRunRules.run_all", CloudRunRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "FunctionsRules.run_all", FunctionsRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "ArtifactRegistryRules.run_all", ArtifactRegistryRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "PubSubRules.run_all", PubSubRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "RedisRules.run_all", RedisRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "FirestoreRules.run_all", FirestoreRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "DNSRules.run_all", DNSRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "FilestoreRules.run_all", FilestoreRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "KMSRules.run_all", KMSRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "BigQueryRules.run_all", BigQueryRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "CDNRules.run_all", CDNRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "LoggingRules.run_all", LoggingRules.run_all, client_id)
+            total_findings += metrics.run_rule("gcp", "SnapshotRules.run_all", SnapshotRules.run_all, client_id)
 
             db.session.commit()
 
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from src.gcp.inventory_scanner import GCPInventoryScanner
 from src.gcp.finding_engine.finding_engine import GCPFindingEngine
+from src.config import metrics
 from src.models.database import db
 from src.models.gcp_account import GCPAccount
 
@@ -16,7 +17,7 @@ class GCPAuditor:
     cuentas GCP. Sin RiskSnapshot todavía (esa tabla está acoplada a
     AWSFinding)."""
 
-    def run_comprehensive_audit(self, client_id, gcp_account_id):
+    def run_comprehensive_audit(self, client_id, gcp_account_id, progress=None):
 
         audit_start = time.time()
         logger.info(f"GCP AUDIT START | client_id={client_id}")
@@ -31,6 +32,9 @@ class GCPAuditor:
                 "findings_created": 0
             }
 
+        if progress:
+            progress(10, "inventory")
+
         try:
             inventory_start = time.time()
 
@@ -41,6 +45,7 @@ class GCPAuditor:
             scanner.run()
 
             inventory_elapsed = time.time() - inventory_start
+            metrics.observe_stage("gcp", "inventory", inventory_elapsed)
             logger.info(
                 f"GCP INVENTORY COMPLETED | client_id={client_id} | duration={inventory_elapsed:.2f}s"
             )
@@ -54,12 +59,16 @@ class GCPAuditor:
                 "findings_created": 0
             }
 
+        if progress:
+            progress(60, "findings")
+
         try:
             findings_start = time.time()
 
             findings_created = GCPFindingEngine.run(client_id)
 
             findings_elapsed = time.time() - findings_start
+            metrics.observe_stage("gcp", "findings", findings_elapsed)
             logger.info(
                 f"GCP FINDING ENGINE COMPLETED | client_id={client_id} | "
                 f"findings={findings_created} | duration={findings_elapsed:.2f}s"
@@ -74,6 +83,9 @@ class GCPAuditor:
                 "findings_created": 0
             }
 
+        if progress:
+            progress(95, "finalize")
+
         try:
             gcp_account.last_sync = datetime.utcnow()
             db.session.commit()
@@ -87,6 +99,7 @@ class GCPAuditor:
             }
 
         audit_elapsed = time.time() - audit_start
+        metrics.observe_stage("gcp", "total", audit_elapsed)
         logger.info(
             f"GCP AUDIT COMPLETED SUCCESSFULLY | client_id={client_id} | "
             f"total_duration={audit_elapsed:.2f}s"
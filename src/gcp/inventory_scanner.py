@@ -24,13 +24,23 @@ Servicios cubiertos hoy:
   - filestore_scanner.py  : Filestore
   - logging_scanner.py    : Cloud Logging
   - snapshot_scanner.py   : Compute Engine Disk Snapshots
+
+Dos modos de ejecución (ver GCPInventoryScanner.run):
+  - secuencial (default) : servicio por servicio.
+  - concurrente          : un ScanUnit por servicio sobre el pool acotado
+                           de src/cloud/scan_pool.py
+                           (GCP_INVENTORY_SCAN_* env vars).
 """
 
 import logging
+import os
+import queue
 from datetime import datetime
 
+from src.config import metrics
 from src.models.database import db
 from src.models.gcp_resource_inventory import GCPResourceInventory
+from src.cloud.scan_pool import ConcurrentScanPool, ScanPoolLimits, ScanUnit
 
 from src.gcp.scanners.compute_scanner import ComputeScanner
 from src.gcp.scanners.network_scanner import NetworkScanner
@@ -68,45 +78,31 @@ class GCPInventoryScanner(
     métodos usan aggregatedList o parent="projects/{p}/locations/-".
     """
 
-    def run(self):
-        logger.info(f"GCP inventory started | client_id={self.client_id}")
+    # ------------------------------------------------------------------
+    # ENTRY-POINT
+    # ------------------------------------------------------------------
+    def run(self, concurrent=None):
+        """
+        concurrent=None lee GCP_INVENTORY_SCAN_CONCURRENT (default off).
+        En modo concurrente los servicios corren en un pool acotado y este
+        thread es el único que escribe en la DB.
+        """
+        if concurrent is None:
+            concurrent = os.getenv("GCP_INVENTORY_SCAN_CONCURRENT", "false").strip().lower() in {
+                "1", "true", "yes", "on"
+            }
+
+        logger.info(
+            f"GCP inventory started | client_id={self.client_id} | "
+            f"mode={'concurrent' if concurrent else 'sequential'}"
+        )
         now = datetime.utcnow()
 
-        services = [
-            ("ComputeEngine", self.scan_instances),
-            ("PersistentDisks", self.scan_disks),
-            ("StaticIPs", self.scan_addresses),
-            ("VPCNetworks", self.scan_networks),
-            ("FirewallRules", self.scan_firewalls),
-            ("LoadBalancing", self.scan_load_balancers),
-            ("CloudNAT", self.scan_nat_gateways),
-            ("CloudStorage", self.scan_buckets),
-            ("CloudSQL", self.scan_sql_instances),
-            ("GKE", self.scan_clusters),
-            ("CloudRun", self.scan_services),
-            ("CloudFunctions", self.scan_functions),
-            ("BigQuery", self.scan_datasets),
-            ("CloudKMS", self.scan_key_rings),
-            ("ArtifactRegistry", self.scan_repositories),
-            ("PubSub", self.scan_topics),
-            ("Memorystore", self.scan_redis_instances),
-            ("Firestore", self.scan_databases),
-            ("CloudDNS", self.scan_managed_zones),
-            ("Filestore", self.scan_filestore_instances),
-            ("CloudCDN", self.scan_cdn_backend_services),
-            ("CloudLogging", self.scan_log_buckets),
-            ("Snapshots", self.scan_snapshots),
-        ]
-
-        for service_name, service_method in services:
-            try:
-                service_method()
-            except Exception:
-                logger.exception(
-                    f"{service_name} scan failed | client_id={self.client_id}"
-                )
+        if concurrent:
+            self._run_concurrent()
+        else:
+            self._run_sequential()
 
-        db.session.commit()
         logger.info("GCP inventory completed")
 
         # Marca como inactivos los recursos no vistos en este scan
@@ -120,3 +116,90 @@ class GCPInventoryScanner(
         })
 
         db.session.commit()
+
+    # ------------------------------------------------------------------
+    # CATÁLOGO DE SERVICIOS: (nombre, método, API de Google que consume)
+    # ------------------------------------------------------------------
+    def _services(self):
+        services = [
+            ("ComputeEngine", self.scan_instances, "compute"),
+            ("PersistentDisks", self.scan_disks, "compute"),
+            ("StaticIPs", self.scan_addresses, "compute"),
+            ("VPCNetworks", self.scan_networks, "compute"),
+            ("FirewallRules", self.scan_firewalls, "compute"),
+            ("LoadBalancing", self.scan_load_balancers, "compute"),
+            ("CloudNAT", self.scan_nat_gateways, "compute"),
+            ("CloudStorage", self.scan_buckets, "storage"),
+            ("CloudSQL", self.scan_sql_instances, "sqladmin"),
+            ("GKE", self.scan_clusters, "container"),
+            ("CloudRun", self.scan_services, "run"),
+            ("CloudFunctions", self.scan_functions, "cloudfunctions"),
+            ("BigQuery", self.scan_datasets, "bigquery"),
+            ("CloudKMS", self.scan_key_rings, "cloudkms"),
+            ("ArtifactRegistry", self.scan_repositories, "artifactregistry"),
+            ("PubSub", self.scan_topics, "pubsub"),
+            ("Memorystore", self.scan_redis_instances, "redis"),
+            ("Firestore", self.scan_databases, "firestore"),
+            ("CloudDNS", self.scan_managed_zones, "dns"),
+            ("Filestore", self.scan_filestore_instances, "file"),
+            ("CloudCDN", self.scan_cdn_backend_services, "compute"),
+            ("CloudLogging", self.scan_log_buckets, "logging"),
+            ("Snapshots", self.scan_snapshots, "compute"),
+        ]
+        return [(name, metrics.timed_scan("gcp", name, fn), api) for name, fn, api in services]
+
+    # ------------------------------------------------------------------
+    # MODO SECUENCIAL
+    # ------------------------------------------------------------------
+    def _run_sequential(self):
+        for service_name, service_method, _ in self._services():
+            try:
+                service_method()
+            except Exception:
+                logger.exception(
+                    f"{service_name} scan failed | client_id={self.client_id}"
+                )
+            finally:
+                self.flush_inventory()
+
+    # ------------------------------------------------------------------
+    # MODO CONCURRENTE
+    # ------------------------------------------------------------------
+    def _run_concurrent(self):
+        # GCP no tiene la dimensión región a nivel de scan: las cuotas de
+        # requests son por API y proyecto, así que la "región" de cada
+        # unidad es la API que consume y GCP_INVENTORY_SCAN_REGION_LIMIT
+        # acota los scans simultáneos contra una misma API (los 9 de
+        # compute v1 comparten cuota).
+        limits = ScanPoolLimits.from_env("GCP_INVENTORY_SCAN")
+
+        units = [
+            ScanUnit(service=service_name, fn=service_method, region=api)
+            for service_name, service_method, api in self._services()
+        ]
+
+        logger.info(
+            f"Concurrent GCP inventory | client_id={self.client_id} | "
+            f"units={len(units)} | workers={limits.max_workers} | "
+            f"api_limit={limits.region_limit}"
+        )
+
+        self._row_queue = queue.Queue()
+        try:
+            pool = ConcurrentScanPool(
+                limits,
+                row_queue=self._row_queue,
+                write_row=self.write_inventory_row,
+                on_unit_done=lambda unit: self.flush_inventory(),
+            )
+            failures = pool.run(units)
+        finally:
+            self._row_queue = None
+
+        for unit, error in failures:
+            logger.error(
+                f"{unit.service} scan failed | client_id={self.client_id}",
+                exc_info=error,
+            )
+
+        self.flush_inventory()
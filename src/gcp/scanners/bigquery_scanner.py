@@ -16,13 +16,22 @@ class BigQueryScanner(GCPBaseScanner):
             for page in self._paginate(
                 bigquery.datasets(), "list", projectId=self.project_id
             ):
-                for dataset in page.get("datasets", []):
+                datasets = page.get("datasets", [])
+
+                # labels y expiraciones sólo vienen en get(): un batch por
+                # página en vez de un request por dataset
+                details = self._execute_batch(bigquery, {
+                    index: bigquery.datasets().get(
+                        projectId=self.project_id,
+                        datasetId=(dataset.get("datasetReference") or {}).get("datasetId"),
+                    )
+                    for index, dataset in enumerate(datasets)
+                })
+
+                for index, dataset in enumerate(datasets):
                     dataset_ref = dataset.get("datasetReference") or {}
                     dataset_id = dataset_ref.get("datasetId")
-
-                    detail = bigquery.datasets().get(
-                        projectId=self.project_id, datasetId=dataset_id
-                    ).execute()
+                    detail = details[index]
 
                     self.upsert_resource(
                         service_name="BigQuery",
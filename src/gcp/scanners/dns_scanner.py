@@ -16,9 +16,12 @@ class DNSScanner(GCPBaseScanner):
             for page in self._paginate(
                 dns.managedZones(), "list", project=self.project_id
             ):
-                for zone in page.get("managedZones", []):
+                zones = page.get("managedZones", [])
+                rrset_counts = self._count_record_sets(dns, [zone.get("name") for zone in zones])
+
+                for zone in zones:
                     dnssec_state = (zone.get("dnssecConfig") or {}).get("state")
-                    rrset_count = self._count_record_sets(dns, zone.get("name"))
+                    rrset_count = rrset_counts.get(zone.get("name"), 0)
 
                     self.upsert_resource(
                         service_name="CloudDNS",
@@ -40,10 +43,12 @@ class DNSScanner(GCPBaseScanner):
             logger.exception(f"GCP Cloud DNS scan failed | project={self.project_id}")
             raise
 
-    def _count_record_sets(self, dns, zone_name):
-        count = 0
-        for page in self._paginate(
-            dns.resourceRecordSets(), "list", project=self.project_id, managedZone=zone_name
+    def _count_record_sets(self, dns, zone_names):
+        """{zona: cantidad de record sets}, con la primera página de todas las zonas en batch."""
+        counts = dict.fromkeys(zone_names, 0)
+        for zone_name, page in self._batch_paginate(
+            dns, dns.resourceRecordSets(), "list",
+            {name: {"project": self.project_id, "managedZone": name} for name in zone_names},
         ):
-            count += len(page.get("rrsets", []))
-        return count
+            counts[zone_name] += len(page.get("rrsets", []))
+        return counts
@@ -14,7 +14,7 @@ class FirestoreScanner(GCPBaseScanner):
             firestore = self._client("firestore", "v1")
 
             parent = f"projects/{self.project_id}"
-            response = firestore.projects().databases().list(parent=parent).execute()
+            response = self._execute(firestore.projects().databases().list(parent=parent))
 
             for database in response.get("databases", []):
                 self.upsert_resource(
@@ -16,7 +16,7 @@ class FunctionsScanner(GCPBaseScanner):
             functions = self._client("cloudfunctions", "v2")
 
             parent = f"projects/{self.project_id}/locations/-"
-            response = functions.projects().locations().functions().list(parent=parent).execute()
+            response = self._execute(functions.projects().locations().functions().list(parent=parent))
 
             for fn in response.get("functions", []):
                 location = fn.get("name", "").split("/locations/")[-1].split("/functions/")[0]
@@ -14,7 +14,7 @@ class GKEScanner(GCPBaseScanner):
             container = self._client("container", "v1")
 
             parent = f"projects/{self.project_id}/locations/-"
-            response = container.projects().locations().clusters().list(parent=parent).execute()
+            response = self._execute(container.projects().locations().clusters().list(parent=parent))
 
             for cluster in response.get("clusters", []):
                 node_pools = cluster.get("nodePools") or []
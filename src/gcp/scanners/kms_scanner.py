@@ -15,30 +15,34 @@ class KMSScanner(GCPBaseScanner):
         try:
             kms = self._client("cloudkms", "v1")
 
-            locations_resp = kms.projects().locations().list(
+            locations_resp = self._execute(kms.projects().locations().list(
                 name=f"projects/{self.project_id}"
-            ).execute()
-
-            for location in locations_resp.get("locations", []):
-                location_id = location.get("locationId")
-                parent = f"projects/{self.project_id}/locations/{location_id}"
-
-                for page in self._paginate(
-                    kms.projects().locations().keyRings(), "list", parent=parent
-                ):
-                    for key_ring in page.get("keyRings", []):
-                        self.upsert_resource(
-                            service_name="CloudKMS",
-                            resource_type="KeyRing",
-                            resource_id=key_ring["name"],
-                            region=location_id,
-                            state=None,
-                            tags={},
-                            resource_metadata={
-                                "name": key_ring["name"].split("/")[-1],
-                                "create_time": key_ring.get("createTime"),
-                            }
-                        )
+            ))
+
+            location_ids = [location.get("locationId") for location in locations_resp.get("locations", [])]
+
+            # Un keyRings.list por location (~40): la primera página de
+            # todas va en batch, sólo las siguientes se piden sueltas.
+            for location_id, page in self._batch_paginate(
+                kms, kms.projects().locations().keyRings(), "list",
+                {
+                    location_id: {"parent": f"projects/{self.project_id}/locations/{location_id}"}
+                    for location_id in location_ids
+                },
+            ):
+                for key_ring in page.get("keyRings", []):
+                    self.upsert_resource(
+                        service_name="CloudKMS",
+                        resource_type="KeyRing",
+                        resource_id=key_ring["name"],
+                        region=location_id,
+                        state=None,
+                        tags={},
+                        resource_metadata={
+                            "name": key_ring["name"].split("/")[-1],
+                            "create_time": key_ring.get("createTime"),
+                        }
+                    )
 
         except Exception:
             logger.exception(f"GCP Cloud KMS scan failed | project={self.project_id}")
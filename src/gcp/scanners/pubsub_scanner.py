@@ -18,8 +18,11 @@ class PubSubScanner(GCPBaseScanner):
             for page in self._paginate(
                 pubsub.projects().topics(), "list", project=project_path
             ):
-                for topic in page.get("topics", []):
-                    subscription_count = self._count_subscriptions(pubsub, topic["name"])
+                topics = page.get("topics", [])
+                subscription_counts = self._count_subscriptions(pubsub, [t["name"] for t in topics])
+
+                for topic in topics:
+                    subscription_count = subscription_counts.get(topic["name"], 0)
 
                     self.upsert_resource(
                         service_name="PubSub",
@@ -39,10 +42,12 @@ class PubSubScanner(GCPBaseScanner):
             logger.exception(f"GCP Pub/Sub scan failed | project={self.project_id}")
             raise
 
-    def _count_subscriptions(self, pubsub, topic_name):
-        count = 0
-        for page in self._paginate(
-            pubsub.projects().topics().subscriptions(), "list", topic=topic_name
+    def _count_subscriptions(self, pubsub, topic_names):
+        """{topic: cantidad de suscripciones}, con la primera página de todos los topics en batch."""
+        counts = dict.fromkeys(topic_names, 0)
+        for topic_name, page in self._batch_paginate(
+            pubsub, pubsub.projects().topics().subscriptions(), "list",
+            {name: {"topic": name} for name in topic_names},
         ):
-            count += len(page.get("subscriptions", []))
-        return count
+            counts[topic_name] += len(page.get("subscriptions", []))
+        return counts
@@ -14,7 +14,7 @@ class RunScanner(GCPBaseScanner):
             run = self._client("run", "v2")
 
             parent = f"projects/{self.project_id}/locations/-"
-            response = run.projects().locations().services().list(parent=parent).execute()
+            response = self._execute(run.projects().locations().services().list(parent=parent))
 
             for service in response.get("services", []):
                 # name: projects/{project}/locations/{location}/services/{service}
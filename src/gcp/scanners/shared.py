@@ -18,26 +18,46 @@ boto3 (un solo SDK, muchos servicios) ya usado para AWS.
 
 import json
 import logging
+import threading
 from datetime import datetime
 
+import google_auth_httplib2
+import httplib2
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from sqlalchemy.dialects.postgresql import insert
+from googleapiclient.errors import HttpError
 
 from src.models.database import db
 from src.models.gcp_account import GCPAccount
 from src.models.gcp_resource_inventory import GCPResourceInventory
+from src.cloud.inventory_writer import InventoryBatchWriter
 
 
 logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/cloud-platform.read-only"]
 
+HTTP_TIMEOUT_SECONDS = 60
+
+# Reintentos de googleapiclient (429 / 5xx con backoff exponencial):
+# importa una vez que varios servicios del proyecto se escanean a la vez.
+NUM_RETRIES = 3
+
+# Requests por BatchHttpRequest. Las APIs aceptan entre 100 y 1000; 50
+# queda debajo del límite de todas las que usan los scanners.
+BATCH_SIZE = 50
+
+
+def _is_retryable(error) -> bool:
+    """429 / 5xx: los mismos que reintenta googleapiclient con num_retries."""
+    return isinstance(error, HttpError) and (error.resp.status == 429 or error.resp.status >= 500)
+
 
 class GCPBaseScanner:
     """
-    Holds GCP credentials + project_id y el helper compartido
-    upsert_resource, usado por todos los scanners de servicios GCP.
+    Holds GCP credentials + project_id y los helpers compartidos
+    (_client, _execute, _paginate, _execute_batch, upsert_resource),
+    usados por todos los scanners de servicios GCP.
     """
 
     def __init__(self, client_id, gcp_account_id):
@@ -57,39 +77,163 @@ class GCPBaseScanner:
             key_info, scopes=SCOPES
         )
 
+        # Un cliente de discovery por API y versión para todo el scan
+        # (antes cada scan_* hacía su propio build(); los 9 scanners sobre
+        # compute v1 lo construían 9 veces).
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+
+        # httplib2.Http no es thread-safe: los clientes se comparten, pero
+        # cada thread ejecuta los requests con su propio Http autorizado.
+        self._thread_http = threading.local()
+
+        # Si está seteada (modo concurrente), upsert_resource encola las
+        # filas acá en vez de escribirlas; el thread que orquesta es el
+        # único que escribe en la DB.
+        self._row_queue = None
+
+        # Upsert multi-fila compartido con AWS/Azure (src/cloud/inventory_writer.py)
+        self._inventory_writer = InventoryBatchWriter(GCPResourceInventory)
+
+    # ------------------------------------------------------------------
+    # CLIENTES Y REQUESTS
+    # ------------------------------------------------------------------
     def _client(self, api_name, api_version):
-        """Construye un cliente REST para una API de Google Cloud dada."""
-        return build(
-            api_name,
-            api_version,
-            credentials=self.credentials,
-            cache_discovery=False,
-        )
+        """Devuelve (construyéndolo una sola vez por scan) el cliente REST de la API."""
+        key = (api_name, api_version)
+        client = self._clients.get(key)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = build(
+                        api_name,
+                        api_version,
+                        credentials=self.credentials,
+                        cache_discovery=False,
+                    )
+                    self._clients[key] = client
+        return client
+
+    def _http(self):
+        http = getattr(self._thread_http, "http", None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+            )
+            self._thread_http.http = http
+        return http
 
-    @staticmethod
-    def _paginate(collection, list_method_name, **params):
+    def _execute(self, request):
+        """Ejecuta un request de discovery con el Http del thread actual."""
+        return request.execute(http=self._http(), num_retries=NUM_RETRIES)
+
+    def _paginate(self, collection, list_method_name, **params):
         """
-        Sigue nextPageToken hasta agotar resultados. Sirve tanto para
+        Sigue nextPageToken hasta agotar resultados, entregando cada
+        página apenas llega (generador: el scanner procesa la primera
+        página mientras todavía no se pidió la segunda). Sirve tanto para
         list() como para aggregatedList() de la API de Compute — ambas
         exponen el método `<list_method_name>_next` generado por
         discovery para paginación.
         """
         method = getattr(collection, list_method_name)
         request = method(**params)
-        responses = []
+        next_method = getattr(collection, f"{list_method_name}_next", None)
 
         while request is not None:
-            response = request.execute()
-            responses.append(response)
+            response = self._execute(request)
+            yield response
 
-            next_method = getattr(collection, f"{list_method_name}_next", None)
             request = (
                 next_method(previous_request=request, previous_response=response)
                 if next_method else None
             )
 
+    # ------------------------------------------------------------------
+    # BATCH
+    # ------------------------------------------------------------------
+    def _execute_batch(self, service, requests_by_key):
+        """
+        Ejecuta requests independientes de una misma API agrupados en
+        BatchHttpRequest (BATCH_SIZE por request HTTP) en vez de uno por
+        uno. Devuelve {key: response}.
+
+        Los sub-requests del batch no pasan por num_retries: los que
+        fallan con 429 / 5xx se reintentan solos vía _execute (con
+        backoff). Cualquier otro error, o un reintento que vuelve a
+        fallar, se relanza igual que si se hubiera ejecutado solo.
+
+        Si la API rechaza el batch entero (no todas lo soportan), ese lote
+        se ejecuta request por request.
+        """
+        responses = {}
+        items = list(requests_by_key.items())
+
+        for start in range(0, len(items), BATCH_SIZE):
+            chunk = items[start:start + BATCH_SIZE]
+            errors = {}
+
+            def callback(request_id, response, exception):
+                if exception is not None:
+                    errors[request_id] = exception
+                else:
+                    responses[chunk[int(request_id)][0]] = response
+
+            batch = service.new_batch_http_request(callback=callback)
+            for index, (_, request) in enumerate(chunk):
+                batch.add(request, request_id=str(index))
+
+            try:
+                batch.execute(http=self._http())
+            except HttpError as e:
+                logger.warning(
+                    f"GCP batch request rejected, executing one by one | "
+                    f"project={self.project_id} | status={e.resp.status}"
+                )
+                for key, request in chunk:
+                    responses[key] = self._execute(request)
+                continue
+
+            for error in errors.values():
+                if not _is_retryable(error):
+                    raise error
+
+            for request_id, error in errors.items():
+                key, request = chunk[int(request_id)]
+                logger.info(
+                    f"GCP batch item failed, retrying alone | "
+                    f"project={self.project_id} | status={error.resp.status}"
+                )
+                responses[key] = self._execute(request)
+
         return responses
 
+    def _batch_paginate(self, service, collection, list_method_name, params_by_key):
+        """
+        Como _paginate, pero para el mismo list() sobre muchos padres
+        (una zona DNS, un topic, una location...): las primeras páginas
+        van juntas por _execute_batch y sólo las siguientes, si las hay,
+        se piden una por una. Genera (key, página).
+        """
+        method = getattr(collection, list_method_name)
+        next_method = getattr(collection, f"{list_method_name}_next", None)
+
+        requests_by_key = {key: method(**params) for key, params in params_by_key.items()}
+        first_pages = self._execute_batch(service, requests_by_key)
+
+        for key, request in requests_by_key.items():
+            response = first_pages[key]
+            while True:
+                yield key, response
+                request = (
+                    next_method(previous_request=request, previous_response=response)
+                    if next_method else None
+                )
+                if request is None:
+                    break
+                response = self._execute(request)
+
     # ------------------------------------------------------------------
     def upsert_resource(
         self,
@@ -103,43 +247,45 @@ class GCPBaseScanner:
     ):
         now = datetime.utcnow()
 
-        stmt = insert(GCPResourceInventory).values(
-            client_id=self.client_id,
-            gcp_account_id=self.gcp_account_id,
-            service_name=service_name,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            region=region,
-            state=state,
-            tags=tags or {},
-            resource_metadata=resource_metadata or {},
-            detected_at=now,
-            last_seen_at=now,
-            is_active=True,
-            created_at=now,
-            updated_at=now
-        )
+        row = {
+            "client_id": self.client_id,
+            "gcp_account_id": self.gcp_account_id,
+            "service_name": service_name,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "region": region,
+            "state": state,
+            "tags": tags or {},
+            "resource_metadata": resource_metadata or {},
+            "detected_at": now,
+            "last_seen_at": now,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
 
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["client_id", "resource_id"],
-            set_={
-                "service_name": service_name,
-                "resource_type": resource_type,
-                "region": region,
-                "state": state,
-                "tags": tags or {},
-                "resource_metadata": resource_metadata or {},
-                "last_seen_at": now,
-                "is_active": True,
-                "updated_at": now
-            }
-        )
+        if self._row_queue is not None:
+            self._row_queue.put(row)
+            return
 
+        self.write_inventory_row(row)
+
+    # ------------------------------------------------------------------
+    def write_inventory_row(self, row):
+        """Acumula la fila; el writer escribe cada INVENTORY_UPSERT_BATCH_SIZE filas."""
+        self._inventory_writer.add(row)
+
+    def flush_inventory(self):
+        """
+        Escribe el batch pendiente y hace commit. Se llama al cerrar cada
+        scan de servicio (también si falló), para conservar las filas ya
+        descubiertas antes del error.
+        """
         try:
-            db.session.execute(stmt)
+            self._inventory_writer.flush()
+            db.session.commit()
         except Exception:
             logger.exception(
-                f"GCP inventory upsert failed | resource={resource_id}"
+                f"GCP inventory flush failed | client_id={self.client_id}"
             )
             db.session.rollback()
-            raise
@@ -22,3 +22,8 @@ from .azure_finding import AzureFinding  # noqa: F401 — registra tabla en SQLA
 from .gcp_account import GCPAccount  # noqa: F401 — registra tabla en SQLAlchemy
 from .gcp_resource_inventory import GCPResourceInventory  # noqa: F401 — registra tabla en SQLAlchemy
 from .gcp_finding import GCPFinding  # noqa: F401 — registra tabla en SQLAlchemy
+from .cloudwatch_metric_series import CloudWatchMetricSeries  # noqa: F401 — registra tabla en SQLAlchemy
+from .audit_job import AuditJob  # noqa: F401 — registra tabla en SQLAlchemy
+from .aws_rollup import AWSInventoryRollup, AWSFindingRollup  # noqa: F401 — registra tabla en SQLAlchemy
+from .report_job import ReportJob, ReportArtifact  # noqa: F401 — registra tabla en SQLAlchemy
+from .notification_outbox import NotificationOutbox  # noqa: F401 — registra tabla en SQLAlchemy
@@ -0,0 +1,74 @@
+"""
+AUDIT JOB MODEL
+===============
+Cola persistente de auditorías (AWS / Azure / GCP).
+
+Las rutas `/audit/run` solo encolan; las ejecuta el worker
+(`scripts/audit_worker.py`), que reclama jobs con
+`SELECT ... FOR UPDATE SKIP LOCKED`. Sobrevive reinicios y se puede
+escalar con más workers en otros hosts.
+
+Estados:
+- queued     → esperando worker (o esperando `run_after` tras un retry)
+- running    → reclamado por un worker (heartbeat_at se actualiza)
+- completed  → terminado OK
+- failed     → agotó los reintentos
+"""
+
+from datetime import datetime
+from src.models.database import db
+
+
+class AuditJob(db.Model):
+    __tablename__ = "audit_jobs"
+
+    id             = db.Column(db.Integer, primary_key=True)
+    client_id      = db.Column(db.Integer, db.ForeignKey("clients.id"), nullable=False, index=True)
+
+    # aws | azure | gcp  +  id en aws_accounts / azure_accounts / gcp_accounts
+    provider       = db.Column(db.String(10), nullable=False)
+    account_id     = db.Column(db.Integer,    nullable=False)
+
+    status         = db.Column(db.String(20), nullable=False, default="queued")
+    attempts       = db.Column(db.Integer,    nullable=False, default=0)
+    max_attempts   = db.Column(db.Integer,    nullable=False, default=3)
+
+    progress       = db.Column(db.Integer,    nullable=False, default=0)   # 0-100
+    stage          = db.Column(db.String(50), nullable=True)
+    error          = db.Column(db.Text,       nullable=True)
+    result         = db.Column(db.JSON,       nullable=True)
+
+    run_after      = db.Column(db.DateTime,   nullable=False, default=datetime.utcnow)
+    locked_by      = db.Column(db.String(100), nullable=True)
+    heartbeat_at   = db.Column(db.DateTime,   nullable=True)
+
+    created_at     = db.Column(db.DateTime,   nullable=False, default=datetime.utcnow)
+    started_at     = db.Column(db.DateTime,   nullable=True)
+    finished_at    = db.Column(db.DateTime,   nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_audit_jobs_claim", "status", "run_after"),
+        db.Index("ix_audit_jobs_account", "provider", "account_id"),
+        # Un solo job activo por cuenta
+        db.Index(
+            "uq_audit_jobs_active_account", "provider", "account_id",
+            unique=True,
+            postgresql_where=db.text("status IN ('queued', 'running')")
+        ),
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id":       self.id,
+            "provider":     self.provider,
+            "account_id":   self.account_id,
+            "status":       self.status,
+            "progress":     self.progress,
+            "stage":        self.stage,
+            "attempts":     self.attempts,
+            "max_attempts": self.max_attempts,
+            "error":        self.error,
+            "created_at":   self.created_at.isoformat() if self.created_at else None,
+            "started_at":   self.started_at.isoformat() if self.started_at else None,
+            "finished_at":  self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -1,5 +1,6 @@
 from src.models.database import db
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.postgresql import TSVECTOR, insert
+from sqlalchemy.orm import deferred
 from datetime import datetime
 
 
@@ -17,6 +18,33 @@ class AWSFinding(db.Model):
             "idx_findings_resource_client_resolved",
             "resource_id", "client_id", "resolved"
         ),
+        # Paginación por cursor (orden por defecto del listado)
+        db.Index(
+            "ix_aws_findings_client_created_keyset",
+            "client_id", db.text("created_at DESC NULLS LAST"), db.text("id DESC")
+        ),
+        # Búsqueda: ILIKE '%x%' usa los trigram, /search usa el tsvector
+        db.Index(
+            "ix_aws_findings_resource_id_trgm", "resource_id",
+            postgresql_using="gin", postgresql_ops={"resource_id": "gin_trgm_ops"}
+        ),
+        db.Index(
+            "ix_aws_findings_message_trgm", "message",
+            postgresql_using="gin", postgresql_ops={"message": "gin_trgm_ops"}
+        ),
+        db.Index(
+            "ix_aws_findings_search_vector", "search_vector",
+            postgresql_using="gin"
+        ),
+        # Filtros de servicio (case-insensitive) y región (prefijo)
+        db.Index(
+            "ix_aws_findings_client_service_lower",
+            "client_id", db.text("lower(aws_service)")
+        ),
+        db.Index(
+            "ix_aws_findings_client_region_prefix", "client_id", "region",
+            postgresql_ops={"region": "varchar_pattern_ops"}
+        ),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -73,6 +101,12 @@ class AWSFinding(db.Model):
         nullable=True
     )
 
+    # ---------------- SEARCH ----------------
+    # Lo mantiene el trigger aws_findings_search_vector_trg (migración
+    # c9e2a5f1d4b7) en cada insert/upsert; la app nunca lo escribe.
+    # deferred: no viaja en cada SELECT del modelo
+    search_vector = deferred(db.Column(TSVECTOR))
+
     # ---------------- TIMESTAMPS ----------------
     detected_at = db.Column(
         db.DateTime,
@@ -139,8 +173,6 @@ class AWSFinding(db.Model):
             }
         )
 
-        result = db.session.execute(stmt)
-
-        db.session.flush()
+        db.session.execute(stmt)
 
         return True
\ No newline at end of file
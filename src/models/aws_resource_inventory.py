@@ -1,3 +1,6 @@
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+
 from src.models.database import db
 
 
@@ -16,6 +19,21 @@ class AWSResourceInventory(db.Model):
             "idx_inventory_client_service", "client_id", "service_name",
             postgresql_where=db.text("is_active = true")
         ),
+        # Paginación por cursor de /api/client/inventory
+        db.Index(
+            "ix_aws_inventory_client_keyset",
+            "client_id", "service_name", "resource_id", "id",
+            postgresql_where=db.text("is_active")
+        ),
+        # Búsqueda (trigram para substring, tsvector para /search)
+        db.Index(
+            "ix_aws_inventory_resource_id_trgm", "resource_id",
+            postgresql_using="gin", postgresql_ops={"resource_id": "gin_trgm_ops"}
+        ),
+        db.Index(
+            "ix_aws_inventory_search_vector", "search_vector",
+            postgresql_using="gin"
+        ),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -65,5 +83,10 @@ class AWSResourceInventory(db.Model):
 
     is_active = db.Column(db.Boolean, default=True)
 
+    # Lo mantiene el trigger aws_resource_inventory_search_vector_trg
+    # (migración c9e2a5f1d4b7) en cada upsert.
+    # deferred: no viaja en cada SELECT del modelo
+    search_vector = deferred(db.Column(TSVECTOR))
+
     created_at = db.Column(db.DateTime)
     updated_at = db.Column(db.DateTime)
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+AWS ROLLUP MODELS
+=================
+Agregados por tenant del inventario activo y de los findings abiertos,
+mantenidos por InventoryRollupService al terminar cada auditoría (y al
+resolver un finding). Los endpoints de inventario / health / breakdown
+por servicio leen de acá en vez de agregar las tablas crudas.
+
+- aws_inventory_rollups: (client, cuenta, servicio, región)
+- aws_finding_rollups:   (client, cuenta, servicio, región, severidad)
+
+Servicio y región son los del inventario: los findings cuentan por cada
+recurso activo al que matchean (mismo join que el resto del dashboard).
+"""
+from datetime import datetime
+from src.models.database import db
+
+
+class AWSInventoryRollup(db.Model):
+    __tablename__ = "aws_inventory_rollups"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    client_id = db.Column(
+        db.Integer,
+        db.ForeignKey("clients.id"),
+        nullable=False
+    )
+
+    aws_account_id = db.Column(
+        db.Integer,
+        db.ForeignKey("aws_accounts.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    service_name = db.Column(db.String(50), nullable=False)
+    region = db.Column(db.String(50), nullable=True)
+
+    # Recursos activos / recursos activos con al menos un finding abierto
+    resource_count = db.Column(db.Integer, nullable=False, default=0)
+    affected_resources = db.Column(db.Integer, nullable=False, default=0)
+
+    refreshed_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow
+    )
+
+    __table_args__ = (
+        db.Index("ix_aws_inventory_rollups_client_account", "client_id", "aws_account_id"),
+    )
+
+
+class AWSFindingRollup(db.Model):
+    __tablename__ = "aws_finding_rollups"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    client_id = db.Column(
+        db.Integer,
+        db.ForeignKey("clients.id"),
+        nullable=False
+    )
+
+    aws_account_id = db.Column(
+        db.Integer,
+        db.ForeignKey("aws_accounts.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    service_name = db.Column(db.String(50), nullable=False)
+    region = db.Column(db.String(50), nullable=True)
+    severity = db.Column(db.String(20), nullable=False)
+
+    open_findings = db.Column(db.Integer, nullable=False, default=0)
+    open_savings = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+    refreshed_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow
+    )
+
+    __table_args__ = (
+        db.Index("ix_aws_finding_rollups_client_account", "client_id", "aws_account_id"),
+    )
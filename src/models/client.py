@@ -84,6 +84,19 @@ class Client(db.Model):
         nullable=True
     )
 
+    # ==========================
+    # DATA VERSION
+    # ==========================
+    # Se incrementa cada vez que cambian los datos del cliente
+    # (auditoría terminada, finding resuelto). Forma parte de la clave
+    # de los reportes cacheados en report_artifacts.
+    data_version = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
     # ==========================
     # AUDIT
     # ==========================
@@ -0,0 +1,50 @@
+"""
+CLOUDWATCH METRIC SERIES MODEL
+==============================
+Datapoints de CloudWatch ya descargados por el rightsizing, por cuenta y
+serie (namespace, métrica, estadística, dimensiones, período).
+
+Cada auditoría solo pide a CloudWatch el tramo posterior al último
+datapoint guardado en vez de re-descargar la ventana completa.
+"""
+from datetime import datetime
+from src.models.database import db
+
+
+class CloudWatchMetricSeries(db.Model):
+    __tablename__ = "cloudwatch_metric_series"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    aws_account_id = db.Column(
+        db.Integer,
+        db.ForeignKey("aws_accounts.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    # sha256 de (region, namespace, metric_name, stat, dimensions, period)
+    series_key = db.Column(db.String(64), nullable=False)
+
+    namespace = db.Column(db.String(255), nullable=False)
+    metric_name = db.Column(db.String(255), nullable=False)
+    stat = db.Column(db.String(30), nullable=False)
+    dimensions = db.Column(db.JSON, nullable=False)
+    period = db.Column(db.Integer, nullable=False)
+
+    # {"2026-10-16T00:00:00": 3.2, ...} — solo períodos completos
+    datapoints = db.Column(db.JSON, nullable=False, default=dict)
+
+    # Fin (exclusivo) del tramo ya consultado: el próximo fetch arranca acá
+    covered_until = db.Column(db.DateTime, nullable=True)
+
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow
+    )
+
+    __table_args__ = (
+        db.UniqueConstraint("aws_account_id", "series_key", name="uq_cw_series_account_key"),
+        db.Index("ix_cw_series_updated_at", "updated_at"),
+    )
@@ -0,0 +1,46 @@
+"""
+NOTIFICATION OUTBOX MODEL
+=========================
+Cola de notificaciones salientes (email / Slack / Teams).
+
+Las rutas, los eventos de usuario y el motor de alertas sólo insertan
+acá (src/services/notification_outbox.py) y siguen; el envío lo hace
+`scripts/notification_worker.py`: emails por una conexión SMTP
+persistente, webhooks con sesiones HTTP keep-alive, con reintentos y
+backoff.
+
+Estados: queued → sending → sent | failed
+"""
+
+from datetime import datetime
+
+from src.models.database import db
+
+
+class NotificationOutbox(db.Model):
+    __tablename__ = "notification_outbox"
+
+    id           = db.Column(db.Integer, primary_key=True)
+
+    channel      = db.Column(db.String(10),  nullable=False)   # email | slack | teams
+    recipient    = db.Column(db.Text,        nullable=False)   # email o URL del webhook
+    subject      = db.Column(db.String(255), nullable=True)
+    body         = db.Column(db.Text,        nullable=True)    # email (texto plano)
+    payload      = db.Column(db.JSON,        nullable=True)    # webhook (JSON)
+    source       = db.Column(db.String(50),  nullable=True)    # alert:<id>, user_event, ...
+
+    status       = db.Column(db.String(20),  nullable=False, default="queued")
+    attempts     = db.Column(db.Integer,     nullable=False, default=0)
+    max_attempts = db.Column(db.Integer,     nullable=False, default=5)
+    error        = db.Column(db.Text,        nullable=True)
+
+    run_after    = db.Column(db.DateTime,    nullable=False, default=datetime.utcnow)
+    locked_by    = db.Column(db.String(100), nullable=True)
+    locked_at    = db.Column(db.DateTime,    nullable=True)
+
+    created_at   = db.Column(db.DateTime,    nullable=False, default=datetime.utcnow)
+    sent_at      = db.Column(db.DateTime,    nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_notification_outbox_claim", "status", "run_after"),
+    )
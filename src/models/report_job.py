@@ -0,0 +1,99 @@
+"""
+REPORT JOB MODELS
+=================
+Generación asíncrona de reportes de cliente (PDF / XLSX).
+
+- report_jobs: cola consumida por `scripts/report_worker.py` (mismo
+  esquema de claim con SKIP LOCKED que audit_jobs). Las rutas sólo
+  encolan; el cliente hace polling y descarga cuando está `completed`.
+- report_artifacts: archivos generados, direccionados por contenido:
+  la clave es el hash de (cliente, cuenta, tipo de reporte, versión de
+  datos). Mientras no haya una auditoría nueva (`clients.data_version`),
+  pedir el mismo reporte devuelve el artefacto guardado sin renderizar.
+
+Estados del job: queued → running → completed | failed
+"""
+
+from datetime import datetime
+
+from sqlalchemy.orm import deferred
+
+from src.models.database import db
+
+
+class ReportJob(db.Model):
+    __tablename__ = "report_jobs"
+
+    id             = db.Column(db.Integer, primary_key=True)
+    client_id      = db.Column(db.Integer, db.ForeignKey("clients.id"), nullable=False, index=True)
+    requested_by   = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    report_type    = db.Column(db.String(30), nullable=False)
+    aws_account_id = db.Column(db.Integer,    nullable=True)   # None = todas las cuentas
+    data_version   = db.Column(db.Integer,    nullable=False)
+    artifact_key   = db.Column(db.String(64), nullable=False)
+
+    status         = db.Column(db.String(20), nullable=False, default="queued")
+    attempts       = db.Column(db.Integer,    nullable=False, default=0)
+    max_attempts   = db.Column(db.Integer,    nullable=False, default=2)
+    error          = db.Column(db.Text,       nullable=True)
+
+    run_after      = db.Column(db.DateTime,   nullable=False, default=datetime.utcnow)
+    locked_by      = db.Column(db.String(100), nullable=True)
+    heartbeat_at   = db.Column(db.DateTime,   nullable=True)
+
+    created_at     = db.Column(db.DateTime,   nullable=False, default=datetime.utcnow)
+    started_at     = db.Column(db.DateTime,   nullable=True)
+    finished_at    = db.Column(db.DateTime,   nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_report_jobs_claim", "status", "run_after"),
+        # Un solo job activo por artefacto: pedidos repetidos lo comparten
+        db.Index(
+            "uq_report_jobs_active_artifact", "artifact_key",
+            unique=True,
+            postgresql_where=db.text("status IN ('queued', 'running')")
+        ),
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id":         self.id,
+            "report_type":    self.report_type,
+            "aws_account_id": self.aws_account_id,
+            "status":         self.status,
+            "attempts":       self.attempts,
+            "error":          self.error,
+            "created_at":     self.created_at.isoformat() if self.created_at else None,
+            "started_at":     self.started_at.isoformat() if self.started_at else None,
+            "finished_at":    self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ReportArtifact(db.Model):
+    __tablename__ = "report_artifacts"
+
+    # sha256 de "client:account:type:data_version"
+    key            = db.Column(db.String(64), primary_key=True)
+
+    client_id      = db.Column(
+        db.Integer,
+        db.ForeignKey("clients.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    aws_account_id = db.Column(db.Integer,    nullable=True)
+    report_type    = db.Column(db.String(30), nullable=False)
+    data_version   = db.Column(db.Integer,    nullable=False)
+
+    mimetype       = db.Column(db.String(100), nullable=False)
+    filename       = db.Column(db.String(150), nullable=False)
+    size_bytes     = db.Column(db.Integer,    nullable=False)
+
+    # deferred: las consultas de estado no traen el archivo
+    content        = deferred(db.Column(db.LargeBinary, nullable=False))
+
+    created_at     = db.Column(db.DateTime,   nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_report_artifacts_client_type", "client_id", "report_type", "aws_account_id"),
+    )
@@ -10,13 +10,14 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import cm
-import matplotlib.pyplot as plt
-import tempfile
+from io import BytesIO
 import os
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from collections import Counter
 
+from src.reports.charts.render import pie_chart_png
+
 
 def build_admin_pdf(stats: dict) -> bytes:
     """
@@ -37,10 +38,10 @@ def build_admin_pdf(stats: dict) -> bytes:
         for c in clients
     )
 
-    buffer = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+    buffer = BytesIO()
 
     doc = SimpleDocTemplate(
-        buffer.name,
+        buffer,
         pagesize=A4,
         rightMargin=36,
         leftMargin=36,
@@ -145,16 +146,9 @@ def build_admin_pdf(stats: dict) -> bytes:
     labels = list(plans_counter.keys())
     values = list(plans_counter.values())
 
-    pie_path = tempfile.NamedTemporaryFile(delete=False, suffix=".png").name
-
-    plt.figure(figsize=(5, 5))
-    plt.pie(values, labels=labels, autopct="%1.1f%%", startangle=90)
-    plt.title("Clientes por plan")
-    plt.axis("equal")
-    plt.savefig(pie_path, bbox_inches="tight")
-    plt.close()
+    pie_png = pie_chart_png(labels, values, title="Clientes por plan")
 
-    story.append(Image(pie_path, width=10 * cm, height=10 * cm))
+    story.append(Image(BytesIO(pie_png), width=10 * cm, height=10 * cm))
     story.append(Spacer(1, 30))
 
     # =====================================================
@@ -198,5 +192,4 @@ def build_admin_pdf(stats: dict) -> bytes:
 
     doc.build(story)
 
-    with open(buffer.name, "rb") as f:
-        return f.read()
+    return buffer.getvalue()
@@ -0,0 +1,68 @@
+"""
+render.py
+---------
+In-memory chart rendering for PDF reports.
+
+- Uses matplotlib's object-oriented API (Figure + Agg canvas) instead of
+  pyplot: no global figure state, so several reports can render charts
+  concurrently from worker threads.
+- Charts are returned as PNG bytes (ReportLab reads them through
+  `Image(BytesIO(png), ...)`); nothing touches the filesystem.
+- Results are memoized on the chart inputs: the same data renders once
+  per process.
+"""
+
+import os
+from functools import lru_cache
+from io import BytesIO
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+DEFAULT_DPI = 100
+
+_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "128"))
+
+
+def _to_png(fig: Figure, **savefig_kwargs) -> bytes:
+    FigureCanvasAgg(fig)
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png", **savefig_kwargs)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _bar_chart(labels: tuple, values: tuple, title: str, ylabel: str,
+               figsize: tuple, dpi: int) -> bytes:
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    ax.bar(labels, values)
+    ax.set_title(title)
+    ax.set_ylabel(ylabel)
+    ax.tick_params(axis="x", labelrotation=25)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _pie_chart(labels: tuple, values: tuple, title: str,
+               figsize: tuple, dpi: int) -> bytes:
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    ax.pie(values, labels=labels, autopct="%1.1f%%", startangle=90)
+    ax.set_title(title)
+    ax.axis("equal")
+    return _to_png(fig, bbox_inches="tight")
+
+
+def bar_chart_png(labels, values, title: str = "", ylabel: str = "",
+                  figsize=(8, 4), dpi: int = DEFAULT_DPI) -> bytes:
+    return _bar_chart(tuple(labels), tuple(values), title, ylabel, tuple(figsize), dpi)
+
+
+def pie_chart_png(labels, values, title: str = "",
+                  figsize=(5, 5), dpi: int = DEFAULT_DPI) -> bytes:
+    return _pie_chart(tuple(labels), tuple(values), title, tuple(figsize), dpi)
@@ -4,47 +4,48 @@ INVENTORY CSV REPORT
 Exporta el inventario completo de recursos AWS en formato CSV.
 Incluye: cuenta, servicio, tipo, recurso, región, estado,
          hallazgos activos, severidad máxima y ahorro estimado.
+
+Se genera en streaming a partir de `iter_inventory_rows()`.
 """
 
-from src.reports.exporters.csv_base import build_csv
+from src.reports.exporters.csv_base import stream_csv
 
 
-def build_inventory_csv(stats: dict) -> bytes:
+HEADERS = [
+    "Cuenta AWS",
+    "Servicio",
+    "Tipo de Recurso",
+    "ID de Recurso",
+    "Región",
+    "Estado",
+    "Con Hallazgos",
+    "Nº Hallazgos",
+    "Severidad Máxima",
+    "Ahorro Estimado (USD/mes)",
+    "Tags",
+    "Detectado el",
+    "Última vez visto",
+]
 
-    resources = stats.get("resources") or []
 
-    headers = [
-        "Cuenta AWS",
-        "Servicio",
-        "Tipo de Recurso",
-        "ID de Recurso",
-        "Región",
-        "Estado",
-        "Con Hallazgos",
-        "Nº Hallazgos",
-        "Severidad Máxima",
-        "Ahorro Estimado (USD/mes)",
-        "Tags",
-        "Detectado el",
-        "Última vez visto",
+def _csv_row(r: dict) -> list:
+    return [
+        r.get("account_name", ""),
+        r.get("service_name", ""),
+        r.get("resource_type", ""),
+        r.get("resource_id", ""),
+        r.get("region", ""),
+        r.get("state", ""),
+        "Sí" if r.get("has_findings") else "No",
+        r.get("findings_count", 0),
+        r.get("max_severity", "—"),
+        f"${r.get('est_savings', 0):.2f}",
+        r.get("tags", "—"),
+        r.get("detected_at", "—"),
+        r.get("last_seen_at", "—"),
     ]
 
-    rows = []
-    for r in resources:
-        rows.append([
-            r.get("account_name", ""),
-            r.get("service_name", ""),
-            r.get("resource_type", ""),
-            r.get("resource_id", ""),
-            r.get("region", ""),
-            r.get("state", ""),
-            "Sí" if r.get("has_findings") else "No",
-            r.get("findings_count", 0),
-            r.get("max_severity", "—"),
-            f"${r.get('est_savings', 0):.2f}",
-            r.get("tags", "—"),
-            r.get("detected_at", "—"),
-            r.get("last_seen_at", "—"),
-        ])
-
-    return build_csv(headers, rows)
+
+def stream_inventory_csv(resources):
+    """Generador de bloques CSV (bytes) para un Response en streaming."""
+    return stream_csv(HEADERS, (_csv_row(r) for r in resources))
@@ -3,135 +3,279 @@ INVENTORY STATS PROVIDER
 ========================
 Reúne todos los datos necesarios para los reportes de Inventario de Recursos:
 CSV y XLSX.
+
+- get_inventory_summary(): totales y distribuciones, calculados con
+  agregaciones SQL (no carga filas).
+- iter_inventory_rows() / iter_flagged_resources(): detalle de recursos
+  leído con `yield_per` (cursor del lado del servidor), para que los
+  exportadores escriban fila a fila y la memoria no crezca con el
+  tamaño del inventario.
 """
 
 from collections import defaultdict
+from itertools import groupby
+
+from sqlalchemy import and_, case, func, select
 
+from src.models.database import db
 from src.models.aws_resource_inventory import AWSResourceInventory
 from src.models.aws_finding import AWSFinding
 from src.models.aws_account import AWSAccount
 from src.services.client_stats_service import get_users_by_client, get_client_plan
 
 
-def get_inventory_stats(client_id: int, aws_account_id: int | None = None) -> dict:
+# Filas por lote del cursor del servidor
+YIELD_PER = 1000
 
-    # ── query base ────────────────────────────────────────────
-    base_q = AWSResourceInventory.query.filter_by(
-        client_id=client_id,
-        is_active=True,
-    )
+
+# ─────────────────────────────────────────────────────────
+# filtros base
+# ─────────────────────────────────────────────────────────
+def _inventory_filter(client_id: int, aws_account_id: int | None) -> list:
+    inv = AWSResourceInventory
+    conditions = [inv.client_id == client_id, inv.is_active.is_(True)]
     if aws_account_id:
-        base_q = base_q.filter_by(aws_account_id=aws_account_id)
+        conditions.append(inv.aws_account_id == aws_account_id)
+    return conditions
 
-    resources = base_q.all()
 
-    # ── findings activos para este cliente ────────────────────
-    f_query = AWSFinding.query.filter_by(client_id=client_id, resolved=False)
+def _findings_filter(client_id: int, aws_account_id: int | None) -> list:
+    conditions = [AWSFinding.client_id == client_id, AWSFinding.resolved.is_(False)]
     if aws_account_id:
-        f_query = f_query.filter_by(aws_account_id=aws_account_id)
+        conditions.append(AWSFinding.aws_account_id == aws_account_id)
+    return conditions
+
+
+def _accounts_map(client_id: int) -> dict[int, str]:
+    return {
+        acc.id: acc.account_name or acc.account_id
+        for acc in AWSAccount.query.filter_by(client_id=client_id, is_active=True).all()
+    }
 
-    active_findings = f_query.all()
 
-    # resource_ids con findings activos → { resource_id: [findings] }
-    findings_by_resource: dict[str, list] = defaultdict(list)
-    for f in active_findings:
-        findings_by_resource[f.resource_id].append(f)
+# ─────────────────────────────────────────────────────────
+# resumen
+# ─────────────────────────────────────────────────────────
+def get_inventory_summary(client_id: int, aws_account_id: int | None = None) -> dict:
 
-    # ── cuentas para label ────────────────────────────────────
-    accounts_map: dict[int, str] = {}
-    for acc in AWSAccount.query.filter_by(client_id=client_id, is_active=True).all():
-        accounts_map[acc.id] = acc.account_name or acc.account_id
+    inv = AWSResourceInventory
+    inventory_filter = _inventory_filter(client_id, aws_account_id)
+    findings_filter = _findings_filter(client_id, aws_account_id)
 
-    # ── agrupar por servicio ──────────────────────────────────
-    by_service: dict[str, int] = defaultdict(int)
-    for r in resources:
-        by_service[r.service_name] += 1
+    def _count_by(column, normalize) -> dict[str, int]:
+        counts: dict[str, int] = defaultdict(int)
+        rows = db.session.execute(
+            select(column, func.count())
+            .where(*inventory_filter)
+            .group_by(column)
+        ).all()
+        for value, count in rows:
+            counts[normalize(value)] += count
+        return dict(sorted(counts.items(), key=lambda x: -x[1]))
 
-    # ── agrupar por región ────────────────────────────────────
-    by_region: dict[str, int] = defaultdict(int)
-    for r in resources:
-        key = r.region or "Sin región"
-        by_region[key] += 1
+    by_service = _count_by(inv.service_name, lambda v: v)
+    by_region = _count_by(inv.region, lambda v: v or "Sin región")
+    by_state = _count_by(inv.state, lambda v: (v or "unknown").lower())
 
-    # ── agrupar por estado ────────────────────────────────────
-    by_state: dict[str, int] = defaultdict(int)
-    for r in resources:
-        key = (r.state or "unknown").lower()
-        by_state[key] += 1
+    total = sum(by_service.values())
 
     # ── con / sin hallazgos ───────────────────────────────────
-    with_findings    = sum(1 for r in resources if r.resource_id in findings_by_resource)
-    without_findings = len(resources) - with_findings
+    with_findings = db.session.execute(
+        select(func.count())
+        .select_from(inv)
+        .where(
+            *inventory_filter,
+            inv.resource_id.in_(select(AWSFinding.resource_id).where(*findings_filter))
+        )
+    ).scalar() or 0
 
-    # ── ahorros potenciales totales ───────────────────────────
-    total_savings = sum(
-        float(f.estimated_monthly_savings or 0)
-        for f in active_findings
-    )
+    # ── findings activos y ahorro potencial ───────────────────
+    active_findings_count, total_savings = db.session.execute(
+        select(
+            func.count(AWSFinding.id),
+            func.coalesce(func.sum(AWSFinding.estimated_monthly_savings), 0)
+        )
+        .where(*findings_filter)
+    ).one()
 
-    # ── detalle completo de recursos ─────────────────────────
-    resource_rows = []
-    for r in resources:
-        flist = findings_by_resource.get(r.resource_id, [])
-        max_sev = _max_severity(flist)
-        est_sav = sum(float(f.estimated_monthly_savings or 0) for f in flist)
-
-        resource_rows.append({
-            "account_name":   accounts_map.get(r.aws_account_id, str(r.aws_account_id)),
-            "service_name":   r.service_name,
-            "resource_type":  r.resource_type,
-            "resource_id":    r.resource_id,
-            "region":         r.region or "—",
-            "state":          r.state or "unknown",
-            "tags":           _fmt_tags(r.tags),
-            "metadata":       r.resource_metadata or {},
-            "has_findings":   len(flist) > 0,
-            "findings_count": len(flist),
-            "max_severity":   max_sev,
-            "est_savings":    round(est_sav, 2),
-            "detected_at":    (r.detected_at.strftime("%Y-%m-%d") if r.detected_at else "—"),
-            "last_seen_at":   (r.last_seen_at.strftime("%Y-%m-%d") if r.last_seen_at else "—"),
-            "findings":       [
-                {
-                    "type":     f.finding_type,
-                    "severity": f.severity,
-                    "message":  f.message,
-                    "savings":  float(f.estimated_monthly_savings or 0),
-                }
-                for f in flist
-            ],
-        })
-
-    # ordena: primero con findings, luego por servicio
-    resource_rows.sort(key=lambda x: (not x["has_findings"], x["service_name"]))
+    accounts_map = _accounts_map(client_id)
 
     return {
         "plan":            get_client_plan(client_id) or "Sin plan activo",
         "user_count":      get_users_by_client(client_id),
         "account_count":   len(accounts_map),
         "account_label":   accounts_map.get(aws_account_id, "Todas las cuentas") if aws_account_id else "Todas las cuentas",
-        "total":           len(resources),
+        "total":           total,
         "with_findings":   with_findings,
-        "without_findings": without_findings,
-        "active_findings_count": len(active_findings),
-        "total_savings":   round(total_savings, 2),
-        "by_service":      dict(sorted(by_service.items(), key=lambda x: -x[1])),
-        "by_region":       dict(sorted(by_region.items(), key=lambda x: -x[1])),
-        "by_state":        dict(sorted(by_state.items(), key=lambda x: -x[1])),
-        "resources":       resource_rows,
+        "without_findings": total - with_findings,
+        "active_findings_count": active_findings_count,
+        "total_savings":   round(float(total_savings), 2),
+        "by_service":      by_service,
+        "by_region":       by_region,
+        "by_state":        by_state,
+    }
+
+
+# ─────────────────────────────────────────────────────────
+# detalle de recursos (streaming)
+# ─────────────────────────────────────────────────────────
+_RESOURCE_COLUMNS = (
+    AWSResourceInventory.id,
+    AWSResourceInventory.aws_account_id,
+    AWSResourceInventory.service_name,
+    AWSResourceInventory.resource_type,
+    AWSResourceInventory.resource_id,
+    AWSResourceInventory.region,
+    AWSResourceInventory.state,
+    AWSResourceInventory.tags,
+    AWSResourceInventory.detected_at,
+    AWSResourceInventory.last_seen_at,
+)
+
+# Orden del índice ix_aws_inventory_client_keyset: sin sort en Postgres
+_RESOURCE_ORDER = (
+    AWSResourceInventory.service_name,
+    AWSResourceInventory.resource_id,
+    AWSResourceInventory.id,
+)
+
+
+def _resource_row(r, accounts_map: dict, findings_count: int,
+                  max_severity: str, est_savings: float) -> dict:
+    return {
+        "account_name":   accounts_map.get(r.aws_account_id, str(r.aws_account_id)),
+        "service_name":   r.service_name,
+        "resource_type":  r.resource_type,
+        "resource_id":    r.resource_id,
+        "region":         r.region or "—",
+        "state":          r.state or "unknown",
+        "tags":           _fmt_tags(r.tags),
+        "has_findings":   findings_count > 0,
+        "findings_count": findings_count,
+        "max_severity":   max_severity,
+        "est_savings":    round(est_savings, 2),
+        "detected_at":    (r.detected_at.strftime("%Y-%m-%d") if r.detected_at else "—"),
+        "last_seen_at":   (r.last_seen_at.strftime("%Y-%m-%d") if r.last_seen_at else "—"),
     }
 
 
+def iter_inventory_rows(client_id: int, aws_account_id: int | None = None):
+    """
+    Recursos activos como dicts, primero los que tienen findings y luego
+    el resto, cada grupo por servicio. Dos pasadas sobre el índice en vez
+    de ordenar todo el inventario.
+    """
+    inv = AWSResourceInventory
+    inventory_filter = _inventory_filter(client_id, aws_account_id)
+    findings_filter = _findings_filter(client_id, aws_account_id)
+    accounts_map = _accounts_map(client_id)
+
+    sev_rank = case(_SEV_ORDER, value=func.upper(AWSFinding.severity), else_=0)
+
+    per_resource = (
+        select(
+            AWSFinding.resource_id,
+            func.count(AWSFinding.id).label("findings_count"),
+            func.max(sev_rank).label("severity_rank"),
+            func.max(func.upper(AWSFinding.severity)).label("any_severity"),
+            func.coalesce(func.sum(AWSFinding.estimated_monthly_savings), 0).label("est_savings"),
+        )
+        .where(*findings_filter)
+        .group_by(AWSFinding.resource_id)
+        .subquery()
+    )
+
+    flagged = db.session.execute(
+        select(
+            *_RESOURCE_COLUMNS,
+            per_resource.c.findings_count,
+            per_resource.c.severity_rank,
+            per_resource.c.any_severity,
+            per_resource.c.est_savings,
+        )
+        .join(per_resource, per_resource.c.resource_id == inv.resource_id)
+        .where(*inventory_filter)
+        .order_by(*_RESOURCE_ORDER)
+        .execution_options(yield_per=YIELD_PER)
+    )
+    for r in flagged:
+        max_sev = _SEV_NAMES.get(r.severity_rank) or r.any_severity
+        yield _resource_row(r, accounts_map, r.findings_count, max_sev, float(r.est_savings))
+
+    clean = db.session.execute(
+        select(*_RESOURCE_COLUMNS)
+        .where(
+            *inventory_filter,
+            inv.resource_id.not_in(select(AWSFinding.resource_id).where(*findings_filter))
+        )
+        .order_by(*_RESOURCE_ORDER)
+        .execution_options(yield_per=YIELD_PER)
+    )
+    for r in clean:
+        yield _resource_row(r, accounts_map, 0, "—", 0.0)
+
+
+def iter_flagged_resources(client_id: int, aws_account_id: int | None = None):
+    """
+    Recursos con findings activos, cada uno con su lista `findings`.
+    Se lee un join recurso × finding ordenado por recurso y se agrupa al
+    vuelo: en memoria sólo vive el recurso actual.
+    """
+    inv = AWSResourceInventory
+    accounts_map = _accounts_map(client_id)
+
+    result = db.session.execute(
+        select(
+            *_RESOURCE_COLUMNS,
+            AWSFinding.finding_type,
+            AWSFinding.severity,
+            AWSFinding.message,
+            AWSFinding.estimated_monthly_savings,
+        )
+        .join(
+            AWSFinding,
+            and_(
+                AWSFinding.resource_id == inv.resource_id,
+                *_findings_filter(client_id, aws_account_id)
+            )
+        )
+        .where(*_inventory_filter(client_id, aws_account_id))
+        .order_by(*_RESOURCE_ORDER, AWSFinding.id)
+        .execution_options(yield_per=YIELD_PER)
+    )
+
+    for _, group in groupby(result, key=lambda r: r.id):
+        group = list(group)
+        findings = [
+            {
+                "type":     r.finding_type,
+                "severity": r.severity,
+                "message":  r.message,
+                "savings":  float(r.estimated_monthly_savings or 0),
+            }
+            for r in group
+        ]
+        row = _resource_row(
+            group[0], accounts_map,
+            findings_count=len(findings),
+            max_severity=_max_severity(findings),
+            est_savings=sum(f["savings"] for f in findings),
+        )
+        row["findings"] = findings
+        yield row
+
+
 # ─────────────────────────────────────────────────────────
 # helpers
 # ─────────────────────────────────────────────────────────
 _SEV_ORDER = {"CRITICAL": 4, "HIGH": 3, "MEDIUM": 2, "LOW": 1}
+_SEV_NAMES = {rank: name for name, rank in _SEV_ORDER.items()}
 
 
 def _max_severity(findings: list) -> str:
     if not findings:
         return "—"
-    return max(findings, key=lambda f: _SEV_ORDER.get(f.severity.upper(), 0)).severity.upper()
+    return max(findings, key=lambda f: _SEV_ORDER.get(f["severity"].upper(), 0))["severity"].upper()
 
 
 def _fmt_tags(tags) -> str:
@@ -1,12 +1,14 @@
 """Hoja de recursos con hallazgos."""
 
-from openpyxl.styles import Alignment
-
 from .styles import TITLE_FONT, SUB_FONT, _fill
-from .helpers import _set_col_widths, _write_header_row, _write_data_row, _severity_fill
+from .helpers import (
+    RowWriter, _set_col_widths, _write_title,
+    _write_header_row, _write_data_row, _severity_fill,
+)
 
 
-def build_findings_sheet(wb, *, generated: str, total_savings: float, resources: list):
+def build_findings_sheet(wb, *, generated: str, with_findings: int,
+                         total_savings: float, flagged_resources):
     ws = wb.create_sheet("Con Hallazgos")
     ws.sheet_view.showGridLines = False
     _set_col_widths(ws, [
@@ -14,40 +16,33 @@ def build_findings_sheet(wb, *, generated: str, total_savings: float, resources:
         (5, 16), (6, 13), (7, 11), (8, 16),
         (9, 22), (10, 18), (11, 48),
     ])
+    ws.freeze_panes = "A5"
 
-    ws.merge_cells("A1:K1")
-    ws["A1"] = "Recursos con Hallazgos Activos"
-    ws["A1"].font = TITLE_FONT
-    ws["A1"].alignment = Alignment(horizontal="left", vertical="center")
-    ws.row_dimensions[1].height = 28
-
-    flagged = [r for r in resources if r.get("has_findings")]
-
-    ws.merge_cells("A2:K2")
-    ws["A2"] = (
+    rw = RowWriter(ws)
+    _write_title(rw, "Recursos con Hallazgos Activos", TITLE_FONT,
+                 merge_to="K", height=28)
+    _write_title(rw, (
         f"Generado: {generated}  ·  "
-        f"{len(flagged)} recursos con hallazgos activos  ·  "
+        f"{with_findings} recursos con hallazgos activos  ·  "
         f"Ahorro potencial total: USD ${total_savings:,.2f}/mes"
-    )
-    ws["A2"].font = SUB_FONT
-    ws.row_dimensions[2].height = 14
+    ), SUB_FONT, merge_to="K", height=14)
+    rw.blank()
 
     cols = [
         "Cuenta AWS", "Servicio", "Tipo", "ID de Recurso",
         "Región", "Estado", "Nº Hallazgos", "Ahorro Est. (USD/mes)",
         "Tipo de Finding", "Severidad", "Descripción",
     ]
-    _write_header_row(ws, 4, cols, fill=_fill("DC2626"))
-    ws.freeze_panes = "A5"
+    _write_header_row(rw, cols, fill=_fill("DC2626"))
 
-    data_row = 5
-    for r in flagged:
+    for r in flagged_resources:
         findings = r.get("findings", [])
         if not findings:
             continue
         for j, f in enumerate(findings):
             sev = f.get("severity", "—").upper()
-            _write_data_row(ws, data_row, [
+            data_row = rw.row + 1
+            _write_data_row(rw, [
                 r.get("account_name", "")           if j == 0 else "",
                 r.get("service_name", "")           if j == 0 else "",
                 r.get("resource_type", "")          if j == 0 else "",
@@ -63,5 +58,3 @@ def build_findings_sheet(wb, *, generated: str, total_savings: float, resources:
                wrap_cols={11},
                row_h=22,
                color_map={10: _severity_fill(sev)})
-            data_row += 1
-
@@ -1,8 +1,13 @@
 """
 Helper functions for the inventory XLSX report.
-Column-width setter, header/data row writers, KPI block, and fill selectors.
+Column-width setter, row writer, header/data row writers, KPI block, and fill selectors.
+
+The workbook is built in openpyxl `write_only` mode: rows can only be
+appended in order, so sheets write through a RowWriter instead of
+addressing cells with ws.cell()/ws["A1"].
 """
 
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 
@@ -13,71 +18,142 @@ from .styles import (
 )
 
 
+_HDR_ALIGN    = Alignment(horizontal="center", vertical="center", wrap_text=True)
+_CENTER_ALIGN = Alignment(horizontal="center", vertical="center")
+_LEFT_ALIGN   = Alignment(horizontal="left", vertical="center")
+_DATA_ALIGN   = Alignment(vertical="center")
+_WRAP_ALIGN   = Alignment(vertical="center", wrap_text=True)
+
+
 # ─────────────────────────────────────────────────────────
 # LAYOUT
 # ─────────────────────────────────────────────────────────
 
 def _set_col_widths(ws, widths: list[tuple[int, float]]):
+    """Must run before the first row is appended."""
     for col_idx, w in widths:
         ws.column_dimensions[get_column_letter(col_idx)].width = w
 
 
+def _merge(ws, ref: str):
+    """write_only sheets have no merge_cells(); ranges are written on close."""
+    ws.merged_cells.add(ref)
+
+
+class RowWriter:
+    """Appends rows in order and keeps track of the current row number."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.row = 0
+
+    def append(self, cells: list, height: float | None = None) -> int:
+        self.row += 1
+        if height:
+            self.ws.row_dimensions[self.row].height = height
+        self.ws.append(cells)
+        # Already serialized: drop it so long sheets do not keep one
+        # RowDimension per row in memory
+        self.ws.row_dimensions.pop(self.row, None)
+        return self.row
+
+    def blank(self, count: int = 1):
+        for _ in range(count):
+            self.append([])
+
+
+def _cell(ws, value=None, *, font=None, fill=None, border=None, alignment=None) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if border is not None:
+        cell.border = border
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
+
+def _place(cells: dict[int, WriteOnlyCell]) -> list:
+    """{column: cell} -> row list with None in the gaps (1-based columns)."""
+    row = [None] * max(cells)
+    for col, cell in cells.items():
+        row[col - 1] = cell
+    return row
+
+
+def _write_title(rw: RowWriter, text: str, font, *, col: int = 1,
+                 merge_to: str, height: float | None = None):
+    ws = rw.ws
+    row = rw.row + 1
+    rw.append(_place({col: _cell(ws, text, font=font, alignment=_LEFT_ALIGN)}), height=height)
+    _merge(ws, f"{get_column_letter(col)}{row}:{merge_to}{row}")
+
+
 # ─────────────────────────────────────────────────────────
 # ROW WRITERS
 # ─────────────────────────────────────────────────────────
 
-def _write_header_row(ws, row: int, labels: list[str], fill=None):
+def _write_header_row(rw: RowWriter, labels: list[str], fill=None):
     f = fill or DARK_FILL
-    for c, label in enumerate(labels, 1):
-        cell = ws.cell(row=row, column=c, value=label)
-        cell.font = HDR_FONT
-        cell.fill = f
-        cell.border = THIN
-        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    ws.row_dimensions[row].height = 20
+    rw.append([
+        _cell(rw.ws, label, font=HDR_FONT, fill=f, border=THIN, alignment=_HDR_ALIGN)
+        for label in labels
+    ], height=20)
 
 
-def _write_data_row(ws, row: int, values: list, alt: bool = False,
+def _write_data_row(rw: RowWriter, values: list, alt: bool = False,
                     wrap_cols: set | None = None, row_h: int = 18,
-                    color_map: dict | None = None):
+                    color_map: dict | None = None, font=None):
     bg = ALT_FILL if alt else WHITE_FILL
-    for c, val in enumerate(values, 1):
-        cell = ws.cell(row=row, column=c, value=val)
-        cell.font = VALUE_FONT
-        cell.fill = color_map.get(c, bg) if color_map else bg
-        cell.border = THIN
-        cell.alignment = Alignment(
-            vertical="center",
-            wrap_text=(wrap_cols is not None and c in wrap_cols),
+    rw.append([
+        _cell(
+            rw.ws, val,
+            font=font or VALUE_FONT,
+            fill=color_map.get(c, bg) if color_map else bg,
+            border=THIN,
+            alignment=_WRAP_ALIGN if (wrap_cols is not None and c in wrap_cols) else _DATA_ALIGN,
         )
-    ws.row_dimensions[row].height = row_h
+        for c, val in enumerate(values, 1)
+    ], height=row_h)
 
 
 # ─────────────────────────────────────────────────────────
 # KPI BLOCK
 # ─────────────────────────────────────────────────────────
 
-def _kpi_block(ws, start_row: int, start_col: int, label: str, value: str,
-               note: str, fill: PatternFill, val_color: str = "1D4ED8"):
-    """Escribe un bloque KPI de 3 filas × 1 columna."""
-    r = start_row
-    c = start_col
-
-    lbl_cell  = ws.cell(row=r,   column=c, value=label)
-    val_cell  = ws.cell(row=r+1, column=c, value=value)
-    note_cell = ws.cell(row=r+2, column=c, value=note)
-
-    lbl_cell.font  = Font(size=8, color="64748B")
-    val_cell.font  = Font(bold=True, size=14, color=val_color)
-    note_cell.font = Font(size=7, color="94A3B8")
-
-    for cell in (lbl_cell, val_cell, note_cell):
-        cell.fill = fill
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    ws.row_dimensions[r].height   = 14
-    ws.row_dimensions[r+1].height = 22
-    ws.row_dimensions[r+2].height = 13
+def _write_kpi_band(rw: RowWriter, blocks: list[tuple]):
+    """
+    Escribe una franja de bloques KPI de 3 filas, cada bloque combinado
+    sobre 2 columnas.
+
+    :param blocks: (col, label, value, note, fill, val_color)
+    """
+    ws = rw.ws
+    label_font = Font(size=8, color="64748B")
+    note_font  = Font(size=7, color="94A3B8")
+
+    rows = [{}, {}, {}]
+    for col, label, value, note, fill, val_color in blocks:
+        texts = (
+            (label, label_font),
+            (value, Font(bold=True, size=14, color=val_color)),
+            (note, note_font),
+        )
+        for r, (text, font) in enumerate(texts):
+            rows[r][col] = _cell(ws, text, font=font, fill=fill, border=THIN,
+                                 alignment=_CENTER_ALIGN)
+            rows[r][col + 1] = _cell(ws, fill=fill, border=THIN)
+
+    start = rw.row + 1
+    for cells, height in zip(rows, (14, 22, 13)):
+        rw.append(_place(cells), height=height)
+
+    for col, *_ in blocks:
+        first, last = get_column_letter(col), get_column_letter(col + 1)
+        for r in range(start, start + 3):
+            _merge(ws, f"{first}{r}:{last}{r}")
 
 
 # ─────────────────────────────────────────────────────────
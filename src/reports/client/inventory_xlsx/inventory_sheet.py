@@ -1,40 +1,36 @@
 """Hoja de inventario completo."""
 
-from openpyxl.styles import Alignment
-
 from .styles import TITLE_FONT, SUB_FONT, _fill
-from .helpers import _set_col_widths, _write_header_row, _write_data_row, _severity_fill, _state_fill
+from .helpers import (
+    RowWriter, _set_col_widths, _write_title,
+    _write_header_row, _write_data_row, _severity_fill, _state_fill,
+)
 
 
-def build_inventory_sheet(wb, *, generated: str, total: int, resources: list):
+def build_inventory_sheet(wb, *, generated: str, total: int, resources):
     ws = wb.create_sheet("Inventario Completo")
     ws.sheet_view.showGridLines = False
     _set_col_widths(ws, [
         (1, 24), (2, 16), (3, 20), (4, 38), (5, 18),
         (6, 14), (7, 13), (8, 11), (9, 13), (10, 18), (11, 36), (12, 14), (13, 14),
     ])
+    ws.freeze_panes = "A5"
 
-    ws.merge_cells("A1:M1")
-    ws["A1"] = "Inventario Completo de Recursos AWS"
-    ws["A1"].font = TITLE_FONT
-    ws["A1"].alignment = Alignment(horizontal="left", vertical="center")
-    ws.row_dimensions[1].height = 28
-
-    ws.merge_cells("A2:M2")
-    ws["A2"] = f"Generado: {generated}  ·  Total recursos activos: {total}"
-    ws["A2"].font = SUB_FONT
-    ws.row_dimensions[2].height = 14
+    rw = RowWriter(ws)
+    _write_title(rw, "Inventario Completo de Recursos AWS", TITLE_FONT,
+                 merge_to="M", height=28)
+    _write_title(rw, f"Generado: {generated}  ·  Total recursos activos: {total}", SUB_FONT,
+                 merge_to="M", height=14)
+    rw.blank()
 
     cols = [
         "Cuenta AWS", "Servicio", "Tipo de Recurso", "ID de Recurso",
         "Región", "Estado", "Con Hallazgos", "Nº Hallazgos",
         "Sev. Máx.", "Ahorro Est. (USD/mes)", "Tags", "Detectado", "Última vez visto",
     ]
-    _write_header_row(ws, 4, cols)
-    ws.freeze_panes = "A5"
+    _write_header_row(rw, cols)
 
     for i, r in enumerate(resources):
-        row   = 5 + i
         has_f = r.get("has_findings", False)
         state = r.get("state", "unknown")
         sev   = r.get("max_severity", "—")
@@ -45,7 +41,7 @@ def build_inventory_sheet(wb, *, generated: str, total: int, resources: list):
             color_map[9] = _severity_fill(sev)
         color_map[6] = _state_fill(state)
 
-        _write_data_row(ws, row, [
+        _write_data_row(rw, [
             r.get("account_name", ""),
             r.get("service_name", ""),
             r.get("resource_type", ""),
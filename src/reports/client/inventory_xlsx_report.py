@@ -5,14 +5,18 @@ Thin orchestrator.  All logic lives in the inventory_xlsx sub-package:
   · inventory_xlsx/styles.py   — fill/font/border constants
   · inventory_xlsx/helpers.py  — row writers, KPI block, conditional fills
   · inventory_xlsx/sheets.py   — one builder function per worksheet
+
+The workbook is written in openpyxl `write_only` mode (rows go straight
+to temp files as they are appended) and saved to a spooled temp file,
+so memory stays flat regardless of inventory size.
 """
 
-from io import BytesIO
 from datetime import datetime
 
 import pytz
 from openpyxl import Workbook
 
+from src.reports.exporters.xlsx_base import spool_workbook
 from .inventory_xlsx.sheets import (
     build_summary_sheet,
     build_inventory_sheet,
@@ -22,11 +26,16 @@ from .inventory_xlsx.sheets import (
 )
 
 
-def build_inventory_xlsx(stats: dict) -> bytes:
+def build_inventory_xlsx(stats: dict, resources, flagged_resources):
+    """
+    :param stats: resumen de get_inventory_summary()
+    :param resources: iterable de recursos (iter_inventory_rows)
+    :param flagged_resources: iterable de recursos con findings (iter_flagged_resources)
+    :return: SpooledTemporaryFile con el XLSX; enviarlo con iter_spooled()
+    """
     chile_tz  = pytz.timezone("America/Santiago")
     generated = datetime.now(chile_tz).strftime("%d/%m/%Y %H:%M CLT")
 
-    resources      = stats.get("resources", [])
     by_service     = stats.get("by_service", {})
     by_region      = stats.get("by_region", {})
     by_state       = stats.get("by_state", {})
@@ -40,8 +49,8 @@ def build_inventory_xlsx(stats: dict) -> bytes:
     acc_count      = stats.get("account_count", 0)
     acc_label      = stats.get("account_label", "Todas las cuentas")
 
-    wb  = Workbook()
-    ws1 = wb.active
+    wb  = Workbook(write_only=True)
+    ws1 = wb.create_sheet()
 
     build_summary_sheet(
         ws1,
@@ -51,13 +60,9 @@ def build_inventory_xlsx(stats: dict) -> bytes:
         by_service=by_service, by_state=by_state, by_region=by_region,
     )
     build_inventory_sheet(wb, generated=generated, total=total, resources=resources)
-    build_service_sheet(wb, generated=generated, total=total,
-                        by_service=by_service, resources=resources)
+    build_service_sheet(wb, generated=generated, total=total, by_service=by_service)
     build_region_sheet(wb, generated=generated, total=total, by_region=by_region)
-    build_findings_sheet(wb, generated=generated, total_savings=total_savings,
-                         resources=resources)
+    build_findings_sheet(wb, generated=generated, with_findings=with_f,
+                         total_savings=total_savings, flagged_resources=flagged_resources)
 
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    return buffer.getvalue()
+    return spool_workbook(wb)
@@ -0,0 +1,101 @@
+"""
+CLIENT REPORT REGISTRY
+======================
+Tipos de reporte que se pueden generar como job (ReportJobService) o
+servir desde el cache de artefactos. Cada tipo define cómo renderizarlo
+y con qué mimetype / nombre de archivo se descarga.
+
+render(client_id, aws_account_id) -> bytes
+"""
+
+from src.reports.client.client_stats_provider import get_client_stats
+from src.reports.client.client_pdf_report import build_client_pdf
+from src.reports.client.client_xlsx_report import build_client_xlsx
+from src.reports.client.executive_pdf_report import build_executive_pdf
+from src.reports.client.cost_pdf_report import build_cost_pdf
+from src.reports.client.cost_xlsx_report import build_cost_xlsx
+from src.reports.client.risk import build_risk_pdf
+from src.reports.client.risk_xlsx_report import build_risk_xlsx
+from src.reports.client.inventory_stats_provider import (
+    get_inventory_summary,
+    iter_inventory_rows,
+    iter_flagged_resources,
+)
+from src.reports.client.inventory_xlsx_report import build_inventory_xlsx
+
+
+PDF_MIMETYPE = "application/pdf"
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _render_client_pdf(client_id, aws_account_id):
+    return build_client_pdf(get_client_stats(client_id))
+
+
+def _render_client_xlsx(client_id, aws_account_id):
+    return build_client_xlsx(get_client_stats(client_id))
+
+
+def _render_inventory_xlsx(client_id, aws_account_id):
+    xlsx_file = build_inventory_xlsx(
+        get_inventory_summary(client_id, aws_account_id),
+        iter_inventory_rows(client_id, aws_account_id),
+        iter_flagged_resources(client_id, aws_account_id),
+    )
+    try:
+        return xlsx_file.read()
+    finally:
+        xlsx_file.close()
+
+
+REPORT_TYPES = {
+    "client_pdf": {
+        "render": _render_client_pdf,
+        "mimetype": PDF_MIMETYPE,
+        "filename": "finopslatam_client_report.pdf",
+        # Reporte de todo el cliente: ignora la cuenta
+        "per_account": False,
+    },
+    "client_xlsx": {
+        "render": _render_client_xlsx,
+        "mimetype": XLSX_MIMETYPE,
+        "filename": "findings.xlsx",
+        "per_account": False,
+    },
+    "executive_pdf": {
+        "render": build_executive_pdf,
+        "mimetype": PDF_MIMETYPE,
+        "filename": "resumen-ejecutivo-finops.pdf",
+        "per_account": True,
+    },
+    "costs_pdf": {
+        "render": build_cost_pdf,
+        "mimetype": PDF_MIMETYPE,
+        "filename": "reporte-costos-finops.pdf",
+        "per_account": True,
+    },
+    "costs_xlsx": {
+        "render": build_cost_xlsx,
+        "mimetype": XLSX_MIMETYPE,
+        "filename": "reporte-costos-finops.xlsx",
+        "per_account": True,
+    },
+    "risk_pdf": {
+        "render": build_risk_pdf,
+        "mimetype": PDF_MIMETYPE,
+        "filename": "reporte-riesgo-compliance-finops.pdf",
+        "per_account": True,
+    },
+    "risk_xlsx": {
+        "render": build_risk_xlsx,
+        "mimetype": XLSX_MIMETYPE,
+        "filename": "reporte-riesgo-compliance-finops.xlsx",
+        "per_account": True,
+    },
+    "inventory_xlsx": {
+        "render": _render_inventory_xlsx,
+        "mimetype": XLSX_MIMETYPE,
+        "filename": "inventario-recursos-aws.xlsx",
+        "per_account": True,
+    },
+}
@@ -28,3 +28,27 @@ def build_csv(headers: list, rows: list) -> bytes:
         writer.writerow(row)
 
     return output.getvalue().encode("utf-8")
+
+
+def stream_csv(headers: list, rows, chunk_rows: int = 500):
+    """
+    Versión en streaming de build_csv: genera el CSV por bloques de
+    `chunk_rows` filas, para devolverlo en un Response sin armar el
+    archivo completo en memoria.
+
+    :param headers: Lista de nombres de columnas
+    :param rows: Iterable de filas (puede ser un generador)
+    :return: Generador de bloques CSV en bytes (UTF-8)
+    """
+    output = StringIO()
+    writer = csv.writer(output)
+
+    writer.writerow(headers)
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % chunk_rows == 0:
+            yield output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate(0)
+
+    yield output.getvalue().encode("utf-8")
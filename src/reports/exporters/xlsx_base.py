@@ -10,6 +10,12 @@ Este módulo NO contiene lógica de negocio.
 
 from openpyxl import Workbook
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
+
+
+# Hasta este tamaño el archivo queda en memoria; sobre eso va a disco
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
 
 
 def build_xlsx(sheet_name: str, headers: list, rows: list) -> bytes:
@@ -38,3 +44,32 @@ def build_xlsx(sheet_name: str, headers: list, rows: list) -> bytes:
     buffer.seek(0)
 
     return buffer.read()
+
+
+def spool_workbook(wb: Workbook) -> SpooledTemporaryFile:
+    """
+    Guarda el workbook en un archivo temporal "spooled" (memoria hasta
+    SPOOL_MAX_SIZE, disco después) en vez de un BytesIO. Pensado para
+    workbooks `write_only`, cuyas hojas ya se escriben a disco fila a fila.
+
+    :return: Archivo posicionado al inicio; cerrarlo con iter_spooled()
+    """
+    tmp = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    wb.save(tmp)
+    tmp.seek(0)
+    return tmp
+
+
+def iter_spooled(tmp, chunk_size: int = CHUNK_SIZE):
+    """
+    Generador de bloques para un Response en streaming. Cierra (y borra)
+    el archivo temporal al terminar o si el cliente corta la descarga.
+    """
+    try:
+        while True:
+            chunk = tmp.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        tmp.close()
@@ -1,15 +1,11 @@
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required
 
-from concurrent.futures import ThreadPoolExecutor
 import logging
-from datetime import datetime
 
 from src.auth.decorators import require_client_user_role
-from src.models.database import db
 from src.models.aws_account import AWSAccount
-from src.aws.finops_auditor import FinOpsAuditor
-from src.services.cost_explorer_cache_service import CostExplorerCacheService
+from src.services.audit_job_service import AuditJobService
 
 
 client_audit_bp = Blueprint(
@@ -20,8 +16,6 @@ client_audit_bp = Blueprint(
 
 logger = logging.getLogger(__name__)
 
-audit_executor = ThreadPoolExecutor(max_workers=5)
-
 
 # =====================================================
 # RUN AUDIT
@@ -40,87 +34,18 @@ def run_client_audit(user):
     if not aws_accounts:
         return jsonify({"error": "No active AWS accounts found"}), 404
 
-    # Evitar ejecución simultánea
-    accounts_to_scan = []
-
-    for account in aws_accounts:
-
-        if account.audit_status == "running":
-            continue
-
-        account.audit_status = "running"
-        account.audit_started_at = datetime.utcnow()
-        account.audit_finished_at = None
-
-        accounts_to_scan.append(account)
-
-    db.session.commit()
-
-    # =====================================================
-    # BACKGROUND TASK
-    # =====================================================
-    def background_audit(app, client_id, aws_account_id):
-
-        with app.app_context():
-
-            try:
-
-                auditor = FinOpsAuditor()
-
-                auditor.run_comprehensive_audit(
-                    client_id,
-                    aws_account_id
-                )
-
-                account = AWSAccount.query.get(aws_account_id)
-
-                if account:
-                    account.audit_status = "completed"
-                    account.audit_finished_at = datetime.utcnow()
-                    db.session.commit()
-
-                # Invalidar caché de desglose por servicio para que el
-                # dashboard refleje los nuevos datos tras el scan.
-                CostExplorerCacheService.invalidate_service_breakdown(aws_account_id)
-
-                db.session.remove()
-
-                logger.info(
-                    f"AUDIT COMPLETED | client_id={client_id}"
-                )
-
-            except Exception as e:
-
-                logger.exception(
-                    f"AUDIT FAILED | client_id={client_id}"
-                )
-
-                db.session.rollback()
-
-                account = AWSAccount.query.get(aws_account_id)
-
-                if account:
-                    account.audit_status = "failed"
-                    account.audit_finished_at = datetime.utcnow()
-                    db.session.commit()
-
-                db.session.remove()
-
-    # =====================================================
-    # RUN THREAD
-    # =====================================================
-    for account in accounts_to_scan:
-
-        audit_executor.submit(
-            background_audit,
-            current_app._get_current_object(),
-            user.client_id,
-            account.id
-        )
+    # Encola en audit_jobs; lo ejecuta scripts/audit_worker.py.
+    # Las cuentas con un job activo no se vuelven a encolar.
+    job_ids = AuditJobService.enqueue(
+        user.client_id,
+        "aws",
+        [account.id for account in aws_accounts]
+    )
 
     return jsonify({
         "status": "started",
-        "accounts_scanning": len(accounts_to_scan)
+        "accounts_scanning": len(job_ids),
+        "job_ids": job_ids
     }), 202
 
 
@@ -140,15 +65,6 @@ def audit_status(user):
     if not aws_accounts:
         return jsonify({"error": "No AWS accounts"}), 404
 
-    result = []
-
-    for account in aws_accounts:
-        result.append({
-            "account_id": account.id,
-            "account_name": account.account_name,
-            "status": account.audit_status,
-            "started_at": account.audit_started_at,
-            "finished_at": account.audit_finished_at
-        })
-
-    return jsonify(result), 200
\ No newline at end of file
+    return jsonify(
+        AuditJobService.status_payload("aws", aws_accounts, "account_name")
+    ), 200
@@ -5,6 +5,8 @@ from src.auth.decorators import require_client_user_role
 from src.services.client_findings_service import ClientFindingsService
 from src.services.client_dashboard_service import ClientDashboardService
 from src.auth.plan_permissions import has_feature
+from src.services.keyset_pagination import InvalidCursor
+from src.services.search_service import SearchService
 
 
 client_findings_bp = Blueprint(
@@ -38,27 +40,33 @@ def get_client_findings(user):
 
     sort_by = request.args.get("sort_by", "created_at")
     sort_order = request.args.get("sort_order", "desc")
-
-    result = ClientFindingsService.list_findings(
-        client_id=user.client_id,
-        aws_account_id=aws_account_id,
-        status=status,
-        severity=severity,
-        finding_type=finding_type,
-        service=service,
-        region=region,
-        page=page,
-        per_page=per_page,
-        search=search,
-        sort_by=sort_by,
-        sort_order=sort_order
-    )
+    cursor = request.args.get("cursor")
+
+    try:
+        result = ClientFindingsService.list_findings(
+            client_id=user.client_id,
+            aws_account_id=aws_account_id,
+            status=status,
+            severity=severity,
+            finding_type=finding_type,
+            service=service,
+            region=region,
+            page=page,
+            per_page=per_page,
+            search=search,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor
+        )
+    except InvalidCursor:
+        return jsonify({"status": "error", "message": "Invalid cursor"}), 400
 
     return jsonify({
         "status": "ok",
         "data": result.get("data", []),
         "total": result.get("total", 0),
-        "pages": result.get("pages", 1)
+        "pages": result.get("pages", 1),
+        "next_cursor": result.get("next_cursor")
     })
 
 
@@ -94,6 +102,31 @@ def get_client_findings_stats(user):
         "status": "ok",
         "data": stats
     })
+
+
+@client_findings_bp.route("/search", methods=["GET"])
+@jwt_required()
+@require_client_user_role(["owner", "finops_admin", "viewer"])
+def search_client_findings(user):
+
+    # PLAN CHECK
+    if not has_feature(user.client_id, "findings"):
+        return jsonify({"error": "Feature not available in current plan"}), 403
+
+    data = SearchService.search_findings(
+        user.client_id,
+        request.args.get("q", ""),
+        aws_account_id=request.args.get("aws_account_id", type=int),
+        status=request.args.get("status", "active"),
+        limit=request.args.get("limit", 20, type=int)
+    )
+
+    return jsonify({
+        "status": "ok",
+        "data": data
+    })
+
+
 @client_findings_bp.route("/<int:finding_id>/resolve", methods=["PATCH"])
 @jwt_required()
 @require_client_user_role(["owner", "finops_admin"])
@@ -7,6 +7,15 @@ from src.models.database import db
 from src.models.aws_resource_inventory import AWSResourceInventory
 from src.models.aws_finding import AWSFinding
 from src.auth.plan_permissions import has_feature
+from src.services.inventory.rollup_service import InventoryRollupService
+from src.services.keyset_pagination import (
+    InvalidCursor,
+    apply_keyset,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    order_by_keyset,
+)
 
 client_inventory_bp = Blueprint(
     "client_inventory", __name__, url_prefix="/api/client/inventory"
@@ -61,31 +70,60 @@ def get_inventory(user):
     if service_filter:
         base_query = base_query.filter(AWSResourceInventory.service_name == service_filter)
 
-    summary_q = db.session.query(
-        AWSResourceInventory.service_name, func.count(AWSResourceInventory.id)
-    ).filter(AWSResourceInventory.client_id == client_id, AWSResourceInventory.is_active == True)
-    if aws_account_id:
-        summary_q = summary_q.filter(AWSResourceInventory.aws_account_id == aws_account_id)
-    summary = {svc: cnt for svc, cnt in summary_q.group_by(AWSResourceInventory.service_name).all()}
-
-    pagination = base_query.order_by(
-        AWSResourceInventory.service_name, AWSResourceInventory.resource_id
-    ).paginate(page=page, per_page=per_page, error_out=False)
-
-    findings_q = db.session.query(
-        AWSFinding.resource_id,
-        func.count(AWSFinding.id).label("count"),
-        func.max(AWSFinding.severity).label("max_severity"),
-    ).filter_by(client_id=client_id, resolved=False)
-    if aws_account_id:
-        findings_q = findings_q.filter(AWSFinding.aws_account_id == aws_account_id)
-    findings_map = {
-        f.resource_id: {"count": f.count, "max_severity": f.max_severity}
-        for f in findings_q.group_by(AWSFinding.resource_id).all()
-    }
+    rollup = InventoryRollupService.services_summary(client_id, aws_account_id or None)
+    summary = {svc: row["total_resources"] for svc, row in rollup.items() if row["total_resources"]}
+
+    # Keyset sobre (service_name, resource_id, id); `page` sin cursor
+    # queda como OFFSET por compatibilidad.
+    key_columns = [
+        AWSResourceInventory.service_name,
+        AWSResourceInventory.resource_id,
+        AWSResourceInventory.id,
+    ]
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            base_query = apply_keyset(
+                base_query, key_columns, decode_cursor(cursor, "inventory"), descending=False
+            )
+        except InvalidCursor:
+            return jsonify({"status": "error", "message": "Invalid cursor"}), 400
+
+    page_query = order_by_keyset(base_query, key_columns, descending=False)
+    if not cursor and page > 1:
+        page_query = page_query.offset((page - 1) * per_page)
+
+    items, next_key = fetch_page(
+        page_query,
+        per_page,
+        lambda item: [item.service_name, item.resource_id, item.id]
+    )
+
+    # Total desde los rollups (mismo filtro de cuenta) en vez de COUNT(*)
+    total = summary.get(service_filter, 0) if service_filter else sum(summary.values())
+
+    # Findings solo de los recursos de esta página
+    findings_map = {}
+    page_resource_ids = [item.resource_id for item in items]
+    if page_resource_ids:
+        findings_q = db.session.query(
+            AWSFinding.resource_id,
+            func.count(AWSFinding.id).label("count"),
+            func.max(AWSFinding.severity).label("max_severity"),
+        ).filter(
+            AWSFinding.client_id == client_id,
+            AWSFinding.resolved.is_(False),
+            AWSFinding.resource_id.in_(page_resource_ids)
+        )
+        if aws_account_id:
+            findings_q = findings_q.filter(AWSFinding.aws_account_id == aws_account_id)
+        findings_map = {
+            f.resource_id: {"count": f.count, "max_severity": f.max_severity}
+            for f in findings_q.group_by(AWSFinding.resource_id).all()
+        }
 
     resources = []
-    for item in pagination.items:
+    for item in items:
         fd = findings_map.get(item.resource_id)
         if fd:
             sev = fd["max_severity"]
@@ -114,7 +152,8 @@ def get_inventory(user):
             "resources": resources,
             "pagination": {
                 "page": page, "per_page": per_page,
-                "total": pagination.total, "pages": pagination.pages,
+                "total": total, "pages": max(1, -(-total // per_page)),
+                "next_cursor": encode_cursor(next_key, "inventory") if next_key else None,
             },
         },
     })
@@ -144,3 +183,21 @@ def get_global_health_score(user):
     from src.services.inventory.inventory_service import InventoryService
     data = InventoryService.get_global_health_score(client_id=user.client_id)
     return jsonify({"status": "ok", "data": data}), 200
+
+
+@client_inventory_bp.route("/search", methods=["GET"])
+@jwt_required()
+@require_client_user_role()
+def search_inventory(user):
+    err = require_assets_feature(user.client_id)
+    if err:
+        return err
+
+    from src.services.search_service import SearchService
+    data = SearchService.search_inventory(
+        user.client_id,
+        request.args.get("q", ""),
+        aws_account_id=request.args.get("aws_account_id", type=int),
+        limit=safe_int(request.args.get("limit"), 20),
+    )
+    return jsonify({"status": "ok", "data": data}), 200
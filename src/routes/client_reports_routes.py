@@ -1,19 +1,35 @@
-from flask import Response, jsonify, request
+from flask import Response, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required
 
 from src.auth.decorators import require_client_user_role
 from src.reports.client.client_stats_provider import get_client_stats
-from src.reports.client.client_pdf_report import build_client_pdf
 from src.reports.client.client_csv_report import build_client_csv
-from src.reports.client.client_xlsx_report import build_client_xlsx
-from src.reports.client.executive_pdf_report import build_executive_pdf
-from src.reports.client.cost_pdf_report import build_cost_pdf
-from src.reports.client.cost_xlsx_report import build_cost_xlsx
-from src.reports.client.risk import build_risk_pdf
-from src.reports.client.risk_xlsx_report import build_risk_xlsx
-from src.reports.client.inventory_stats_provider import get_inventory_stats
-from src.reports.client.inventory_csv_report import build_inventory_csv
+from src.reports.client.inventory_stats_provider import (
+    get_inventory_summary,
+    iter_inventory_rows,
+    iter_flagged_resources,
+)
+from src.reports.client.inventory_csv_report import stream_inventory_csv
 from src.reports.client.inventory_xlsx_report import build_inventory_xlsx
+from src.reports.exporters.xlsx_base import iter_spooled
+from src.models.aws_account import AWSAccount
+from src.services.report_job_service import ReportJobService
+
+
+def _artifact_response(artifact):
+    """
+    Descarga de un artefacto de report_artifacts. Las rutas GET de PDF /
+    XLSX lo sirven desde cache mientras no cambie `data_version` del
+    cliente; sólo renderizan en el request si no existe.
+    """
+    return Response(
+        artifact.content,
+        mimetype=artifact.mimetype,
+        headers={
+            "Content-Disposition":
+            f"attachment; filename={artifact.filename}"
+        }
+    )
 
 
 def register_client_report_routes(app):
@@ -37,17 +53,8 @@ def register_client_report_routes(app):
     @jwt_required()
     @require_client_user_role()
     def client_pdf_report(user):
-        stats = get_client_stats(user.client_id)
-        pdf_data = build_client_pdf(stats)
-
-        return Response(
-            pdf_data,
-            mimetype="application/pdf",
-            headers={
-                "Content-Disposition":
-                "attachment; filename=finopslatam_client_report.pdf"
-            }
-        )
+        artifact = ReportJobService.get_or_render(user.client_id, "client_pdf")
+        return _artifact_response(artifact)
 
     # ===============================
     # CLIENT — CSV
@@ -75,17 +82,8 @@ def register_client_report_routes(app):
     @jwt_required()
     @require_client_user_role()
     def client_xlsx_report(user):
-        stats = get_client_stats(user.client_id)
-        xlsx_data = build_client_xlsx(stats)
-
-        return Response(
-            xlsx_data,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition":
-                "attachment; filename=findings.xlsx"
-            }
-        )
+        artifact = ReportJobService.get_or_render(user.client_id, "client_xlsx")
+        return _artifact_response(artifact)
 
     # ===============================
     # CLIENT — RESUMEN EJECUTIVO PDF
@@ -97,16 +95,10 @@ def register_client_report_routes(app):
         account_id_raw = request.args.get("account_id")
         aws_account_id = int(account_id_raw) if account_id_raw else None
 
-        pdf_data = build_executive_pdf(user.client_id, aws_account_id)
-
-        return Response(
-            pdf_data,
-            mimetype="application/pdf",
-            headers={
-                "Content-Disposition":
-                "attachment; filename=resumen-ejecutivo-finops.pdf"
-            }
+        artifact = ReportJobService.get_or_render(
+            user.client_id, "executive_pdf", aws_account_id
         )
+        return _artifact_response(artifact)
 
     # ===============================
     # REPORTE DE COSTOS — PDF
@@ -118,16 +110,10 @@ def register_client_report_routes(app):
         account_id_raw = request.args.get("account_id")
         aws_account_id = int(account_id_raw) if account_id_raw else None
 
-        pdf_data = build_cost_pdf(user.client_id, aws_account_id)
-
-        return Response(
-            pdf_data,
-            mimetype="application/pdf",
-            headers={
-                "Content-Disposition":
-                "attachment; filename=reporte-costos-finops.pdf"
-            }
+        artifact = ReportJobService.get_or_render(
+            user.client_id, "costs_pdf", aws_account_id
         )
+        return _artifact_response(artifact)
 
     # ===============================
     # REPORTE DE COSTOS — XLSX
@@ -139,16 +125,10 @@ def register_client_report_routes(app):
         account_id_raw = request.args.get("account_id")
         aws_account_id = int(account_id_raw) if account_id_raw else None
 
-        xlsx_data = build_cost_xlsx(user.client_id, aws_account_id)
-
-        return Response(
-            xlsx_data,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition":
-                "attachment; filename=reporte-costos-finops.xlsx"
-            }
+        artifact = ReportJobService.get_or_render(
+            user.client_id, "costs_xlsx", aws_account_id
         )
+        return _artifact_response(artifact)
 
     # ===============================
     # REPORTE DE RIESGO — PDF
@@ -160,16 +140,10 @@ def register_client_report_routes(app):
         account_id_raw = request.args.get("account_id")
         aws_account_id = int(account_id_raw) if account_id_raw else None
 
-        pdf_data = build_risk_pdf(user.client_id, aws_account_id)
-
-        return Response(
-            pdf_data,
-            mimetype="application/pdf",
-            headers={
-                "Content-Disposition":
-                "attachment; filename=reporte-riesgo-compliance-finops.pdf"
-            }
+        artifact = ReportJobService.get_or_render(
+            user.client_id, "risk_pdf", aws_account_id
         )
+        return _artifact_response(artifact)
 
     # ===============================
     # REPORTE DE RIESGO — XLSX
@@ -181,16 +155,10 @@ def register_client_report_routes(app):
         account_id_raw = request.args.get("account_id")
         aws_account_id = int(account_id_raw) if account_id_raw else None
 
-        xlsx_data = build_risk_xlsx(user.client_id, aws_account_id)
-
-        return Response(
-            xlsx_data,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition":
-                "attachment; filename=reporte-riesgo-compliance-finops.xlsx"
-            }
+        artifact = ReportJobService.get_or_render(
+            user.client_id, "risk_xlsx", aws_account_id
         )
+        return _artifact_response(artifact)
 
     # ===============================
     # INVENTARIO DE RECURSOS — CSV
@@ -202,11 +170,12 @@ def register_client_report_routes(app):
         account_id_raw = request.args.get("account_id")
         aws_account_id = int(account_id_raw) if account_id_raw else None
 
-        stats    = get_inventory_stats(user.client_id, aws_account_id)
-        csv_data = build_inventory_csv(stats)
+        # Streaming: las filas salen del cursor del servidor a medida que
+        # se envían (stream_with_context mantiene viva la sesión de DB)
+        rows = iter_inventory_rows(user.client_id, aws_account_id)
 
         return Response(
-            csv_data,
+            stream_with_context(stream_inventory_csv(rows)),
             mimetype="text/csv",
             headers={
                 "Content-Disposition":
@@ -224,14 +193,78 @@ def register_client_report_routes(app):
         account_id_raw = request.args.get("account_id")
         aws_account_id = int(account_id_raw) if account_id_raw else None
 
-        stats     = get_inventory_stats(user.client_id, aws_account_id)
-        xlsx_data = build_inventory_xlsx(stats)
+        stats = get_inventory_summary(user.client_id, aws_account_id)
+        xlsx_file = build_inventory_xlsx(
+            stats,
+            iter_inventory_rows(user.client_id, aws_account_id),
+            iter_flagged_resources(user.client_id, aws_account_id),
+        )
 
         return Response(
-            xlsx_data,
+            iter_spooled(xlsx_file),
             mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={
                 "Content-Disposition":
                 "attachment; filename=inventario-recursos-aws.xlsx"
             }
         )
+
+    # ===============================
+    # JOBS DE REPORTES (ASÍNCRONO)
+    # ===============================
+    @app.route("/api/client/reports/jobs", methods=["POST"])
+    @jwt_required()
+    @require_client_user_role()
+    def client_report_job_submit(user):
+        data = request.get_json(silent=True) or {}
+        report_type = data.get("report_type")
+
+        aws_account_id = data.get("account_id")
+        if aws_account_id is not None:
+            try:
+                aws_account_id = int(aws_account_id)
+            except (TypeError, ValueError):
+                return jsonify({"error": "Invalid account_id"}), 400
+
+            owned = AWSAccount.query.filter_by(
+                id=aws_account_id, client_id=user.client_id
+            ).first()
+            if not owned:
+                return jsonify({"error": "AWS account not found"}), 404
+
+        try:
+            job = ReportJobService.submit(
+                user.client_id, report_type, aws_account_id, requested_by=user.id
+            )
+        except ValueError:
+            return jsonify({"error": "Invalid report_type"}), 400
+
+        return jsonify(job.to_dict()), 200 if job.status == "completed" else 202
+
+    @app.route("/api/client/reports/jobs/<int:job_id>", methods=["GET"])
+    @jwt_required()
+    @require_client_user_role()
+    def client_report_job_status(user, job_id):
+        job = ReportJobService.get_job(user.client_id, job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        return jsonify(job.to_dict()), 200
+
+    @app.route("/api/client/reports/jobs/<int:job_id>/download", methods=["GET"])
+    @jwt_required()
+    @require_client_user_role()
+    def client_report_job_download(user, job_id):
+        job = ReportJobService.get_job(user.client_id, job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        if job.status != "completed":
+            return jsonify({"error": "Report not ready", "status": job.status}), 409
+
+        artifact = ReportJobService.get_artifact(job.artifact_key)
+        if not artifact:
+            # Purgado por retención: hay que volver a pedirlo
+            return jsonify({"error": "Report expired"}), 410
+
+        return _artifact_response(artifact)
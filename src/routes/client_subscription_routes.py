@@ -15,7 +15,7 @@ from src.models.subscription import ClientSubscription
 from src.models.plan import Plan
 from src.models.database import db
 
-from src.services.email_service import send_email
+from src.services.notification_outbox import queue_email
 from src.services.email_templates import (
     build_internal_plan_upgrade_alert,
     build_plan_upgrade_request_received_email
@@ -138,7 +138,7 @@ def upgrade_subscription(user):
             new_plan_name=new_plan.name,
         )
 
-        send_email(
+        queue_email(
             to=user.email,
             subject="FinOpsLatam — Solicitud de upgrade recibida",
             body=owner_email_body
@@ -182,7 +182,7 @@ def upgrade_subscription(user):
             new_plan_name=new_plan.name
         )
 
-        send_email(
+        queue_email(
             to="contacto@finopslatam.com",
             subject="FinOpsLatam — Nueva solicitud de upgrade",
             body=admin_body
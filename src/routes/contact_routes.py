@@ -13,7 +13,7 @@ IMPORTANTE:
 import logging
 from flask import Blueprint, request, jsonify
 
-from src.services.email_service import send_email
+from src.services.notification_outbox import queue_email
 from src.models.user import User
 from src.security.validation import is_valid_email, normalize_email
 
@@ -59,7 +59,7 @@ Mensaje:
 {mensaje}
 """
 
-    sent = send_email(
+    sent = queue_email(
         to="contacto@finopslatam.com",
         subject=f"📩 Nuevo contacto – {servicio}",
         body=body,
@@ -82,7 +82,7 @@ Mensaje:
     notified_emails = {"contacto@finopslatam.com"}
     for staff_user in global_users:
         if staff_user.email not in notified_emails:
-            send_email(
+            queue_email(
                 to=staff_user.email,
                 subject=f"🔔 Nueva solicitud de consultoría – {empresa}",
                 body=body,
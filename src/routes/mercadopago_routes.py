@@ -35,7 +35,7 @@ from src.services.mercadopago_service import (
     create_subscription,
     get_subscription_status,
 )
-from src.services.email_service import send_email
+from src.services.notification_outbox import queue_email
 from src.services.email_templates import (
     build_payment_welcome_email,
     build_admin_new_payment_email,
@@ -77,7 +77,7 @@ def _send_staff_emails(
     try:
         for staff in _get_staff_users():
             if staff.email:
-                send_email(
+                queue_email(
                     to=staff.email,
                     subject=f"FinOps Latam — Nuevo pago MP: {plan_name}",
                     body=build_admin_new_payment_email(
@@ -115,7 +115,7 @@ def _activate_subscription(subscription: MPSubscription) -> None:
     db.session.commit()
 
     try:
-        send_email(
+        queue_email(
             to=email,
             subject="FinOps Latam — Bienvenido, tu pago fue confirmado",
             body=build_payment_welcome_email(nombre=nombre, plan_name=plan_name),
@@ -23,7 +23,7 @@ from src.models.database import db
 from src.models.payment import Payment
 from src.models.user import User
 from src.models.notification import Notification
-from src.services.email_service import send_email
+from src.services.notification_outbox import queue_email
 from src.services.email_templates import (
     build_payment_welcome_email,
     build_admin_new_payment_email,
@@ -85,7 +85,7 @@ def _handle_subscription_activated(resource: dict) -> None:
     db.session.commit()
 
     try:
-        send_email(
+        queue_email(
             to=email,
             subject="FinOps Latam — Bienvenido, tu pago fue confirmado",
             body=build_payment_welcome_email(nombre=nombre, plan_name=plan_name),
@@ -96,7 +96,7 @@ def _handle_subscription_activated(resource: dict) -> None:
     try:
         for staff in _get_staff_users():
             if staff.email:
-                send_email(
+                queue_email(
                     to=staff.email,
                     subject=f"FinOps Latam — Nuevo pago: {plan_name}",
                     body=build_admin_new_payment_email(
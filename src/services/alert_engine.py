@@ -3,13 +3,21 @@ ALERT ENGINE
 ============
 Runner principal del motor de alertas.
 Evalúa todas las políticas activas y dispara notificaciones.
+
+Las políticas que toca evaluar se agrupan por (cliente, cuenta); los
+datos de costos, anomalías, inventario y findings se precargan una vez
+por corrida en un AlertRunContext (ver alert_run_context.py), con las
+llamadas a AWS repartidas en un pool de threads por cuenta.
 """
 
+from contextlib import contextmanager
 from datetime import datetime
 
+from src.config import metrics
 from src.models.alert_policy import AlertPolicy
 from src.models.database import db
 from src.services.alert_notifier import dispatch_alert
+from src.services.alert_run_context import AlertRunContext
 from src.services.alert_evaluators import (
     evaluate_budget_monthly,
     evaluate_budget_annual,
@@ -42,8 +50,25 @@ def _should_fire(policy: AlertPolicy) -> bool:
 
 
 def _mark_fired(policy: AlertPolicy):
+    # Commit por grupo (ver _run_policies)
     policy.last_fired_at = datetime.utcnow()
-    db.session.commit()
+
+
+@contextmanager
+def _keep_loaded_on_commit():
+    """
+    Durante la corrida los commits (cache de Cost Explorer, outbox,
+    commit por grupo) no expiran las políticas cargadas: con
+    expire_on_commit cada acceso posterior recargaba una política con su
+    propio SELECT.
+    """
+    session = db.session()
+    previous = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        yield
+    finally:
+        session.expire_on_commit = previous
 
 
 # ── MAPA DE EVALUADORES ───────────────────────────────────────────────────────
@@ -69,38 +94,51 @@ def run_alert_engine() -> dict:
     cuando se cumplen las condiciones.
     Retorna resumen de ejecución.
     """
+    with metrics.alert_engine_timer(), _keep_loaded_on_commit():
+        summary = _run_policies()
+
+    metrics.ALERTS_FIRED.labels("fired").inc(summary["alertas_disparadas"])
+    metrics.ALERTS_FIRED.labels("error").inc(summary["errores"])
+    return summary
+
+
+def _run_policies() -> dict:
     policies = AlertPolicy.query.all()
 
     fired_count = 0
     skipped_count = 0
     error_count = 0
 
+    due = []
     for policy in policies:
-        if not _should_fire(policy):
-            skipped_count += 1
-            continue
-
-        evaluator = EVALUATORS.get(policy.policy_id)
-        if not evaluator:
+        if not _should_fire(policy) or policy.policy_id not in EVALUATORS:
             skipped_count += 1
             continue
-
-        try:
-            fired, context = evaluator(policy)
-            if fired:
-                delivered = dispatch_alert(policy, context)
-                if delivered:
-                    _mark_fired(policy)
-                    fired_count += 1
-                else:
-                    print(
-                        f"[AlertEngine] Alerta no enviada en política "
-                        f"{policy.id} ({policy.policy_id})"
-                    )
-                    error_count += 1
-        except Exception as e:
-            print(f"[AlertEngine] Error en política {policy.id} ({policy.policy_id}): {e}")
-            error_count += 1
+        due.append(policy)
+
+    ctx = AlertRunContext.build(due)
+
+    for group in ctx.groups().values():
+        for policy in group:
+            evaluator = EVALUATORS[policy.policy_id]
+            try:
+                fired, context = evaluator(policy, ctx)
+                if fired:
+                    delivered = dispatch_alert(policy, context)
+                    if delivered:
+                        _mark_fired(policy)
+                        fired_count += 1
+                    else:
+                        print(
+                            f"[AlertEngine] Alerta no enviada en política "
+                            f"{policy.id} ({policy.policy_id})"
+                        )
+                        error_count += 1
+            except Exception as e:
+                print(f"[AlertEngine] Error en política {policy.id} ({policy.policy_id}): {e}")
+                error_count += 1
+
+        db.session.commit()
 
     return {
         "total_politicas": len(policies),
@@ -2,58 +2,36 @@
 ALERT EVALUATORS
 ================
 Funciones de evaluación para cada tipo de política de alerta.
-Cada evaluador recibe un AlertPolicy y retorna (fired: bool, context: dict).
+Cada evaluador recibe un AlertPolicy y el AlertRunContext de la corrida
+(costos, anomalías e inventario ya precargados) y retorna
+(fired: bool, context: dict). No llaman a AWS ni consultan la BD.
 """
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from src.models.alert_policy import AlertPolicy
-from src.models.aws_finding import AWSFinding
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.services.cost_explorer_cache_service import CostExplorerCacheService as CostExplorerService
-from src.aws.anomaly_monitor_service import AnomalyMonitorService
+from src.services.alert_run_context import AlertRunContext, anomaly_min_impact
 
 
 # ── HELPERS COMPARTIDOS ───────────────────────────────────────────────────────
 
-def _get_accounts(policy: AlertPolicy) -> list:
-    from src.models.aws_account import AWSAccount
-    if policy.aws_account_id:
-        account = AWSAccount.query.filter_by(
-            id=policy.aws_account_id,
-            client_id=policy.client_id,
-            is_active=True
-        ).first()
-        return [account] if account else []
-    return AWSAccount.query.filter_by(client_id=policy.client_id, is_active=True).all()
-
-
-def _monthly_cost(account) -> float:
+def _monthly_cost(ctx: AlertRunContext, account) -> float:
     try:
-        months = CostExplorerService(account).get_last_6_months_cost()
+        months = ctx.last_6_months(account)
         return months[-1]["amount"] if months else 0.0
     except Exception:
         return 0.0
 
 
-def _annual_cost(account) -> float:
-    try:
-        data = CostExplorerService(account).get_annual_costs()
-        return data.get("current_year_ytd", 0.0)
-    except Exception:
-        return 0.0
-
-
-def _annual_previous_cost(account) -> float:
+def _annual_costs(ctx: AlertRunContext, account) -> dict:
     try:
-        data = CostExplorerService(account).get_annual_costs()
-        return data.get("previous_year_cost", 0.0)
+        return ctx.annual_costs(account)
     except Exception:
-        return 0.0
+        return {}
 
 
-def _monthly_reference_avg(accounts: list) -> float:
+def _monthly_reference_avg(ctx: AlertRunContext, accounts: list) -> float:
     """
     Referencia para comparaciones porcentuales mensuales:
     promedio de los últimos 3 meses (sin incluir el mes actual),
@@ -62,7 +40,7 @@ def _monthly_reference_avg(accounts: list) -> float:
     reference = 0.0
     for account in accounts:
         try:
-            months = CostExplorerService(account).get_last_6_months_cost()
+            months = ctx.last_6_months(account)
             past = [m["amount"] for m in months[:-1][-3:] if m["amount"] > 0]
             if past:
                 reference += (sum(past) / len(past))
@@ -81,12 +59,12 @@ def _exceeds(value: float, threshold: float, t_type: str, reference: float = 0.0
 
 # ── EVALUADORES ───────────────────────────────────────────────────────────────
 
-def evaluate_budget_monthly(policy: AlertPolicy):
-    accounts = _get_accounts(policy)
-    total = sum(_monthly_cost(a) for a in accounts)
+def evaluate_budget_monthly(policy: AlertPolicy, ctx: AlertRunContext):
+    accounts = ctx.accounts_for(policy)
+    total = sum(_monthly_cost(ctx, a) for a in accounts)
     threshold = policy.threshold or 0
     t_type = policy.threshold_type or "USD"
-    reference = _monthly_reference_avg(accounts) if t_type == "%" else 0.0
+    reference = _monthly_reference_avg(ctx, accounts) if t_type == "%" else 0.0
 
     fired = _exceeds(total, threshold, t_type, reference)
     context = {
@@ -99,10 +77,12 @@ def evaluate_budget_monthly(policy: AlertPolicy):
     return fired, context
 
 
-def evaluate_budget_annual(policy: AlertPolicy):
-    accounts = _get_accounts(policy)
-    total = sum(_annual_cost(a) for a in accounts)
-    reference = sum(_annual_previous_cost(a) for a in accounts)
+def evaluate_budget_annual(policy: AlertPolicy, ctx: AlertRunContext):
+    accounts = ctx.accounts_for(policy)
+    # Un solo dato anual por cuenta para el YTD y el año anterior
+    annual = [_annual_costs(ctx, a) for a in accounts]
+    total = sum(data.get("current_year_ytd", 0.0) for data in annual)
+    reference = sum(data.get("previous_year_cost", 0.0) for data in annual)
     threshold = policy.threshold or 0
     t_type = policy.threshold_type or "USD"
 
@@ -117,19 +97,18 @@ def evaluate_budget_annual(policy: AlertPolicy):
     return fired, context
 
 
-def evaluate_anomaly_spike(policy: AlertPolicy):
-    accounts = _get_accounts(policy)
+def evaluate_anomaly_spike(policy: AlertPolicy, ctx: AlertRunContext):
+    accounts = ctx.accounts_for(policy)
     if not accounts:
         return False, {}
 
     threshold = policy.threshold or 10
     t_type = policy.threshold_type or "USD"
-    min_impact = threshold if t_type == "USD" else 10.0
+    min_impact = anomaly_min_impact(policy)
 
     all_anomalies = []
     for account in accounts:
-        anomalies = AnomalyMonitorService.get_anomalies(account, min_impact_usd=min_impact)
-        all_anomalies.extend(anomalies)
+        all_anomalies.extend(ctx.anomalies(account, min_impact))
 
     if all_anomalies:
         detalle = [
@@ -149,7 +128,7 @@ def evaluate_anomaly_spike(policy: AlertPolicy):
         }
 
     try:
-        months = CostExplorerService(accounts[0]).get_last_6_months_cost()
+        months = ctx.last_6_months(accounts[0])
         if len(months) < 2:
             return False, {}
         current = months[-1]["amount"]
@@ -170,13 +149,13 @@ def evaluate_anomaly_spike(policy: AlertPolicy):
         return False, {}
 
 
-def evaluate_service_cost(policy: AlertPolicy):
-    accounts = _get_accounts(policy)
+def evaluate_service_cost(policy: AlertPolicy, ctx: AlertRunContext):
+    accounts = ctx.accounts_for(policy)
     threshold = policy.threshold or 0
     over = []
     for account in accounts:
         try:
-            breakdown = CostExplorerService(account).get_service_breakdown_current_month()
+            breakdown = ctx.service_breakdown(account)
             for svc in breakdown:
                 if svc["amount"] >= threshold:
                     over.append({"servicio": svc["service"], "costo": f"USD {round(svc['amount'], 2)}"})
@@ -189,43 +168,34 @@ def evaluate_service_cost(policy: AlertPolicy):
     }
 
 
-def evaluate_tagging_policy(policy: AlertPolicy):
-    q = AWSResourceInventory.query.filter_by(client_id=policy.client_id, is_active=True)
-    if policy.aws_account_id:
-        q = q.filter_by(aws_account_id=policy.aws_account_id)
-    resources = q.all()
-    untagged = [r for r in resources if not r.tags or r.tags == {}]
+def evaluate_tagging_policy(policy: AlertPolicy, ctx: AlertRunContext):
+    stats = ctx.inventory_stats(policy)
     threshold = int(policy.threshold or 1)
-    fired = len(untagged) >= threshold
+    fired = stats["untagged"] >= threshold
     return fired, {
-        "recursos_sin_etiquetas": len(untagged),
-        "total_recursos": len(resources),
+        "recursos_sin_etiquetas": stats["untagged"],
+        "total_recursos": stats["total"],
         "umbral": threshold,
     }
 
 
-def evaluate_idle_resources(policy: AlertPolicy):
-    idle_types = ["idle", "rightsizing", "underutilized", "unused", "low_utilization"]
-    q = AWSFinding.query.filter_by(client_id=policy.client_id, resolved=False)
-    if policy.aws_account_id:
-        q = q.filter_by(aws_account_id=policy.aws_account_id)
-    findings = q.all()
-    idle = [f for f in findings if any(t in f.finding_type.lower() for t in idle_types)]
+def evaluate_idle_resources(policy: AlertPolicy, ctx: AlertRunContext):
+    stats = ctx.finding_stats(policy)
     threshold = int(policy.threshold or 1)
-    fired = len(idle) >= threshold
+    fired = stats["idle"] >= threshold
     return fired, {
-        "recursos_inactivos_detectados": len(idle),
+        "recursos_inactivos_detectados": stats["idle"],
         "umbral": threshold,
-        "ahorro_potencial": f"USD {sum(float(f.estimated_monthly_savings or 0) for f in idle):.2f}",
+        "ahorro_potencial": f"USD {stats['idle_savings']:.2f}",
     }
 
 
-def evaluate_forecast(policy: AlertPolicy):
-    accounts = _get_accounts(policy)
+def evaluate_forecast(policy: AlertPolicy, ctx: AlertRunContext):
+    accounts = ctx.accounts_for(policy)
     if not accounts:
         return False, {}
     try:
-        months = CostExplorerService(accounts[0]).get_last_6_months_cost()
+        months = ctx.last_6_months(accounts[0])
         if not months:
             return False, {}
         current_cost = months[-1]["amount"]
@@ -238,7 +208,7 @@ def evaluate_forecast(policy: AlertPolicy):
         projected = (current_cost / days_elapsed) * days_in_month
         threshold = policy.threshold or 0
         t_type = policy.threshold_type or "USD"
-        reference = _monthly_reference_avg(accounts) if t_type == "%" else 0.0
+        reference = _monthly_reference_avg(ctx, accounts) if t_type == "%" else 0.0
         fired = _exceeds(projected, threshold, t_type, reference)
         context = {
             "proyeccion_fin_de_mes": f"USD {round(projected, 2)}",
@@ -253,36 +223,27 @@ def evaluate_forecast(policy: AlertPolicy):
         return False, {}
 
 
-def evaluate_off_hours(policy: AlertPolicy):
+def evaluate_off_hours(policy: AlertPolicy, ctx: AlertRunContext):
     tz = ZoneInfo("America/Santiago")
-    from datetime import datetime
     hour = datetime.now(tz).hour
     is_off = hour >= 22 or hour < 8
     if not is_off:
         return False, {"razon": "Dentro de horario hábil (08:00–22:00 CL)"}
-    q = AWSResourceInventory.query.filter_by(client_id=policy.client_id, is_active=True)
-    if policy.aws_account_id:
-        q = q.filter_by(aws_account_id=policy.aws_account_id)
-    running = q.filter(AWSResourceInventory.state.in_(["running", "available"])).all()
+    running = ctx.inventory_stats(policy)["running"]
     threshold = int(policy.threshold or 1)
-    fired = len(running) >= threshold
+    fired = running >= threshold
     return fired, {
-        "recursos_activos_fuera_horario": len(running),
+        "recursos_activos_fuera_horario": running,
         "hora_actual_cl": f"{hour:02d}:00",
         "umbral": threshold,
     }
 
 
-def evaluate_lifecycle(policy: AlertPolicy):
-    lifecycle_types = ["snapshot", "lifecycle", "stale", "orphan", "unattached", "old_"]
-    q = AWSFinding.query.filter_by(client_id=policy.client_id, resolved=False)
-    if policy.aws_account_id:
-        q = q.filter_by(aws_account_id=policy.aws_account_id)
-    findings = q.all()
-    lc = [f for f in findings if any(t in f.finding_type.lower() for t in lifecycle_types)]
+def evaluate_lifecycle(policy: AlertPolicy, ctx: AlertRunContext):
+    lifecycle = ctx.finding_stats(policy)["lifecycle"]
     threshold = int(policy.threshold or 1)
-    fired = len(lc) >= threshold
+    fired = lifecycle >= threshold
     return fired, {
-        "recursos_con_alerta_ciclo_vida": len(lc),
+        "recursos_con_alerta_ciclo_vida": lifecycle,
         "umbral": threshold,
     }
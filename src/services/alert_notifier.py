@@ -12,12 +12,15 @@ Canales soportados:
 Nota sobre Slack/Teams:
 El campo `email` de la política almacena la URL del webhook
 cuando el canal es slack o teams.
-"""
 
-import requests
+Las notificaciones se encolan en `notification_outbox` y las entrega
+scripts/notification_worker.py (conexión SMTP reutilizada, webhooks con
+keep-alive, reintentos con backoff): una corrida del motor con muchas
+alertas no espera a SMTP ni a los webhooks.
+"""
 
 from src.models.aws_account import AWSAccount
-from src.services.email_service import send_email
+from src.services.notification_outbox import queue_email, queue_webhook
 from src.services.email_templates import build_alert_fired_email
 
 
@@ -42,8 +45,8 @@ def dispatch_alert(policy, context: dict):
     """Dispara la alerta por el canal configurado en la política.
 
     Retorna:
-        True  -> notificación enviada correctamente
-        False -> no se envió o falló el canal
+        True  -> notificación encolada para envío
+        False -> no se pudo encolar (sin destino, canal no soportado, ...)
     """
     if policy.channel == "email":
         return _send_email_alert(policy, context)
@@ -84,10 +87,11 @@ def _send_email_alert(policy, context: dict):
         account_label=account_label,
     )
 
-    return send_email(
+    return queue_email(
         to=policy.email,
         subject=f"FinOpsLatam — Alerta: {policy.title} — {account_label}",
         body=body,
+        source=f"alert:{policy.id}",
     )
 
 
@@ -110,18 +114,7 @@ def _send_slack_alert(policy, context: dict):
         )
     }
 
-    try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
-        if 200 <= response.status_code < 300:
-            return True
-        print(
-            f"[AlertNotifier] Slack webhook HTTP {response.status_code} "
-            f"(política {policy.id})"
-        )
-        return False
-    except Exception as e:
-        print(f"[AlertNotifier] Slack webhook error (política {policy.id}): {e}")
-        return False
+    return queue_webhook("slack", webhook_url, payload, source=f"alert:{policy.id}")
 
 
 # ── TEAMS ─────────────────────────────────────────────────────────
@@ -148,15 +141,4 @@ def _send_teams_alert(policy, context: dict):
         }]
     }
 
-    try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
-        if 200 <= response.status_code < 300:
-            return True
-        print(
-            f"[AlertNotifier] Teams webhook HTTP {response.status_code} "
-            f"(política {policy.id})"
-        )
-        return False
-    except Exception as e:
-        print(f"[AlertNotifier] Teams webhook error (política {policy.id}): {e}")
-        return False
+    return queue_webhook("teams", webhook_url, payload, source=f"alert:{policy.id}")
@@ -0,0 +1,319 @@
+"""
+ALERT RUN CONTEXT
+=================
+Datos de una corrida del motor de alertas, precargados una sola vez.
+
+Antes cada política armaba su propio CostExplorerCacheService por cuenta
+(leyendo la fila de cache otra vez, o llamando a AWS en un miss) y hacía
+sus propias queries de inventario / findings. Ahora:
+
+1. Plan: las políticas a evaluar se agrupan por (cliente, cuenta) y se
+   calcula qué necesita cada cuenta AWS (6 meses, anual, breakdown por
+   servicio, anomalías con cada impacto mínimo pedido).
+2. Cache de Cost Explorer: 1 query para todas las cuentas.
+3. Misses + anomalías: un pool de threads, una tarea por cuenta. Igual
+   que en scan_pool, los workers sólo hablan con AWS — reciben un
+   snapshot de la cuenta (AccountRef) y nunca tocan `db.session`; el
+   thread que orquesta guarda lo nuevo en el cache.
+4. Inventario y findings: 1 query agregada por tabla, agrupada por
+   (cliente, cuenta), para todas las políticas que la usan.
+
+Los evaluadores (alert_evaluators.py) leen de acá; un error al traer un
+dato se guarda y se relanza al leerlo, así cada evaluador mantiene su
+manejo de errores.
+"""
+
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from sqlalchemy import Text, cast, func, or_
+
+from src.aws.anomaly_monitor_service import AnomalyMonitorService
+from src.aws.cost_explorer_service import CostExplorerService
+from src.models.aws_account import AWSAccount
+from src.models.aws_finding import AWSFinding
+from src.models.aws_resource_inventory import AWSResourceInventory
+from src.models.database import db
+from src.services.cost_explorer_cache_service import CostExplorerCacheService
+
+
+logger = logging.getLogger(__name__)
+
+# Claves del cache de Cost Explorer -> método de CostExplorerService
+CE_METHODS = {
+    "6months":           "get_last_6_months_cost",
+    "annual":            "get_annual_costs",
+    "service_breakdown": "get_service_breakdown_current_month",
+}
+
+IDLE_TYPES = ("idle", "rightsizing", "underutilized", "unused", "low_utilization")
+LIFECYCLE_TYPES = ("snapshot", "lifecycle", "stale", "orphan", "unattached", "old_")
+RUNNING_STATES = ("running", "available")
+
+INVENTORY_POLICIES = {"tagging-policy", "off-hours"}
+FINDING_POLICIES = {"idle-resources", "lifecycle"}
+
+
+def max_workers() -> int:
+    return max(1, int(os.getenv("ALERT_ENGINE_MAX_WORKERS", "8")))
+
+
+def anomaly_min_impact(policy) -> float:
+    threshold = policy.threshold or 10
+    return threshold if (policy.threshold_type or "USD") == "USD" else 10.0
+
+
+@dataclass(frozen=True)
+class AccountRef:
+    """Lo que necesitan CostExplorerService / AnomalyMonitorService, sin ORM."""
+    id: int
+    client_id: int
+    account_id: str
+    account_name: str
+    role_arn: str
+    external_id: str
+    anomaly_monitor_arn: str | None
+
+    @classmethod
+    def from_account(cls, account: AWSAccount) -> "AccountRef":
+        return cls(
+            id=account.id,
+            client_id=account.client_id,
+            account_id=account.account_id,
+            account_name=account.account_name,
+            role_arn=account.role_arn,
+            external_id=account.external_id,
+            anomaly_monitor_arn=account.anomaly_monitor_arn,
+        )
+
+
+def _fetch_account(account: AccountRef, keys: set, min_impacts: set) -> dict:
+    """Corre en el pool: sólo llamadas a AWS."""
+    results = {}
+    ce = None
+    for key in sorted(keys):
+        try:
+            if ce is None:
+                ce = CostExplorerService(account)
+            results[key] = getattr(ce, CE_METHODS[key])()
+        except Exception as e:
+            results[key] = e
+
+    for min_impact in sorted(min_impacts):
+        results[("anomalies", min_impact)] = AnomalyMonitorService.get_anomalies(
+            account, min_impact_usd=min_impact
+        )
+    return results
+
+
+class AlertRunContext:
+
+    def __init__(self, policies: list) -> None:
+        self.policies = policies
+        self._accounts = {}                       # client_id -> [AccountRef] (por id)
+        self._data = {}                           # (aws_account_id, key) -> data | Exception
+        self._inventory = defaultdict(dict)       # client_id -> {aws_account_id: stats}
+        self._findings = defaultdict(dict)        # client_id -> {aws_account_id: stats}
+
+    # =====================================================
+    # BUILD
+    # =====================================================
+    @classmethod
+    def build(cls, policies: list) -> "AlertRunContext":
+        ctx = cls(policies)
+        client_ids = {p.client_id for p in policies}
+        if not client_ids:
+            return ctx
+
+        ctx._load_accounts(client_ids)
+        ctx._prefetch_costs()
+        ctx._load_inventory_stats({p.client_id for p in policies if p.policy_id in INVENTORY_POLICIES})
+        ctx._load_finding_stats({p.client_id for p in policies if p.policy_id in FINDING_POLICIES})
+        return ctx
+
+    def groups(self) -> dict:
+        """{(client_id, aws_account_id): [políticas]} en orden estable."""
+        grouped = defaultdict(list)
+        for policy in self.policies:
+            grouped[(policy.client_id, policy.aws_account_id)].append(policy)
+        return dict(grouped)
+
+    def _load_accounts(self, client_ids):
+        accounts = (
+            AWSAccount.query
+            .filter(AWSAccount.client_id.in_(client_ids), AWSAccount.is_active.is_(True))
+            .order_by(AWSAccount.id)
+            .all()
+        )
+        by_client = defaultdict(list)
+        for account in accounts:
+            by_client[account.client_id].append(AccountRef.from_account(account))
+        self._accounts = dict(by_client)
+
+    def _requirements(self):
+        """{aws_account_id: (claves CE, impactos mínimos de anomalías)}"""
+        keys = defaultdict(set)
+        impacts = defaultdict(set)
+
+        for policy in self.policies:
+            accounts = self.accounts_for(policy)
+            if not accounts:
+                continue
+            percent = (policy.threshold_type or "USD") == "%"
+
+            if policy.policy_id == "budget-monthly":
+                for a in accounts:
+                    keys[a.id].add("6months")
+            elif policy.policy_id == "budget-annual":
+                for a in accounts:
+                    keys[a.id].add("annual")
+            elif policy.policy_id == "service-cost":
+                for a in accounts:
+                    keys[a.id].add("service_breakdown")
+            elif policy.policy_id == "anomaly-spike":
+                for a in accounts:
+                    impacts[a.id].add(anomaly_min_impact(policy))
+                # Fallback manual sobre la primera cuenta
+                keys[accounts[0].id].add("6months")
+            elif policy.policy_id == "forecast":
+                for a in (accounts if percent else accounts[:1]):
+                    keys[a.id].add("6months")
+
+        return keys, impacts
+
+    def _prefetch_costs(self):
+        keys, impacts = self._requirements()
+        account_ids = set(keys) | set(impacts)
+        if not account_ids:
+            return
+
+        cached = CostExplorerCacheService.read_many(account_ids)
+        self._data.update(cached)
+
+        refs = {a.id: a for accounts in self._accounts.values() for a in accounts}
+        tasks = {}
+        for account_id in account_ids:
+            misses = {k for k in keys.get(account_id, ()) if (account_id, k) not in cached}
+            if misses or impacts.get(account_id):
+                tasks[account_id] = (misses, impacts.get(account_id, set()))
+
+        if not tasks:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(max_workers(), len(tasks))) as executor:
+            futures = {
+                account_id: executor.submit(_fetch_account, refs[account_id], misses, min_impacts)
+                for account_id, (misses, min_impacts) in tasks.items()
+            }
+            results = {account_id: future.result() for account_id, future in futures.items()}
+
+        # Escrituras en el thread que orquesta (el que tiene la sesión),
+        # todas en un solo commit
+        to_store = {}
+        for account_id, fetched in results.items():
+            for key, value in fetched.items():
+                self._data[(account_id, key)] = value
+                if key in CE_METHODS and not isinstance(value, Exception):
+                    logger.info(f"[CE_CACHE] MISS {key} account={account_id} → AWS API")
+                    to_store[(account_id, key)] = value
+        CostExplorerCacheService.store_many(to_store)
+
+    def _load_inventory_stats(self, client_ids):
+        if not client_ids:
+            return
+        inv = AWSResourceInventory
+        untagged = or_(inv.tags.is_(None), cast(inv.tags, Text).in_(("null", "{}", "[]", '""')))
+        rows = (
+            db.session.query(
+                inv.client_id,
+                inv.aws_account_id,
+                func.count(inv.id).label("total"),
+                func.count(inv.id).filter(untagged).label("untagged"),
+                func.count(inv.id).filter(inv.state.in_(RUNNING_STATES)).label("running"),
+            )
+            .filter(inv.client_id.in_(client_ids), inv.is_active.is_(True))
+            .group_by(inv.client_id, inv.aws_account_id)
+            .all()
+        )
+        for row in rows:
+            self._inventory[row.client_id][row.aws_account_id] = {
+                "total": row.total, "untagged": row.untagged, "running": row.running,
+            }
+
+    def _load_finding_stats(self, client_ids):
+        if not client_ids:
+            return
+        ftype = func.lower(AWSFinding.finding_type)
+        is_idle = or_(*(ftype.contains(t, autoescape=True) for t in IDLE_TYPES))
+        is_lifecycle = or_(*(ftype.contains(t, autoescape=True) for t in LIFECYCLE_TYPES))
+        rows = (
+            db.session.query(
+                AWSFinding.client_id,
+                AWSFinding.aws_account_id,
+                func.count(AWSFinding.id).filter(is_idle).label("idle"),
+                func.coalesce(
+                    func.sum(AWSFinding.estimated_monthly_savings).filter(is_idle), 0
+                ).label("idle_savings"),
+                func.count(AWSFinding.id).filter(is_lifecycle).label("lifecycle"),
+            )
+            .filter(AWSFinding.client_id.in_(client_ids), AWSFinding.resolved.is_(False))
+            .group_by(AWSFinding.client_id, AWSFinding.aws_account_id)
+            .all()
+        )
+        for row in rows:
+            self._findings[row.client_id][row.aws_account_id] = {
+                "idle": row.idle,
+                "idle_savings": float(row.idle_savings or 0),
+                "lifecycle": row.lifecycle,
+            }
+
+    # =====================================================
+    # LECTURA (EVALUADORES)
+    # =====================================================
+    def accounts_for(self, policy) -> list[AccountRef]:
+        accounts = self._accounts.get(policy.client_id, [])
+        if policy.aws_account_id:
+            return [a for a in accounts if a.id == policy.aws_account_id]
+        return accounts
+
+    def _get(self, account: AccountRef, key):
+        value = self._data.get((account.id, key))
+        if isinstance(value, Exception):
+            raise value
+        if value is None:
+            raise LookupError(f"{key} no precargado para la cuenta {account.id}")
+        return value
+
+    def last_6_months(self, account: AccountRef) -> list:
+        return self._get(account, "6months")
+
+    def annual_costs(self, account: AccountRef) -> dict:
+        return self._get(account, "annual")
+
+    def service_breakdown(self, account: AccountRef) -> list:
+        return self._get(account, "service_breakdown")
+
+    def anomalies(self, account: AccountRef, min_impact: float) -> list:
+        return self._data.get((account.id, ("anomalies", min_impact)), [])
+
+    def _sum_stats(self, stats_by_account: dict, policy, fields) -> dict:
+        totals = dict.fromkeys(fields, 0)
+        for aws_account_id, stats in stats_by_account.items():
+            if policy.aws_account_id and aws_account_id != policy.aws_account_id:
+                continue
+            for field in fields:
+                totals[field] += stats[field]
+        return totals
+
+    def inventory_stats(self, policy) -> dict:
+        return self._sum_stats(
+            self._inventory.get(policy.client_id, {}), policy, ("total", "untagged", "running")
+        )
+
+    def finding_stats(self, policy) -> dict:
+        return self._sum_stats(
+            self._findings.get(policy.client_id, {}), policy, ("idle", "idle_savings", "lifecycle")
+        )
@@ -0,0 +1,310 @@
+"""
+assistant_context.py
+Contexto de datos de Finops.ia por (cliente, cuenta).
+
+Los handlers del asistente ya no cargan findings / inventario completos:
+leen este contexto, que se arma con pocas queries agregadas
+
+1. findings abiertos agrupados por (cuenta, servicio, severidad, tipo):
+   totales, por servicio, por severidad, por tipo, por cuenta.
+2. findings abiertos con row_number() por cada lista que muestran los
+   handlers (top ahorro, prioridad, CRITICAL, sin usar, por servicio):
+   sólo vuelven las filas que entran en alguna lista.
+3. inventario activo agrupado por (servicio, región).
+4. últimos 2 risk snapshots y cuentas activas.
+
+Se cachea en el cache del dashboard (kind="assistant"): comparte la
+generación del cliente, así que una auditoría terminada o un finding
+resuelto lo invalida igual que al resumen. Todo es JSON (va a Redis).
+"""
+from sqlalchemy import and_, case, func, or_, select
+
+from src.models.aws_account import AWSAccount
+from src.models.aws_finding import AWSFinding
+from src.models.aws_resource_inventory import AWSResourceInventory
+from src.models.database import db
+from src.models.risk_snapshot import RiskSnapshot
+from src.services.dashboard.cache import get_cache
+
+
+CACHE_KIND = "assistant"
+
+SEVERITY_RANK = {"CRITICAL": 4, "HIGH": 3, "MEDIUM": 2, "LOW": 1}
+
+# Tipos de finding que los handlers tratan como "sin usar"
+IDLE_KEYWORDS = ("IDLE", "UNDERUTILIZED", "UNUSED", "NAT_IDLE")
+# ... y como candidatos a eliminar en el plan de reducción (sin UNDERUTILIZED)
+REMOVABLE_KEYWORDS = ("IDLE", "UNUSED", "NAT_IDLE")
+RIGHTSIZE_KEYWORDS = ("RIGHTSIZE", "DOWNSIZE")
+
+# Largo de cada lista que arman los handlers
+TOP_LIMIT = 8
+PRIORITY_LIMIT = 6
+CRITICAL_LIMIT = 7
+IDLE_LIMIT = 6
+REMOVABLE_LIMIT = 3
+SERVICE_LIMIT = 5
+
+MESSAGE_CHARS = 200
+
+
+def get_assistant_context(client_id: int, aws_account_id: int | None = None) -> dict:
+    aws_account_id = aws_account_id or None
+    return get_cache().get_or_build(
+        client_id,
+        aws_account_id,
+        lambda: build_assistant_context(client_id, aws_account_id),
+        kind=CACHE_KIND,
+    )
+
+
+def build_assistant_context(client_id: int, aws_account_id: int | None = None) -> dict:
+    context = {"aws_account_id": aws_account_id}
+    context.update(_finding_aggregates(client_id, aws_account_id))
+    context.update(_finding_lists(client_id, aws_account_id))
+    context["inventory"] = _inventory_counts(client_id, aws_account_id)
+    context["snapshots"] = _snapshots(client_id)
+    context["accounts"] = _accounts(client_id)
+    return context
+
+
+# ── Helpers ──────────────────────────────────────────────────
+def _matches(finding_type, keywords) -> bool:
+    t = (finding_type or "").upper()
+    return any(k in t for k in keywords)
+
+
+def _sql_matches(keywords):
+    t = func.upper(AWSFinding.finding_type)
+    return or_(*(t.contains(k) for k in keywords))
+
+
+def _open_findings(client_id, aws_account_id):
+    conditions = [AWSFinding.client_id == client_id, AWSFinding.resolved.is_(False)]
+    if aws_account_id:
+        conditions.append(AWSFinding.aws_account_id == aws_account_id)
+    return conditions
+
+
+def _group():
+    return {"count": 0, "savings": 0.0}
+
+
+def _add(group, count, savings):
+    group["count"] += count
+    group["savings"] += savings
+
+
+# ── 1. Agregados de findings ─────────────────────────────────
+def _finding_aggregates(client_id, aws_account_id) -> dict:
+    # Sin filtro de cuenta: "por cuenta" compara todas las del cliente
+    rows = db.session.execute(
+        select(
+            AWSFinding.aws_account_id,
+            AWSFinding.aws_service,
+            AWSFinding.severity,
+            AWSFinding.finding_type,
+            func.count(AWSFinding.id).label("count"),
+            func.coalesce(func.sum(AWSFinding.estimated_monthly_savings), 0).label("savings"),
+        )
+        .where(*_open_findings(client_id, None))
+        .group_by(
+            AWSFinding.aws_account_id,
+            AWSFinding.aws_service,
+            AWSFinding.severity,
+            AWSFinding.finding_type,
+        )
+    ).all()
+
+    totals = _group()
+    severity = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0}
+    by_type = {}
+    by_service = {}
+    service_accounts = {}
+    by_account = {}
+    groups = {"critical": _group(), "idle": _group(), "removable": _group(), "rightsize": _group()}
+
+    for row in rows:
+        savings = float(row.savings or 0)
+
+        account = by_account.setdefault(row.aws_account_id, _group())
+        _add(account, row.count, savings)
+
+        if aws_account_id and row.aws_account_id != aws_account_id:
+            continue
+
+        _add(totals, row.count, savings)
+        _add(by_service.setdefault(row.aws_service, _group()), row.count, savings)
+        severity[row.severity] = severity.get(row.severity, 0) + row.count
+        by_type[row.finding_type] = by_type.get(row.finding_type, 0) + row.count
+
+        accounts = service_accounts.setdefault(row.aws_service, [])
+        if row.aws_account_id not in accounts:
+            accounts.append(row.aws_account_id)
+
+        if row.severity == "CRITICAL":
+            _add(groups["critical"], row.count, savings)
+        if _matches(row.finding_type, IDLE_KEYWORDS):
+            _add(groups["idle"], row.count, savings)
+        if _matches(row.finding_type, REMOVABLE_KEYWORDS):
+            _add(groups["removable"], row.count, savings)
+        if _matches(row.finding_type, RIGHTSIZE_KEYWORDS):
+            _add(groups["rightsize"], row.count, savings)
+
+    return {
+        "totals": totals,
+        "severity": severity,
+        "by_type": sorted(by_type.items(), key=lambda x: -x[1]),
+        "by_service": sorted(
+            ([svc, g["savings"], g["count"]] for svc, g in by_service.items()),
+            key=lambda x: -x[1]
+        ),
+        "service_accounts": service_accounts,
+        "by_account": sorted(
+            ([acc_id, g["savings"], g["count"]] for acc_id, g in by_account.items()),
+            key=lambda x: -x[1]
+        ),
+        "groups": groups,
+    }
+
+
+# ── 2. Listas de findings (top-N por lista) ──────────────────
+def _finding_lists(client_id, aws_account_id) -> dict:
+    savings = func.coalesce(AWSFinding.estimated_monthly_savings, 0)
+    by_savings = (savings.desc(), AWSFinding.id)
+    severity_rank = case(SEVERITY_RANK, value=AWSFinding.severity, else_=0)
+
+    is_critical = AWSFinding.severity == "CRITICAL"
+    is_idle = _sql_matches(IDLE_KEYWORDS)
+    is_removable = _sql_matches(REMOVABLE_KEYWORDS)
+
+    def rank(partition_by=None, order_by=by_savings):
+        return func.row_number().over(partition_by=partition_by, order_by=order_by)
+
+    ranked = (
+        select(
+            AWSFinding.finding_type,
+            AWSFinding.severity,
+            AWSFinding.resource_id,
+            AWSFinding.region,
+            func.left(AWSFinding.message, MESSAGE_CHARS).label("message"),
+            AWSFinding.aws_service,
+            AWSFinding.aws_account_id,
+            savings.label("savings"),
+            is_critical.label("is_critical"),
+            is_idle.label("is_idle"),
+            is_removable.label("is_removable"),
+            rank().label("rn_top"),
+            rank(order_by=(severity_rank.desc(), *by_savings)).label("rn_priority"),
+            rank(partition_by=is_critical).label("rn_critical"),
+            rank(partition_by=is_idle).label("rn_idle"),
+            rank(partition_by=is_removable).label("rn_removable"),
+            rank(partition_by=AWSFinding.aws_service).label("rn_service"),
+        )
+        .where(*_open_findings(client_id, aws_account_id))
+        .subquery()
+    )
+    c = ranked.c
+
+    rows = db.session.execute(
+        select(ranked).where(or_(
+            c.rn_top <= TOP_LIMIT,
+            c.rn_priority <= PRIORITY_LIMIT,
+            and_(c.is_critical, c.rn_critical <= CRITICAL_LIMIT),
+            and_(c.is_idle, c.rn_idle <= IDLE_LIMIT),
+            and_(c.is_removable, c.rn_removable <= REMOVABLE_LIMIT),
+            c.rn_service <= SERVICE_LIMIT,
+        ))
+    ).all()
+
+    def pick(include, rank_of, limit):
+        chosen = sorted((r for r in rows if include(r) and rank_of(r) <= limit), key=rank_of)
+        return [_finding_dict(r) for r in chosen]
+
+    services = {}
+    for svc in sorted({r.aws_service for r in rows}):
+        services[svc] = pick(lambda r: r.aws_service == svc, lambda r: r.rn_service, SERVICE_LIMIT)
+
+    return {
+        "top": pick(lambda r: True, lambda r: r.rn_top, TOP_LIMIT),
+        "priority": pick(lambda r: True, lambda r: r.rn_priority, PRIORITY_LIMIT),
+        "critical": pick(lambda r: r.is_critical, lambda r: r.rn_critical, CRITICAL_LIMIT),
+        "idle": pick(lambda r: r.is_idle, lambda r: r.rn_idle, IDLE_LIMIT),
+        "removable": pick(lambda r: r.is_removable, lambda r: r.rn_removable, REMOVABLE_LIMIT),
+        "services": services,
+    }
+
+
+def _finding_dict(row) -> dict:
+    return {
+        "finding_type":   row.finding_type,
+        "severity":       row.severity,
+        "resource_id":    row.resource_id,
+        "region":         row.region,
+        "message":        row.message,
+        "aws_service":    row.aws_service,
+        "aws_account_id": row.aws_account_id,
+        "savings":        float(row.savings or 0),
+    }
+
+
+# ── 3. Inventario ────────────────────────────────────────────
+def _inventory_counts(client_id, aws_account_id) -> dict:
+    inv = AWSResourceInventory
+    query = (
+        select(inv.service_name, inv.region, func.count(inv.id).label("count"))
+        .where(inv.client_id == client_id, inv.is_active.is_(True))
+        .group_by(inv.service_name, inv.region)
+    )
+    if aws_account_id:
+        query = query.where(inv.aws_account_id == aws_account_id)
+
+    by_service = {}
+    by_region = {}
+    for row in db.session.execute(query):
+        by_service[row.service_name] = by_service.get(row.service_name, 0) + row.count
+        if row.region:
+            by_region[row.region] = by_region.get(row.region, 0) + row.count
+
+    return {
+        "by_service": sorted(by_service.items(), key=lambda x: -x[1]),
+        "by_region": sorted(by_region.items()),
+    }
+
+
+# ── 4. Snapshots / cuentas ───────────────────────────────────
+def _snapshots(client_id, n=2) -> list[dict]:
+    snaps = (RiskSnapshot.query.filter_by(client_id=client_id)
+             .order_by(RiskSnapshot.created_at.desc()).limit(n).all())
+
+    def num(value):
+        return float(value) if value is not None else None
+
+    return [
+        {
+            # Texto: se muestra tal cual lo guarda Numeric(5, 2)
+            "risk_score":            str(s.risk_score) if s.risk_score is not None else None,
+            "risk_level":            s.risk_level,
+            "health_score":          s.health_score,
+            "governance_percentage": num(s.governance_percentage),
+            "financial_exposure":    num(s.financial_exposure),
+            "total_findings":        s.total_findings,
+            "high_count":            s.high_count,
+            "medium_count":          s.medium_count,
+            "low_count":             s.low_count,
+        }
+        for s in snaps
+    ]
+
+
+def _accounts(client_id) -> list[dict]:
+    accounts = AWSAccount.query.filter_by(client_id=client_id, is_active=True).all()
+    return [
+        {
+            "id":           a.id,
+            "account_name": a.account_name,
+            "account_id":   a.account_id,
+            "last_sync":    a.last_sync.strftime("%Y-%m-%d %H:%M") if a.last_sync else None,
+        }
+        for a in accounts
+    ]
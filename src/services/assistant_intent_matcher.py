@@ -0,0 +1,134 @@
+"""
+assistant_intent_matcher.py
+Detección de intención de Finops.ia con un matcher precompilado.
+
+- Las palabras clave viven en archivos JSON (assistant_data/intents.json
+  y los que agregue ASSISTANT_INTENTS_FILES, separados por os.pathsep):
+  un archivo extra suma keywords a intents existentes o define intents
+  nuevos (que necesitan su handler en el engine).
+- Texto y keywords se normalizan igual: minúsculas, sin tildes, signos
+  de puntuación como espacios.
+- Todas las keywords se compilan en una sola regex (un trie de
+  prefijos, ver _trie_pattern) dentro de un lookahead: una pasada por el
+  mensaje encuentra todas las coincidencias, también las solapadas
+  ("hallazgos criticos" dentro de "muestrame hallazgos criticos"), y
+  cada una suma su largo al puntaje de sus intents. Gana el de mayor
+  puntaje; a igual puntaje, el declarado primero (el orden de antes).
+- Los intents "generic" del JSON (services_in_use, all_findings) tienen
+  keywords largas y amplias ("que recursos tengo"): sólo ganan si ningún
+  intent específico coincidió, como en el recorrido por orden de antes.
+"""
+import json
+import os
+import re
+import unicodedata
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "assistant_data")
+DEFAULT_INTENTS_FILE = os.path.join(DATA_DIR, "intents.json")
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text: str) -> str:
+    text = (text or "").casefold()
+    if not text.isascii():
+        # NFKD separa letra y tilde; el encode descarta la tilde (y ¿ ¡)
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def _trie_pattern(words) -> str:
+    """
+    Regex con prefijos factorizados ("ahorr(?:o(?: total)?|ar)"): re no
+    optimiza una alternancia plana, así cada posición del texto se
+    descarta en pocos pasos. Las ramas son codiciosas, así que en cada
+    posición gana la keyword más larga.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        ends = "" in node
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+    return emit(trie)
+
+
+def intents_files() -> list[str]:
+    extra = os.getenv("ASSISTANT_INTENTS_FILES", "")
+    return [DEFAULT_INTENTS_FILE] + [p for p in extra.split(os.pathsep) if p]
+
+
+def load_intent_data(paths: list[str] | None = None) -> dict:
+    """{"intents": {intent: [keywords]}, "off_topic": [keywords], "generic": [intents]} combinados."""
+    intents = {}
+    off_topic = []
+    generic = []
+    for path in paths or intents_files():
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for intent, keywords in data.get("intents", {}).items():
+            intents.setdefault(intent, []).extend(keywords)
+        off_topic.extend(data.get("off_topic", []))
+        generic.extend(i for i in data.get("generic", []) if i not in generic)
+    return {"intents": intents, "off_topic": off_topic, "generic": generic}
+
+
+class IntentMatcher:
+
+    def __init__(self, intents: dict[str, list[str]], generic=()) -> None:
+        self.intents = list(intents)
+        self.generic = set(generic)
+        self._order = {intent: i for i, intent in enumerate(self.intents)}
+
+        # keyword normalizada -> intents que la usan (en orden de declaración)
+        self._owners = {}
+        for intent, keywords in intents.items():
+            for kw in keywords:
+                norm = normalize(kw)
+                if not norm:
+                    continue
+                owners = self._owners.setdefault(norm, [])
+                if intent not in owners:
+                    owners.append(intent)
+
+        if self._owners:
+            trie = _trie_pattern(self._owners)
+            self._pattern = re.compile(trie)
+            # Lookahead: finditer avanza de a un carácter y no consume el
+            # texto, así una keyword dentro de otra más larga también cuenta.
+            self._overlapping = re.compile(f"(?=({trie}))")
+        else:
+            self._pattern = self._overlapping = None
+
+    def scores(self, text: str) -> dict[str, int]:
+        scores = {}
+        if self._pattern is None:
+            return scores
+        for match in self._overlapping.finditer(normalize(text)):
+            kw = match.group(1)
+            for intent in self._owners[kw]:
+                scores[intent] = scores.get(intent, 0) + len(kw)
+        return scores
+
+    def match(self, text: str) -> str | None:
+        scores = self.scores(text)
+        specific = {i: score for i, score in scores.items() if i not in self.generic}
+        scores = specific or scores
+        if not scores:
+            return None
+        return max(scores, key=lambda intent: (scores[intent], -self._order[intent]))
+
+    def matches_any(self, text: str) -> bool:
+        return self._pattern is not None and self._pattern.search(normalize(text)) is not None
@@ -0,0 +1,456 @@
+"""
+AUDIT JOB SERVICE
+=================
+Cola persistente de auditorías sobre la tabla `audit_jobs`.
+
+- enqueue(): lo usan las rutas `/audit/run` (AWS, Azure, GCP). Un solo
+  job activo por cuenta (índice único parcial); si ya hay uno, no se
+  duplica.
+- claim(): lo usa el worker. `SELECT ... FOR UPDATE SKIP LOCKED` para
+  que varios workers (en uno o varios hosts) nunca tomen el mismo job,
+  más un advisory lock por cliente para respetar el límite de auditorías
+  simultáneas por tenant.
+- start_inline(): lo usa la auditoría nocturna, que ejecuta el runner en
+  su propio proceso: registra el job ya `running` bajo el mismo advisory
+  lock y límite por tenant, así worker y run nocturno nunca auditan la
+  misma cuenta a la vez.
+- report_progress() / heartbeat(): escriben en una conexión aparte, así
+  no hacen commit del trabajo a medio terminar de la auditoría.
+- complete() / fail(): cierran el job (o lo re-encolan con backoff) y
+  reflejan el estado en `audit_status` de la cuenta, que otros
+  serializers siguen exponiendo. complete() además invalida el cache
+  del dashboard del cliente en todos los workers y sube su
+  `data_version` (los reportes cacheados dejan de servirse).
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+from src.models.database import db
+from src.models.audit_job import AuditJob
+from src.models.aws_account import AWSAccount
+from src.models.azure_account import AzureAccount
+from src.models.gcp_account import GCPAccount
+from src.services.dashboard.cache import invalidate_client
+from src.services.report_job_service import bump_data_version
+
+
+logger = logging.getLogger(__name__)
+
+ACCOUNT_MODELS = {
+    "aws": AWSAccount,
+    "azure": AzureAccount,
+    "gcp": GCPAccount,
+}
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Namespace del advisory lock por cliente (pg_try_advisory_xact_lock(ns, client_id))
+CLAIM_LOCK_NAMESPACE = 4201
+
+CLAIM_CANDIDATES = 10
+
+
+def tenant_limit() -> int:
+    return max(1, int(os.getenv("AUDIT_JOB_TENANT_LIMIT", "2")))
+
+
+def max_attempts() -> int:
+    return max(1, int(os.getenv("AUDIT_JOB_MAX_ATTEMPTS", "3")))
+
+
+def retry_backoff_seconds() -> int:
+    return max(1, int(os.getenv("AUDIT_JOB_RETRY_BACKOFF_SECONDS", "60")))
+
+
+def stale_seconds() -> int:
+    return max(60, int(os.getenv("AUDIT_JOB_STALE_SECONDS", "900")))
+
+
+_CLAIM_SQL = text("""
+    SELECT j.id, j.client_id
+    FROM audit_jobs j
+    WHERE j.status = 'queued'
+      AND j.run_after <= :now
+      AND (
+          SELECT count(*) FROM audit_jobs r
+          WHERE r.client_id = j.client_id AND r.status = 'running'
+      ) < :tenant_limit
+    ORDER BY j.run_after, j.id
+    LIMIT :limit
+    FOR UPDATE OF j SKIP LOCKED
+""")
+
+_RUNNING_FOR_CLIENT_SQL = text("""
+    SELECT count(*) FROM audit_jobs
+    WHERE client_id = :client_id AND status = 'running'
+""")
+
+
+class AuditJobService:
+
+    # =====================================================
+    # ENQUEUE (RUTAS)
+    # =====================================================
+    @staticmethod
+    def enqueue(client_id: int, provider: str, account_ids: list[int]) -> list[int]:
+        """Encola un job por cuenta. Devuelve los ids de los jobs nuevos."""
+        if provider not in ACCOUNT_MODELS:
+            raise ValueError(f"Unknown audit provider: {provider}")
+
+        if not account_ids:
+            return []
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "client_id": client_id,
+                "provider": provider,
+                "account_id": account_id,
+                "status": "queued",
+                "attempts": 0,
+                "max_attempts": max_attempts(),
+                "progress": 0,
+                "run_after": now,
+                "created_at": now,
+            }
+            for account_id in account_ids
+        ]
+
+        stmt = insert(AuditJob).values(rows).on_conflict_do_nothing(
+            index_elements=["provider", "account_id"],
+            index_where=AuditJob.status.in_(ACTIVE_STATUSES),
+        ).returning(AuditJob.id, AuditJob.account_id)
+
+        created = db.session.execute(stmt).all()
+
+        AuditJobService._mirror_accounts(
+            provider, [row.account_id for row in created], "queued",
+            started_at=None, finished_at=None
+        )
+        db.session.commit()
+
+        for row in created:
+            logger.info(
+                f"AUDIT JOB QUEUED | job_id={row.id} | client_id={client_id} | "
+                f"provider={provider} | account_id={row.account_id}"
+            )
+
+        return [row.id for row in created]
+
+    # =====================================================
+    # STATUS (RUTAS)
+    # =====================================================
+    @staticmethod
+    def latest_jobs(provider: str, account_ids: list[int]) -> dict:
+        """account_id -> último AuditJob de esa cuenta."""
+        if not account_ids:
+            return {}
+
+        jobs = (
+            AuditJob.query
+            .filter(
+                AuditJob.provider == provider,
+                AuditJob.account_id.in_(account_ids)
+            )
+            .order_by(AuditJob.account_id, AuditJob.id.desc())
+            .distinct(AuditJob.account_id)
+            .all()
+        )
+        return {job.account_id: job for job in jobs}
+
+    @staticmethod
+    def status_payload(provider: str, accounts: list, name_attr: str) -> list[dict]:
+        """Respuesta de `/audit/status`: mismas claves de siempre + progreso del job."""
+        jobs = AuditJobService.latest_jobs(provider, [a.id for a in accounts])
+
+        result = []
+        for account in accounts:
+            job = jobs.get(account.id)
+            item = {
+                "account_id": account.id,
+                "account_name": getattr(account, name_attr),
+                "status": job.status if job else "idle",
+                "started_at": job.started_at if job else None,
+                "finished_at": job.finished_at if job else None,
+                "progress": job.progress if job else 0,
+                "stage": job.stage if job else None,
+                "attempts": job.attempts if job else 0,
+                "job_id": job.id if job else None,
+            }
+            result.append(item)
+        return result
+
+    # =====================================================
+    # CLAIM (WORKER)
+    # =====================================================
+    @staticmethod
+    def claim(worker_id: str):
+        """
+        Reclama el próximo job ejecutable y lo marca `running`.
+        Devuelve el AuditJob o None si no hay nada disponible.
+        """
+        now = datetime.utcnow()
+        limit = tenant_limit()
+
+        try:
+            candidates = db.session.execute(_CLAIM_SQL, {
+                "now": now,
+                "tenant_limit": limit,
+                "limit": CLAIM_CANDIDATES,
+            }).all()
+
+            for job_id, client_id in candidates:
+                # Serializa el conteo por tenant entre workers concurrentes
+                locked = db.session.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:ns, :client_id)"),
+                    {"ns": CLAIM_LOCK_NAMESPACE, "client_id": client_id}
+                ).scalar()
+                if not locked:
+                    continue
+
+                running = db.session.execute(
+                    _RUNNING_FOR_CLIENT_SQL, {"client_id": client_id}
+                ).scalar()
+                if running >= limit:
+                    continue
+
+                job = AuditJob.query.get(job_id)
+                job.status = "running"
+                job.attempts += 1
+                job.progress = 0
+                job.stage = "claimed"
+                job.error = None
+                job.locked_by = worker_id
+                job.started_at = now
+                job.heartbeat_at = now
+                job.finished_at = None
+
+                AuditJobService._mirror_accounts(
+                    job.provider, [job.account_id], "running",
+                    started_at=now, finished_at=None
+                )
+                db.session.commit()
+                return job
+
+            db.session.rollback()
+            return None
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+    # =====================================================
+    # INLINE (AUDITORÍA NOCTURNA)
+    # =====================================================
+    @staticmethod
+    def start_inline(client_id: int, provider: str, account_id: int, worker_id: str):
+        """
+        Crea un job `running` para una auditoría que ejecuta el llamador.
+        Devuelve el AuditJob, o None si la cuenta ya tiene un job activo
+        (índice único parcial) o el cliente está en su límite de
+        auditorías simultáneas.
+
+        Un solo intento (max_attempts=1): si falla queda `failed` y el
+        worker no lo re-ejecuta; el reintento es el resume del run nocturno.
+        """
+        if provider not in ACCOUNT_MODELS:
+            raise ValueError(f"Unknown audit provider: {provider}")
+
+        now = datetime.utcnow()
+
+        try:
+            # Bloqueante (a diferencia de claim): el run nocturno puede esperar
+            # a que un worker termine de reclamar para este cliente
+            db.session.execute(
+                text("SELECT pg_advisory_xact_lock(:ns, :client_id)"),
+                {"ns": CLAIM_LOCK_NAMESPACE, "client_id": client_id}
+            )
+
+            running = db.session.execute(
+                _RUNNING_FOR_CLIENT_SQL, {"client_id": client_id}
+            ).scalar()
+            if running >= tenant_limit():
+                db.session.rollback()
+                return None
+
+            stmt = insert(AuditJob).values(
+                client_id=client_id,
+                provider=provider,
+                account_id=account_id,
+                status="running",
+                attempts=1,
+                max_attempts=1,
+                progress=0,
+                stage="claimed",
+                locked_by=worker_id,
+                run_after=now,
+                created_at=now,
+                started_at=now,
+                heartbeat_at=now,
+            ).on_conflict_do_nothing(
+                index_elements=["provider", "account_id"],
+                index_where=AuditJob.status.in_(ACTIVE_STATUSES),
+            ).returning(AuditJob.id)
+
+            job_id = db.session.execute(stmt).scalar()
+            if job_id is None:
+                db.session.rollback()
+                return None
+
+            AuditJobService._mirror_accounts(
+                provider, [account_id], "running",
+                started_at=now, finished_at=None
+            )
+            db.session.commit()
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+        logger.info(
+            f"AUDIT JOB STARTED INLINE | job_id={job_id} | client_id={client_id} | "
+            f"provider={provider} | account_id={account_id} | worker_id={worker_id}"
+        )
+        return AuditJob.query.get(job_id)
+
+    # =====================================================
+    # PROGRESS / HEARTBEAT (WORKER, CONEXIÓN APARTE)
+    # =====================================================
+    @staticmethod
+    def report_progress(job_id: int, progress: int, stage: str) -> None:
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(
+                    text("""
+                        UPDATE audit_jobs
+                        SET progress = :progress, stage = :stage, heartbeat_at = :now
+                        WHERE id = :job_id AND status = 'running'
+                    """),
+                    {"progress": progress, "stage": stage,
+                     "now": datetime.utcnow(), "job_id": job_id}
+                )
+        except Exception:
+            logger.exception(f"AUDIT JOB PROGRESS UPDATE FAILED | job_id={job_id}")
+
+    @staticmethod
+    def heartbeat(job_ids: list[int]) -> None:
+        if not job_ids:
+            return
+        with db.engine.begin() as conn:
+            conn.execute(
+                AuditJob.__table__.update()
+                .where(AuditJob.__table__.c.id.in_(job_ids))
+                .where(AuditJob.__table__.c.status == "running")
+                .values(heartbeat_at=datetime.utcnow())
+            )
+
+    # =====================================================
+    # FINISH (WORKER)
+    # =====================================================
+    @staticmethod
+    def complete(job_id: int, result: dict | None = None) -> None:
+        now = datetime.utcnow()
+        job = AuditJob.query.get(job_id)
+        if not job:
+            return
+
+        job.status = "completed"
+        job.progress = 100
+        job.stage = "done"
+        job.result = result
+        job.finished_at = now
+        job.locked_by = None
+
+        AuditJobService._mirror_accounts(
+            job.provider, [job.account_id], "completed", finished_at=now
+        )
+        db.session.commit()
+
+        invalidate_client(job.client_id)
+        bump_data_version(job.client_id)
+
+    @staticmethod
+    def fail(job_id: int, error: str) -> None:
+        """Re-encola con backoff exponencial o marca `failed` si agotó intentos."""
+        now = datetime.utcnow()
+        job = AuditJob.query.get(job_id)
+        if not job:
+            return
+
+        AuditJobService._retry_or_fail(job, error, now)
+        db.session.commit()
+
+    @staticmethod
+    def requeue_stale() -> int:
+        """Jobs `running` sin heartbeat (worker caído o reiniciado)."""
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=stale_seconds())
+
+        stale = (
+            AuditJob.query
+            .filter(
+                AuditJob.status == "running",
+                AuditJob.heartbeat_at < cutoff
+            )
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for job in stale:
+            logger.warning(
+                f"AUDIT JOB STALE | job_id={job.id} | locked_by={job.locked_by}"
+            )
+            AuditJobService._retry_or_fail(job, "Worker heartbeat lost", now)
+
+        db.session.commit()
+        return len(stale)
+
+    # =====================================================
+    # HELPERS
+    # =====================================================
+    @staticmethod
+    def _retry_or_fail(job, error, now):
+        job.error = (error or "")[:2000]
+        job.locked_by = None
+
+        if job.attempts < job.max_attempts:
+            delay = retry_backoff_seconds() * (2 ** (job.attempts - 1))
+            job.status = "queued"
+            job.stage = "retry_scheduled"
+            job.run_after = now + timedelta(seconds=delay)
+            AuditJobService._mirror_accounts(job.provider, [job.account_id], "queued")
+            logger.warning(
+                f"AUDIT JOB RETRY | job_id={job.id} | attempt={job.attempts}/{job.max_attempts} | "
+                f"retry_in={delay}s"
+            )
+        else:
+            job.status = "failed"
+            job.finished_at = now
+            AuditJobService._mirror_accounts(
+                job.provider, [job.account_id], "failed", finished_at=now
+            )
+            logger.error(
+                f"AUDIT JOB FAILED | job_id={job.id} | attempts={job.attempts}"
+            )
+
+    @staticmethod
+    def _mirror_accounts(provider, account_ids, status, **timestamps):
+        """Refleja el estado en `<provider>_accounts.audit_status` (lo exponen los to_dict)."""
+        if not account_ids:
+            return
+
+        values = {"audit_status": status}
+        if "started_at" in timestamps:
+            values["audit_started_at"] = timestamps["started_at"]
+        if "finished_at" in timestamps:
+            values["audit_finished_at"] = timestamps["finished_at"]
+
+        model = ACCOUNT_MODELS[provider]
+        model.query.filter(model.id.in_(account_ids)).update(
+            values, synchronize_session=False
+        )
@@ -0,0 +1,184 @@
+"""
+AUDIT WORKER
+============
+Proceso independiente que consume `audit_jobs` (ver AuditJobService).
+
+Corre fuera de gunicorn (`python scripts/audit_worker.py`), así las
+auditorías no compiten con los requests por el GIL, sobreviven a
+reinicios del API y se pueden repartir en varios hosts: cada worker
+reclama jobs con SKIP LOCKED.
+
+Dentro del proceso, `concurrency` threads ejecutan jobs en paralelo; el
+thread principal reclama jobs, mantiene el heartbeat de los que están
+corriendo y re-encola los que quedaron huérfanos.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from src.models.database import db
+from src.services.audit_job_service import AuditJobService
+
+
+logger = logging.getLogger(__name__)
+
+
+class AuditJobError(Exception):
+    """El auditor devolvió status=error (se reintenta como cualquier fallo)."""
+
+
+# =====================================================
+# EJECUCIÓN POR PROVIDER
+# =====================================================
+def _run_aws(client_id, account_id, progress):
+    from src.aws.finops_auditor import FinOpsAuditor
+    from src.services.cost_explorer_cache_service import CostExplorerCacheService
+
+    result = FinOpsAuditor().run_comprehensive_audit(client_id, account_id, progress=progress)
+    if result.get("status") == "ok":
+        # Invalidar caché de desglose por servicio para que el
+        # dashboard refleje los nuevos datos tras el scan.
+        CostExplorerCacheService.invalidate_service_breakdown(account_id)
+    return result
+
+
+def _run_azure(client_id, account_id, progress):
+    from src.azure.azure_auditor import AzureAuditor
+    return AzureAuditor().run_comprehensive_audit(client_id, account_id, progress=progress)
+
+
+def _run_gcp(client_id, account_id, progress):
+    from src.gcp.gcp_auditor import GCPAuditor
+    return GCPAuditor().run_comprehensive_audit(client_id, account_id, progress=progress)
+
+
+RUNNERS = {
+    "aws": _run_aws,
+    "azure": _run_azure,
+    "gcp": _run_gcp,
+}
+
+
+class AuditWorker:
+
+    HEARTBEAT_SECONDS = 30
+    STALE_CHECK_SECONDS = 60
+
+    def __init__(self, app, concurrency=None, poll_seconds=None, worker_id=None):
+        self.app = app
+        self.concurrency = concurrency or max(1, int(os.getenv("AUDIT_WORKER_CONCURRENCY", "4")))
+        self.poll_seconds = poll_seconds or float(os.getenv("AUDIT_WORKER_POLL_SECONDS", "5"))
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._running = {}          # job_id -> Future
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    # =====================================================
+    # JOB
+    # =====================================================
+    def _execute(self, job_id, client_id, provider, account_id):
+        with self.app.app_context():
+            log_ctx = f"job_id={job_id} | client_id={client_id} | provider={provider}"
+            start = time.time()
+
+            def progress(pct, stage):
+                AuditJobService.report_progress(job_id, pct, stage)
+
+            try:
+                logger.info(f"AUDIT JOB START | {log_ctx}")
+                result = RUNNERS[provider](client_id, account_id, progress)
+
+                if not result or result.get("status") != "ok":
+                    raise AuditJobError((result or {}).get("message", "Audit failed"))
+
+                AuditJobService.complete(job_id, result)
+                logger.info(
+                    f"AUDIT JOB COMPLETED | {log_ctx} | duration={time.time() - start:.2f}s"
+                )
+
+            except Exception as e:
+                logger.exception(f"AUDIT JOB ERROR | {log_ctx}")
+                db.session.rollback()
+                try:
+                    AuditJobService.fail(job_id, str(e))
+                except Exception:
+                    logger.exception(f"AUDIT JOB FAIL UPDATE ERROR | {log_ctx}")
+                    db.session.rollback()
+
+            finally:
+                db.session.remove()
+
+    # =====================================================
+    # LOOP
+    # =====================================================
+    def _free_slots(self):
+        with self._lock:
+            for job_id in [j for j, f in self._running.items() if f.done()]:
+                self._running.pop(job_id)
+            return self.concurrency - len(self._running)
+
+    def _claim_jobs(self, executor):
+        claimed = 0
+        while self._free_slots() > 0 and not self._stop.is_set():
+            job = AuditJobService.claim(self.worker_id)
+            if job is None:
+                break
+
+            future = executor.submit(
+                self._execute, job.id, job.client_id, job.provider, job.account_id
+            )
+            with self._lock:
+                self._running[job.id] = future
+            claimed += 1
+        return claimed
+
+    def run_forever(self):
+        logger.info(
+            f"AUDIT WORKER START | worker_id={self.worker_id} | concurrency={self.concurrency}"
+        )
+
+        last_heartbeat = last_stale_check = 0.0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            with self.app.app_context():
+                # Al parar se deja de reclamar, pero se sigue mandando
+                # heartbeat hasta que terminen los jobs en curso.
+                while not self._stop.is_set() or self._free_slots() < self.concurrency:
+                    try:
+                        now = time.monotonic()
+
+                        if now - last_stale_check >= self.STALE_CHECK_SECONDS:
+                            AuditJobService.requeue_stale()
+                            last_stale_check = now
+
+                        if now - last_heartbeat >= self.HEARTBEAT_SECONDS:
+                            with self._lock:
+                                job_ids = list(self._running)
+                            AuditJobService.heartbeat(job_ids)
+                            last_heartbeat = now
+
+                        claimed = 0
+                        if not self._stop.is_set():
+                            claimed = self._claim_jobs(executor)
+
+                    except Exception:
+                        logger.exception(f"AUDIT WORKER LOOP ERROR | worker_id={self.worker_id}")
+                        db.session.rollback()
+                        claimed = 0
+
+                    finally:
+                        db.session.remove()
+
+                    if not claimed:
+                        time.sleep(self.poll_seconds if not self._stop.is_set() else 1)
+
+        logger.info(f"AUDIT WORKER STOPPED | worker_id={self.worker_id}")
@@ -8,7 +8,7 @@ All helpers are pure functions that receive a SQLAlchemy query object and return
 the filtered query, so behaviour is identical to the original inline code.
 """
 
-from sqlalchemy import or_
+from sqlalchemy import func, or_
 
 from src.models.aws_finding import AWSFinding
 from src.models.aws_resource_inventory import AWSResourceInventory
@@ -46,24 +46,47 @@ def apply_finding_type_filter(query, finding_type):
     return query
 
 
+def escape_like(value):
+    """Escape LIKE wildcards so user input is matched literally (escape='\\')."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 def apply_service_filter(query, service):
+    """
+    Case-insensitive exact match. Equality on lower(aws_service) uses the
+    (client_id, lower(aws_service)) index, unlike ILIKE, and treats '_' / '%'
+    in the input literally.
+    """
     if service:
-        query = query.filter(AWSFinding.aws_service.ilike(service))
+        query = query.filter(func.lower(AWSFinding.aws_service) == service.lower())
     return query
 
 
 def apply_region_filter(query, region):
+    """
+    Prefix match ('us-east' -> us-east-1, us-east-2). Regions are stored in
+    lowercase, so a case-sensitive LIKE on the lowered input is equivalent to
+    the old ILIKE and can use the varchar_pattern_ops index.
+    """
     if region:
-        query = query.filter(AWSFinding.region.ilike(f"{region}%"))
+        query = query.filter(
+            AWSFinding.region.like(f"{escape_like(region.lower())}%", escape="\\")
+        )
     return query
 
 
 def apply_search_filter(query, search):
+    """
+    Substring match on resource_id / message. Both columns have pg_trgm GIN
+    indexes, so ILIKE '%term%' is an index scan for terms of 3+ chars.
+    Ranked / prefix search lives in src/services/search_service.py.
+    """
     if search:
+        pattern = f"%{escape_like(search)}%"
         query = query.filter(
             or_(
-                AWSFinding.resource_id.ilike(f"%{search}%"),
-                AWSFinding.message.ilike(f"%{search}%")
+                AWSFinding.resource_id.ilike(pattern, escape="\\"),
+                AWSFinding.message.ilike(pattern, escape="\\")
             )
         )
     return query
@@ -7,6 +7,10 @@ from sqlalchemy import func, case, and_
 from src.models.database import db
 from src.models.aws_finding import AWSFinding
 from src.models.aws_resource_inventory import AWSResourceInventory
+from src.services.dashboard.cache import invalidate_client
+from src.services.inventory.rollup_service import InventoryRollupService
+from src.services.keyset_pagination import invalidate_counts
+from src.services.report_job_service import bump_data_version
 
 
 def resolve_finding_record(client_id: int, finding_id: int, user_id: int):
@@ -30,7 +34,12 @@ def resolve_finding_record(client_id: int, finding_id: int, user_id: int):
     finding.resolved_by = user_id
     finding.updated_at = datetime.utcnow()
 
+    InventoryRollupService.refresh(client_id, finding.aws_account_id)
+
     db.session.commit()
+    invalidate_client(client_id)
+    invalidate_counts(client_id)
+    bump_data_version(client_id)
 
     return finding
 
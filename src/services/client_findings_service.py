@@ -7,6 +7,14 @@ from src.models.aws_resource_inventory import AWSResourceInventory
 from src.models.aws_account import AWSAccount
 from src.services.client_dashboard_service import ClientDashboardService
 from src.services.client_findings_ops import resolve_finding_record, get_summary_by_service
+from src.services.keyset_pagination import (
+    apply_keyset,
+    cached_count,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    order_by_keyset,
+)
 
 # Filter/query helpers live in a dedicated module to keep this file < 300 lines.
 from src.services.client_findings_filters import (
@@ -33,7 +41,8 @@ class ClientFindingsService:
         per_page=20,
         search=None,
         sort_by="created_at",
-        sort_order="desc"
+        sort_order="desc",
+        cursor=None
     ):
 
         # ---------------- BASE QUERY (JOIN INVENTORY ACTIVO) ----------------
@@ -80,27 +89,51 @@ class ClientFindingsService:
             "resource_id": AWSFinding.resource_id
         }
 
-        sort_column = allowed_sort_fields.get(sort_by, AWSFinding.created_at)
+        if sort_by not in allowed_sort_fields:
+            sort_by = "created_at"
+
+        per_page = min(max(per_page, 1), 200)
 
-        if sort_order == "asc":
-            query = query.order_by(sort_column.asc())
-        else:
-            query = query.order_by(sort_column.desc())
+        # id como desempate: orden total y estable entre páginas
+        key_columns = [allowed_sort_fields[sort_by], AWSFinding.id]
+        descending = sort_order != "asc"
+        cursor_key = f"{sort_by}:{'desc' if descending else 'asc'}"
 
-        # ---------------- PAGINATION ----------------
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        # ---------------- TOTAL (cacheado, no COUNT por página) ----------------
+        total = cached_count(
+            (client_id, "findings", aws_account_id, status, severity,
+             finding_type, service, search, region),
+            lambda: query.count()
         )
 
-        findings = pagination.items
+        # ---------------- PAGINATION (KEYSET) ----------------
+        # Con cursor: "después de la última fila". Sin cursor se acepta
+        # `page` (OFFSET) por compatibilidad con clientes viejos.
+        if cursor:
+            query = apply_keyset(
+                query,
+                key_columns,
+                decode_cursor(cursor, cursor_key),
+                descending
+            )
+
+        query = order_by_keyset(query, key_columns, descending)
+
+        if not cursor and page > 1:
+            query = query.offset((page - 1) * per_page)
+
+        findings, next_key = fetch_page(
+            query,
+            per_page,
+            lambda row: [getattr(row[0], sort_by), row[0].id]
+        )
 
         return {
-            "total": pagination.total,
-            "pages": pagination.pages,
-            "current_page": pagination.page,
-            "per_page": pagination.per_page,
+            "total": total,
+            "pages": max(1, -(-total // per_page)),
+            "current_page": page,
+            "per_page": per_page,
+            "next_cursor": encode_cursor(next_key, cursor_key) if next_key else None,
             "data": [
                 {
                     "id": f.id,
@@ -39,6 +39,8 @@ def create_client_user(actor: User, name: str, email: str, role: str, password:
     db.session.add(new_user)
     db.session.commit()
 
+    # Lleva la contraseña inicial: se envía en línea, no pasa por
+    # notification_outbox (no debe quedar guardada en la base).
     try:
         send_email(
             to=email,
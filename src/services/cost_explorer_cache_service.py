@@ -26,6 +26,12 @@ _TTL = {
 }
 
 
+def _is_fresh(row) -> bool:
+    ttl = _TTL.get(row.cache_key, 24 * 3600)
+    age = (datetime.utcnow() - row.fetched_at).total_seconds()
+    return age <= ttl
+
+
 def _read_cache(aws_account_id: int, cache_key: str):
     """Devuelve los datos cacheados si aún son válidos, o None si vencieron."""
     row = CostExplorerCache.query.filter_by(
@@ -33,12 +39,7 @@ def _read_cache(aws_account_id: int, cache_key: str):
         cache_key=cache_key
     ).first()
 
-    if row is None:
-        return None
-
-    ttl = _TTL.get(cache_key, 24 * 3600)
-    age = (datetime.utcnow() - row.fetched_at).total_seconds()
-    if age > ttl:
+    if row is None or not _is_fresh(row):
         return None
 
     return json.loads(row.data_json)
@@ -122,6 +123,60 @@ class CostExplorerCacheService:
         _write_cache(self._account.id, key, data)
         return data
 
+    # ── Lectura / escritura en lote (motor de alertas) ──────────────
+    @staticmethod
+    def read_many(aws_account_ids) -> dict:
+        """{(aws_account_id, cache_key): data} de las entradas vigentes, en 1 query."""
+        if not aws_account_ids:
+            return {}
+        rows = CostExplorerCache.query.filter(
+            CostExplorerCache.aws_account_id.in_(list(aws_account_ids))
+        ).all()
+        return {
+            (row.aws_account_id, row.cache_key): json.loads(row.data_json)
+            for row in rows
+            if _is_fresh(row)
+        }
+
+    @staticmethod
+    def store_many(entries: dict) -> None:
+        """
+        Guarda {(aws_account_id, cache_key): data} con 1 query de lectura y
+        un solo commit (_write_cache hace commit por entrada, y cada
+        commit expira todo lo cargado en la sesión).
+        """
+        if not entries:
+            return
+
+        account_ids = {account_id for account_id, _ in entries}
+        rows = {
+            (row.aws_account_id, row.cache_key): row
+            for row in CostExplorerCache.query.filter(
+                CostExplorerCache.aws_account_id.in_(list(account_ids))
+            ).all()
+        }
+
+        now = datetime.utcnow()
+        for (aws_account_id, cache_key), data in entries.items():
+            serialized = json.dumps(data)
+            row = rows.get((aws_account_id, cache_key))
+            if row:
+                row.data_json = serialized
+                row.fetched_at = now
+            else:
+                db.session.add(CostExplorerCache(
+                    aws_account_id=aws_account_id,
+                    cache_key=cache_key,
+                    data_json=serialized,
+                    fetched_at=now
+                ))
+
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"[CE_CACHE] batch write failed entries={len(entries)}: {e}")
+
     # ── Invalidación forzada (Scan RUN) ──────────────────────────────
     @staticmethod
     def invalidate_service_breakdown(aws_account_id: int) -> None:
@@ -0,0 +1,304 @@
+"""
+DAILY AUDIT RUNNER
+==================
+Auditoría nocturna de todos los clientes activos (AWS, Azure y GCP).
+
+- Los clientes se reparten en un process pool (contexto `spawn`): cada
+  proceso importa la app y mantiene su propio app context, así que no
+  comparte conexiones de SQLAlchemy con el padre.
+- Las llamadas a STS y Cost Explorer se acotan globalmente (entre todos
+  los procesos) con semáforos de multiprocessing vía `api_limiter`.
+- Cada cuenta se audita bajo un job de `audit_jobs` creado con
+  AuditJobService.start_inline (advisory lock + límite por tenant + un
+  solo job activo por cuenta): un `/audit/run` del usuario no puede
+  correr en paralelo con la auditoría nocturna de la misma cuenta, y
+  `audit_status` / progreso se ven igual que con el worker.
+- El padre es el único que escribe el archivo de estado: cada cliente
+  terminado queda registrado bajo el run_id que se persiste al arrancar.
+  Si el run se cae, el siguiente arranque retoma ese mismo run (aunque
+  haya pasado la medianoche UTC); solo un run terminado (`finished_at`)
+  da lugar a uno nuevo.
+- Al final imprime (y deja en el estado) el tiempo por cliente y por
+  cuenta.
+
+Entry point: scripts/daily_snapshot.py
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+
+def default_processes() -> int:
+    return max(1, int(os.getenv("DAILY_RUN_PROCESSES", str(min(4, os.cpu_count() or 1)))))
+
+
+def default_state_path() -> str:
+    return os.getenv("DAILY_RUN_STATE_PATH", os.path.join("instance", "daily_run_state.json"))
+
+
+# =====================================================
+# PROCESO HIJO
+# =====================================================
+_app_context = None
+
+
+def _init_process(semaphores):
+    """Initializer del pool: app context propio + límites globales de API."""
+    global _app_context
+
+    from app import app
+    from src.aws import api_limiter
+
+    api_limiter.install(semaphores)
+
+    _app_context = app.app_context()
+    _app_context.push()
+
+
+@contextmanager
+def _job_heartbeat(job_id: int):
+    """Heartbeat del job mientras corre el runner (si no, requeue_stale lo daría por caído)."""
+    from flask import current_app
+    from src.services.audit_job_service import AuditJobService
+    from src.services.audit_worker import AuditWorker
+
+    app = current_app._get_current_object()
+    stop = threading.Event()
+
+    def beat():
+        with app.app_context():
+            while not stop.wait(AuditWorker.HEARTBEAT_SECONDS):
+                try:
+                    AuditJobService.heartbeat([job_id])
+                except Exception:
+                    logger.exception(f"DAILY AUDIT HEARTBEAT FAILED | job_id={job_id}")
+
+    thread = threading.Thread(target=beat, name=f"daily-heartbeat-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def audit_tenant(client_id: int) -> dict:
+    """Audita todas las cuentas activas (AWS, Azure, GCP) de un cliente."""
+    from src.models.database import db
+    from src.services.audit_job_service import ACCOUNT_MODELS, AuditJobService
+    from src.services.audit_worker import RUNNERS
+    from src.services.dashboard.cache import invalidate_client
+    from src.services.report_job_service import bump_data_version
+    from src.services.risk_snapshot_service import RiskSnapshotService
+
+    tenant_start = time.time()
+    report = {"client_id": client_id, "accounts": [], "status": "ok"}
+    worker_id = f"daily:{socket.gethostname()}:{os.getpid()}"
+
+    for provider, model in ACCOUNT_MODELS.items():
+        accounts = model.query.filter_by(client_id=client_id, is_active=True).all()
+
+        for account in accounts:
+            account_start = time.time()
+            entry = {"provider": provider, "account_id": account.id}
+
+            # Si el usuario lanzó una auditoría a mano (o el cliente está en
+            # su límite de auditorías simultáneas), no se pisa
+            job = AuditJobService.start_inline(client_id, provider, account.id, worker_id)
+
+            if job is None:
+                entry["status"] = "skipped_busy"
+            else:
+                job_id = entry["job_id"] = job.id
+
+                def progress(pct, stage, job_id=job_id):
+                    AuditJobService.report_progress(job_id, pct, stage)
+
+                try:
+                    with _job_heartbeat(job_id):
+                        result = RUNNERS[provider](client_id, account.id, progress) or {}
+                    entry["status"] = result.get("status", "error")
+                    entry["findings_created"] = result.get("findings_created", 0)
+                    if entry["status"] == "ok":
+                        AuditJobService.complete(job_id, result)
+                    else:
+                        entry["error"] = result.get("message")
+                        AuditJobService.fail(job_id, entry["error"] or "Audit failed")
+                except Exception as e:
+                    logger.exception(
+                        f"DAILY AUDIT ERROR | client_id={client_id} | "
+                        f"provider={provider} | account_id={account.id}"
+                    )
+                    db.session.rollback()
+                    entry["status"] = "error"
+                    entry["error"] = str(e)
+                    try:
+                        AuditJobService.fail(job_id, str(e))
+                    except Exception:
+                        logger.exception(f"DAILY AUDIT FAIL UPDATE ERROR | job_id={job_id}")
+                        db.session.rollback()
+
+            entry["duration_seconds"] = round(time.time() - account_start, 2)
+            report["accounts"].append(entry)
+
+            if entry["status"] == "error":
+                report["status"] = "partial"
+
+    # Snapshot agregado del cliente
+    try:
+        RiskSnapshotService.create_snapshot(client_id)
+    except Exception as e:
+        logger.exception(f"DAILY SNAPSHOT ERROR | client_id={client_id}")
+        db.session.rollback()
+        report["status"] = "partial"
+        report["snapshot_error"] = str(e)
+
+    invalidate_client(client_id)
+    bump_data_version(client_id)
+    db.session.remove()
+
+    report["duration_seconds"] = round(time.time() - tenant_start, 2)
+    return report
+
+
+# =====================================================
+# PROCESO PADRE
+# =====================================================
+class DailyAuditRunner:
+
+    def __init__(self, processes=None, state_path=None, sts_concurrency=None,
+                 ce_concurrency=None):
+        self.processes = processes or default_processes()
+        self.state_path = state_path or default_state_path()
+        self.sts_concurrency = sts_concurrency or max(1, int(os.getenv("DAILY_RUN_STS_CONCURRENCY", "4")))
+        self.ce_concurrency = ce_concurrency or max(1, int(os.getenv("DAILY_RUN_CE_CONCURRENCY", "2")))
+
+    # ------------------------------------------------------------------
+    def _load_state(self, fresh: bool) -> dict:
+        """Estado del run sin terminar, o uno nuevo con su propio run_id."""
+        if not fresh and os.path.exists(self.state_path):
+            try:
+                with open(self.state_path) as f:
+                    state = json.load(f)
+                if "finished_at" not in state:
+                    # Estados previos al run_id: se identifican por su fecha
+                    state.setdefault("run_id", state.get("run_date"))
+                    return state
+            except (OSError, ValueError):
+                logger.warning(f"DAILY RUN STATE UNREADABLE | path={self.state_path} — starting fresh")
+
+        now = datetime.utcnow()
+        return {
+            "run_id": now.strftime("%Y%m%dT%H%M%SZ"),
+            "run_date": now.date().isoformat(),
+            "started_at": now.isoformat(),
+            "tenants": {},
+        }
+
+    def _save_state(self, state: dict) -> None:
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Escritura atómica: un crash a mitad nunca deja el estado corrupto
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    # ------------------------------------------------------------------
+    def pending_clients(self, state: dict, client_ids=None) -> list[int]:
+        from src.models.client import Client
+
+        query = Client.query.filter_by(is_active=True)
+        if client_ids:
+            query = query.filter(Client.id.in_(client_ids))
+
+        done = {int(cid) for cid in state["tenants"]}
+        return [c.id for c in query.order_by(Client.id).all() if c.id not in done]
+
+    def run(self, client_ids=None, fresh=False) -> dict:
+        state = self._load_state(fresh)
+
+        pending = self.pending_clients(state, client_ids)
+        if state["tenants"]:
+            print(f"Resuming daily run {state['run_id']}: {len(state['tenants'])} tenants already done")
+
+        print(f"Auditing {len(pending)} tenants with {self.processes} processes")
+        self._save_state(state)
+
+        ctx = multiprocessing.get_context("spawn")
+        semaphores = {
+            "sts": ctx.BoundedSemaphore(self.sts_concurrency),
+            "cost-explorer": ctx.BoundedSemaphore(self.ce_concurrency),
+        }
+
+        run_start = time.time()
+
+        with ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=ctx,
+            initializer=_init_process,
+            initargs=(semaphores,),
+        ) as pool:
+            futures = {pool.submit(audit_tenant, client_id): client_id for client_id in pending}
+
+            for future in as_completed(futures):
+                client_id = futures[future]
+                try:
+                    report = future.result()
+                except Exception as e:
+                    # No se marca como terminado: el próximo run lo reintenta
+                    logger.exception(f"DAILY TENANT CRASHED | client_id={client_id}")
+                    print(f"✗ client {client_id}: crashed ({e})")
+                    continue
+
+                state["tenants"][str(client_id)] = report
+                self._save_state(state)
+
+                print(
+                    f"{'✓' if report['status'] == 'ok' else '!'} client {client_id}: "
+                    f"{len(report['accounts'])} accounts in {report['duration_seconds']:.1f}s"
+                )
+
+        state["finished_at"] = datetime.utcnow().isoformat()
+        state["duration_seconds"] = round(time.time() - run_start, 2)
+        self._save_state(state)
+
+        self.print_report(state)
+        return state
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def print_report(state: dict) -> None:
+        tenants = sorted(
+            state["tenants"].values(),
+            key=lambda r: r["duration_seconds"],
+            reverse=True
+        )
+
+        print(f"\n=== Daily audit report {state['run_id']} ===")
+        print(f"{'client':>8}  {'status':<8}  {'seconds':>9}  accounts")
+        for report in tenants:
+            accounts = ", ".join(
+                f"{a['provider']}:{a['account_id']}={a['status']}({a['duration_seconds']:.0f}s)"
+                for a in report["accounts"]
+            ) or "-"
+            print(
+                f"{report['client_id']:>8}  {report['status']:<8}  "
+                f"{report['duration_seconds']:>9.1f}  {accounts}"
+            )
+
+        if "duration_seconds" in state:
+            print(f"\nTotal wall time: {state['duration_seconds']:.1f}s")
@@ -0,0 +1,227 @@
+"""
+DASHBOARD AGGREGATES
+====================
+Todos los contadores que usan Governance / Risk / ROI / Executive /
+Remediation y el facade, calculados de una vez por (client, account):
+
+1. CTE `findings_by_resource`: findings del cliente agregados por
+   resource_id (abiertos por severidad, MISSING_*, resueltos en la
+   ventana de remediación, ahorros).
+2. Inventario activo LEFT JOIN ese CTE, agrupado con ROLLUP(service_name):
+   una fila por servicio + la fila total.
+3. Una query chica sobre aws_accounts (cantidad, last_sync, total).
+
+Los números son los mismos que daban las queries separadas (join
+finding ↔ inventario activo por resource_id + client_id): sumar los
+agregados por recurso sobre cada fila de inventario equivale a contar los
+pares del join. El breakdown de riesgo por servicio sale de los rollups
+(InventoryRollupService), no de acá.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, select
+
+from src.models.aws_account import AWSAccount
+from src.models.aws_finding import AWSFinding
+from src.models.aws_resource_inventory import AWSResourceInventory
+from src.models.database import db
+
+
+SEVERITIES = ("HIGH", "MEDIUM", "LOW")
+
+
+def _count(condition):
+    return func.count(AWSFinding.id).filter(condition)
+
+
+def _sum_savings(condition):
+    return func.sum(AWSFinding.estimated_monthly_savings).filter(condition)
+
+
+class DashboardAggregates:
+
+    # =====================================================
+    # ENTRY POINT
+    # =====================================================
+    @staticmethod
+    def compute(
+        client_id: int,
+        aws_account_id: int | None = None,
+        remediation_days: int = 30
+    ) -> dict:
+
+        result = DashboardAggregates._inventory_and_findings(
+            client_id,
+            aws_account_id,
+            remediation_days
+        )
+        result.update(
+            DashboardAggregates._accounts(client_id, aws_account_id)
+        )
+        return result
+
+    # =====================================================
+    # INVENTORY × FINDINGS (1 query, ROLLUP por servicio)
+    # =====================================================
+    @staticmethod
+    def _findings_by_resource(client_id, aws_account_id, cutoff):
+
+        is_open = AWSFinding.resolved.is_(False)
+        is_recent = and_(
+            AWSFinding.resolved.is_(True),
+            AWSFinding.resolved_at >= cutoff
+        )
+        is_missing = AWSFinding.finding_type.like("MISSING_%")
+
+        columns = [
+            AWSFinding.resource_id,
+            _count(is_open).label("open_count"),
+            _sum_savings(is_open).label("open_savings"),
+            _sum_savings(and_(is_open, AWSFinding.severity == "HIGH")).label("open_high_savings"),
+            _count(and_(is_open, is_missing)).label("missing_open"),
+            _count(
+                and_(is_open, is_missing, AWSFinding.severity != "HIGH")
+            ).label("missing_open_non_high"),
+            _count(is_recent).label("recent_count"),
+            _sum_savings(is_recent).label("recent_savings"),
+        ]
+
+        for severity in SEVERITIES:
+            is_severity = AWSFinding.severity == severity
+            columns.append(_count(and_(is_open, is_severity)).label(f"open_{severity.lower()}"))
+            columns.append(_count(and_(is_recent, is_severity)).label(f"recent_{severity.lower()}"))
+
+        query = (
+            select(*columns)
+            .where(
+                AWSFinding.client_id == client_id,
+                is_open | is_recent
+            )
+            .group_by(AWSFinding.resource_id)
+        )
+
+        if aws_account_id is not None:
+            query = query.where(AWSFinding.aws_account_id == aws_account_id)
+
+        return query.cte("findings_by_resource")
+
+    @staticmethod
+    def _inventory_and_findings(client_id, aws_account_id, remediation_days):
+
+        cutoff = datetime.utcnow() - timedelta(days=remediation_days)
+        fr = DashboardAggregates._findings_by_resource(
+            client_id,
+            aws_account_id,
+            cutoff
+        )
+        inv = AWSResourceInventory
+
+        def total(column):
+            return func.coalesce(func.sum(column), 0)
+
+        query = (
+            select(
+                inv.service_name,
+                func.grouping(inv.service_name).label("is_total"),
+                func.count(inv.id).label("total_resources"),
+                func.count(func.distinct(inv.resource_id)).filter(
+                    fr.c.open_count > 0
+                ).label("resources_affected"),
+                func.count(inv.id).filter(fr.c.missing_open > 0).label("non_compliant"),
+                func.count(inv.id).filter(
+                    fr.c.missing_open_non_high > 0
+                ).label("non_compliant_non_high"),
+                total(fr.c.open_high).label("open_high"),
+                total(fr.c.open_medium).label("open_medium"),
+                total(fr.c.open_low).label("open_low"),
+                total(fr.c.open_savings).label("open_savings"),
+                total(fr.c.open_high_savings).label("open_high_savings"),
+                total(fr.c.recent_count).label("recent_count"),
+                total(fr.c.recent_high).label("recent_high"),
+                total(fr.c.recent_medium).label("recent_medium"),
+                total(fr.c.recent_low).label("recent_low"),
+                total(fr.c.recent_savings).label("recent_savings"),
+            )
+            .select_from(inv)
+            .outerjoin(fr, fr.c.resource_id == inv.resource_id)
+            .where(
+                inv.client_id == client_id,
+                inv.is_active.is_(True)
+            )
+            .group_by(func.rollup(inv.service_name))
+        )
+
+        if aws_account_id is not None:
+            query = query.where(inv.aws_account_id == aws_account_id)
+
+        rows = db.session.execute(query).all()
+
+        result = {
+            "remediation_days": remediation_days,
+            "total_resources": 0,
+            "resources_affected": 0,
+            "non_compliant": 0,
+            "non_compliant_non_high": 0,
+            "open": {"high": 0, "medium": 0, "low": 0, "savings": 0.0, "high_savings": 0.0},
+            "resolved_recent": {"total": 0, "high": 0, "medium": 0, "low": 0, "savings": 0.0},
+            "services": {},
+        }
+
+        for row in rows:
+            if not row.is_total:
+                result["services"][row.service_name] = {
+                    "total_resources": row.total_resources,
+                }
+                continue
+
+            result["total_resources"] = row.total_resources
+            result["resources_affected"] = row.resources_affected
+            result["non_compliant"] = row.non_compliant
+            result["non_compliant_non_high"] = row.non_compliant_non_high
+            result["open"] = {
+                "high": int(row.open_high),
+                "medium": int(row.open_medium),
+                "low": int(row.open_low),
+                "savings": float(row.open_savings),
+                "high_savings": float(row.open_high_savings),
+            }
+            result["resolved_recent"] = {
+                "total": int(row.recent_count),
+                "high": int(row.recent_high),
+                "medium": int(row.recent_medium),
+                "low": int(row.recent_low),
+                "savings": float(row.recent_savings),
+            }
+
+        return result
+
+    # =====================================================
+    # ACCOUNTS (1 query)
+    # =====================================================
+    @staticmethod
+    def _accounts(client_id, aws_account_id):
+
+        in_scope = (
+            AWSAccount.id == aws_account_id
+            if aws_account_id is not None
+            else AWSAccount.id.isnot(None)
+        )
+
+        row = db.session.execute(
+            select(
+                func.count(AWSAccount.id).label("total_accounts"),
+                func.count(AWSAccount.id).filter(in_scope).label("accounts_count"),
+                func.max(AWSAccount.last_sync).filter(in_scope).label("last_sync"),
+            )
+            .where(
+                AWSAccount.client_id == client_id,
+                AWSAccount.is_active.is_(True)
+            )
+        ).first()
+
+        return {
+            "accounts_count": row.accounts_count or 0,
+            "total_accounts": row.total_accounts or 0,
+            "last_sync": row.last_sync,
+        }
@@ -0,0 +1,335 @@
+"""
+DASHBOARD CACHE — compartido entre workers
+==========================================
+Cache del resumen de ClientDashboardFacade (y de otras vistas por
+cliente, ver `kind` en get_or_build) en dos niveles:
+
+- L1: LRU en memoria del proceso, acotado (DASHBOARD_CACHE_L1_SIZE).
+- L2: Redis (si REDIS_URL está seteado y responde), compartido por todos
+  los workers de gunicorn y por el audit worker.
+
+Invalidación por generación: cada cliente tiene un contador
+`dashboard:gen:<client_id>` en Redis. Las entradas guardan la generación
+con la que se construyeron; `invalidate(client_id)` incrementa el contador
+y cualquier worker que lea después ve su entrada L1 como vieja. Así una
+auditoría terminada en el audit worker o un finding resuelto en otro
+worker invalida el dashboard en todos.
+
+Coalescing: misses concurrentes de la misma clave construyen el resumen
+una sola vez — un lock (por franja de claves) dentro del proceso y un lock
+`SET NX` en Redis entre procesos. Quien no obtiene el lock espera el
+resultado (DASHBOARD_CACHE_BUILD_WAIT) y, si no llega, lo construye igual.
+
+Sin Redis se comporta como antes pero acotado: LRU por proceso con TTL
+y generación local.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from flask import json
+
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "dashboard"
+_BUILD_LOCK_STRIPES = 64
+
+# Libera el lock solo si sigue siendo nuestro (no pisa el de otro worker)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def cache_ttl() -> int:
+    return int(os.getenv("DASHBOARD_CACHE_TTL", "900"))
+
+
+def l1_size() -> int:
+    return max(1, int(os.getenv("DASHBOARD_CACHE_L1_SIZE", "256")))
+
+
+def build_wait_seconds() -> float:
+    return float(os.getenv("DASHBOARD_CACHE_BUILD_WAIT", "20"))
+
+
+# =====================================================
+# L1 — LRU EN MEMORIA
+# =====================================================
+class LRUCache:
+
+    def __init__(self, max_entries: int, ttl: int) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, generation):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            data, gen, ts = entry
+            if gen != generation or time.time() - ts >= self.ttl:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return data
+
+    def set(self, key, generation, data) -> None:
+        with self._lock:
+            self._entries[key] = (data, generation, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard_client(self, client_id: int) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == client_id]:
+                del self._entries[key]
+
+
+# =====================================================
+# L2 — REDIS
+# =====================================================
+class RedisDashboardStore:
+
+    def __init__(self, redis_client, ttl: int) -> None:
+        self._redis = redis_client
+        self.ttl = ttl
+        self._release = redis_client.register_script(_RELEASE_LOCK_SCRIPT)
+
+    @staticmethod
+    def _gen_key(client_id: int) -> str:
+        return f"{_KEY_PREFIX}:gen:{client_id}"
+
+    @staticmethod
+    def _data_key(key, generation: int) -> str:
+        client_id, aws_account_id, kind = key
+        return f"{_KEY_PREFIX}:{kind}:{client_id}:{generation}:{aws_account_id or 'all'}"
+
+    @staticmethod
+    def _lock_key(key, generation: int) -> str:
+        client_id, aws_account_id, kind = key
+        return f"{_KEY_PREFIX}:lock:{kind}:{client_id}:{generation}:{aws_account_id or 'all'}"
+
+    def generation(self, client_id: int) -> int:
+        return int(self._redis.get(self._gen_key(client_id)) or 0)
+
+    def bump(self, client_id: int) -> int:
+        return int(self._redis.incr(self._gen_key(client_id)))
+
+    def get(self, key, generation: int):
+        raw = self._redis.get(self._data_key(key, generation))
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, generation: int, data) -> None:
+        self._redis.set(self._data_key(key, generation), json.dumps(data), ex=self.ttl)
+
+    def acquire(self, key, generation: int, timeout: float):
+        token = uuid.uuid4().hex
+        acquired = self._redis.set(
+            self._lock_key(key, generation), token, nx=True, px=int(timeout * 1000)
+        )
+        return token if acquired else None
+
+    def release(self, key, generation: int, token: str) -> None:
+        self._release(keys=[self._lock_key(key, generation)], args=[token])
+
+
+# =====================================================
+# CACHE
+# =====================================================
+class DashboardCache:
+
+    def __init__(self, store=None, ttl=None, max_entries=None) -> None:
+        self.ttl = ttl or cache_ttl()
+        self._store = store
+        self._l1 = LRUCache(max_entries or l1_size(), self.ttl)
+        self._local_generations = {}
+        # Locks por franja (hash de la clave): acotados, no crecen con los clientes
+        self._build_locks = [threading.Lock() for _ in range(_BUILD_LOCK_STRIPES)]
+
+    # ------------------------------------------------------------------
+    def _generation(self, client_id: int) -> int:
+        if self._store is not None:
+            try:
+                return self._store.generation(client_id)
+            except Exception:
+                logger.exception("DASHBOARD CACHE | Redis no disponible (generation)")
+                # -1 nunca coincide con una entrada guardada: no se sirve nada viejo
+                return -1
+        return self._local_generations.get(client_id, 0)
+
+    def generation(self, client_id: int) -> int:
+        """Generación vigente del cliente (-1 si Redis no responde)."""
+        return self._generation(client_id)
+
+    def _build_lock(self, key) -> threading.Lock:
+        return self._build_locks[hash(key) % _BUILD_LOCK_STRIPES]
+
+    def _lookup(self, key, generation: int):
+        if generation < 0:
+            return None
+
+        data = self._l1.get(key, generation)
+        if data is not None or self._store is None:
+            return data
+
+        try:
+            data = self._store.get(key, generation)
+        except Exception:
+            logger.exception(f"DASHBOARD CACHE | Redis no disponible (get) | key={key}")
+            return None
+
+        if data is not None:
+            self._l1.set(key, generation, data)
+        return data
+
+    def _store_result(self, key, generation: int, data) -> None:
+        if generation < 0:
+            return
+
+        self._l1.set(key, generation, data)
+        if self._store is None:
+            return
+        try:
+            self._store.set(key, generation, data)
+        except Exception:
+            logger.exception(f"DASHBOARD CACHE | Redis no disponible (set) | key={key}")
+
+    # ------------------------------------------------------------------
+    def get_or_build(self, client_id: int, aws_account_id, builder, kind: str = "summary"):
+        """
+        `kind` separa vistas distintas del mismo cliente (resumen del
+        dashboard, contexto del asistente, ...): comparten la generación,
+        así que una auditoría las invalida a todas.
+        """
+        key = (client_id, aws_account_id, kind)
+        generation = self._generation(client_id)
+
+        data = self._lookup(key, generation)
+        if data is not None:
+            return data
+
+        # Un solo builder por clave dentro del proceso
+        with self._build_lock(key):
+            data = self._lookup(key, generation)
+            if data is not None:
+                return data
+
+            # ... y uno solo entre procesos
+            token = None
+            if self._store is not None and generation >= 0:
+                data, token = self._wait_for_remote_build(key, generation)
+                if data is not None:
+                    return data
+
+            try:
+                data = builder()
+                self._store_result(key, generation, data)
+            finally:
+                if token:
+                    try:
+                        self._store.release(key, generation, token)
+                    except Exception:
+                        logger.exception(f"DASHBOARD CACHE | lock release falló | key={key}")
+
+        return data
+
+    def _wait_for_remote_build(self, key, generation: int):
+        """(data, None) si otro worker lo construyó; (None, token) si nos toca."""
+        deadline = time.monotonic() + build_wait_seconds()
+
+        while True:
+            try:
+                token = self._store.acquire(key, generation, build_wait_seconds())
+                if token:
+                    return None, token
+                data = self._store.get(key, generation)
+            except Exception:
+                logger.exception(f"DASHBOARD CACHE | Redis no disponible (lock) | key={key}")
+                return None, None
+
+            if data is not None:
+                self._l1.set(key, generation, data)
+                return data, None
+
+            if time.monotonic() >= deadline:
+                logger.warning(f"DASHBOARD CACHE | build wait timeout | key={key}")
+                return None, None
+
+            time.sleep(0.1)
+
+    # ------------------------------------------------------------------
+    def invalidate(self, client_id: int) -> None:
+        self._l1.discard_client(client_id)
+        self._local_generations[client_id] = self._local_generations.get(client_id, 0) + 1
+
+        if self._store is None:
+            return
+        try:
+            self._store.bump(client_id)
+        except Exception:
+            logger.exception(f"DASHBOARD CACHE | invalidación no propagada | client_id={client_id}")
+
+
+# =====================================================
+# INSTANCIA DEL PROCESO
+# =====================================================
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def _build_cache() -> DashboardCache:
+    """
+    Mismo patrón opcional-con-fallback que el rate limiter
+    (src/security/hardening.py): Redis si REDIS_URL responde, si no LRU
+    local.
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return DashboardCache()
+
+    try:
+        import redis
+
+        client = redis.Redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=2)
+        client.ping()
+        logger.info("Dashboard cache: usando backend Redis (%s)", redis_url)
+        return DashboardCache(store=RedisDashboardStore(client, cache_ttl()))
+    except Exception:
+        logger.exception("Dashboard cache: Redis no disponible, usando LRU en memoria")
+        return DashboardCache()
+
+
+def get_cache() -> DashboardCache:
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = _build_cache()
+    return _instance
+
+
+def invalidate_client(client_id: int) -> None:
+    """Invalida el dashboard de un cliente en todos los workers."""
+    get_cache().invalidate(client_id)
+
+
+def client_generation(client_id: int) -> int:
+    """
+    Generación de datos del cliente, compartida entre workers: cambia con
+    cada invalidate_client (fin de auditoría, finding resuelto, ...).
+    Otros caches por cliente la usan como versión de sus entradas.
+    """
+    return get_cache().generation(client_id)
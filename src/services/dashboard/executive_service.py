@@ -1,8 +1,4 @@
-from sqlalchemy import func, and_
-from src.models.aws_finding import AWSFinding
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.aws_account import AWSAccount
-from src.models.database import db
+from src.services.dashboard.aggregates import DashboardAggregates
 from src.services.dashboard.risk_service import RiskService
 from src.services.dashboard.governance_service import GovernanceService
 from src.services.dashboard.roi_service import ROIService
@@ -21,22 +17,35 @@ class ExecutiveService:
         governance: dict | None = None,
         roi: dict | None = None,
         priority_services: list | None = None,
+        aggregates: dict | None = None,
     ):
 
         # -----------------------------------------------------
         # CORE METRICS
         # -----------------------------------------------------
+        if aggregates is None:
+            aggregates = DashboardAggregates.compute(client_id, aws_account_id)
+
         if risk is None:
-            risk = RiskService.get_risk_score(client_id, aws_account_id)
+            risk = RiskService.get_risk_score(
+                client_id,
+                aws_account_id,
+                aggregates=aggregates
+            )
 
         if governance is None:
             governance = GovernanceService.get_governance_score(
                 client_id,
-                aws_account_id
+                aws_account_id,
+                aggregates=aggregates
             )
 
         if roi is None:
-            roi = ROIService.get_roi_projection(client_id, aws_account_id)
+            roi = ROIService.get_roi_projection(
+                client_id,
+                aws_account_id,
+                aggregates=aggregates
+            )
 
         if priority_services is None:
             priority_services = RiskService.get_priority_services(
@@ -55,33 +64,7 @@ class ExecutiveService:
         # -----------------------------------------------------
         # FINANCIAL EXPOSURE (ACTIVE FINDINGS ONLY + INVENTORY ACTIVE)
         # -----------------------------------------------------
-        monthly_exposure_query = (
-            db.session.query(
-                func.sum(AWSFinding.estimated_monthly_savings)
-            )
-            .join(
-                AWSResourceInventory,
-                and_(
-                    AWSFinding.resource_id == AWSResourceInventory.resource_id,
-                    AWSFinding.client_id == AWSResourceInventory.client_id
-                )
-            )
-            .filter(
-                AWSFinding.client_id == client_id,
-                AWSFinding.resolved.is_(False),
-                AWSResourceInventory.is_active.is_(True)
-            )
-        )
-
-        if aws_account_id is not None:
-            monthly_exposure_query = monthly_exposure_query.filter(
-                AWSFinding.aws_account_id == aws_account_id,
-                AWSResourceInventory.aws_account_id == aws_account_id
-            )
-
-        monthly_exposure = monthly_exposure_query.scalar() or 0
-
-        monthly_exposure = float(monthly_exposure)
+        monthly_exposure = float(aggregates["open"]["savings"])
         annual_exposure = round(monthly_exposure * 12, 2)
 
         # -----------------------------------------------------
@@ -108,17 +91,7 @@ class ExecutiveService:
         # -----------------------------------------------------
         # ACCOUNT FOOTPRINT
         # -----------------------------------------------------
-        accounts_query = AWSAccount.query.filter_by(
-            client_id=client_id,
-            is_active=True
-        )
-
-        if aws_account_id is not None:
-            accounts_query = accounts_query.filter(
-                AWSAccount.id == aws_account_id
-            )
-
-        accounts_count = accounts_query.count()
+        accounts_count = aggregates["accounts_count"]
 
         # -----------------------------------------------------
         # NARRATIVE GENERATION
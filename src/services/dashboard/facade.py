@@ -1,11 +1,4 @@
-import time
-
-from sqlalchemy import func, and_
-from src.models.aws_finding import AWSFinding
-from src.models.aws_account import AWSAccount
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.database import db
-
+from src.services.dashboard.aggregates import DashboardAggregates
 from src.services.dashboard.risk_service import RiskService
 from src.services.dashboard.governance_service import GovernanceService
 from src.services.dashboard.executive_service import ExecutiveService
@@ -15,30 +8,30 @@ from src.services.dashboard.remediation_service import RemediationService
 from src.services.client_findings_service import ClientFindingsService
 from src.aws.cost_explorer_service import CostExplorerService
 from src.services.client_dashboard_service import ClientDashboardService
-
-# =====================================================
-#   IN-MEMORY CACHE (TTL 5 min por client/account)
-# =====================================================
-_cache: dict = {}
-_CACHE_TTL = 900  # segundos (15 min — L1 cache; la fuente real está en cost_explorer_cache BD)
+from src.services.dashboard import cache as dashboard_cache
 
 
 class ClientDashboardFacade:
 
     @staticmethod
     def invalidate_cache(client_id: int, aws_account_id: int | None = None):
-        _cache.pop((client_id, aws_account_id), None)
+        # Se invalida el cliente entero: la vista "todas las cuentas"
+        # también depende de la cuenta que cambió.
+        dashboard_cache.invalidate_client(client_id)
 
     @staticmethod
     def get_summary(client_id: int, aws_account_id: int | None = None):
-
         # =====================================================
-        # CACHE CHECK
+        # CACHE (L1 LRU + Redis compartido, ver dashboard/cache.py)
         # =====================================================
-        cache_key = (client_id, aws_account_id)
-        entry = _cache.get(cache_key)
-        if entry and time.time() - entry["ts"] < _CACHE_TTL:
-            return entry["data"]
+        return dashboard_cache.get_cache().get_or_build(
+            client_id,
+            aws_account_id,
+            lambda: ClientDashboardFacade._build_summary(client_id, aws_account_id)
+        )
+
+    @staticmethod
+    def _build_summary(client_id: int, aws_account_id: int | None = None):
 
         # =====================================================
         # FINDINGS STATS (Delegado al servicio optimizado)
@@ -49,109 +42,26 @@ class ClientDashboardFacade:
         )
 
         # =====================================================
-        # ACCOUNTS SUMMARY
+        # CONTADORES (inventario × findings + cuentas en 1 pasada)
         # =====================================================
-        accounts_data = (
-            db.session.query(
-                func.count(AWSAccount.id).label("accounts_count"),
-                func.max(AWSAccount.last_sync).label("last_sync")
-            )
-            .filter(
-                AWSAccount.client_id == client_id,
-                AWSAccount.is_active.is_(True)
-            )
+        aggregates = DashboardAggregates.compute(
+            client_id,
+            aws_account_id,
+            remediation_days=30
         )
 
-        if aws_account_id is not None:
-            accounts_data = accounts_data.filter(
-                AWSAccount.id == aws_account_id
-            )
-
-        accounts_data = accounts_data.first()
-
-        accounts_count = accounts_data.accounts_count if accounts_data else 0
         last_sync = (
-            accounts_data.last_sync.isoformat()
-            if accounts_data and accounts_data.last_sync
+            aggregates["last_sync"].isoformat()
+            if aggregates["last_sync"]
             else None
-
-        )
-
-        # Total de cuentas del cliente (sin filtro de cuenta individual)
-        total_accounts_count = (
-            db.session.query(func.count(AWSAccount.id))
-            .filter(
-                AWSAccount.client_id == client_id,
-                AWSAccount.is_active.is_(True)
-            )
-            .scalar() or 0
-        )
-
-        # =====================================================
-        # RESOURCES AFFECTED (solo inventory activo)
-        # =====================================================
-        resources_query = (
-            db.session.query(
-                func.count(func.distinct(AWSFinding.resource_id))
-            )
-            .join(
-                AWSResourceInventory,
-                and_(
-                    AWSFinding.resource_id == AWSResourceInventory.resource_id,
-                    AWSFinding.client_id == AWSResourceInventory.client_id
-                )
-            )
-            .filter(
-                AWSFinding.client_id == client_id,
-                AWSFinding.resolved.is_(False),
-                AWSResourceInventory.is_active.is_(True)
-            )
-        )
-
-        # =====================================================
-        # ACCOUNT FILTER
-        # =====================================================
-
-        if aws_account_id is not None:
-            resources_query = resources_query.filter(
-                AWSFinding.aws_account_id == aws_account_id
-            )
-
-        resources_affected = resources_query.scalar() or 0
-
-        # =====================================================
-        # SERVICES SCANNED (Inventory real activo)
-        # =====================================================
-
-        inventory_query = db.session.query(
-            AWSResourceInventory.service_name,
-            func.count(AWSResourceInventory.id).label("total_resources")
-        ).filter(
-            AWSResourceInventory.client_id == client_id,
-            AWSResourceInventory.is_active.is_(True)
-        )
-
-        # =====================================================
-        # ACCOUNT FILTER
-        # =====================================================
-
-        if aws_account_id is not None:
-            inventory_query = inventory_query.filter(
-                AWSResourceInventory.aws_account_id == aws_account_id
-            )
-
-        services_scanned_raw = (
-            inventory_query
-            .group_by(AWSResourceInventory.service_name)
-            .all()
         )
 
         services_scanned = [
             {
-                "service": s.service_name,
-                "total_resources": s.total_resources
+                "service": service_name,
+                "total_resources": service["total_resources"]
             }
-            for s in services_scanned_raw
+            for service_name, service in aggregates["services"].items()
         ]
 
         # =====================================================
@@ -159,9 +69,14 @@ class ClientDashboardFacade:
         # =====================================================
         governance = GovernanceService.get_governance_score(
             client_id,
-            aws_account_id
+            aws_account_id,
+            aggregates=aggregates
+        )
+        risk = RiskService.get_risk_score(
+            client_id,
+            aws_account_id,
+            aggregates=aggregates
         )
-        risk = RiskService.get_risk_score(client_id, aws_account_id)
         risk_by_service = RiskService.get_risk_breakdown_by_service(
             client_id,
             aws_account_id
@@ -173,7 +88,8 @@ class ClientDashboardFacade:
         )
         roi_projection = ROIService.get_roi_projection(
             client_id,
-            aws_account_id
+            aws_account_id,
+            aggregates=aggregates
         )
         executive_summary = ExecutiveService.get_executive_summary(
             client_id,
@@ -182,12 +98,14 @@ class ClientDashboardFacade:
             governance=governance,
             roi=roi_projection,
             priority_services=priority_services,
+            aggregates=aggregates,
         )
         trend = TrendService.get_risk_trend(client_id, 30)
         remediation = RemediationService.get_remediation_metrics(
             client_id,
             30,
-            aws_account_id
+            aws_account_id,
+            aggregates=aggregates
         )
         cost_data = ClientDashboardService.get_cost_data(
             client_id,
@@ -196,10 +114,10 @@ class ClientDashboardFacade:
 
         result = {
             "findings": findings_stats,
-            "accounts": accounts_count,
-            "total_accounts": total_accounts_count,
+            "accounts": aggregates["accounts_count"],
+            "total_accounts": aggregates["total_accounts"],
             "last_sync": last_sync,
-            "resources_affected": resources_affected,
+            "resources_affected": aggregates["resources_affected"],
             "services_scanned": services_scanned,
             "governance": governance,
             "risk": risk,
@@ -212,5 +130,4 @@ class ClientDashboardFacade:
             "cost": cost_data,
         }
 
-        _cache[cache_key] = {"data": result, "ts": time.time()}
         return result
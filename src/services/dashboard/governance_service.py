@@ -1,7 +1,4 @@
-from sqlalchemy import func, and_
-from src.models.aws_finding import AWSFinding
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.database import db
+from src.services.dashboard.aggregates import DashboardAggregates
 
 
 class GovernanceService:
@@ -12,25 +9,17 @@ class GovernanceService:
     @staticmethod
     def get_governance_score(
         client_id: int,
-        aws_account_id: int | None = None
+        aws_account_id: int | None = None,
+        aggregates: dict | None = None,
     ):
 
         # -----------------------------------------------------
-        # TOTAL ACTIVE RESOURCES
+        # CONTADORES (DashboardAggregates: 1 pasada)
         # -----------------------------------------------------
-        total_resources_query = db.session.query(
-            func.count(AWSResourceInventory.id)
-        ).filter(
-            AWSResourceInventory.client_id == client_id,
-            AWSResourceInventory.is_active.is_(True)
-        )
-
-        if aws_account_id is not None:
-            total_resources_query = total_resources_query.filter(
-                AWSResourceInventory.aws_account_id == aws_account_id
-            )
+        if aggregates is None:
+            aggregates = DashboardAggregates.compute(client_id, aws_account_id)
 
-        total_resources = total_resources_query.scalar() or 0
+        total_resources = aggregates["total_resources"]
 
         if total_resources == 0:
             return {
@@ -44,34 +33,7 @@ class GovernanceService:
         # NON-COMPLIANT RESOURCES
         # (Governance-related unresolved findings)
         # -----------------------------------------------------
-        non_compliant_resources_query = (
-            db.session.query(
-                func.count(func.distinct(AWSResourceInventory.id))
-            )
-            .join(
-                AWSFinding,
-                and_(
-                    AWSFinding.resource_id == AWSResourceInventory.resource_id,
-                    AWSFinding.client_id == AWSResourceInventory.client_id,
-                    AWSFinding.resolved.is_(False),
-                    AWSFinding.finding_type.like("MISSING_%")
-                )
-            )
-            .filter(
-                AWSResourceInventory.client_id == client_id,
-                AWSResourceInventory.is_active.is_(True)
-            )
-        )
-
-        if aws_account_id is not None:
-            non_compliant_resources_query = non_compliant_resources_query.filter(
-                AWSResourceInventory.aws_account_id == aws_account_id,
-                AWSFinding.aws_account_id == aws_account_id
-            )
-
-        non_compliant_resources = (
-            non_compliant_resources_query.scalar() or 0
-        )
+        non_compliant_resources = aggregates["non_compliant"]
 
         compliant_resources = max(
             total_resources - non_compliant_resources,
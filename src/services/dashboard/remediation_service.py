@@ -1,8 +1,4 @@
-from datetime import datetime, timedelta
-from sqlalchemy import func, case, and_
-from src.models.aws_finding import AWSFinding
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.database import db
+from src.services.dashboard.aggregates import DashboardAggregates
 
 
 class RemediationService:
@@ -14,56 +10,27 @@ class RemediationService:
     def get_remediation_metrics(
         client_id: int,
         days: int = 30,
-        aws_account_id: int | None = None
+        aws_account_id: int | None = None,
+        aggregates: dict | None = None,
     ):
 
-        cutoff = datetime.utcnow() - timedelta(days=days)
-
         # -----------------------------------------------------
-        # AGGREGATED RESOLUTION METRICS (JOIN INVENTORY ACTIVO)
+        # AGGREGATED RESOLUTION METRICS (DashboardAggregates)
         # -----------------------------------------------------
-        results_query = (
-            db.session.query(
-                func.count(AWSFinding.id).label("total_resolved"),
-                func.sum(
-                    case((AWSFinding.severity == "HIGH", 1), else_=0)
-                ).label("high"),
-                func.sum(
-                    case((AWSFinding.severity == "MEDIUM", 1), else_=0)
-                ).label("medium"),
-                func.sum(
-                    case((AWSFinding.severity == "LOW", 1), else_=0)
-                ).label("low"),
-                func.sum(AWSFinding.estimated_monthly_savings).label("savings")
-            )
-            .join(
-                AWSResourceInventory,
-                and_(
-                    AWSFinding.resource_id == AWSResourceInventory.resource_id,
-                    AWSFinding.client_id == AWSResourceInventory.client_id
-                )
-            )
-            .filter(
-                AWSFinding.client_id == client_id,
-                AWSFinding.resolved.is_(True),
-                AWSFinding.resolved_at >= cutoff,
-                AWSResourceInventory.is_active.is_(True)
-            )
-        )
-
-        if aws_account_id is not None:
-            results_query = results_query.filter(
-                AWSFinding.aws_account_id == aws_account_id,
-                AWSResourceInventory.aws_account_id == aws_account_id
+        if aggregates is None or aggregates["remediation_days"] != days:
+            aggregates = DashboardAggregates.compute(
+                client_id,
+                aws_account_id,
+                remediation_days=days
             )
 
-        results = results_query.first()
+        resolved = aggregates["resolved_recent"]
 
-        total_resolved = results.total_resolved or 0
-        high = results.high or 0
-        medium = results.medium or 0
-        low = results.low or 0
-        realized_savings = float(results.savings or 0)
+        total_resolved = resolved["total"]
+        high = resolved["high"]
+        medium = resolved["medium"]
+        low = resolved["low"]
+        realized_savings = resolved["savings"]
 
         # -----------------------------------------------------
         # EXECUTION VELOCITY (PER DAY)
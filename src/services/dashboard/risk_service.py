@@ -1,7 +1,5 @@
-from sqlalchemy import func, case, and_
-from src.models.aws_finding import AWSFinding
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.database import db
+from src.services.dashboard.aggregates import DashboardAggregates
+from src.services.inventory.rollup_service import InventoryRollupService
 
 
 class RiskService:
@@ -12,25 +10,17 @@ class RiskService:
     @staticmethod
     def get_risk_score(
         client_id: int,
-        aws_account_id: int | None = None
+        aws_account_id: int | None = None,
+        aggregates: dict | None = None,
     ):
 
         # ---------------------------------
         # 1️⃣ Total active resources
         # ---------------------------------
-        total_resources_query = db.session.query(
-            func.count(AWSResourceInventory.id)
-        ).filter(
-            AWSResourceInventory.client_id == client_id,
-            AWSResourceInventory.is_active.is_(True)
-        )
+        if aggregates is None:
+            aggregates = DashboardAggregates.compute(client_id, aws_account_id)
 
-        if aws_account_id is not None:
-            total_resources_query = total_resources_query.filter(
-                AWSResourceInventory.aws_account_id == aws_account_id
-            )
-
-        total_resources = total_resources_query.scalar() or 0
+        total_resources = aggregates["total_resources"]
 
         if total_resources == 0:
             return {
@@ -43,39 +33,11 @@ class RiskService:
             }
 
         # ---------------------------------
-        # 2️⃣ Aggregate severities in single query
+        # 2️⃣ Open findings by severity
         # ---------------------------------
-        results_query = (
-            db.session.query(
-                func.sum(case((AWSFinding.severity == "HIGH", 1), else_=0)).label("high"),
-                func.sum(case((AWSFinding.severity == "MEDIUM", 1), else_=0)).label("medium"),
-                func.sum(case((AWSFinding.severity == "LOW", 1), else_=0)).label("low")
-            )
-            .join(
-                AWSResourceInventory,
-                and_(
-                    AWSFinding.resource_id == AWSResourceInventory.resource_id,
-                    AWSFinding.client_id == AWSResourceInventory.client_id
-                )
-            )
-            .filter(
-                AWSFinding.client_id == client_id,
-                AWSFinding.resolved.is_(False),
-                AWSResourceInventory.is_active.is_(True)
-            )
-        )
-
-        if aws_account_id is not None:
-            results_query = results_query.filter(
-                AWSFinding.aws_account_id == aws_account_id,
-                AWSResourceInventory.aws_account_id == aws_account_id
-            )
-
-        results = results_query.first()
-
-        high = results.high or 0
-        medium = results.medium or 0
-        low = results.low or 0
+        high = aggregates["open"]["high"]
+        medium = aggregates["open"]["medium"]
+        low = aggregates["open"]["low"]
 
         # ---------------------------------
         # 3️⃣ Risk calculation
@@ -107,49 +69,30 @@ class RiskService:
         aws_account_id: int | None = None
     ):
 
-        results_query = (
-            db.session.query(
-                AWSResourceInventory.service_name,
-                func.count(AWSResourceInventory.id).label("total_resources"),
-                func.sum(case((AWSFinding.severity == "HIGH", 1), else_=0)).label("high"),
-                func.sum(case((AWSFinding.severity == "MEDIUM", 1), else_=0)).label("medium"),
-                func.sum(case((AWSFinding.severity == "LOW", 1), else_=0)).label("low")
-            )
-            .outerjoin(
-                AWSFinding,
-                and_(
-                    AWSFinding.resource_id == AWSResourceInventory.resource_id,
-                    AWSFinding.client_id == AWSResourceInventory.client_id,
-                    AWSFinding.resolved.is_(False)
-                )
-            )
-            .filter(
-                AWSResourceInventory.client_id == client_id,
-                AWSResourceInventory.is_active.is_(True)
-            )
-        )
+        # Rollups por servicio (refrescados al terminar cada auditoría)
+        summary = InventoryRollupService.services_summary(client_id, aws_account_id)
 
-        if aws_account_id is not None:
-            results_query = results_query.filter(
-                AWSResourceInventory.aws_account_id == aws_account_id
-            )
+        breakdown = {}
 
-        results = (
-            results_query
-            .group_by(AWSResourceInventory.service_name)
-            .all()
-        )
+        for service_name, row in summary.items():
 
-        breakdown = {}
+            if not row["total_resources"]:
+                continue
 
-        for row in results:
+            high = row["high"]
+            medium = row["medium"]
+            low = row["low"]
 
-            high = row.high or 0
-            medium = row.medium or 0
-            low = row.low or 0
+            # Denominador histórico: filas del outer join inventario ×
+            # findings abiertos (recursos sin findings + pares con findings)
+            total_resources = (
+                row["total_resources"]
+                - row["affected_resources"]
+                + row["total_findings"]
+            )
 
             risk_points = (high * 5) + (medium * 3) + (low * 1)
-            max_risk = row.total_resources * 5
+            max_risk = total_resources * 5
 
             risk_score = (
                 100 - ((risk_points / max_risk) * 100)
@@ -159,13 +102,13 @@ class RiskService:
             risk_score = max(min(risk_score, 100), 0)
             risk_score = round(risk_score, 2)
 
-            breakdown[row.service_name] = {
+            breakdown[service_name] = {
                 "risk_score": risk_score,
                 "risk_level": RiskService._calculate_risk_level(risk_score),
                 "high": high,
                 "medium": medium,
                 "low": low,
-                "total_resources": row.total_resources
+                "total_resources": total_resources
             }
 
         return breakdown
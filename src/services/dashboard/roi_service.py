@@ -1,7 +1,4 @@
-from sqlalchemy import func, case, and_
-from src.models.aws_finding import AWSFinding
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.database import db
+from src.services.dashboard.aggregates import DashboardAggregates
 
 
 class ROIService:
@@ -12,25 +9,17 @@ class ROIService:
     @staticmethod
     def get_roi_projection(
         client_id: int,
-        aws_account_id: int | None = None
+        aws_account_id: int | None = None,
+        aggregates: dict | None = None,
     ):
 
         # -----------------------------------------------------
-        # TOTAL ACTIVE RESOURCES
+        # CONTADORES (DashboardAggregates: 1 pasada)
         # -----------------------------------------------------
-        total_resources_query = db.session.query(
-            func.count(AWSResourceInventory.id)
-        ).filter(
-            AWSResourceInventory.client_id == client_id,
-            AWSResourceInventory.is_active.is_(True)
-        )
-
-        if aws_account_id is not None:
-            total_resources_query = total_resources_query.filter(
-                AWSResourceInventory.aws_account_id == aws_account_id
-            )
+        if aggregates is None:
+            aggregates = DashboardAggregates.compute(client_id, aws_account_id)
 
-        total_resources = total_resources_query.scalar() or 0
+        total_resources = aggregates["total_resources"]
 
         if total_resources == 0:
             return {
@@ -41,52 +30,10 @@ class ROIService:
                 "high_savings_opportunity_annual": 0.0
             }
 
-        # -----------------------------------------------------
-        # AGGREGATED ACTIVE FINDINGS (JOIN INVENTORY ACTIVO)
-        # -----------------------------------------------------
-        results_query = (
-            db.session.query(
-                func.sum(case((AWSFinding.severity == "HIGH", 1), else_=0)).label("high"),
-                func.sum(case((AWSFinding.severity == "MEDIUM", 1), else_=0)).label("medium"),
-                func.sum(case((AWSFinding.severity == "LOW", 1), else_=0)).label("low"),
-                func.sum(
-                    AWSFinding.estimated_monthly_savings
-                ).label("total_savings"),
-                func.sum(
-                    case(
-                        (AWSFinding.severity == "HIGH",
-                        AWSFinding.estimated_monthly_savings),
-                        else_=0
-                    )
-                ).label("high_savings")
-            )
-            .join(
-                AWSResourceInventory,
-                and_(
-                    AWSFinding.resource_id == AWSResourceInventory.resource_id,
-                    AWSFinding.client_id == AWSResourceInventory.client_id
-                )
-            )
-            .filter(
-                AWSFinding.client_id == client_id,
-                AWSFinding.resolved.is_(False),
-                AWSResourceInventory.is_active.is_(True)
-            )
-        )
-
-        if aws_account_id is not None:
-            results_query = results_query.filter(
-                AWSFinding.aws_account_id == aws_account_id,
-                AWSResourceInventory.aws_account_id == aws_account_id
-            )
-
-        results = results_query.first()
-
-        high = results.high or 0
-        medium = results.medium or 0
-        low = results.low or 0
-        total_savings = float(results.total_savings or 0)
-        high_savings = float(results.high_savings or 0)
+        medium = aggregates["open"]["medium"]
+        low = aggregates["open"]["low"]
+        total_savings = aggregates["open"]["savings"]
+        high_savings = aggregates["open"]["high_savings"]
 
         # -----------------------------------------------------
         # SIMULACIÓN: HIGH RESUELTOS
@@ -107,35 +54,7 @@ class ROIService:
         # GOVERNANCE PROJECTION
         # Simulamos remediación HIGH governance findings
         # -----------------------------------------------------
-        non_compliant_resources_query = (
-            db.session.query(
-                func.count(func.distinct(AWSResourceInventory.id))
-            )
-            .join(
-                AWSFinding,
-                and_(
-                    AWSFinding.resource_id == AWSResourceInventory.resource_id,
-                    AWSFinding.client_id == AWSResourceInventory.client_id,
-                    AWSFinding.resolved.is_(False),
-                    AWSFinding.finding_type.like("MISSING_%"),
-                    AWSFinding.severity != "HIGH"
-                )
-            )
-            .filter(
-                AWSResourceInventory.client_id == client_id,
-                AWSResourceInventory.is_active.is_(True)
-            )
-        )
-
-        if aws_account_id is not None:
-            non_compliant_resources_query = non_compliant_resources_query.filter(
-                AWSResourceInventory.aws_account_id == aws_account_id,
-                AWSFinding.aws_account_id == aws_account_id
-            )
-
-        non_compliant_resources = (
-            non_compliant_resources_query.scalar() or 0
-        )
+        non_compliant_resources = aggregates["non_compliant_non_high"]
 
         compliant_resources = max(
             total_resources - non_compliant_resources,
@@ -6,7 +6,8 @@ Servicio centralizado para envío de correos vía SMTP.
 
 Responsabilidades:
 - Enviar correos transaccionales (password reset, eventos admin)
-- Manejar conexión SMTP de forma segura
+- Manejar conexión SMTP de forma segura (SMTPConnection: una conexión
+  reutilizable para el dispatcher de notificaciones)
 - NO exponer credenciales en logs
 
 Notas:
@@ -23,37 +24,103 @@ from email.mime.multipart import MIMEMultipart
 logger = logging.getLogger("email")
 
 
+def smtp_settings() -> dict | None:
+    """Configuración SMTP del entorno, o None si no está completa."""
+    settings = {
+        "host": os.getenv("SMTP_HOST"),
+        "port": int(os.getenv("SMTP_PORT", 587)),
+        "user": os.getenv("SMTP_USER"),
+        "password": os.getenv("SMTP_PASS"),
+    }
+    if not all([settings["host"], settings["user"], settings["password"]]):
+        return None
+    return settings
+
+
+def _build_message(sender: str, to: str, subject: str, body: str) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["From"] = sender
+    msg["To"] = to
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "plain", "utf-8"))
+    return msg
+
+
+class SMTPConnection:
+    """
+    Conexión SMTP persistente para enviar muchos correos seguidos
+    (dispatcher de notificaciones): el handshake (connect + STARTTLS +
+    login) se hace una vez y se reutiliza. Si el servidor cortó la
+    conexión entre envíos, reconecta una vez y reintenta.
+
+    send() lanza la excepción de smtplib: el caller decide si reintenta.
+    """
+
+    def __init__(self, settings: dict, timeout: int = 15) -> None:
+        self.settings = settings
+        self.timeout = timeout
+        self._server = None
+
+    def _connect(self):
+        server = smtplib.SMTP(self.settings["host"], self.settings["port"], timeout=self.timeout)
+        try:
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+            server.login(self.settings["user"], self.settings["password"])
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+
+    def send(self, to: str, subject: str, body: str) -> None:
+        msg = _build_message(self.settings["user"], to, subject, body)
+        if self._server is None:
+            self._connect()
+        try:
+            self._server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._server = None
+            self._connect()
+            self._server.send_message(msg)
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def send_email(to: str, subject: str, body: str) -> bool:
     """
-    Envía un correo electrónico vía SMTP.
+    Envía un correo electrónico vía SMTP, en el momento (una conexión por
+    correo). Las rutas y servicios usan queue_email()
+    (src/services/notification_outbox.py), que no bloquea el request;
+    esto queda para los correos con contraseñas, que no se guardan en
+    la cola.
 
     Retorna:
         True  -> correo enviado correctamente
         False -> fallo o SMTP no configurado
     """
 
-    smtp_host = os.getenv("SMTP_HOST")
-    smtp_port = int(os.getenv("SMTP_PORT", 587))
-    smtp_user = os.getenv("SMTP_USER")
-    smtp_pass = os.getenv("SMTP_PASS")
-
-    if not all([smtp_host, smtp_user, smtp_pass]):
+    settings = smtp_settings()
+    if settings is None:
         logger.warning("SMTP no configurado. Envío de correo omitido.")
         return False
 
     try:
-        msg = MIMEMultipart()
-        msg["From"] = smtp_user
-        msg["To"] = to
-        msg["Subject"] = subject
-        msg.attach(MIMEText(body, "plain", "utf-8"))
-
-        with smtplib.SMTP(smtp_host, smtp_port, timeout=15) as server:
-            server.ehlo()
-            server.starttls()
-            server.ehlo()
-            server.login(smtp_user, smtp_pass)
-            server.send_message(msg)
+        with SMTPConnection(settings) as connection:
+            connection.send(to, subject, body)
 
         logger.info(f"Correo enviado correctamente a {to}")
         return True
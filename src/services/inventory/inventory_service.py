@@ -1,8 +1,4 @@
-from sqlalchemy import func, case, and_
-
-from src.models.database import db
-from src.models.aws_resource_inventory import AWSResourceInventory
-from src.models.aws_finding import AWSFinding
+from src.services.inventory.rollup_service import InventoryRollupService
 
 
 def _compute_health_score(high: int, medium: int, low: int, total_resources: int) -> tuple:
@@ -19,64 +15,27 @@ def _compute_health_score(high: int, medium: int, low: int, total_resources: int
 
 class InventoryService:
 
+    # Ambas lecturas salen de los rollups que refresca FindingEngine
+    # al terminar cada auditoría (ver rollup_service.py).
+
     @staticmethod
     def get_services_summary(client_id):
-        severity_rank = case(
-            (AWSFinding.severity == "LOW", 1),
-            (AWSFinding.severity == "MEDIUM", 2),
-            (AWSFinding.severity == "HIGH", 3),
-            else_=0
-        )
-
-        findings_subq = (
-            db.session.query(
-                AWSFinding.resource_id.label("f_resource_id"),
-                func.count(AWSFinding.id).label("f_total"),
-                func.sum(case((AWSFinding.severity == "HIGH", 1), else_=0)).label("f_high"),
-                func.sum(case((AWSFinding.severity == "MEDIUM", 1), else_=0)).label("f_medium"),
-                func.sum(case((AWSFinding.severity == "LOW", 1), else_=0)).label("f_low"),
-                func.max(severity_rank).label("f_max_severity_rank"),
-            )
-            .filter(AWSFinding.client_id == client_id, AWSFinding.resolved == False)
-            .group_by(AWSFinding.resource_id)
-            .subquery()
-        )
-
-        query = (
-            db.session.query(
-                AWSResourceInventory.service_name.label("service"),
-                func.count(func.distinct(AWSResourceInventory.id)).label("total_resources"),
-                func.coalesce(func.sum(findings_subq.c.f_total), 0).label("total_findings"),
-                func.coalesce(func.sum(findings_subq.c.f_high), 0).label("high_count"),
-                func.coalesce(func.sum(findings_subq.c.f_medium), 0).label("medium_count"),
-                func.coalesce(func.sum(findings_subq.c.f_low), 0).label("low_count"),
-                func.max(findings_subq.c.f_max_severity_rank).label("max_severity_rank"),
-            )
-            .outerjoin(
-                findings_subq,
-                findings_subq.c.f_resource_id == AWSResourceInventory.resource_id
-            )
-            .filter(
-                AWSResourceInventory.client_id == client_id,
-                AWSResourceInventory.is_active == True
-            )
-            .group_by(AWSResourceInventory.service_name)
-        )
+        summary = InventoryRollupService.services_summary(client_id)
 
         data = []
-        for r in query.all():
-            total_resources = int(r.total_resources or 0)
-            high = int(r.high_count or 0)
-            medium = int(r.medium_count or 0)
-            low = int(r.low_count or 0)
-            health_score, risk_level = _compute_health_score(high, medium, low, total_resources)
+        for service, row in summary.items():
+            if not row["total_resources"]:
+                continue
+            health_score, risk_level = _compute_health_score(
+                row["high"], row["medium"], row["low"], row["total_resources"]
+            )
             data.append({
-                "service": r.service,
-                "total_resources": total_resources,
-                "total_findings": int(r.total_findings or 0),
-                "high": high,
-                "medium": medium,
-                "low": low,
+                "service": service,
+                "total_resources": row["total_resources"],
+                "total_findings": row["total_findings"],
+                "high": row["high"],
+                "medium": row["medium"],
+                "low": row["low"],
                 "health_score": health_score,
                 "risk_level": risk_level,
             })
@@ -84,40 +43,18 @@ class InventoryService:
 
     @staticmethod
     def get_global_health_score(client_id):
-        query = (
-            db.session.query(
-                func.count(func.distinct(AWSResourceInventory.id)).label("total_resources"),
-                func.sum(case((AWSFinding.severity == "HIGH", 1), else_=0)).label("high_count"),
-                func.sum(case((AWSFinding.severity == "MEDIUM", 1), else_=0)).label("medium_count"),
-                func.sum(case((AWSFinding.severity == "LOW", 1), else_=0)).label("low_count"),
-                func.count(AWSFinding.id).label("total_findings"),
-            )
-            .outerjoin(
-                AWSFinding,
-                and_(
-                    AWSFinding.resource_id == AWSResourceInventory.resource_id,
-                    AWSFinding.client_id == client_id,
-                    AWSFinding.resolved == False
-                )
-            )
-            .filter(
-                AWSResourceInventory.client_id == client_id,
-                AWSResourceInventory.is_active == True
-            )
-        )
-
-        result = query.one()
-        total_resources = result.total_resources or 0
-        high = result.high_count or 0
-        medium = result.medium_count or 0
-        low = result.low_count or 0
+        totals = InventoryRollupService.totals(client_id)
+        total_resources = totals["total_resources"]
+        high = totals["high"]
+        medium = totals["medium"]
+        low = totals["low"]
         health_score, risk_level = _compute_health_score(high, medium, low, total_resources)
 
         return {
             "health_score": health_score,
             "risk_level": risk_level,
             "total_resources": total_resources,
-            "total_findings": result.total_findings or 0,
+            "total_findings": totals["total_findings"],
             "high": high,
             "medium": medium,
             "low": low,
@@ -0,0 +1,223 @@
+"""
+INVENTORY ROLLUP SERVICE
+========================
+Mantiene y lee `aws_inventory_rollups` / `aws_finding_rollups`
+(ver src/models/aws_rollup.py).
+
+- refresh(): recalcula el tramo de un cliente (o de una cuenta) con dos
+  INSERT ... SELECT agrupados. Lo llama FindingEngine dentro de su commit
+  único al terminar la auditoría, y la resolución manual de un finding
+  para su cuenta. No hace commit: queda en la transacción del caller.
+- services_summary() / totals(): lecturas sobre los rollups; el costo
+  depende de la cantidad de servicios × regiones, no del tamaño del
+  inventario.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import and_, delete, func, insert, literal, select, text
+
+from src.models.database import db
+from src.models.aws_finding import AWSFinding
+from src.models.aws_resource_inventory import AWSResourceInventory
+from src.models.aws_rollup import AWSFindingRollup, AWSInventoryRollup
+
+
+SEVERITIES = ("HIGH", "MEDIUM", "LOW")
+
+# Namespace del advisory lock (4201 = claim de audit_jobs)
+_REFRESH_LOCK_NAMESPACE = 4202
+
+
+class InventoryRollupService:
+
+    # =====================================================
+    # REFRESH
+    # =====================================================
+    @staticmethod
+    def refresh(client_id: int, aws_account_id: int | None = None) -> None:
+
+        # Dos refresh del mismo cliente en paralelo (worker + resolve)
+        # se serializan: si no, ambos borran y ambos insertan.
+        db.session.execute(
+            text("SELECT pg_advisory_xact_lock(:ns, :client_id)"),
+            {"ns": _REFRESH_LOCK_NAMESPACE, "client_id": client_id}
+        )
+
+        now = datetime.utcnow()
+
+        for model in (AWSInventoryRollup, AWSFindingRollup):
+            stmt = delete(model).where(model.client_id == client_id)
+            if aws_account_id is not None:
+                stmt = stmt.where(model.aws_account_id == aws_account_id)
+            db.session.execute(stmt)
+
+        inv = AWSResourceInventory
+        inventory_filter = [
+            inv.client_id == client_id,
+            inv.is_active.is_(True),
+        ]
+        if aws_account_id is not None:
+            inventory_filter.append(inv.aws_account_id == aws_account_id)
+
+        # -----------------------------------------------------
+        # INVENTARIO: recursos y recursos afectados
+        # -----------------------------------------------------
+        open_resources = (
+            select(AWSFinding.resource_id)
+            .where(
+                AWSFinding.client_id == client_id,
+                AWSFinding.resolved.is_(False)
+            )
+            .distinct()
+            .subquery()
+        )
+
+        inventory_select = (
+            select(
+                inv.client_id,
+                inv.aws_account_id,
+                inv.service_name,
+                inv.region,
+                func.count(inv.id),
+                func.count(inv.id).filter(open_resources.c.resource_id.isnot(None)),
+                literal(now),
+            )
+            .outerjoin(open_resources, open_resources.c.resource_id == inv.resource_id)
+            .where(*inventory_filter)
+            .group_by(inv.client_id, inv.aws_account_id, inv.service_name, inv.region)
+        )
+
+        db.session.execute(
+            insert(AWSInventoryRollup).from_select(
+                [
+                    "client_id", "aws_account_id", "service_name", "region",
+                    "resource_count", "affected_resources", "refreshed_at",
+                ],
+                inventory_select
+            )
+        )
+
+        # -----------------------------------------------------
+        # FINDINGS ABIERTOS × INVENTARIO ACTIVO
+        # -----------------------------------------------------
+        findings_select = (
+            select(
+                inv.client_id,
+                inv.aws_account_id,
+                inv.service_name,
+                inv.region,
+                AWSFinding.severity,
+                func.count(AWSFinding.id),
+                func.coalesce(func.sum(AWSFinding.estimated_monthly_savings), 0),
+                literal(now),
+            )
+            .join(
+                AWSFinding,
+                and_(
+                    AWSFinding.resource_id == inv.resource_id,
+                    AWSFinding.client_id == inv.client_id,
+                    AWSFinding.resolved.is_(False)
+                )
+            )
+            .where(*inventory_filter)
+            .group_by(
+                inv.client_id, inv.aws_account_id, inv.service_name,
+                inv.region, AWSFinding.severity
+            )
+        )
+
+        db.session.execute(
+            insert(AWSFindingRollup).from_select(
+                [
+                    "client_id", "aws_account_id", "service_name", "region",
+                    "severity", "open_findings", "open_savings", "refreshed_at",
+                ],
+                findings_select
+            )
+        )
+
+    # =====================================================
+    # LECTURAS
+    # =====================================================
+    @staticmethod
+    def services_summary(client_id: int, aws_account_id: int | None = None) -> dict:
+        """
+        {service_name: {total_resources, affected_resources, total_findings,
+                        high, medium, low, savings}}
+        """
+        summary = defaultdict(lambda: {
+            "total_resources": 0,
+            "affected_resources": 0,
+            "total_findings": 0,
+            "high": 0,
+            "medium": 0,
+            "low": 0,
+            "savings": 0.0,
+        })
+
+        inventory_query = (
+            db.session.query(
+                AWSInventoryRollup.service_name,
+                func.sum(AWSInventoryRollup.resource_count).label("resource_count"),
+                func.sum(AWSInventoryRollup.affected_resources).label("affected_resources"),
+            )
+            .filter(AWSInventoryRollup.client_id == client_id)
+        )
+        if aws_account_id is not None:
+            inventory_query = inventory_query.filter(
+                AWSInventoryRollup.aws_account_id == aws_account_id
+            )
+
+        for row in inventory_query.group_by(AWSInventoryRollup.service_name).all():
+            entry = summary[row.service_name]
+            entry["total_resources"] = int(row.resource_count or 0)
+            entry["affected_resources"] = int(row.affected_resources or 0)
+
+        findings_query = (
+            db.session.query(
+                AWSFindingRollup.service_name,
+                AWSFindingRollup.severity,
+                func.sum(AWSFindingRollup.open_findings).label("open_findings"),
+                func.sum(AWSFindingRollup.open_savings).label("open_savings"),
+            )
+            .filter(AWSFindingRollup.client_id == client_id)
+        )
+        if aws_account_id is not None:
+            findings_query = findings_query.filter(
+                AWSFindingRollup.aws_account_id == aws_account_id
+            )
+
+        findings_rows = findings_query.group_by(
+            AWSFindingRollup.service_name,
+            AWSFindingRollup.severity
+        ).all()
+
+        for row in findings_rows:
+            entry = summary[row.service_name]
+            count = int(row.open_findings or 0)
+            entry["total_findings"] += count
+            entry["savings"] += float(row.open_savings or 0)
+            if row.severity in SEVERITIES:
+                entry[row.severity.lower()] += count
+
+        return dict(summary)
+
+    @staticmethod
+    def totals(client_id: int, aws_account_id: int | None = None) -> dict:
+        totals = {
+            "total_resources": 0,
+            "affected_resources": 0,
+            "total_findings": 0,
+            "high": 0,
+            "medium": 0,
+            "low": 0,
+            "savings": 0.0,
+        }
+
+        for entry in InventoryRollupService.services_summary(client_id, aws_account_id).values():
+            for key in totals:
+                totals[key] += entry[key]
+
+        return totals
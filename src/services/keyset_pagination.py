@@ -0,0 +1,165 @@
+"""
+keyset_pagination.py
+--------------------
+Cursor (keyset) pagination helpers for the findings and inventory listings.
+
+OFFSET pagination makes Postgres walk and discard every previous row, so
+deep pages on large tenants get slower linearly. Here each page filters
+with "strictly after the last row of the previous page" on the sort key
+plus the primary key as tiebreaker, which keeps every page on the same
+index range scan.
+
+- order_by_keyset(): ORDER BY for the key (NULLS LAST, same direction).
+- apply_keyset(): WHERE for "after this cursor".
+- encode_cursor() / decode_cursor(): opaque, URL-safe cursor tokens.
+- cached_count(): totals are cached for a short TTL instead of running
+  COUNT(*) over the filtered join on every page.
+"""
+
+import base64
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import and_, false, or_
+
+from src.services.dashboard.cache import LRUCache, client_generation
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# -----------------------------------------------------------------------
+# CURSOR TOKENS
+# -----------------------------------------------------------------------
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+        raise InvalidCursor("unknown cursor value")
+    return value
+
+
+def encode_cursor(values, sort_key: str | None = None) -> str:
+    payload = {"k": sort_key, "v": [_encode_value(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_key: str | None = None) -> list:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_value(v) for v in payload["v"]]
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        raise InvalidCursor("malformed cursor") from e
+
+    # A cursor issued for another ordering would point at the wrong row
+    if payload.get("k") != sort_key:
+        raise InvalidCursor("cursor does not match sort order")
+    return values
+
+
+# -----------------------------------------------------------------------
+# ORDER BY / WHERE
+# -----------------------------------------------------------------------
+
+def order_by_keyset(query, columns, descending: bool):
+    """ORDER BY every key column in the same direction, NULLS LAST."""
+    return query.order_by(*[
+        (col.desc() if descending else col.asc()).nulls_last()
+        for col in columns
+    ])
+
+
+def _after(columns, values, descending):
+    col, rest = columns[0], columns[1:]
+    value = values[0]
+
+    if value is None:
+        # Already in the NULL tail of this column
+        if not rest:
+            return false()
+        return and_(col.is_(None), _after(rest, values[1:], descending))
+
+    beyond = col < value if descending else col > value
+    condition = or_(beyond, col.is_(None))
+
+    if rest:
+        condition = or_(condition, and_(col == value, _after(rest, values[1:], descending)))
+
+    return condition
+
+
+def apply_keyset(query, columns, values, descending: bool):
+    """Filter to rows strictly after `values` in the keyset ordering."""
+    if len(values) != len(columns):
+        raise InvalidCursor("cursor does not match sort key")
+    return query.filter(_after(list(columns), list(values), descending))
+
+
+def fetch_page(query, per_page: int, key_of_row):
+    """
+    LIMIT per_page + 1 to know whether there is a next page without a
+    COUNT. Returns (rows, last_key_or_None).
+    """
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_key = key_of_row(rows[-1]) if has_more and rows else None
+    return rows, next_key
+
+
+# -----------------------------------------------------------------------
+# CACHED TOTALS
+# -----------------------------------------------------------------------
+
+_count_cache = LRUCache(
+    max_entries=int(os.getenv("LISTING_COUNT_CACHE_SIZE", "1024")),
+    ttl=int(os.getenv("LISTING_COUNT_CACHE_TTL", "60")),
+)
+
+
+def cached_count(key, count_fn) -> int:
+    """
+    Total for `key`, recomputed at most once per TTL per worker.
+
+    Keys must start with client_id (e.g. (client_id, "findings", ...)).
+    Entries are versioned with the client's dashboard generation, so
+    anything that invalidates the dashboard (audit completion, resolving a
+    finding) also drops cached totals, in every worker when Redis is set.
+    """
+    generation = client_generation(key[0])
+    if generation < 0:
+        # Redis down: no way to tell whether an entry is stale
+        return count_fn()
+
+    total = _count_cache.get(key, generation)
+    if total is None:
+        total = count_fn()
+        _count_cache.set(key, generation, total)
+    return total
+
+
+def invalidate_counts(client_id: int) -> None:
+    """Drop this worker's cached totals for a client right away."""
+    _count_cache.discard_client(client_id)
@@ -0,0 +1,302 @@
+"""
+NOTIFICATION DISPATCHER
+=======================
+Proceso independiente que consume `notification_outbox` (ver
+NotificationOutboxService) y entrega por canal:
+
+- email: todos los correos del lote por una sola SMTPConnection, que
+  queda abierta mientras haya trabajo (se cierra cuando la cola queda
+  vacía). Una tormenta de alertas ya no hace un handshake SMTP por
+  correo. Si el servidor rechaza el login, el lote se corta ahí: los
+  correos pendientes vuelven juntos a la cola (sin consumir intento) y
+  no se vuelve a intentar el login hasta SMTP_AUTH_RETRY_SECONDS.
+- slack / teams: requests.Session con keep-alive por canal y un pool de
+  threads acotado por canal (NOTIFICATION_<CANAL>_CONCURRENCY).
+
+Los threads de envío no tocan `db.session`: devuelven DeliveryResult y
+el loop principal registra los resultados. Errores transitorios (red,
+HTTP 429/5xx, SMTP 4xx) se reintentan con backoff; los permanentes
+(HTTP 4xx, SMTP 5xx) se marcan `failed`.
+"""
+
+import logging
+import os
+import smtplib
+import socket
+import time
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.models.database import db
+from src.services.email_service import SMTPConnection, smtp_settings
+from src.services.notification_outbox import NotificationOutboxService, WEBHOOK_CHANNELS
+
+
+logger = logging.getLogger(__name__)
+
+
+def default_batch_size() -> int:
+    return max(1, int(os.getenv("NOTIFICATION_BATCH_SIZE", "100")))
+
+
+def default_poll_seconds() -> float:
+    return float(os.getenv("NOTIFICATION_POLL_SECONDS", "2"))
+
+
+def smtp_auth_retry_seconds() -> float:
+    return max(1.0, float(os.getenv("SMTP_AUTH_RETRY_SECONDS", "300")))
+
+
+def channel_concurrency(channel: str) -> int:
+    default = os.getenv("NOTIFICATION_WEBHOOK_CONCURRENCY", "4")
+    return max(1, int(os.getenv(f"NOTIFICATION_{channel.upper()}_CONCURRENCY", default)))
+
+
+@dataclass
+class DeliveryResult:
+    id: int
+    ok: bool
+    error: str | None = None
+    retryable: bool = True
+    retry_after: float | None = None
+    # No se llegó a intentar (problema del canal): vuelve a la cola sin consumir intento
+    requeue: bool = False
+
+
+def _retry_after_seconds(value) -> float | None:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+# =====================================================
+# WEBHOOKS
+# =====================================================
+class WebhookChannel:
+
+    TIMEOUT_SECONDS = 10
+
+    def __init__(self, name: str, concurrency: int) -> None:
+        self.name = name
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix=f"notify-{name}"
+        )
+
+    def submit(self, item: dict):
+        return self.executor.submit(self._post, item)
+
+    def _post(self, item: dict) -> DeliveryResult:
+        try:
+            response = self.session.post(
+                item["recipient"], json=item["payload"], timeout=self.TIMEOUT_SECONDS
+            )
+        except requests.RequestException as e:
+            return DeliveryResult(item["id"], False, f"{self.name} webhook error: {e}")
+
+        if 200 <= response.status_code < 300:
+            return DeliveryResult(item["id"], True)
+
+        return DeliveryResult(
+            item["id"], False,
+            f"{self.name} webhook HTTP {response.status_code}",
+            retryable=response.status_code == 429 or response.status_code >= 500,
+            retry_after=_retry_after_seconds(response.headers.get("Retry-After")),
+        )
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+
+# =====================================================
+# DISPATCHER
+# =====================================================
+class NotificationDispatcher:
+
+    STALE_CHECK_SECONDS = 60
+    PURGE_SECONDS = 3600
+
+    def __init__(self, app, batch_size=None, poll_seconds=None, worker_id=None):
+        self.app = app
+        self.batch_size = batch_size or default_batch_size()
+        self.poll_seconds = poll_seconds or default_poll_seconds()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._stop = threading.Event()
+        self._smtp = None
+        self._smtp_auth_blocked_until = 0.0
+        self._email_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notify-email")
+        self._webhooks = {
+            channel: WebhookChannel(channel, channel_concurrency(channel))
+            for channel in WEBHOOK_CHANNELS
+        }
+
+    def stop(self):
+        self._stop.set()
+
+    # =====================================================
+    # EMAIL
+    # =====================================================
+    def _send_emails(self, items: list[dict]) -> list[DeliveryResult]:
+        """Corre en el thread de email: un lote por la misma conexión."""
+        settings = smtp_settings()
+        if settings is None:
+            return [DeliveryResult(i["id"], False, "SMTP no configurado", retryable=False) for i in items]
+
+        if time.monotonic() < self._smtp_auth_blocked_until:
+            return self._requeue_emails(items, "SMTP login rechazado recientemente")
+
+        results = []
+        for n, item in enumerate(items):
+            if self._smtp is None:
+                self._smtp = SMTPConnection(settings)
+            try:
+                self._smtp.send(item["recipient"], item["subject"] or "", item["body"] or "")
+                results.append(DeliveryResult(item["id"], True))
+
+            except smtplib.SMTPAuthenticationError as e:
+                # Credenciales rechazadas: es de la conexión, no del correo.
+                # No se repite el login por cada mensaje del lote.
+                self._close_smtp()
+                self._smtp_auth_blocked_until = time.monotonic() + smtp_auth_retry_seconds()
+                logger.error(f"SMTP LOGIN FAILED | code={e.smtp_code} | pending={len(items) - n}")
+                results.extend(self._requeue_emails(items[n:], f"SMTP auth {e.smtp_code}: {e.smtp_error!r}"))
+                break
+
+            except smtplib.SMTPResponseException as e:
+                # 5xx del servidor para este correo: no se arregla reintentando
+                permanent = e.smtp_code >= 500
+                results.append(DeliveryResult(
+                    item["id"], False, f"SMTP {e.smtp_code}: {e.smtp_error!r}", retryable=not permanent
+                ))
+                if not permanent:
+                    self._close_smtp()
+
+            except smtplib.SMTPRecipientsRefused as e:
+                results.append(DeliveryResult(item["id"], False, f"SMTP recipients refused: {e}", retryable=False))
+
+            except Exception as e:
+                # Conexión caída: el resto del lote se reintenta más tarde
+                self._close_smtp()
+                error = f"SMTP error: {e}"
+                results.extend(DeliveryResult(i["id"], False, error) for i in items[n:])
+                break
+
+        return results
+
+    @staticmethod
+    def _requeue_emails(items: list[dict], error: str) -> list[DeliveryResult]:
+        return [
+            DeliveryResult(i["id"], False, error, retry_after=smtp_auth_retry_seconds(), requeue=True)
+            for i in items
+        ]
+
+    def _close_smtp(self):
+        if self._smtp is not None:
+            self._smtp.close()
+            self._smtp = None
+
+    # =====================================================
+    # LOTE
+    # =====================================================
+    def _deliver(self, batch: list[dict]) -> list[DeliveryResult]:
+        emails = [item for item in batch if item["channel"] == "email"]
+        futures = []
+        results = []
+
+        if emails:
+            futures.append(self._email_executor.submit(self._send_emails, emails))
+
+        webhook_futures = []
+        for item in batch:
+            channel = self._webhooks.get(item["channel"])
+            if channel is not None:
+                webhook_futures.append(channel.submit(item))
+            elif item["channel"] != "email":
+                results.append(DeliveryResult(
+                    item["id"], False, f"Canal no soportado: {item['channel']}", retryable=False
+                ))
+
+        for future in futures:
+            results.extend(future.result())
+        for future in webhook_futures:
+            results.append(future.result())
+        return results
+
+    def _record(self, results: list[DeliveryResult]) -> None:
+        NotificationOutboxService.mark_sent([r.id for r in results if r.ok])
+
+        requeued = [r for r in results if not r.ok and r.requeue]
+        if requeued:
+            NotificationOutboxService.requeue(
+                [r.id for r in requeued], requeued[0].error, requeued[0].retry_after or 0
+            )
+
+        for result in results:
+            if not result.ok and not result.requeue:
+                NotificationOutboxService.mark_failed(
+                    result.id, result.error, result.retryable, result.retry_after
+                )
+
+    # =====================================================
+    # LOOP
+    # =====================================================
+    def run_forever(self):
+        logger.info(
+            f"NOTIFICATION DISPATCHER START | worker_id={self.worker_id} | batch_size={self.batch_size}"
+        )
+
+        last_stale_check = last_purge = 0.0
+
+        with self.app.app_context():
+            while not self._stop.is_set():
+                batch = []
+                try:
+                    now = time.monotonic()
+
+                    if now - last_stale_check >= self.STALE_CHECK_SECONDS:
+                        NotificationOutboxService.requeue_stale()
+                        last_stale_check = now
+
+                    if now - last_purge >= self.PURGE_SECONDS:
+                        NotificationOutboxService.purge_sent()
+                        last_purge = now
+
+                    batch = NotificationOutboxService.claim_batch(self.worker_id, self.batch_size)
+                    if batch:
+                        start = time.time()
+                        results = self._deliver(batch)
+                        self._record(results)
+                        logger.info(
+                            f"NOTIFICATION BATCH | size={len(batch)} | "
+                            f"sent={sum(1 for r in results if r.ok)} | duration={time.time() - start:.2f}s"
+                        )
+
+                except Exception:
+                    logger.exception(f"NOTIFICATION DISPATCHER LOOP ERROR | worker_id={self.worker_id}")
+                    db.session.rollback()
+
+                finally:
+                    db.session.remove()
+
+                if not batch:
+                    # Cola vacía: no dejar la conexión SMTP abierta hasta que expire
+                    self._email_executor.submit(self._close_smtp).result()
+                    self._stop.wait(self.poll_seconds)
+
+        self._email_executor.submit(self._close_smtp).result()
+        self._email_executor.shutdown(wait=True)
+        for channel in self._webhooks.values():
+            channel.close()
+
+        logger.info(f"NOTIFICATION DISPATCHER STOPPED | worker_id={self.worker_id}")
@@ -0,0 +1,253 @@
+"""
+NOTIFICATION OUTBOX SERVICE
+===========================
+Encolado y ciclo de vida de las notificaciones salientes (tabla
+`notification_outbox`, ver src/models/notification_outbox.py).
+
+- queue_email() / queue_webhook(): los usan rutas, eventos de usuario y
+  el motor de alertas. Insertan en una conexión aparte (no dependen de
+  que el caller haga commit) y vuelven enseguida.
+- claim_batch() / mark_sent() / mark_failed() / requeue() /
+  requeue_stale() / purge_sent(): los usa el dispatcher (`scripts/notification_worker.py`),
+  con el mismo claim por SKIP LOCKED que audit_jobs / report_jobs.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+
+from src.models.database import db
+from src.models.notification_outbox import NotificationOutbox
+from src.services.email_service import smtp_settings
+
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_CHANNELS = ("slack", "teams")
+
+
+def max_attempts() -> int:
+    return max(1, int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "5")))
+
+
+def retry_backoff_seconds() -> int:
+    return max(1, int(os.getenv("NOTIFICATION_RETRY_BACKOFF_SECONDS", "30")))
+
+
+def stale_seconds() -> int:
+    return max(60, int(os.getenv("NOTIFICATION_STALE_SECONDS", "300")))
+
+
+def retention_days() -> int:
+    """Notificaciones enviadas / fallidas más viejas que esto se borran."""
+    return max(1, int(os.getenv("NOTIFICATION_RETENTION_DAYS", "7")))
+
+
+_CLAIM_SQL = text("""
+    UPDATE notification_outbox
+    SET status = 'sending', attempts = attempts + 1,
+        locked_by = :worker_id, locked_at = :now
+    WHERE id IN (
+        SELECT id FROM notification_outbox
+        WHERE status = 'queued' AND run_after <= :now
+        ORDER BY run_after, id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, channel, recipient, subject, body, payload, attempts, max_attempts
+""")
+
+
+# =====================================================
+# ENCOLADO
+# =====================================================
+def _enqueue(values: dict) -> bool:
+    now = datetime.utcnow()
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(
+                insert(NotificationOutbox.__table__).values(
+                    status="queued",
+                    attempts=0,
+                    max_attempts=max_attempts(),
+                    run_after=now,
+                    created_at=now,
+                    **values
+                )
+            )
+        return True
+    except Exception:
+        logger.exception(
+            f"NOTIFICATION ENQUEUE FAILED | channel={values['channel']} | source={values.get('source')}"
+        )
+        return False
+
+
+def queue_email(to: str, subject: str, body: str, source: str | None = None) -> bool:
+    """
+    Encola un correo. Misma firma y retorno que send_email(): False si
+    SMTP no está configurado o no se pudo encolar.
+    """
+    if not to:
+        return False
+    if smtp_settings() is None:
+        logger.warning("SMTP no configurado. Envío de correo omitido.")
+        return False
+    return _enqueue({
+        "channel": "email",
+        "recipient": to,
+        "subject": subject[:255] if subject else subject,
+        "body": body,
+        "source": source,
+    })
+
+
+def queue_webhook(channel: str, url: str, payload: dict, source: str | None = None) -> bool:
+    if channel not in WEBHOOK_CHANNELS:
+        raise ValueError(f"Unknown webhook channel: {channel}")
+    if not url:
+        return False
+    return _enqueue({
+        "channel": channel,
+        "recipient": url,
+        "payload": payload,
+        "source": source,
+    })
+
+
+class NotificationOutboxService:
+
+    # =====================================================
+    # CLAIM (DISPATCHER)
+    # =====================================================
+    @staticmethod
+    def claim_batch(worker_id: str, limit: int) -> list[dict]:
+        """Marca hasta `limit` notificaciones como `sending` y las devuelve como dicts."""
+        try:
+            rows = db.session.execute(
+                _CLAIM_SQL, {"worker_id": worker_id, "now": datetime.utcnow(), "limit": limit}
+            ).mappings().all()
+            db.session.commit()
+            return [dict(row) for row in rows]
+        except Exception:
+            db.session.rollback()
+            raise
+
+    # =====================================================
+    # RESULTADOS (DISPATCHER)
+    # =====================================================
+    @staticmethod
+    def mark_sent(ids: list[int]) -> None:
+        if not ids:
+            return
+        NotificationOutbox.query.filter(NotificationOutbox.id.in_(ids)).update(
+            {
+                NotificationOutbox.status: "sent",
+                NotificationOutbox.sent_at: datetime.utcnow(),
+                NotificationOutbox.error: None,
+                NotificationOutbox.locked_by: None,
+                # El contenido ya no hace falta: no se conserva hasta el purge
+                NotificationOutbox.body: None,
+                NotificationOutbox.payload: None,
+            },
+            synchronize_session=False,
+        )
+        db.session.commit()
+
+    @staticmethod
+    def mark_failed(notification_id: int, error: str, retryable: bool = True,
+                    retry_after: float | None = None) -> None:
+        notification = NotificationOutbox.query.get(notification_id)
+        if notification is None:
+            return
+        NotificationOutboxService._retry_or_fail(
+            notification, error, datetime.utcnow(), retryable, retry_after
+        )
+        db.session.commit()
+
+    @staticmethod
+    def requeue(ids: list[int], error: str, delay_seconds: float) -> None:
+        """
+        Devuelve a la cola, juntas y sin consumir intento, notificaciones
+        que no se llegaron a enviar por un problema del canal (ej. login
+        SMTP rechazado), no del mensaje.
+        """
+        if not ids:
+            return
+        NotificationOutbox.query.filter(
+            NotificationOutbox.id.in_(ids),
+            NotificationOutbox.status == "sending"
+        ).update(
+            {
+                NotificationOutbox.status: "queued",
+                NotificationOutbox.attempts: NotificationOutbox.attempts - 1,
+                NotificationOutbox.run_after: datetime.utcnow() + timedelta(seconds=delay_seconds),
+                NotificationOutbox.error: (error or "")[:2000],
+                NotificationOutbox.locked_by: None,
+            },
+            synchronize_session=False,
+        )
+        db.session.commit()
+
+    @staticmethod
+    def requeue_stale() -> int:
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=stale_seconds())
+
+        stale = (
+            NotificationOutbox.query
+            .filter(
+                NotificationOutbox.status == "sending",
+                NotificationOutbox.locked_at < cutoff
+            )
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for notification in stale:
+            logger.warning(
+                f"NOTIFICATION STALE | id={notification.id} | locked_by={notification.locked_by}"
+            )
+            NotificationOutboxService._retry_or_fail(notification, "Dispatcher lost", now)
+
+        db.session.commit()
+        return len(stale)
+
+    @staticmethod
+    def purge_sent() -> int:
+        cutoff = datetime.utcnow() - timedelta(days=retention_days())
+        deleted = NotificationOutbox.query.filter(
+            NotificationOutbox.status.in_(("sent", "failed")),
+            NotificationOutbox.created_at < cutoff
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+    # =====================================================
+    # HELPERS
+    # =====================================================
+    @staticmethod
+    def _retry_or_fail(notification, error, now, retryable=True, retry_after=None):
+        notification.error = (error or "")[:2000]
+        notification.locked_by = None
+
+        if retryable and notification.attempts < notification.max_attempts:
+            delay = retry_backoff_seconds() * (2 ** (notification.attempts - 1))
+            if retry_after:
+                delay = max(delay, retry_after)
+            notification.status = "queued"
+            notification.run_after = now + timedelta(seconds=delay)
+            logger.warning(
+                f"NOTIFICATION RETRY | id={notification.id} | channel={notification.channel} | "
+                f"attempt={notification.attempts}/{notification.max_attempts} | retry_in={delay}s"
+            )
+        else:
+            notification.status = "failed"
+            notification.body = None
+            notification.payload = None
+            logger.error(
+                f"NOTIFICATION FAILED | id={notification.id} | channel={notification.channel} | "
+                f"attempts={notification.attempts}"
+            )
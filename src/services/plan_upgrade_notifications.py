@@ -7,7 +7,7 @@ Lógica de notificaciones in-app y email para solicitudes de upgrade de plan.
 from src.models.user import User
 from src.models.notification import Notification
 from src.models.database import db
-from src.services.email_service import send_email
+from src.services.notification_outbox import queue_email
 from src.services.email_templates import build_plan_changed_email, build_plan_upgrade_rejected_email
 
 
@@ -20,7 +20,7 @@ def notify_upgrade_approved(request_upgrade, current_plan, new_plan):
             old_plan_name=current_plan.name,
             new_plan_name=new_plan.name,
         )
-        send_email(to=user.email, subject="FinOpsLatam — Plan actualizado", body=email_body)
+        queue_email(to=user.email, subject="FinOpsLatam — Plan actualizado", body=email_body)
 
     try:
         Notification.query.filter_by(
@@ -49,7 +49,7 @@ def notify_upgrade_rejected(request_upgrade):
         email_body = build_plan_upgrade_rejected_email(
             name=user.contact_name, plan_name=request_upgrade.requested_plan,
         )
-        send_email(
+        queue_email(
             to=user.email,
             subject="FinOpsLatam — Solicitud de upgrade rechazada",
             body=email_body,
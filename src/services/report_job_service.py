@@ -0,0 +1,388 @@
+"""
+REPORT JOB SERVICE
+==================
+Generación asíncrona de reportes de cliente + cache de artefactos
+(tablas `report_jobs` / `report_artifacts`, ver src/models/report_job.py).
+
+- submit(): lo usa `POST /api/client/reports/jobs`. Si el artefacto de
+  (cliente, cuenta, tipo, data_version) ya existe, el job nace
+  `completed` y se descarga sin renderizar; si hay un job activo para el
+  mismo artefacto, se devuelve ese.
+- claim() / complete() / fail() / requeue_stale(): los usa el worker
+  (`scripts/report_worker.py`), con el mismo esquema de SKIP LOCKED y
+  heartbeat que audit_jobs.
+- get_or_render(): para las rutas GET directas de siempre; sirven desde
+  el cache y sólo renderizan en el request si no hay artefacto.
+- bump_data_version(): lo llaman las auditorías y la resolución de
+  findings; invalida todos los artefactos del cliente (cambia la clave).
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import undefer
+
+from src.models.database import db
+from src.models.client import Client
+from src.models.report_job import ReportArtifact, ReportJob
+
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def max_attempts() -> int:
+    return max(1, int(os.getenv("REPORT_JOB_MAX_ATTEMPTS", "2")))
+
+
+def retry_backoff_seconds() -> int:
+    return max(1, int(os.getenv("REPORT_JOB_RETRY_BACKOFF_SECONDS", "30")))
+
+
+def stale_seconds() -> int:
+    return max(60, int(os.getenv("REPORT_JOB_STALE_SECONDS", "600")))
+
+
+def retention_hours() -> int:
+    """Artefactos y jobs terminados más viejos que esto se borran."""
+    return max(1, int(os.getenv("REPORT_ARTIFACT_RETENTION_HOURS", "168")))
+
+
+_CLAIM_SQL = text("""
+    SELECT id FROM report_jobs
+    WHERE status = 'queued' AND run_after <= :now
+    ORDER BY run_after, id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+""")
+
+
+# =====================================================
+# DATA VERSION / CLAVES
+# =====================================================
+def current_data_version(client_id: int) -> int:
+    return db.session.query(Client.data_version).filter(Client.id == client_id).scalar() or 0
+
+
+def bump_data_version(client_id: int) -> None:
+    """Conexión aparte: no hace commit de la transacción del caller."""
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(
+                text("UPDATE clients SET data_version = data_version + 1 WHERE id = :client_id"),
+                {"client_id": client_id}
+            )
+    except Exception:
+        logger.exception(f"REPORT DATA VERSION BUMP FAILED | client_id={client_id}")
+
+
+def artifact_key(client_id: int, aws_account_id: int | None,
+                 report_type: str, data_version: int) -> str:
+    account = aws_account_id if aws_account_id is not None else "all"
+    raw = f"{client_id}:{account}:{report_type}:{data_version}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _report_types() -> dict:
+    # Import diferido: bump_data_version() se usa desde el flujo de
+    # auditorías, que no necesita cargar reportlab / openpyxl
+    from src.reports.client.report_registry import REPORT_TYPES
+    return REPORT_TYPES
+
+
+def _resolve_type(report_type: str, aws_account_id: int | None):
+    spec = _report_types().get(report_type)
+    if spec is None:
+        raise ValueError(f"Unknown report type: {report_type}")
+    return spec, (aws_account_id if spec["per_account"] else None)
+
+
+class ReportJobService:
+
+    # =====================================================
+    # SUBMIT / STATUS (RUTAS)
+    # =====================================================
+    @staticmethod
+    def submit(client_id: int, report_type: str,
+               aws_account_id: int | None = None,
+               requested_by: int | None = None) -> ReportJob:
+
+        _, aws_account_id = _resolve_type(report_type, aws_account_id)
+        version = current_data_version(client_id)
+        key = artifact_key(client_id, aws_account_id, report_type, version)
+        now = datetime.utcnow()
+
+        values = {
+            "client_id": client_id,
+            "requested_by": requested_by,
+            "report_type": report_type,
+            "aws_account_id": aws_account_id,
+            "data_version": version,
+            "artifact_key": key,
+            "attempts": 0,
+            "max_attempts": max_attempts(),
+            "run_after": now,
+            "created_at": now,
+        }
+
+        # Dos vueltas: el job activo que bloqueó el insert puede terminar
+        # entre el insert y la lectura
+        for _ in range(2):
+            if db.session.query(ReportArtifact.key).filter_by(key=key).scalar():
+                job = ReportJob(
+                    **values, status="completed", started_at=now, finished_at=now
+                )
+                db.session.add(job)
+                db.session.commit()
+                logger.info(
+                    f"REPORT JOB CACHE HIT | job_id={job.id} | client_id={client_id} | "
+                    f"type={report_type}"
+                )
+                return job
+
+            stmt = insert(ReportJob).values(status="queued", **values).on_conflict_do_nothing(
+                index_elements=["artifact_key"],
+                index_where=ReportJob.status.in_(ACTIVE_STATUSES),
+            ).returning(ReportJob.id)
+
+            job_id = db.session.execute(stmt).scalar()
+            if job_id is None:
+                job = (
+                    ReportJob.query
+                    .filter(
+                        ReportJob.artifact_key == key,
+                        ReportJob.status.in_(ACTIVE_STATUSES)
+                    )
+                    .first()
+                )
+            else:
+                job = ReportJob.query.get(job_id)
+
+            if job is not None:
+                db.session.commit()
+                if job_id is not None:
+                    logger.info(
+                        f"REPORT JOB QUEUED | job_id={job.id} | client_id={client_id} | "
+                        f"type={report_type} | aws_account_id={aws_account_id}"
+                    )
+                return job
+
+        db.session.rollback()
+        raise RuntimeError("Could not submit report job")
+
+    @staticmethod
+    def get_job(client_id: int, job_id: int) -> ReportJob | None:
+        return ReportJob.query.filter_by(id=job_id, client_id=client_id).first()
+
+    @staticmethod
+    def get_artifact(key: str) -> ReportArtifact | None:
+        return (
+            ReportArtifact.query
+            .options(undefer(ReportArtifact.content))
+            .filter_by(key=key)
+            .first()
+        )
+
+    # =====================================================
+    # RUTAS DIRECTAS (SINCRÓNICAS)
+    # =====================================================
+    @staticmethod
+    def get_or_render(client_id: int, report_type: str,
+                      aws_account_id: int | None = None) -> ReportArtifact:
+
+        spec, aws_account_id = _resolve_type(report_type, aws_account_id)
+        version = current_data_version(client_id)
+        key = artifact_key(client_id, aws_account_id, report_type, version)
+
+        artifact = ReportJobService.get_artifact(key)
+        if artifact is not None:
+            return artifact
+
+        content = spec["render"](client_id, aws_account_id)
+        ReportJobService._store_artifact(
+            key, client_id, aws_account_id, report_type, version, content
+        )
+        db.session.commit()
+        return ReportJobService.get_artifact(key)
+
+    # =====================================================
+    # CLAIM / RENDER (WORKER)
+    # =====================================================
+    @staticmethod
+    def claim(worker_id: str) -> ReportJob | None:
+        now = datetime.utcnow()
+        try:
+            job_id = db.session.execute(_CLAIM_SQL, {"now": now}).scalar()
+            if job_id is None:
+                db.session.rollback()
+                return None
+
+            job = ReportJob.query.get(job_id)
+            job.status = "running"
+            job.attempts += 1
+            job.error = None
+            job.locked_by = worker_id
+            job.started_at = now
+            job.heartbeat_at = now
+            job.finished_at = None
+            db.session.commit()
+            return job
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def render(job_id: int) -> None:
+        """Renderiza el artefacto del job (si otro job no lo generó ya)."""
+        job = ReportJob.query.get(job_id)
+        if job is None:
+            return
+
+        exists = db.session.query(ReportArtifact.key).filter_by(key=job.artifact_key).scalar()
+        if not exists:
+            spec = _report_types()[job.report_type]
+            content = spec["render"](job.client_id, job.aws_account_id)
+            ReportJobService._store_artifact(
+                job.artifact_key, job.client_id, job.aws_account_id,
+                job.report_type, job.data_version, content
+            )
+
+        ReportJobService.complete(job_id)
+
+    @staticmethod
+    def heartbeat(job_ids: list[int]) -> None:
+        if not job_ids:
+            return
+        with db.engine.begin() as conn:
+            conn.execute(
+                ReportJob.__table__.update()
+                .where(ReportJob.__table__.c.id.in_(job_ids))
+                .where(ReportJob.__table__.c.status == "running")
+                .values(heartbeat_at=datetime.utcnow())
+            )
+
+    # =====================================================
+    # FINISH (WORKER)
+    # =====================================================
+    @staticmethod
+    def complete(job_id: int) -> None:
+        job = ReportJob.query.get(job_id)
+        if not job:
+            return
+
+        job.status = "completed"
+        job.finished_at = datetime.utcnow()
+        job.locked_by = None
+        db.session.commit()
+
+    @staticmethod
+    def fail(job_id: int, error: str) -> None:
+        now = datetime.utcnow()
+        job = ReportJob.query.get(job_id)
+        if not job:
+            return
+
+        ReportJobService._retry_or_fail(job, error, now)
+        db.session.commit()
+
+    @staticmethod
+    def requeue_stale() -> int:
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=stale_seconds())
+
+        stale = (
+            ReportJob.query
+            .filter(
+                ReportJob.status == "running",
+                ReportJob.heartbeat_at < cutoff
+            )
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for job in stale:
+            logger.warning(
+                f"REPORT JOB STALE | job_id={job.id} | locked_by={job.locked_by}"
+            )
+            ReportJobService._retry_or_fail(job, "Worker heartbeat lost", now)
+
+        db.session.commit()
+        return len(stale)
+
+    @staticmethod
+    def purge_expired() -> int:
+        """Borra artefactos y jobs terminados fuera de la retención."""
+        cutoff = datetime.utcnow() - timedelta(hours=retention_hours())
+
+        artifacts = (
+            ReportArtifact.query
+            .filter(ReportArtifact.created_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        ReportJob.query.filter(
+            ReportJob.status.in_(("completed", "failed")),
+            ReportJob.finished_at < cutoff
+        ).delete(synchronize_session=False)
+
+        db.session.commit()
+        return artifacts
+
+    # =====================================================
+    # HELPERS
+    # =====================================================
+    @staticmethod
+    def _store_artifact(key, client_id, aws_account_id, report_type, data_version, content):
+        spec = _report_types()[report_type]
+
+        db.session.execute(
+            insert(ReportArtifact).values(
+                key=key,
+                client_id=client_id,
+                aws_account_id=aws_account_id,
+                report_type=report_type,
+                data_version=data_version,
+                mimetype=spec["mimetype"],
+                filename=spec["filename"],
+                size_bytes=len(content),
+                content=content,
+                created_at=datetime.utcnow(),
+            ).on_conflict_do_nothing(index_elements=["key"])
+        )
+
+        # Versiones anteriores del mismo reporte ya no se pueden pedir
+        stale = ReportArtifact.query.filter(
+            ReportArtifact.client_id == client_id,
+            ReportArtifact.report_type == report_type,
+            ReportArtifact.data_version < data_version,
+        )
+        if aws_account_id is None:
+            stale = stale.filter(ReportArtifact.aws_account_id.is_(None))
+        else:
+            stale = stale.filter(ReportArtifact.aws_account_id == aws_account_id)
+        stale.delete(synchronize_session=False)
+
+    @staticmethod
+    def _retry_or_fail(job, error, now):
+        job.error = (error or "")[:2000]
+        job.locked_by = None
+
+        if job.attempts < job.max_attempts:
+            delay = retry_backoff_seconds() * (2 ** (job.attempts - 1))
+            job.status = "queued"
+            job.run_after = now + timedelta(seconds=delay)
+            logger.warning(
+                f"REPORT JOB RETRY | job_id={job.id} | attempt={job.attempts}/{job.max_attempts} | "
+                f"retry_in={delay}s"
+            )
+        else:
+            job.status = "failed"
+            job.finished_at = now
+            logger.error(
+                f"REPORT JOB FAILED | job_id={job.id} | attempts={job.attempts}"
+            )
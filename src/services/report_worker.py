@@ -0,0 +1,137 @@
+"""
+REPORT WORKER
+=============
+Proceso independiente que consume `report_jobs` (ver ReportJobService).
+
+Corre fuera de gunicorn (`python scripts/report_worker.py`): el render
+de PDFs / XLSX (cost explorer, findings, governance, gráficos) deja de
+ocupar workers del API. Igual que el audit worker, reclama con SKIP
+LOCKED, así que se pueden levantar varios.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from src.models.database import db
+from src.services.report_job_service import ReportJobService
+
+
+logger = logging.getLogger(__name__)
+
+
+class ReportWorker:
+
+    HEARTBEAT_SECONDS = 30
+    STALE_CHECK_SECONDS = 60
+    PURGE_SECONDS = 3600
+
+    def __init__(self, app, concurrency=None, poll_seconds=None, worker_id=None):
+        self.app = app
+        self.concurrency = concurrency or max(1, int(os.getenv("REPORT_WORKER_CONCURRENCY", "2")))
+        self.poll_seconds = poll_seconds or float(os.getenv("REPORT_WORKER_POLL_SECONDS", "2"))
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._running = {}          # job_id -> Future
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    # =====================================================
+    # JOB
+    # =====================================================
+    def _execute(self, job_id, client_id, report_type):
+        with self.app.app_context():
+            log_ctx = f"job_id={job_id} | client_id={client_id} | type={report_type}"
+            start = time.time()
+
+            try:
+                logger.info(f"REPORT JOB START | {log_ctx}")
+                ReportJobService.render(job_id)
+                logger.info(
+                    f"REPORT JOB COMPLETED | {log_ctx} | duration={time.time() - start:.2f}s"
+                )
+
+            except Exception as e:
+                logger.exception(f"REPORT JOB ERROR | {log_ctx}")
+                db.session.rollback()
+                try:
+                    ReportJobService.fail(job_id, str(e))
+                except Exception:
+                    logger.exception(f"REPORT JOB FAIL UPDATE ERROR | {log_ctx}")
+                    db.session.rollback()
+
+            finally:
+                db.session.remove()
+
+    # =====================================================
+    # LOOP
+    # =====================================================
+    def _free_slots(self):
+        with self._lock:
+            for job_id in [j for j, f in self._running.items() if f.done()]:
+                self._running.pop(job_id)
+            return self.concurrency - len(self._running)
+
+    def _claim_jobs(self, executor):
+        claimed = 0
+        while self._free_slots() > 0 and not self._stop.is_set():
+            job = ReportJobService.claim(self.worker_id)
+            if job is None:
+                break
+
+            future = executor.submit(self._execute, job.id, job.client_id, job.report_type)
+            with self._lock:
+                self._running[job.id] = future
+            claimed += 1
+        return claimed
+
+    def run_forever(self):
+        logger.info(
+            f"REPORT WORKER START | worker_id={self.worker_id} | concurrency={self.concurrency}"
+        )
+
+        last_heartbeat = last_stale_check = last_purge = 0.0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            with self.app.app_context():
+                while not self._stop.is_set() or self._free_slots() < self.concurrency:
+                    try:
+                        now = time.monotonic()
+
+                        if now - last_stale_check >= self.STALE_CHECK_SECONDS:
+                            ReportJobService.requeue_stale()
+                            last_stale_check = now
+
+                        if now - last_purge >= self.PURGE_SECONDS:
+                            ReportJobService.purge_expired()
+                            last_purge = now
+
+                        if now - last_heartbeat >= self.HEARTBEAT_SECONDS:
+                            with self._lock:
+                                job_ids = list(self._running)
+                            ReportJobService.heartbeat(job_ids)
+                            last_heartbeat = now
+
+                        claimed = 0
+                        if not self._stop.is_set():
+                            claimed = self._claim_jobs(executor)
+
+                    except Exception:
+                        logger.exception(f"REPORT WORKER LOOP ERROR | worker_id={self.worker_id}")
+                        db.session.rollback()
+                        claimed = 0
+
+                    finally:
+                        db.session.remove()
+
+                    if not claimed:
+                        time.sleep(self.poll_seconds if not self._stop.is_set() else 1)
+
+        logger.info(f"REPORT WORKER STOPPED | worker_id={self.worker_id}")
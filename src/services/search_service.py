@@ -0,0 +1,185 @@
+"""
+SEARCH SERVICE
+==============
+Búsqueda rankeada de findings e inventario AWS para el buscador de la UI
+(`/api/client/findings/search`, `/api/client/inventory/search`).
+
+Se apoya en los índices de la migración c9e2a5f1d4b7:
+- `search_vector` (tsvector mantenido por trigger) con tsquery por prefijo
+  (`term:*`): "ec2 unatt" encuentra "EC2 ... unattached".
+- pg_trgm sobre resource_id: prefijo (LIKE 'x%') y similitud (`%`)
+  para IDs/ARNs con typos o fragmentos.
+
+Ranking: ts_rank del texto + similarity() del resource_id.
+"""
+
+import re
+
+from sqlalchemy import and_, func, literal_column, or_
+
+from src.models.database import db
+from src.models.aws_finding import AWSFinding
+from src.models.aws_resource_inventory import AWSResourceInventory
+from src.services.client_findings_filters import escape_like
+
+
+MIN_QUERY_LENGTH = 2
+MAX_TOKENS = 8
+MAX_LIMIT = 50
+
+
+def _prefix_tsquery(q: str) -> str | None:
+    """'ec2 unatt' -> 'ec2:* & unatt:*' (solo caracteres de palabra)."""
+    tokens = re.findall(r"\w+", q.lower())[:MAX_TOKENS]
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def _normalize(q: str | None, limit: int) -> tuple[str | None, int]:
+    q = (q or "").strip()
+    if len(q) < MIN_QUERY_LENGTH:
+        return None, 0
+    return q[:200], min(max(limit, 1), MAX_LIMIT)
+
+
+class SearchService:
+
+    # =====================================================
+    # FINDINGS
+    # =====================================================
+    @staticmethod
+    def search_findings(
+        client_id: int,
+        q: str,
+        aws_account_id: int | None = None,
+        status: str | None = "active",
+        limit: int = 20
+    ) -> list[dict]:
+
+        q, limit = _normalize(q, limit)
+        if not q:
+            return []
+
+        conditions = [
+            AWSFinding.resource_id.ilike(f"{escape_like(q)}%", escape="\\"),
+            AWSFinding.resource_id.op("%")(q),
+        ]
+
+        tsquery_text = _prefix_tsquery(q)
+        text_rank = literal_column("0")
+        if tsquery_text:
+            tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), tsquery_text)
+            conditions.append(AWSFinding.search_vector.op("@@")(tsquery))
+            text_rank = func.ts_rank(AWSFinding.search_vector, tsquery)
+
+        score = (text_rank + func.similarity(AWSFinding.resource_id, q)).label("score")
+
+        query = (
+            db.session.query(AWSFinding, score)
+            .join(
+                AWSResourceInventory,
+                and_(
+                    AWSFinding.resource_id == AWSResourceInventory.resource_id,
+                    AWSFinding.client_id == AWSResourceInventory.client_id
+                )
+            )
+            .filter(
+                AWSFinding.client_id == client_id,
+                AWSResourceInventory.is_active.is_(True),
+                or_(*conditions)
+            )
+        )
+
+        if aws_account_id is not None:
+            query = query.filter(AWSFinding.aws_account_id == aws_account_id)
+
+        if status == "active":
+            query = query.filter(AWSFinding.resolved.is_(False))
+        elif status == "resolved":
+            query = query.filter(AWSFinding.resolved.is_(True))
+
+        rows = query.order_by(score.desc(), AWSFinding.id.desc()).limit(limit).all()
+
+        return [
+            {
+                "id": f.id,
+                "aws_account_id": f.aws_account_id,
+                "resource_id": f.resource_id,
+                "aws_service": f.aws_service,
+                "finding_type": f.finding_type,
+                "severity": f.severity,
+                "message": f.message,
+                "resolved": f.resolved,
+                "score": round(float(row_score or 0), 4),
+            }
+            for f, row_score in rows
+        ]
+
+    # =====================================================
+    # INVENTORY
+    # =====================================================
+    @staticmethod
+    def search_inventory(
+        client_id: int,
+        q: str,
+        aws_account_id: int | None = None,
+        limit: int = 20
+    ) -> list[dict]:
+
+        q, limit = _normalize(q, limit)
+        if not q:
+            return []
+
+        inv = AWSResourceInventory
+
+        conditions = [
+            inv.resource_id.ilike(f"{escape_like(q)}%", escape="\\"),
+            inv.resource_id.op("%")(q),
+        ]
+
+        tsquery_text = _prefix_tsquery(q)
+        text_rank = literal_column("0")
+        if tsquery_text:
+            tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), tsquery_text)
+            conditions.append(inv.search_vector.op("@@")(tsquery))
+            text_rank = func.ts_rank(inv.search_vector, tsquery)
+
+        score = (text_rank + func.similarity(inv.resource_id, q)).label("score")
+
+        query = (
+            db.session.query(
+                inv.id,
+                inv.aws_account_id,
+                inv.resource_id,
+                inv.service_name,
+                inv.resource_type,
+                inv.region,
+                inv.state,
+                score
+            )
+            .filter(
+                inv.client_id == client_id,
+                inv.is_active.is_(True),
+                or_(*conditions)
+            )
+        )
+
+        if aws_account_id is not None:
+            query = query.filter(inv.aws_account_id == aws_account_id)
+
+        rows = query.order_by(score.desc(), inv.id.desc()).limit(limit).all()
+
+        return [
+            {
+                "id": r.id,
+                "aws_account_id": r.aws_account_id,
+                "resource_id": r.resource_id,
+                "service_name": r.service_name,
+                "resource_type": r.resource_type,
+                "region": r.region,
+                "state": r.state,
+                "score": round(float(r.score or 0), 4),
+            }
+            for r in rows
+        ]
@@ -6,6 +6,7 @@ Eventos del sistema relacionados con usuarios.
 
 import logging
 from src.services.email_service import send_email
+from src.services.notification_outbox import queue_email
 from src.services.email_templates import (
     build_user_welcome_email,
     build_plan_changed_email,
@@ -20,9 +21,15 @@ from src.services.email_templates import (
 logger = logging.getLogger("user_events")
 
 
-def safe_send_email(to: str, subject: str, body: str):
+def safe_send_email(to: str, subject: str, body: str, contains_credentials: bool = False):
+    # Encola y vuelve: el envío lo hace scripts/notification_worker.py.
+    # Los correos con contraseñas (temporales o iniciales) se envían en
+    # línea: no deben quedar guardados en notification_outbox.
     try:
-        send_email(to=to, subject=subject, body=body)
+        if contains_credentials:
+            send_email(to=to, subject=subject, body=body)
+        else:
+            queue_email(to=to, subject=subject, body=body, source="user_event")
     except Exception:
         logger.exception("[EMAIL_FAILED] to=%s", to)
 
@@ -44,6 +51,7 @@ def on_user_created_with_password(user, raw_password):
             user.email,
             raw_password,
         ),
+        contains_credentials=True,
     )
 
 # -------------------------------------------------
@@ -78,6 +86,7 @@ def on_admin_reset_password(user, temp_password):
             user.email,
             temp_password,
         ),
+        contains_credentials=True,
     )
 
 # -------------------------------------------------
@@ -130,4 +139,5 @@ def on_forgot_password(user, temp_password):
             user.email,
             temp_password,
         ),
+        contains_credentials=True,
     )
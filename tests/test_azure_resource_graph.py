@@ -0,0 +1,146 @@
+"""
+Backend Resource Graph de inventario Azure contra la grabación
+src/azure/recordings/resource_graph_sample.json.
+
+Corre el scan completo (paginado por skip token, MAPPERS,
+_apply_cdn_endpoints, _apply_servicebus_counts) sobre el stand-in
+RecordedResourceGraphClient y verifica que cada fila tenga el mismo
+service_name / resource_type / state / claves de resource_metadata que
+produce el scanner de management equivalente, que es lo que consumen las
+reglas del finding engine.
+
+    python -m pytest tests/test_azure_resource_graph.py
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("azure.mgmt.resourcegraph")
+pytest.importorskip("azure.mgmt.servicebus")
+pytest.importorskip("flask_sqlalchemy")
+
+from src.azure.resource_graph import RecordedResourceGraphClient, iter_resources  # noqa: E402
+from src.azure.scanners.resource_graph_scanner import ResourceGraphScanner  # noqa: E402
+
+
+RECORDING = os.path.join(
+    os.path.dirname(__file__), "..", "src", "azure", "recordings", "resource_graph_sample.json"
+)
+SUBSCRIPTION_ID = "00000000-0000-0000-0000-000000000001"
+
+BASE = {"name", "resource_group"}
+
+# resource_metadata que escribe cada scanner de src/azure/scanners/
+SCANNER_METADATA_KEYS = {
+    ("VirtualMachines", "VirtualMachine"): BASE | {"vm_size", "os_type"},
+    ("ManagedDisks", "Disk"): BASE | {"sku_name", "disk_size_gb", "managed_by"},
+    ("Snapshots", "Snapshot"): BASE | {"source_resource_id", "disk_size_gb"},
+    ("StorageAccounts", "StorageAccount"): BASE | {
+        "kind", "sku_name", "access_tier", "allow_blob_public_access",
+        "supports_https_traffic_only",
+    },
+    ("SQLDatabase", "SqlServer"): BASE | {"public_network_access", "minimal_tls_version", "version"},
+    ("SQLDatabase", "SqlDatabase"): {"name", "server_name", "sku_name", "sku_tier", "max_size_bytes"},
+    ("PostgreSQL", "FlexibleServer"): BASE | {
+        "sku_name", "sku_tier", "version", "storage_size_gb", "backup_retention_days",
+        "public_network_access", "high_availability_mode",
+    },
+    ("AppService", "WebApp"): BASE | {"kind", "https_only", "default_host_name", "server_farm_id"},
+    ("Functions", "FunctionApp"): BASE | {"kind", "https_only", "default_host_name", "server_farm_id"},
+    ("PublicIP", "PublicIPAddress"): BASE | {"sku_name", "ip_address", "allocation_method"},
+    ("LoadBalancer", "LoadBalancer"): BASE | {"sku_name", "backend_pool_count", "total_backend_addresses"},
+    ("DNS", "Zone"): BASE | {"zone_type", "number_of_record_sets"},
+    ("KeyVault", "Vault"): BASE | {
+        "sku_name", "purge_protection_enabled", "soft_delete_enabled", "network_default_action",
+    },
+    ("Monitor", "LogAnalyticsWorkspace"): BASE | {"sku_name", "retention_in_days", "daily_quota_gb"},
+    ("CDN", "Profile"): BASE | {"sku_name", "endpoint_count", "any_http_allowed"},
+    ("ServiceBus", "Namespace"): BASE | {"sku_name", "minimum_tls_version", "queue_count", "topic_count"},
+}
+
+# nombre -> (service_name, resource_type, state)
+EXPECTED = {
+    "vm-api-01": ("VirtualMachines", "VirtualMachine", "running"),
+    "vm-batch-02": ("VirtualMachines", "VirtualMachine", "deallocated"),
+    "disk-orphan-01": ("ManagedDisks", "Disk", "Unattached"),
+    "snap-vm-api-01-2024": ("Snapshots", "Snapshot", "Succeeded"),
+    "stdatalake01": ("StorageAccounts", "StorageAccount", "available"),
+    "sql-core": ("SQLDatabase", "SqlServer", "Ready"),
+    "orders": ("SQLDatabase", "SqlDatabase", "Online"),
+    "pg-analytics": ("PostgreSQL", "FlexibleServer", "Ready"),
+    "app-portal": ("AppService", "WebApp", "Running"),
+    "func-ingest": ("Functions", "FunctionApp", "Running"),
+    "pip-unused": ("PublicIP", "PublicIPAddress", "unassociated"),
+    "lb-empty": ("LoadBalancer", "LoadBalancer", "Succeeded"),
+    "example.com": ("DNS", "Zone", None),
+    "kv-core": ("KeyVault", "Vault", "active"),
+    "law-central": ("Monitor", "LogAnalyticsWorkspace", "Succeeded"),
+    "cdn-static": ("CDN", "Profile", "Active"),
+    "sb-events": ("ServiceBus", "Namespace", "Active"),
+}
+
+
+@pytest.fixture
+def scanned_rows(monkeypatch):
+    monkeypatch.setenv("AZURE_RESOURCE_GRAPH_RECORDING", RECORDING)
+
+    # Sin AzureBaseScanner.__init__: no hay cuenta en la DB ni credenciales
+    scanner = ResourceGraphScanner.__new__(ResourceGraphScanner)
+    scanner.subscription_id = SUBSCRIPTION_ID
+    scanner.credential = None
+
+    rows = []
+    scanner.upsert_resource = lambda **row: rows.append(row)
+    scanner.scan_resource_graph()
+
+    return {row["resource_metadata"]["name"]: row for row in rows}
+
+
+def test_recorded_client_pages_with_skip_token():
+    client = RecordedResourceGraphClient.from_file(RECORDING)
+
+    rows = list(iter_resources(client, [SUBSCRIPTION_ID]))
+
+    assert len(client.requests) == 2
+    assert client.requests[0].options.skip_token is None
+    assert client.requests[1].options.skip_token is not None
+    assert len(rows) == 19
+    assert list(iter_resources(client, ["ffffffff-0000-0000-0000-000000000000"])) == []
+
+
+def test_rows_match_management_scanners(scanned_rows):
+    assert set(scanned_rows) == set(EXPECTED)
+
+    for name, (service_name, resource_type, state) in EXPECTED.items():
+        row = scanned_rows[name]
+        assert (row["service_name"], row["resource_type"], row["state"]) == (
+            service_name, resource_type, state
+        ), name
+        assert set(row["resource_metadata"]) == SCANNER_METADATA_KEYS[(service_name, resource_type)], name
+        assert row["resource_id"].startswith(f"/subscriptions/{SUBSCRIPTION_ID}/")
+
+
+def test_resource_group_keeps_resource_id_casing(scanned_rows):
+    assert scanned_rows["vm-api-01"]["resource_metadata"]["resource_group"] == "RG-APP"
+    assert scanned_rows["orders"]["resource_metadata"]["server_name"] == "sql-core"
+
+
+def test_sql_master_database_is_skipped(scanned_rows):
+    assert "master" not in scanned_rows
+
+
+def test_cdn_endpoints_are_folded_into_profile(scanned_rows):
+    metadata = scanned_rows["cdn-static"]["resource_metadata"]
+
+    assert "static-assets" not in scanned_rows
+    assert metadata["endpoint_count"] == 1
+    assert metadata["any_http_allowed"] is True
+
+
+def test_servicebus_counts_unknown_with_recording(scanned_rows):
+    metadata = scanned_rows["sb-events"]["resource_metadata"]
+
+    # None (no 0): la regla de namespace vacío no debe dispararse
+    assert metadata["queue_count"] is None
+    assert metadata["topic_count"] is None